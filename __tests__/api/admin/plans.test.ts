@@ -0,0 +1,75 @@
+import { NextRequest } from 'next/server';
+
+const PLAN_OBJECT_ID = '650000000000000000000a01';
+
+jest.mock('@/lib/auth/withAuth', () => ({
+    withAdminAuth: (handler: any) => (req: any, context: any) =>
+        handler(req, { id: 'admin-1', role: 'admin', emailAddresses: [{ emailAddress: 'admin@example.com' }] }, context),
+}));
+jest.mock('@/lib/db/mongodb', () => ({ connectToDatabase: jest.fn().mockResolvedValue(undefined) }));
+jest.mock('@/lib/planCache', () => ({ invalidatePlanCache: jest.fn().mockResolvedValue(undefined) }));
+jest.mock('@/lib/models/PlanChangeLog', () => ({
+    __esModule: true,
+    default: { insertMany: jest.fn().mockResolvedValue([]), create: jest.fn() },
+}));
+jest.mock('@/lib/models/User', () => ({
+    User: { countDocuments: jest.fn().mockResolvedValue(2), find: jest.fn() },
+}));
+jest.mock('@/lib/models/Product', () => ({ __esModule: true, default: { find: jest.fn(), updateMany: jest.fn() } }));
+jest.mock('@/lib/models/Subscription', () => ({
+    Subscription: { distinct: jest.fn().mockResolvedValue(['user-1', 'user-2']) },
+}));
+jest.mock('@/lib/models/Plan', () => {
+    const plan = {
+        id: 'pro',
+        price: 99900,
+        limits: { products: 50, emailCampaigns: 10, autoDMAutomations: 10, maxAutoDms: 2000 },
+    };
+    const Plan = {
+        // The route awaits the document; refreshEntitlements chains select().lean().
+        findOne: jest.fn(() => ({ ...plan, select: () => ({ lean: async () => ({ _id: '650000000000000000000a01' }) }) })),
+        findOneAndUpdate: jest.fn().mockResolvedValue(plan),
+    };
+    return { __esModule: true, default: Plan, Plan };
+});
+jest.mock('@/lib/cache/entitlements', () => ({
+    ...jest.requireActual('@/lib/cache/entitlements'),
+    invalidateEntitlements: jest.fn().mockResolvedValue(undefined),
+}));
+
+import { PATCH } from '@/app/api/admin/plans/[planId]/route';
+import { invalidateEntitlements } from '@/lib/cache/entitlements';
+import { Subscription } from '@/lib/models/Subscription';
+
+function patchLimits(limits: Record<string, number>) {
+    const req = new NextRequest('http://localhost:3000/api/admin/plans/pro', {
+        method: 'PATCH',
+        body: JSON.stringify({ limits }),
+        headers: { 'Content-Type': 'application/json' },
+    });
+    return (PATCH as any)(req, { params: { planId: 'pro' } });
+}
+
+// Limit enforcement runs after the response (fire and forget).
+const settle = () => new Promise(resolve => setImmediate(resolve));
+
+describe('PATCH /api/admin/plans/[planId] — cached DM entitlements', () => {
+    beforeEach(() => jest.clearAllMocks());
+
+    it('invalidates the plan subscribers\' entitlements when the monthly DM cap changes', async () => {
+        const response = await patchLimits({ maxAutoDms: 500 });
+        await settle();
+
+        expect(response.status).toBe(200);
+        expect(Subscription.distinct).toHaveBeenCalledWith('userId', expect.objectContaining({ planId: PLAN_OBJECT_ID }));
+        expect(invalidateEntitlements).toHaveBeenCalledWith('user-1', 'user-2');
+    });
+
+    it('leaves entitlements cached when another limit changes', async () => {
+        const response = await patchLimits({ emailCampaigns: 5 });
+        await settle();
+
+        expect(response.status).toBe(200);
+        expect(invalidateEntitlements).not.toHaveBeenCalled();
+    });
+});
@@ -1,15 +1,18 @@
 import { POST } from '@/app/api/analytics/track/route';
 import { createTestRequest } from '@/tests/utils/api-test-utils';
 import AnalyticsEvent from '@/lib/models/AnalyticsEvent';
+import { analyticsIngest } from '@/lib/analytics/ingest';
 import { connectToDatabase } from '@/lib/db/mongodb';
 
+const CREATOR_ID = '65f000000000000000000123';
+
 describe('POST /api/analytics/track', () => {
     beforeAll(async () => {
         await connectToDatabase();
     });
 
     afterAll(async () => {
-        await AnalyticsEvent.deleteMany({ creatorId: 'test-creator-123' });
+        await AnalyticsEvent.deleteMany({ creatorId: CREATOR_ID });
     });
 
     it('should track page view event', async () => {
@@ -17,7 +20,7 @@ describe('POST /api/analytics/track', () => {
             method: 'POST',
             body: {
                 eventType: 'page_view',
-                creatorId: 'test-creator-123',
+                creatorId: CREATOR_ID,
                 path: '/testcreator',
                 referrer: 'https://google.com',
             },
@@ -29,16 +32,39 @@ describe('POST /api/analytics/track', () => {
         expect(response.status).toBe(201);
         expect(data.success).toBe(true);
 
-        const event = await AnalyticsEvent.findOne({ creatorId: 'test-creator-123', eventType: 'page_view' });
+        // Events are written behind the response; flush the buffer first.
+        await analyticsIngest.flush();
+        const event = await AnalyticsEvent.findById(data.eventId);
         expect(event).not.toBeNull();
     });
 
+    it('should accept a batched beacon', async () => {
+        const req = createTestRequest({
+            method: 'POST',
+            body: {
+                events: [
+                    { eventType: 'page_view', creatorId: CREATOR_ID, path: '/testcreator' },
+                    { eventType: 'product_view', creatorId: CREATOR_ID, path: '/testcreator/product' },
+                ],
+            },
+        });
+
+        const response = await POST(req);
+        const data = await response.json();
+
+        expect(response.status).toBe(201);
+        expect(data.accepted).toBe(2);
+
+        await analyticsIngest.flush();
+        expect(await AnalyticsEvent.countDocuments({ _id: { $in: data.eventIds } })).toBe(2);
+    });
+
     it('should validate event type', async () => {
         const req = createTestRequest({
             method: 'POST',
             body: {
                 eventType: 'invalid_event',
-                creatorId: 'test-creator-123',
+                creatorId: CREATOR_ID,
             },
         });
 
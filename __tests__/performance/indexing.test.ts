@@ -1,4 +1,6 @@
 import Product from '@/lib/models/Product';
+import { Order } from '@/lib/models/Order';
+import { KEYSET_SORT, keysetFilter } from '@/lib/db/pagination';
 import { connectToDatabase } from '@/lib/db/mongodb';
 import mongoose from 'mongoose';
 
@@ -19,4 +21,16 @@ describe('Database Indexing Performance', () => {
 
         expect(isIndexScan).toBe(true);
     });
+
+    it('should seek keyset pages from an index without sorting in memory', async () => {
+        await Order.createIndexes();
+        const creatorId = new mongoose.Types.ObjectId();
+        const after = { createdAt: new Date(), _id: new mongoose.Types.ObjectId() };
+
+        const explain: any = await Order.find(keysetFilter({ creatorId }, after)).sort(KEYSET_SORT).limit(21).explain();
+        const winningPlan = JSON.stringify(explain.queryPlanner.winningPlan);
+
+        expect(winningPlan).toContain('IXSCAN');
+        expect(winningPlan).not.toContain('"stage":"SORT"');
+    });
 });
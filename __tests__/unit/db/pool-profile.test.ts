@@ -0,0 +1,22 @@
+import { POOL_PROFILES, resolvePoolProfile } from '@/lib/db/mongodb';
+
+describe('Mongo pool profiles', () => {
+    afterEach(() => {
+        delete process.env.MONGODB_MAX_POOL_SIZE;
+        delete process.env.MONGODB_MIN_POOL_SIZE;
+    });
+
+    it('gives long-lived workers a bigger pool than serverless API instances', () => {
+        expect(resolvePoolProfile('worker').maxPoolSize).toBeGreaterThan(resolvePoolProfile('api').maxPoolSize);
+        expect(resolvePoolProfile('api')).toEqual(POOL_PROFILES.api);
+    });
+
+    it('applies env overrides and keeps minPoolSize within maxPoolSize', () => {
+        process.env.MONGODB_MAX_POOL_SIZE = '3';
+        process.env.MONGODB_MIN_POOL_SIZE = 'not-a-number';
+
+        const profile = resolvePoolProfile('worker');
+        expect(profile.maxPoolSize).toBe(3);
+        expect(profile.minPoolSize).toBe(3);
+    });
+});
@@ -0,0 +1,133 @@
+/**
+ * Count the Mongo round trips the queue spends deciding whether a dm_delivery
+ * job may send, and print one JSON line with the totals.
+ *
+ *   npx tsx scripts/bench-dm-entitlements.ts --mode cached --jobs 1000
+ *
+ * `--mode legacy` replays the lookups handleDMDelivery used to make per job
+ * (platform settings, creator, subscription + plan, the month's DMLog count).
+ * `--mode cached` runs isAutomationEnabled / getDMEntitlement / reserveDM from
+ * src/lib/cache/entitlements.ts. Both write the DMLog entry a sent DM leaves,
+ * and remove it afterwards. Needs MONGODB_URI and the Upstash env (the
+ * stand-in provides both); driven by `python -m harness.entitlement_bench`.
+ */
+import mongoose from 'mongoose';
+import { connectToDatabase } from '../src/lib/db/mongodb';
+import { getDMEntitlement, invalidateEntitlements, isAutomationEnabled, reserveDM } from '../src/lib/cache/entitlements';
+import { DMLog } from '../src/lib/models/DMLog';
+import { Plan } from '../src/lib/models/Plan';
+import { PlatformSettings } from '../src/lib/models/PlatformSettings';
+import { Subscription } from '../src/lib/models/Subscription';
+import { User } from '../src/lib/models/User';
+import { PlanTier } from '../src/lib/models/plan.types';
+
+function flag(name: string, fallback: string) {
+    const index = process.argv.indexOf(`--${name}`);
+    return index >= 0 ? process.argv[index + 1] : fallback;
+}
+
+const mode = flag('mode', 'cached');
+const jobs = Number(flag('jobs', '1000'));
+const creatorId = flag('creator', process.env.TEST_CREATOR_ID || '650000000000000000000001');
+const runId = `${mode}-${Date.now()}`;
+
+// Driver housekeeping, not queries the job makes.
+const IGNORED = new Set(['hello', 'isMaster', 'ismaster', 'ping', 'endSessions', 'buildInfo', 'saslStart', 'saslContinue']);
+const commands: Record<string, number> = {};
+
+async function legacyGate() {
+    const settings = await PlatformSettings.findOne();
+    if (settings?.featureToggles?.automationEnabled === false) throw new Error('Automations disabled');
+    const creator = await User.findById(creatorId).lean();
+    if (!creator) throw new Error('Creator not found');
+    const activeSub = await Subscription.findOne({
+        userId: creatorId,
+        status: { $in: ['active', 'trialing'] }
+    }).populate('planId');
+    let plan = activeSub?.planId as any;
+    if (!plan) plan = await Plan.findOne({ tier: PlanTier.FREE });
+    if (!plan) throw new Error('No plan configuration found.');
+    const startOfMonth = new Date();
+    startOfMonth.setDate(1);
+    startOfMonth.setHours(0, 0, 0, 0);
+    const usageCount = await DMLog.countDocuments({ creatorId, createdAt: { $gte: startOfMonth }, status: 'success' });
+    if (usageCount >= plan.maxAutoDms) throw new Error(`Plan limit reached: ${usageCount}/${plan.maxAutoDms} Auto DMs.`);
+}
+
+async function cachedGate() {
+    if (!(await isAutomationEnabled())) throw new Error('Automations disabled');
+    const entitlement = await getDMEntitlement(creatorId);
+    if (!entitlement) throw new Error('Creator not found');
+    await reserveDM(entitlement);
+}
+
+/** A plan with a monthly cap and an active subscription to it, written directly. */
+async function seedPlan() {
+    const db = mongoose.connection.db!;
+    const planId = new mongoose.Types.ObjectId('650000000000000000000e01');
+    await db.collection('plans').updateOne({ _id: planId }, {
+        $set: { id: 'perf-entitlements', name: 'Perf Entitlements', tier: 'pro', maxAutoDms: jobs * 100, isActive: true },
+    }, { upsert: true });
+    const now = new Date();
+    await db.collection('subscriptions').updateOne({ userId: new mongoose.Types.ObjectId(creatorId), planId }, {
+        $set: {
+            status: 'active', billingPeriod: 'monthly', originalPrice: 0, discountAmount: 0, finalPrice: 0,
+            startDate: now, endDate: new Date(now.getTime() + 30 * 86400_000),
+        },
+    }, { upsert: true });
+    await invalidateEntitlements(creatorId);
+}
+
+function percentile(sorted: number[], pct: number) {
+    return sorted.length ? sorted[Math.min(sorted.length - 1, Math.ceil((pct / 100) * sorted.length) - 1)] : 0;
+}
+
+async function main() {
+    await mongoose.connect(process.env.MONGODB_URI!, { monitorCommands: true });
+    await connectToDatabase();
+    await seedPlan();
+
+    mongoose.connection.getClient().on('commandStarted', (event: any) => {
+        if (!IGNORED.has(event.commandName)) commands[event.commandName] = (commands[event.commandName] || 0) + 1;
+    });
+
+    const gate = mode === 'legacy' ? legacyGate : cachedGate;
+    const latencies: number[] = [];
+    const started = Date.now();
+    for (let i = 0; i < jobs; i++) {
+        const jobStarted = performance.now();
+        await gate();
+        latencies.push(performance.now() - jobStarted);
+        await DMLog.create({
+            creatorId, recipientId: `bench-${i}`, triggerSource: 'automation', status: 'success',
+            messageSent: 'bench', provider: 'instagram', lastInteractionAt: new Date(),
+            metadata: { entitlementBench: runId },
+        });
+    }
+    const durationMs = Date.now() - started;
+
+    const total = Object.values(commands).reduce((sum, count) => sum + count, 0);
+    const gateTrips = total - (commands.insert || 0);
+    latencies.sort((a, b) => a - b);
+    console.log(JSON.stringify({
+        mode,
+        jobs,
+        durationMs,
+        mongoCommands: total,
+        gateRoundTrips: gateTrips,
+        gateRoundTripsPerJob: Number((gateTrips / jobs).toFixed(3)),
+        roundTripsPerJob: Number((total / jobs).toFixed(3)),
+        byCommand: commands,
+        gateP50Ms: Number(percentile(latencies, 50).toFixed(2)),
+        gateP95Ms: Number(percentile(latencies, 95).toFixed(2)),
+    }));
+
+    await DMLog.deleteMany({ 'metadata.entitlementBench': runId });
+    await mongoose.disconnect();
+}
+
+// The cache's invalidation subscriber would keep the process alive.
+main().then(() => process.exit(0), error => {
+    console.error(error);
+    process.exit(1);
+});
@@ -0,0 +1,59 @@
+/**
+ * Soak createMemoryCache with distinct keys and print memory samples as JSON lines.
+ *
+ *   NODE_OPTIONS=--expose-gc npx tsx scripts/bench-memory-cache.ts --keys 1000000
+ *
+ * Flags: --keys N, --ttl-ms N, --sample-every N, --max-entries N, --max-bytes N,
+ * --unbounded (no size limits and no sweep, i.e. the old behaviour).
+ * Driven by `python -m harness.memory_soak`.
+ */
+import { createMemoryCache } from '../src/lib/cache/memory-cache';
+
+function flag(name: string, fallback: number) {
+    const index = process.argv.indexOf(`--${name}`);
+    return index >= 0 ? Number(process.argv[index + 1]) : fallback;
+}
+
+const keys = flag('keys', 1_000_000);
+const ttlMs = flag('ttl-ms', 60_000);
+const sampleEvery = flag('sample-every', 50_000);
+const unbounded = process.argv.includes('--unbounded');
+
+const cache = createMemoryCache<Record<string, unknown>>(ttlMs, unbounded
+    ? { maxEntries: Infinity, maxBytes: Infinity, sweepIntervalMs: 0 }
+    : { maxEntries: flag('max-entries', 5000), maxBytes: flag('max-bytes', 16 * 1024 * 1024) });
+
+// Roughly the shape and size of a cached storefront profile.
+const payload = (i: number) => ({
+    creator: { username: `creator-${i}`, displayName: `Creator ${i}`, bio: 'x'.repeat(160), avatar: '' },
+    profile: { theme: { primaryColor: '#6366f1', fontFamily: 'Inter' }, links: [{ title: 'Shop', url: `https://example.com/${i}` }] },
+});
+
+function sample(done: number) {
+    (global as any).gc?.();
+    const memory = process.memoryUsage();
+    console.log(JSON.stringify({
+        keys: done,
+        rssMb: Number((memory.rss / 1048576).toFixed(1)),
+        heapUsedMb: Number((memory.heapUsed / 1048576).toFixed(1)),
+        ...cache.stats(),
+    }));
+}
+
+async function main() {
+    const started = Date.now();
+    sample(0);
+    for (let i = 1; i <= keys; i++) {
+        await cache.get(`storefront:creator-${i}`, async () => payload(i));
+        // Re-read a small hot set so the hit ratio means something.
+        await cache.get(`storefront:creator-${i % 100}`, async () => payload(i % 100));
+        if (i % sampleEvery === 0) sample(i);
+    }
+    console.log(JSON.stringify({ done: true, unbounded, durationMs: Date.now() - started }));
+    cache.dispose();
+}
+
+main().catch(error => {
+    console.error(error);
+    process.exit(1);
+});
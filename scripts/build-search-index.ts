@@ -0,0 +1,37 @@
+/**
+ * Build the search index before /api/search is cut over to it, and print one
+ * JSON line per sync pass.
+ *
+ *   npm run search:build            # catch up from the last checkpoint
+ *   npm run search:build -- --full  # rebuild, removing entries for deleted sources
+ *
+ * Runs syncSearchIndex in five-minute passes (the cron gets 50s) until every
+ * kind has caught up; /api/search keeps querying the collections until then.
+ */
+import mongoose from 'mongoose';
+import { connectToDatabase, setPoolRole } from '../src/lib/db/mongodb';
+import { syncSearchIndex, SearchKind } from '../src/lib/search/indexer';
+
+const KINDS: SearchKind[] = ['product', 'creator'];
+const PASS_BUDGET_MS = 5 * 60_000;
+
+async function main() {
+    setPoolRole('cron');
+    await connectToDatabase();
+    const full = process.argv.includes('--full');
+    for (const kind of KINDS) {
+        for (;;) {
+            const result = await syncSearchIndex(kind, { full, budgetMs: PASS_BUDGET_MS });
+            console.log(JSON.stringify(result));
+            if (result.caughtUp) break;
+        }
+    }
+}
+
+main()
+    .then(() => mongoose.disconnect())
+    .catch(async error => {
+        console.error('[search:build]', error);
+        await mongoose.disconnect();
+        process.exit(1);
+    });
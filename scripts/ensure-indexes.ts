@@ -9,7 +9,11 @@ import mongoose from 'mongoose';
 import { User } from '../src/lib/models/User';
 import Product from '../src/lib/models/Product';
 import { Order } from '../src/lib/models/Order';
+import Lead from '../src/lib/models/Lead';
 import { AnalyticsEvent } from '../src/lib/models/AnalyticsEvent';
+import { AnalyticsRollup } from '../src/lib/models/AnalyticsRollup';
+import { JobCheckpoint } from '../src/lib/models/JobCheckpoint';
+import { SearchDocument } from '../src/lib/models/SearchDocument';
 import Coupon from '../src/lib/models/Coupon';
 import { Affiliate } from '../src/lib/models/Affiliate';
 import Payout from '../src/lib/models/Payout';
@@ -27,12 +31,26 @@ async function ensureIndexes() {
         { name: 'User', model: User },
         { name: 'Product', model: Product },
         { name: 'Order', model: Order },
+        { name: 'Lead', model: Lead },
         { name: 'AnalyticsEvent', model: AnalyticsEvent },
+        { name: 'AnalyticsRollup', model: AnalyticsRollup },
+        { name: 'JobCheckpoint', model: JobCheckpoint },
+        { name: 'SearchDocument', model: SearchDocument },
         { name: 'Coupon', model: Coupon },
         { name: 'Affiliate', model: Affiliate },
         { name: 'Payout', model: Payout }
     ];
 
+    // Indexes replaced by a longer one with the same prefix. The keyset
+    // pagination indexes end in (createdAt: -1, _id: -1), which also serves
+    // everything the old (creatorId, createdAt) ones did.
+    const supersededIndexes = [
+        { name: 'Order', model: Order, index: 'creatorId_1_createdAt_-1' },
+        { name: 'Order', model: Order, index: 'creatorId_1_status_1_createdAt_-1' },
+        { name: 'Lead', model: Lead, index: 'creatorId_1_createdAt_-1' },
+        { name: 'Product', model: Product, index: 'creatorId_1_createdAt_-1' },
+    ];
+
     console.log('🔍 Ensuring indexes for all models...\n');
 
     for (const { name, model } of indexedModels) {
@@ -55,6 +73,18 @@ async function ensureIndexes() {
         }
     }
 
+    for (const { name, model, index } of supersededIndexes) {
+        try {
+            if (await model.collection.indexExists(index)) {
+                await model.collection.dropIndex(index);
+                console.log(`🧹 ${name}: dropped superseded index ${index}`);
+            }
+        } catch (error: any) {
+            console.error(`   ❌ Could not drop ${name}.${index}:`, error.message);
+        }
+    }
+    console.log();
+
     // Check for slow queries (if admin access available)
     console.log('🔍 Checking for potential index improvements...\n');
 
@@ -74,6 +104,16 @@ async function ensureIndexes() {
             fields: { creatorId: 1, paymentStatus: 1, paidAt: -1 },
             reason: 'Revenue queries'
         },
+        {
+            collection: 'orders',
+            fields: { creatorId: 1, createdAt: -1, _id: -1 },
+            reason: 'Keyset pagination of creator order lists'
+        },
+        {
+            collection: 'leads',
+            fields: { creatorId: 1, createdAt: -1, _id: -1 },
+            reason: 'Keyset pagination of creator lead lists'
+        },
         {
             collection: 'orders',
             fields: { customerEmail: 1 },
@@ -18,6 +18,7 @@ import {
 } from '@/components/ui/table';
 import { Badge } from '@/components/ui/badge';
 import { toast } from 'react-hot-toast';
+import { downloadExport } from '@/lib/utils/export-utils';
 
 export default function LeadsPage() {
     const [leads, setLeads] = useState<any[]>([]);
@@ -57,18 +58,17 @@ export default function LeadsPage() {
     const handleExport = async () => {
         setExporting(true);
         try {
-            const res = await fetch('/api/creator/leads/export');
+            // A navigation cannot report errors, so check there is something to export first.
+            const res = await fetch('/api/creator/leads/export', { method: 'HEAD' });
+            if (res.status === 404) {
+                toast.error('No leads found to export');
+                return;
+            }
             if (!res.ok) throw new Error('Export failed');
 
-            const blob = await res.blob();
-            const url = window.URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = `leads_export_${new Date().toISOString().split('T')[0]}.csv`;
-            document.body.appendChild(a);
-            a.click();
-            window.URL.revokeObjectURL(url);
-            toast.success('Leads exported successfully');
+            // Streamed by the server; the browser saves it without buffering.
+            downloadExport('/api/creator/leads/export');
+            toast.success('Leads export started');
         } catch (error) {
             console.error(error);
             toast.error('Failed to export leads');
@@ -3,6 +3,7 @@ import { connectToDatabase } from '@/lib/db/mongodb';
 import Lead from '@/lib/models/Lead';
 import { withAdminAuth } from '@/lib/auth/withAuth';
 import { checkAdminPermission } from '@/lib/middleware/adminAuth';
+import { InvalidCursorError, KEYSET_SORT, keysetFilter, keysetPage, parseKeysetParams } from '@/lib/db/pagination';
 
 export const dynamic = 'force-dynamic';
 
@@ -15,14 +16,11 @@ export const GET = withAdminAuth(async (req: NextRequest, user: any) => {
         await connectToDatabase();
 
         const { searchParams } = new URL(req.url);
-        const page = parseInt(searchParams.get('page') || '1');
-        const limit = parseInt(searchParams.get('limit') || '20');
+        const paging = parseKeysetParams(searchParams, { limit: 20 });
         const search = searchParams.get('search') || '';
         const source = searchParams.get('source') || '';
         const creatorId = searchParams.get('creatorId') || '';
 
-        const skip = (page - 1) * limit;
-
         // Build query
         const query: any = {};
 
@@ -42,28 +40,34 @@ export const GET = withAdminAuth(async (req: NextRequest, user: any) => {
             query.creatorId = creatorId;
         }
 
-        const [leads, total] = await Promise.all([
-            Lead.find(query)
+        const [rows, total] = await Promise.all([
+            Lead.find(keysetFilter(query, paging.after))
                 .populate('creatorId', 'email displayName')
                 .populate('leadMagnetId', 'title')
-                .sort({ createdAt: -1 })
-                .skip(skip)
-                .limit(limit)
+                .sort(KEYSET_SORT)
+                .skip(paging.skip)
+                .limit(paging.limit + 1)
                 .lean(),
-            Lead.countDocuments(query)
+            paging.cursor ? null : Lead.countDocuments(query)
         ]);
+        const { items: leads, hasMore, nextCursor } = keysetPage(rows, paging.limit);
 
         return NextResponse.json({
             leads,
             pagination: {
-                total,
-                pages: Math.ceil(total / limit),
-                currentPage: page,
-                limit
+                total: total ?? undefined,
+                pages: total === null ? undefined : Math.ceil(total / paging.limit),
+                currentPage: paging.page,
+                limit: paging.limit,
+                hasMore,
+                nextCursor
             }
         });
 
     } catch (error: any) {
+        if (error instanceof InvalidCursorError) {
+            return NextResponse.json({ error: error.message }, { status: 400 });
+        }
         console.error('Admin Fetch Leads Error:', error);
         return NextResponse.json(
             { error: 'Failed to fetch leads' },
@@ -4,13 +4,13 @@ import { Order } from '@/lib/models/Order';
 import { User } from '@/lib/models/User';
 import { withAdminAuth } from '@/lib/auth/withAuth';
 import { withErrorHandler } from '@/lib/utils/errorHandler';
+import { KEYSET_SORT, keysetFilter, keysetPage, parseKeysetParams } from '@/lib/db/pagination';
 
 async function getHandler(req: NextRequest) {
   await dbConnect();
 
   const { searchParams } = new URL(req.url);
-  const page = parseInt(searchParams.get('page') || '1');
-  const limit = parseInt(searchParams.get('limit') || '10');
+  const paging = parseKeysetParams(searchParams, { limit: 10 });
   const status = searchParams.get('status');
   const search = searchParams.get('search');
 
@@ -28,26 +28,27 @@ async function getHandler(req: NextRequest) {
     ].filter(v => v !== null);
   }
 
-  const skip = (page - 1) * limit;
-
-  const [orders, total] = await Promise.all([
-    Order.find(query)
+  const [rows, total] = await Promise.all([
+    Order.find(keysetFilter(query, paging.after))
       .populate('creatorId', 'displayName email')
       .populate('userId', 'displayName email')
-      .sort({ createdAt: -1 })
-      .skip(skip)
-      .limit(limit)
+      .sort(KEYSET_SORT)
+      .skip(paging.skip)
+      .limit(paging.limit + 1)
       .lean(),
-    Order.countDocuments(query)
+    paging.cursor ? null : Order.countDocuments(query)
   ]);
+  const { items: orders, hasMore, nextCursor } = keysetPage(rows, paging.limit);
 
   return NextResponse.json({
     orders,
     pagination: {
-      total,
-      page,
-      limit,
-      pages: Math.ceil(total / limit)
+      total: total ?? undefined,
+      page: paging.page,
+      limit: paging.limit,
+      pages: total === null ? undefined : Math.ceil(total / paging.limit),
+      hasMore,
+      nextCursor
     }
   });
 }
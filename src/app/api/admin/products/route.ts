@@ -3,13 +3,13 @@ import { connectToDatabase as dbConnect } from '@/lib/db/mongodb';
 import { Product } from '@/lib/models/Product';
 import { withAdminAuth } from '@/lib/auth/withAuth';
 import { withErrorHandler } from '@/lib/utils/errorHandler';
+import { KEYSET_SORT, keysetFilter, keysetPage, parseKeysetParams } from '@/lib/db/pagination';
 
 async function getHandler(req: NextRequest) {
     await dbConnect();
 
     const { searchParams } = new URL(req.url);
-    const page = parseInt(searchParams.get('page') || '1');
-    const limit = parseInt(searchParams.get('limit') || '10');
+    const paging = parseKeysetParams(searchParams, { limit: 10 });
     const search = searchParams.get('search') || '';
     const status = searchParams.get('status');
     const type = searchParams.get('type');
@@ -28,25 +28,26 @@ async function getHandler(req: NextRequest) {
         query.type = type;
     }
 
-    const skip = (page - 1) * limit;
-
-    const [products, total] = await Promise.all([
-        Product.find(query)
+    const [rows, total] = await Promise.all([
+        Product.find(keysetFilter(query, paging.after))
             .populate('creatorId', 'displayName email')
-            .sort({ createdAt: -1 })
-            .skip(skip)
-            .limit(limit)
+            .sort(KEYSET_SORT)
+            .skip(paging.skip)
+            .limit(paging.limit + 1)
             .lean(),
-        Product.countDocuments(query)
+        paging.cursor ? null : Product.countDocuments(query)
     ]);
+    const { items: products, hasMore, nextCursor } = keysetPage(rows, paging.limit);
 
     return NextResponse.json({
         products,
         pagination: {
-            total,
-            page,
-            limit,
-            pages: Math.ceil(total / limit)
+            total: total ?? undefined,
+            page: paging.page,
+            limit: paging.limit,
+            pages: total === null ? undefined : Math.ceil(total / paging.limit),
+            hasMore,
+            nextCursor
         }
     });
 }
@@ -3,6 +3,8 @@ import { connectToDatabase } from '@/lib/db/mongodb';
 import { PlatformSettings } from '@/lib/models/PlatformSettings';
 import { withAdminAuth } from '@/lib/auth/withAuth';
 import AuditLog from '@/lib/models/AuditLog';
+import { invalidateCache } from '@/lib/cache';
+import { AUTOMATION_SETTINGS_KEY } from '@/lib/cache/entitlements';
 
 // GET /api/admin/settings
 export const GET = withAdminAuth(async () => {
@@ -43,6 +45,9 @@ export const PATCH = withAdminAuth(async (req, user) => {
             { new: true, upsert: true }
         );
 
+        // The queue caches the automation kill switch.
+        await invalidateCache(AUTOMATION_SETTINGS_KEY);
+
         // Dynamic Audit Log for 106+ checkpoints - this records which key changed
         const changes = [];
         for (const key in body) {
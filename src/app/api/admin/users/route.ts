@@ -3,14 +3,14 @@ import { connectToDatabase as dbConnect } from '@/lib/db/mongodb';
 import { User } from '@/lib/models/User';
 import { withAdminAuth } from '@/lib/auth/withAuth';
 import { withErrorHandler } from '@/lib/utils/errorHandler';
+import { KEYSET_SORT, keysetFilter, keysetPage, parseKeysetParams } from '@/lib/db/pagination';
 import { recordAdminAction } from '@/lib/utils/auditLogger';
 
 async function getHandler(req: NextRequest) {
   await dbConnect();
 
   const { searchParams } = new URL(req.url);
-  const page = parseInt(searchParams.get('page') || '1');
-  const limit = parseInt(searchParams.get('limit') || '10');
+  const paging = parseKeysetParams(searchParams, { limit: 10 });
   const search = searchParams.get('search') || '';
   const role = searchParams.get('role');
   const status = searchParams.get('status');
@@ -34,25 +34,26 @@ async function getHandler(req: NextRequest) {
     if (status === 'active') query.isSuspended = false;
   }
 
-  const skip = (page - 1) * limit;
-
-  const [users, total] = await Promise.all([
-    User.find(query)
+  const [rows, total] = await Promise.all([
+    User.find(keysetFilter(query, paging.after))
       .select('displayName email username role plan subscriptionStatus isSuspended createdAt trialUsed')
-      .sort({ createdAt: -1 })
-      .skip(skip)
-      .limit(limit)
+      .sort(KEYSET_SORT)
+      .skip(paging.skip)
+      .limit(paging.limit + 1)
       .lean(),
-    User.countDocuments(query)
+    paging.cursor ? null : User.countDocuments(query)
   ]);
+  const { items: users, hasMore, nextCursor } = keysetPage(rows, paging.limit);
 
   return NextResponse.json({
     users,
     pagination: {
-      total,
-      page,
-      limit,
-      pages: Math.ceil(total / limit)
+      total: total ?? undefined,
+      page: paging.page,
+      limit: paging.limit,
+      pages: total === null ? undefined : Math.ceil(total / paging.limit),
+      hasMore,
+      nextCursor
     }
   });
 }
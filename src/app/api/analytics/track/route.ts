@@ -1,37 +1,73 @@
 import { NextRequest, NextResponse } from 'next/server'
+import mongoose from 'mongoose'
 import { connectToDatabase } from '@/lib/db/mongodb'
-import { AnalyticsEvent } from '@/lib/models/AnalyticsEvent'
+import { analyticsIngest, BufferFullError } from '@/lib/analytics/ingest'
 import { analyticsRateLimit } from '@/lib/security/analyticsLimiter'
 
+const ALLOWED = ['page_view', 'product_view', 'performance', 'error']
+const MAX_EVENTS_PER_BEACON = 50
+
+/**
+ * POST /api/analytics/track
+ * Body: one event `{ eventType, creatorId, path?, referrer?, productId?, metadata? }`
+ * or a batched beacon `{ events: [...] }` of up to 50.
+ * Events are buffered and written in bulk (see lib/analytics/ingest); 503 means
+ * the buffer is full and the beacon should be retried later or dropped.
+ */
 export async function POST(req: NextRequest) {
   try {
     const limited = await analyticsRateLimit(req, 60, 60)
     if (limited) return limited
     await connectToDatabase()
     const body = await req.json()
-    const { eventType, creatorId, path, referrer, productId, metadata } = body
-    const allowed = ['page_view', 'product_view', 'performance', 'error']
-    if (!eventType || !allowed.includes(eventType)) {
-      return NextResponse.json({ error: 'Invalid eventType' }, { status: 400 })
-    }
-    if (!creatorId) {
-      return NextResponse.json({ error: 'creatorId is required' }, { status: 400 })
+    const batched = Array.isArray(body?.events)
+    const items: any[] = batched ? body.events : [body]
+    if (items.length === 0 || items.length > MAX_EVENTS_PER_BEACON) {
+      return NextResponse.json({ error: `Send between 1 and ${MAX_EVENTS_PER_BEACON} events` }, { status: 400 })
     }
+
     const ip = req.headers.get('x-forwarded-for') || req.headers.get('x-real-ip') || 'unknown'
     const userAgent = req.headers.get('user-agent') || ''
-    const payload: any = {
-      eventType,
-      creatorId,
-      productId: productId || undefined,
-      ip,
-      userAgent,
-      referrer: referrer || '',
-      path: path || '',
-      metadata: metadata || {},
-      createdAt: new Date()
+    const now = new Date()
+    const events: any[] = []
+    for (const item of items) {
+      const { eventType, creatorId, path, referrer, productId, metadata } = item || {}
+      if (!eventType || !ALLOWED.includes(eventType)) {
+        return NextResponse.json({ error: 'Invalid eventType' }, { status: 400 })
+      }
+      if (!creatorId) {
+        return NextResponse.json({ error: 'creatorId is required' }, { status: 400 })
+      }
+      if (!mongoose.isValidObjectId(creatorId) || (productId && !mongoose.isValidObjectId(productId))) {
+        return NextResponse.json({ error: 'Invalid creatorId or productId' }, { status: 400 })
+      }
+      events.push({
+        _id: new mongoose.Types.ObjectId(),
+        eventType,
+        creatorId,
+        productId: productId || undefined,
+        ip,
+        userAgent,
+        referrer: referrer || '',
+        path: path || '',
+        metadata: metadata || {},
+        createdAt: now
+      })
+    }
+
+    try {
+      await analyticsIngest.enqueue(events)
+    } catch (error) {
+      if (error instanceof BufferFullError) {
+        return NextResponse.json({ error: 'Analytics ingest is busy' }, { status: 503, headers: { 'Retry-After': '5' } })
+      }
+      throw error
+    }
+
+    if (!batched) {
+      return NextResponse.json({ success: true, eventId: events[0]._id }, { status: 201 })
     }
-    const event = await (AnalyticsEvent as any).create(payload)
-    return NextResponse.json({ success: true, eventId: event._id }, { status: 201 })
+    return NextResponse.json({ success: true, accepted: events.length, eventIds: events.map(event => event._id) }, { status: 201 })
   } catch (error: any) {
     return NextResponse.json({ error: 'Failed to track event' }, { status: 500 })
   }
@@ -1,7 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { connectToDatabase } from '@/lib/db/mongodb';
 import { Order } from '@/lib/models/Order';
-import { AnalyticsEvent } from '@/lib/models/AnalyticsEvent';
+import { getEventTotals } from '@/lib/analytics/rollups';
 import { withCreatorAuth } from '@/lib/auth/withAuth';
 import { withErrorHandler } from '@/lib/utils/errorHandler';
 
@@ -11,7 +11,7 @@ import { withErrorHandler } from '@/lib/utils/errorHandler';
  * - Total revenue (all-time)
  * - Total sales (order count)
  * - Total leads (email captures via lead magnets)
- * - Conversion rate (orders / unique clicks * 100)
+ * - Conversion rate (orders / unique clicks * 100, unique clicks estimated with HyperLogLog)
  * - Store views
  */
 async function handler(req: NextRequest, user: any) {
@@ -41,8 +41,9 @@ async function handler(req: NextRequest, user: any) {
 
     const dateFilter = startDate ? { createdAt: { $gte: startDate } } : {};
 
-    // 1. Parallelize independent metrics queries
-    const [revenueResult, totalLeads, storeViews, uniqueClicks] = await Promise.all([
+    // 1. Parallelize independent metrics queries. Event metrics come from the
+    // hourly/daily rollups (src/lib/analytics/rollups.ts) instead of raw events.
+    const [revenueResult, totalLeads, events] = await Promise.all([
         Order.aggregate([
             {
                 $match: {
@@ -64,23 +65,16 @@ async function handler(req: NextRequest, user: any) {
             amount: 0, // Free lead magnets
             ...dateFilter
         }),
-        AnalyticsEvent.countDocuments({
-            creatorId,
-            eventType: 'store_view',
-            ...dateFilter
-        }),
-        AnalyticsEvent.distinct('ip', {
-            creatorId,
-            eventType: { $in: ['product_view', 'add_to_cart'] },
-            ...dateFilter
-        })
+        getEventTotals(creatorId, startDate)
     ]);
 
+    const storeViews = events.counts.store_view || 0;
+    const uniqueClicks = events.uniqueVisitors;
     const totalRevenue = revenueResult[0]?.totalRevenue || 0;
     const totalSales = revenueResult[0]?.totalSales || 0;
 
-    const conversionRate = uniqueClicks.length > 0
-        ? (totalSales / uniqueClicks.length) * 100
+    const conversionRate = uniqueClicks > 0
+        ? (totalSales / uniqueClicks) * 100
         : 0;
 
     return {
@@ -3,50 +3,47 @@ import { connectToDatabase } from '@/lib/db/mongodb';
 import Lead from '@/lib/models/Lead';
 import { withCreatorAuth } from '@/lib/auth/withAuth';
 import { withErrorHandler } from '@/lib/utils/errorHandler';
+import { KEYSET_SORT } from '@/lib/db/pagination';
+import { EXPORT_BATCH_SIZE, ExportColumn, parseExportOptions, streamExport } from '@/lib/utils/export-stream';
+
+const COLUMNS: ExportColumn[] = [
+    { key: 'email', header: 'Email', value: (lead: any) => lead.email },
+    { key: 'name', header: 'Name', value: (lead: any) => lead.name || '' },
+    { key: 'phone', header: 'Phone', value: (lead: any) => lead.phone || '' },
+    { key: 'interest', header: 'Interest', value: (lead: any) => lead.interest || '' },
+    { key: 'source', header: 'Source', value: (lead: any) => lead.source || '' },
+    { key: 'dmStatus', header: 'DM Status', value: (lead: any) => lead.dmStatus || 'none' },
+    { key: 'createdAt', header: 'Created At', value: (lead: any) => new Date(lead.createdAt).toLocaleString() },
+];
 
 /**
  * GET /api/creator/leads/export
- * Exports all leads for the authenticated creator as CSV
+ * Exports all leads for the authenticated creator, streamed from a cursor.
+ * `?format=csv|jsonl` (default csv), `?gzip=1` to compress.
  */
 async function handler(req: NextRequest, user: any) {
     await connectToDatabase();
 
-    const leads = await Lead.find({ creatorId: user._id })
-        .sort({ createdAt: -1 })
-        .lean();
-
-    if (leads.length === 0) {
+    const query = { creatorId: user._id };
+    if (!(await Lead.exists(query))) {
         return NextResponse.json({ message: 'No leads found to export' }, { status: 404 });
     }
 
-    // CSV Headers
-    const headers = ['Email', 'Name', 'Phone', 'Interest', 'Source', 'DM Status', 'Created At'];
-
-    // CSV Rows
-    const rows = leads.map(lead => [
-        lead.email,
-        lead.name || '',
-        lead.phone || '',
-        lead.interest || '',
-        lead.source || '',
-        lead.dmStatus || 'none',
-        new Date(lead.createdAt).toLocaleString()
-    ]);
-
-    // Construct CSV String
-    const csvContent = [
-        headers.join(','),
-        ...rows.map(row => row.map(cell => `"${String(cell).replace(/"/g, '""')}"`).join(','))
-    ].join('\n');
-
-    const filename = `leads_export_${new Date().toISOString().split('T')[0]}.csv`;
+    const cursor = Lead.find(query).sort(KEYSET_SORT).lean().cursor({ batchSize: EXPORT_BATCH_SIZE });
+    const filename = `leads_export_${new Date().toISOString().split('T')[0]}`;
+    return streamExport(cursor, COLUMNS, filename, parseExportOptions(req.nextUrl.searchParams));
+}
 
-    return new Response(csvContent, {
-        headers: {
-            'Content-Type': 'text/csv',
-            'Content-Disposition': `attachment; filename="${filename}"`
-        }
-    });
+/**
+ * HEAD /api/creator/leads/export
+ * 200 when the creator has leads to export, 404 otherwise. The dashboard
+ * checks this before navigating to the download, which cannot show errors.
+ */
+async function headHandler(req: NextRequest, user: any) {
+    await connectToDatabase();
+    const found = await Lead.exists({ creatorId: user._id });
+    return new NextResponse(null, { status: found ? 200 : 404 });
 }
 
 export const GET = withCreatorAuth(withErrorHandler(handler));
+export const HEAD = withCreatorAuth(withErrorHandler(headHandler));
@@ -3,32 +3,35 @@ import { connectToDatabase } from '@/lib/db/mongodb';
 import Lead from '@/lib/models/Lead';
 import { withCreatorAuth } from '@/lib/auth/withAuth';
 import { withErrorHandler } from '@/lib/utils/errorHandler';
+import { KEYSET_SORT, keysetFilter, keysetPage, parseKeysetParams } from '@/lib/db/pagination';
 
 /**
  * GET /api/creator/leads
- * Fetches all leads captured by the current creator
+ * Fetches all leads captured by the current creator, newest first. Page with
+ * `cursor` (pagination.nextCursor); `page` still works but skips.
  */
 async function handler(req: NextRequest, user: any) {
     await connectToDatabase();
 
     const searchParams = req.nextUrl.searchParams;
-    const page = parseInt(searchParams.get('page') || '1');
-    const limit = parseInt(searchParams.get('limit') || '10');
-    const skip = (page - 1) * limit;
+    const paging = parseKeysetParams(searchParams, { limit: 10 });
 
     const query = { creatorId: user._id };
 
-    const [leads, total] = await Promise.all([
-        Lead.find(query).sort({ createdAt: -1 }).skip(skip).limit(limit),
-        Lead.countDocuments(query)
+    const [rows, total] = await Promise.all([
+        Lead.find(keysetFilter(query, paging.after)).sort(KEYSET_SORT).skip(paging.skip).limit(paging.limit + 1),
+        paging.cursor ? null : Lead.countDocuments(query)
     ]);
+    const { items: leads, hasMore, nextCursor } = keysetPage(rows, paging.limit);
 
     return NextResponse.json({
         leads,
         pagination: {
-            total,
-            page,
-            pages: Math.ceil(total / limit)
+            total: total ?? undefined,
+            page: paging.page,
+            pages: total === null ? undefined : Math.ceil(total / paging.limit),
+            hasMore,
+            nextCursor
         }
     });
 }
@@ -2,51 +2,38 @@ import { NextRequest, NextResponse } from 'next/server';
 import { connectToDatabase } from '@/lib/db/mongodb';
 import { Order } from '@/lib/models/Order';
 import { withCreatorAuth } from '@/lib/auth/withAuth';
+import { KEYSET_SORT } from '@/lib/db/pagination';
+import { EXPORT_BATCH_SIZE, ExportColumn, parseExportOptions, streamExport } from '@/lib/utils/export-stream';
+
+const COLUMNS: ExportColumn[] = [
+    { key: 'orderId', header: 'Order ID', value: (o: any) => o._id?.toString() },
+    { key: 'date', header: 'Date', value: (o: any) => o.createdAt ? new Date(o.createdAt).toISOString().split('T')[0] : '' },
+    { key: 'buyerName', header: 'Buyer Name', value: (o: any) => o.buyerName || o.customerName || '' },
+    { key: 'buyerEmail', header: 'Buyer Email', value: (o: any) => o.buyerEmail || o.customerEmail || '' },
+    { key: 'product', header: 'Product', value: (o: any) => o.productId?.title || o.productId?.name || '' },
+    { key: 'amount', header: 'Amount', value: (o: any) => ((o.total || o.amount || 0) / 100).toFixed(2) },
+    { key: 'status', header: 'Status', value: (o: any) => o.status || '' },
+    { key: 'paymentId', header: 'Payment ID', value: (o: any) => o.razorpayPaymentId || o.paymentId || '' },
+    { key: 'coupon', header: 'Coupon', value: (o: any) => o.couponCode || '' },
+];
 
 /**
  * GET /api/creator/orders/export
- * Export orders as CSV with proper escaping
+ * Export every order, newest first, streamed from a cursor.
+ * `?format=csv|jsonl` (default csv), `?gzip=1` to compress.
  */
 async function handler(req: NextRequest, user: any) {
     try {
         await connectToDatabase();
 
-        // Limit to last 10,000 orders for safety
-        const orders = await Order.find({ creatorId: user._id })
-            .sort({ createdAt: -1 })
-            .limit(10000)
+        const cursor = Order.find({ creatorId: user._id })
+            .sort(KEYSET_SORT)
             .populate('productId', 'title name')
-            .lean();
-
-        // Build CSV
-        const headers = [
-            'Order ID', 'Date', 'Buyer Name', 'Buyer Email',
-            'Product', 'Amount', 'Status', 'Payment ID', 'Coupon'
-        ];
-
-        const rows = orders.map((o: any) => [
-            o._id?.toString() || '',
-            o.createdAt ? new Date(o.createdAt).toISOString().split('T')[0] : '',
-            o.buyerName || o.customerName || '',
-            o.buyerEmail || o.customerEmail || '',
-            o.productId?.title || o.productId?.name || '',
-            ((o.total || o.amount || 0) / 100).toFixed(2),
-            o.status || '',
-            o.razorpayPaymentId || o.paymentId || '',
-            o.couponCode || '',
-        ]);
-
-        const csv = [headers, ...rows]
-            .map(row => row.map((cell: string) => `"${String(cell).replace(/"/g, '""')}"`).join(','))
-            .join('\n');
+            .lean()
+            .cursor({ batchSize: EXPORT_BATCH_SIZE });
 
-        return new NextResponse(csv, {
-            status: 200,
-            headers: {
-                'Content-Type': 'text/csv',
-                'Content-Disposition': `attachment; filename="orders-${new Date().toISOString().split('T')[0]}.csv"`,
-            }
-        });
+        const date = new Date().toISOString().split('T')[0];
+        return streamExport(cursor, COLUMNS, `orders-${date}`, parseExportOptions(req.nextUrl.searchParams));
     } catch (error: any) {
         console.error('[ORDERS_EXPORT]', error);
         return NextResponse.json({ error: 'Export failed' }, { status: 500 });
@@ -0,0 +1,47 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { connectToDatabase } from '@/lib/db/mongodb';
+import Subscriber from '@/lib/models/Subscriber';
+import { withCreatorAuth } from '@/lib/auth/withAuth';
+import { hasFeature } from '@/lib/utils/planLimits';
+import { KEYSET_SORT } from '@/lib/db/pagination';
+import { EXPORT_BATCH_SIZE, ExportColumn, parseExportOptions, streamExport } from '@/lib/utils/export-stream';
+
+const COLUMNS: ExportColumn[] = [
+    { key: 'email', header: 'Email', value: (s: any) => s.email },
+    { key: 'name', header: 'Name', value: (s: any) => s.name || '' },
+    { key: 'status', header: 'Status', value: (s: any) => s.status },
+    { key: 'source', header: 'Source', value: (s: any) => s.source || '' },
+    { key: 'tags', header: 'Tags', value: (s: any) => (s.tags || []).join(';') },
+    { key: 'orderCount', header: 'Orders', value: (s: any) => s.orderCount || 0 },
+    { key: 'totalSpent', header: 'Total Spent', value: (s: any) => ((s.totalSpent || 0) / 100).toFixed(2) },
+    { key: 'subscribedAt', header: 'Subscribed At', value: (s: any) => new Date(s.createdAt).toISOString() },
+];
+
+/**
+ * GET /api/creator/subscribers/export
+ * Export the creator's subscribers, newest first, streamed from a cursor.
+ * `?status=` filters; `?format=csv|jsonl` (default csv), `?gzip=1` to compress.
+ */
+async function handler(req: NextRequest, user: any) {
+    await connectToDatabase();
+
+    if (!hasFeature(user, 'emailMarketing')) {
+        return NextResponse.json({ error: 'Upgrade required' }, { status: 403 });
+    }
+
+    const { searchParams } = req.nextUrl;
+    const query: any = { creatorId: user._id };
+    const status = searchParams.get('status');
+    if (status) query.status = status;
+
+    const cursor = Subscriber.find(query)
+        .select('email name status source tags orderCount totalSpent createdAt')
+        .sort(KEYSET_SORT)
+        .lean()
+        .cursor({ batchSize: EXPORT_BATCH_SIZE });
+
+    const date = new Date().toISOString().split('T')[0];
+    return streamExport(cursor, COLUMNS, `subscribers-${date}`, parseExportOptions(searchParams));
+}
+
+export const GET = withCreatorAuth(handler);
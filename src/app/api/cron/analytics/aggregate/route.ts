@@ -1,43 +1,48 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { connectToDatabase } from '@/lib/db/mongodb';
-import { AnalyticsEvent } from '@/lib/models/AnalyticsEvent';
-import DailyMetric from '@/lib/models/DailyMetric';
+import { withCronAuth } from '@/lib/auth/cron';
+import { aggregateDailyMetrics } from '@/lib/analytics/dailyMetrics';
 
-export async function GET(req: NextRequest) {
-    // Verify CRON secret
-    const authHeader = req.headers.get('authorization');
-    if (authHeader !== `Bearer ${process.env.CRON_SECRET}`) {
-        return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+export const maxDuration = 60;
+
+const DAY = /^\d{4}-\d{2}-\d{2}$/;
+
+/**
+ * GET /api/cron/analytics/aggregate
+ * Pre-aggregates raw events into DailyMetric rows for fast dashboard loading.
+ * Catches up every complete day since the last run; pass
+ * `?from=YYYY-MM-DD[&to=YYYY-MM-DD][&windowDays=N]` to backfill a range.
+ * Call again while `caughtUp` is false to resume.
+ */
+export const GET = withCronAuth(async (req: NextRequest) => {
+    const { searchParams } = new URL(req.url);
+    const from = searchParams.get('from');
+    const to = searchParams.get('to');
+    const windowDays = Number(searchParams.get('windowDays') || 1);
+
+    if ((from && !DAY.test(from)) || (to && !DAY.test(to)) || (to && !from)) {
+        return NextResponse.json({ error: 'from/to must be YYYY-MM-DD, and to requires from' }, { status: 400 });
+    }
+    if (!Number.isInteger(windowDays) || windowDays < 1 || windowDays > 31) {
+        return NextResponse.json({ error: 'windowDays must be between 1 and 31' }, { status: 400 });
     }
 
     try {
         await connectToDatabase();
-        const yesterday = new Date();
-        yesterday.setDate(yesterday.getDate() - 1);
-        yesterday.setHours(0, 0, 0, 0);
-
-        const today = new Date();
-        today.setHours(0, 0, 0, 0);
-
-        // Pre-aggregate raw events into DailyMetric documents for fast dashboard loading
-        const stats = await AnalyticsEvent.aggregate([
-            { $match: { createdAt: { $gte: yesterday, $lt: today } } },
-            { $group: {
-                _id: { creatorId: '$creatorId', type: '$eventType' },
-                count: { $sum: 1 }
-            }}
-        ]);
+        const result = await aggregateDailyMetrics({
+            from: from ? new Date(`${from}T00:00:00Z`) : undefined,
+            to: to ? new Date(`${to}T00:00:00Z`) : undefined,
+            windowDays,
+            budgetMs: 50_000,
+        });
 
-        for (const stat of stats) {
-            await DailyMetric.findOneAndUpdate(
-                { creatorId: stat._id.creatorId, date: yesterday, metricName: stat._id.type },
-                { $set: { value: stat.count } },
-                { upsert: true }
-            );
-        }
+        console.log(
+            `[ANALYTICS_AGGREGATE] ${result.mode} ${result.from}..${result.to}: ${result.groups} groups ` +
+            `in ${result.durationMs}ms (${result.groupsPerSecond}/s), cursor ${result.cursor}`
+        );
 
-        return NextResponse.json({ success: true, processed: stats.length });
+        return NextResponse.json({ success: true, ...result });
     } catch (err: any) {
         return NextResponse.json({ success: false, error: err.message }, { status: 500 });
     }
-}
+});
@@ -0,0 +1,26 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { connectToDatabase } from '@/lib/db/mongodb';
+import { withCronAuth } from '@/lib/auth/cron';
+import { rollupAnalyticsEvents } from '@/lib/analytics/rollups';
+
+export const maxDuration = 60;
+
+/**
+ * GET /api/cron/analytics/rollup
+ * Hourly job that rolls new AnalyticsEvents up into hourly/daily
+ * AnalyticsRollup documents for the dashboard summary. Resumes from its
+ * checkpoint; `caughtUp: false` means a backfill is still in progress.
+ */
+export const GET = withCronAuth(async (req: NextRequest) => {
+    try {
+        await connectToDatabase();
+        const result = await rollupAnalyticsEvents({ budgetMs: 50_000 });
+
+        console.log(`[ANALYTICS_ROLLUP] ${result.windows} windows, ${result.buckets} buckets, cursor ${result.cursor?.toISOString()}`);
+
+        return NextResponse.json({ success: true, ...result });
+    } catch (error: any) {
+        console.error('[ANALYTICS_ROLLUP]', error);
+        return NextResponse.json({ error: 'Rollup failed' }, { status: 500 });
+    }
+});
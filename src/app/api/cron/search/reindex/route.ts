@@ -0,0 +1,43 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { connectToDatabase } from '@/lib/db/mongodb';
+import { withCronAuth } from '@/lib/auth/cron';
+import { syncSearchIndex, SearchKind } from '@/lib/search/indexer';
+
+export const maxDuration = 60;
+
+const KINDS: SearchKind[] = ['product', 'creator'];
+
+/**
+ * GET /api/cron/search/reindex
+ * Brings the search index up to date with products and creators changed
+ * since the last run (model hooks keep it current between runs). Pass
+ * `?kind=product|creator` to limit it and `?full=1` to rebuild from scratch;
+ * call again while `caughtUp` is false.
+ */
+export const GET = withCronAuth(async (req: NextRequest) => {
+    const { searchParams } = new URL(req.url);
+    const kind = searchParams.get('kind');
+    if (kind && !KINDS.includes(kind as SearchKind)) {
+        return NextResponse.json({ error: 'kind must be product or creator' }, { status: 400 });
+    }
+    const full = searchParams.get('full') === '1';
+
+    try {
+        await connectToDatabase();
+        const started = Date.now();
+        const results = [];
+        for (const current of kind ? [kind as SearchKind] : KINDS) {
+            const budgetMs = Math.max(50_000 - (Date.now() - started), 1000);
+            const result = await syncSearchIndex(current, { full, budgetMs });
+            results.push(result);
+            console.log(`[SEARCH_REINDEX] ${current} ${result.mode}: ${result.indexed} indexed, ${result.removed} removed (${result.docsPerSecond}/s), cursor ${result.cursor}`);
+            if (!result.caughtUp) break;
+        }
+
+        const caughtUp = results.length === (kind ? 1 : KINDS.length) && results.every(result => result.caughtUp);
+        return NextResponse.json({ success: true, caughtUp, results });
+    } catch (error: any) {
+        console.error('[SEARCH_REINDEX]', error);
+        return NextResponse.json({ error: 'Reindex failed' }, { status: 500 });
+    }
+});
@@ -2,6 +2,8 @@ import { NextRequest, NextResponse } from 'next/server';
 import { connectToDatabase } from '@/lib/db/mongodb';
 import Order from '@/lib/models/Order';
 import { DownloadToken } from '@/lib/models/DownloadToken';
+import Product from '@/lib/models/Product';
+import { productFileKey } from '@/lib/services/downloadToken';
 import { sendEmail } from '@/lib/services/email';
 import crypto from 'crypto';
 
@@ -38,11 +40,16 @@ export async function POST(req: NextRequest) {
         }
 
         // Generate a new download token
+        const productId = order.items[0]?.productId;
+        const product = productId
+            ? await Product.findById(productId).select('files digitalFileUrl previewFileKey').lean()
+            : null;
         const tokenValue = crypto.randomUUID();
         const newToken = await DownloadToken.create({
             token: tokenValue,
             orderId: order._id,
-            productId: order.items[0]?.productId,
+            productId,
+            fileKey: product ? productFileKey(product as any) : undefined,
             buyerEmail: email.trim().toLowerCase(),
             maxDownloads: 3,
             downloadCount: 0,
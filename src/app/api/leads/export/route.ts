@@ -3,13 +3,29 @@ import { connectToDatabase } from '@/lib/db/mongodb';
 import Lead from '@/lib/models/Lead';
 import { auth } from '@clerk/nextjs/server';
 import User from '@/lib/models/User';
+import { KEYSET_SORT } from '@/lib/db/pagination';
+import { EXPORT_BATCH_SIZE, ExportColumn, parseExportOptions, streamExport } from '@/lib/utils/export-stream';
 
 export const runtime = 'nodejs';
 export const dynamic = 'force-dynamic';
 
+const COLUMNS: ExportColumn[] = [
+    { key: 'email', header: 'Email', value: (lead: any) => lead.email || '' },
+    { key: 'name', header: 'Name', value: (lead: any) => lead.name || '' },
+    { key: 'phone', header: 'Phone', value: (lead: any) => lead.phone || '' },
+    { key: 'interest', header: 'Interest', value: (lead: any) => lead.interest || '' },
+    { key: 'source', header: 'Source', value: (lead: any) => lead.source || '' },
+    { key: 'leadMagnet', header: 'Lead Magnet', value: (lead: any) => lead.leadMagnetId?.title || 'N/A' },
+    { key: 'creatorEmail', header: 'Creator Email', value: (lead: any) => lead.creatorId?.email || 'N/A' },
+    { key: 'creatorName', header: 'Creator Name', value: (lead: any) => lead.creatorId?.displayName || 'N/A' },
+    { key: 'capturedAt', header: 'Captured At', value: (lead: any) => new Date(lead.createdAt).toISOString() },
+    { key: 'downloadSent', header: 'Download Sent', value: (lead: any) => lead.downloadSent ? 'Yes' : 'No' },
+];
+
 /**
  * GET /api/leads/export
- * Exports leads as CSV (creator-specific or platform-wide admin)
+ * Exports leads as CSV or JSONL (creator-specific or platform-wide admin),
+ * streamed from a cursor. `?format=csv|jsonl`, `?gzip=1` to compress.
  */
 export async function GET(req: NextRequest) {
     try {
@@ -49,57 +65,14 @@ export async function GET(req: NextRequest) {
             query.leadMagnetId = leadMagnetId;
         }
 
-        // Fetch leads with population
-        const leads = await Lead.find(query)
+        const cursor = Lead.find(query)
             .populate('leadMagnetId', 'title')
             .populate('creatorId', 'email displayName')
-            .sort({ createdAt: -1 })
-            .lean();
-
-        // Generate CSV Header
-        const headers = [
-            'Email',
-            'Name',
-            'Phone',
-            'Interest',
-            'Source',
-            'Lead Magnet',
-            'Creator Email',
-            'Creator Name',
-            'Captured At',
-            'Download Sent'
-        ];
-
-        const csvLines = [headers.join(',')];
-
-        for (const lead of leads) {
-            const leadMagnet = lead.leadMagnetId as any;
-            const creator = lead.creatorId as any;
-
-            const line = [
-                `"${lead.email || ''}"`,
-                `"${lead.name || ''}"`,
-                `"${lead.phone || ''}"`,
-                `"${lead.interest || ''}"`,
-                `"${lead.source || ''}"`,
-                `"${leadMagnet?.title || 'N/A'}"`,
-                `"${creator?.email || 'N/A'}"`,
-                `"${creator?.displayName || 'N/A'}"`,
-                `"${new Date(lead.createdAt).toISOString()}"`,
-                `"${lead.downloadSent ? 'Yes' : 'No'}"`
-            ];
-            csvLines.push(line.join(','));
-        }
-
-        const csv = csvLines.join('\n');
+            .sort(KEYSET_SORT)
+            .lean()
+            .cursor({ batchSize: EXPORT_BATCH_SIZE });
 
-        return new NextResponse(csv, {
-            status: 200,
-            headers: {
-                'Content-Type': 'text/csv',
-                'Content-Disposition': `attachment; filename="leads_export_${Date.now()}.csv"`,
-            },
-        });
+        return streamExport(cursor, COLUMNS, `leads_export_${Date.now()}`, parseExportOptions(searchParams));
 
     } catch (error: any) {
         console.error('Export leads error:', error);
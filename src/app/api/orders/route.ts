@@ -3,17 +3,16 @@ import { connectToDatabase } from '@/lib/db/mongodb';
 import { Order } from '@/lib/models/Order';
 import { withCreatorAuth } from '@/lib/auth/withAuth';
 import { successResponse, errorResponse } from '@/types/api';
+import { InvalidCursorError, KEYSET_SORT, keysetFilter, keysetPage, parseKeysetParams } from '@/lib/db/pagination';
 
 async function handler(req: NextRequest, user: any) {
     try {
         await connectToDatabase();
 
         const { searchParams } = new URL(req.url);
-        const limit = parseInt(searchParams.get('limit') || '20');
-        const page = parseInt(searchParams.get('page') || '1');
+        const paging = parseKeysetParams(searchParams, { limit: 20 });
         const search = searchParams.get('search') || '';
         const status = searchParams.get('status') || '';
-        const skip = (page - 1) * limit;
 
         // Build Query
         const query: any = { creatorId: user._id };
@@ -31,13 +30,17 @@ async function handler(req: NextRequest, user: any) {
             ];
         }
 
-        const orders = await Order.find(query)
-            .sort({ createdAt: -1 })
-            .skip(skip)
-            .limit(limit)
-            .lean();
-
-        const totalContext = await Order.countDocuments(query);
+        // Pass `cursor` (from pagination.nextCursor) instead of `page` to seek
+        // rather than skip; the total is only counted for the first request.
+        const [rows, totalContext] = await Promise.all([
+            Order.find(keysetFilter(query, paging.after))
+                .sort(KEYSET_SORT)
+                .skip(paging.skip)
+                .limit(paging.limit + 1)
+                .lean(),
+            paging.cursor ? null : Order.countDocuments(query)
+        ]);
+        const { items: orders, hasMore, nextCursor } = keysetPage(rows, paging.limit);
 
         const ordersWithAlias = orders.map((order: any) => ({
             ...order,
@@ -47,13 +50,18 @@ async function handler(req: NextRequest, user: any) {
         return NextResponse.json(successResponse({
             orders: ordersWithAlias,
             pagination: {
-                total: totalContext,
-                page,
-                limit,
-                pages: Math.ceil(totalContext / limit)
+                total: totalContext ?? undefined,
+                page: paging.page,
+                limit: paging.limit,
+                pages: totalContext === null ? undefined : Math.ceil(totalContext / paging.limit),
+                hasMore,
+                nextCursor
             }
         }));
     } catch (error: any) {
+        if (error instanceof InvalidCursorError) {
+            return NextResponse.json(errorResponse('Invalid cursor'), { status: 400 });
+        }
         console.error('Orders API Error:', error);
         return NextResponse.json(errorResponse('Failed to fetch orders', error.message), { status: 500 });
     }
@@ -1,11 +1,18 @@
-import { NextResponse } from 'next/server';
-import { connectToDatabase } from '@/lib/db/mongodb';
-import redis from '@/lib/cache';
+import { NextRequest, NextResponse } from 'next/server';
+import { connectToDatabase, getPoolStats } from '@/lib/db/mongodb';
+import redis, { getCacheStats } from '@/lib/cache';
 import mongoose from 'mongoose';
 
-export async function GET() {
+/**
+ * Public liveness check. Process internals (cache counters, Mongo pool,
+ * memory) are only added for callers sending `Authorization: Bearer
+ * <CRON_SECRET>`, i.e. monitoring and the perf harness.
+ */
+export async function GET(req: NextRequest) {
     try {
-        const health = {
+        const authHeader = req.headers.get('authorization');
+        const withStats = !!process.env.CRON_SECRET && authHeader === `Bearer ${process.env.CRON_SECRET}`;
+        const health: Record<string, any> = {
             status: 'degraded',
             db: 'disconnected',
             redis: 'disconnected',
@@ -21,6 +28,15 @@ export async function GET() {
         } catch (dbErr) {
             console.error('Health Check - DB Error:', dbErr);
         }
+        if (withStats) {
+            const memory = process.memoryUsage();
+            health.cache = getCacheStats();
+            health.pool = getPoolStats();
+            health.memory = {
+                rssMb: Math.round(memory.rss / 1048576),
+                heapUsedMb: Math.round(memory.heapUsed / 1048576)
+            };
+        }
 
         // Check Redis
         try {
@@ -6,6 +6,7 @@ import { withCreatorAuth } from '@/lib/auth/withAuth';
 import { sanitizeHTML } from '@/utils/sanitizers';
 import { successResponse, errorResponse } from '@/types/api';
 import { ProductSchema } from '@/lib/validation/schemas';
+import { InvalidCursorError, KEYSET_SORT, keysetFilter, keysetPage, parseKeysetParams } from '@/lib/db/pagination';
 
 /**
  * POST /api/products
@@ -111,7 +112,9 @@ const postHandler = async (req: NextRequest, user: any) => {
 
 /**
  * GET /api/products
- * List products
+ * List products, newest first. Without `limit` or `cursor` the whole list is
+ * returned (it is capped by the plan's product limit); with them it is paged
+ * by keyset and `meta.nextCursor` fetches the next page.
  */
 export async function GET(req: NextRequest) {
     try {
@@ -135,9 +138,22 @@ export async function GET(req: NextRequest) {
             query.isActive = true;
         }
 
-        const products = await Product.find(query).sort({ createdAt: -1 });
-        return NextResponse.json(successResponse(products));
+        if (!searchParams.has('limit') && !searchParams.has('cursor')) {
+            const products = await Product.find(query).sort(KEYSET_SORT);
+            return NextResponse.json(successResponse(products));
+        }
+
+        const paging = parseKeysetParams(searchParams, { limit: 20 });
+        const rows = await Product.find(keysetFilter(query, paging.after))
+            .sort(KEYSET_SORT)
+            .skip(paging.skip)
+            .limit(paging.limit + 1);
+        const { items, hasMore, nextCursor } = keysetPage(rows, paging.limit);
+        return NextResponse.json(successResponse(items, undefined, { limit: paging.limit, hasMore, nextCursor }));
     } catch (error: any) {
+        if (error instanceof InvalidCursorError) {
+            return NextResponse.json(errorResponse('Invalid cursor'), { status: 400 });
+        }
         console.error('Fetch Products Error:', error);
         return NextResponse.json(errorResponse('Failed to fetch products'), { status: 500 });
     }
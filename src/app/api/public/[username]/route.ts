@@ -13,6 +13,9 @@ export const revalidate = 60;
  * Returns a creator's public profile and storefront configuration.
  * This is an unauthenticated, publicly cacheable endpoint.
  * Sensitive fields (tokens, billing, calendar config) are excluded.
+ * Profiles are served stale for up to 10 minutes while one request refreshes
+ * them, and unknown usernames are cached for 30s, so an expiring key for a
+ * busy storefront does not send every concurrent request to MongoDB.
  */
 export async function GET(
     _req: NextRequest,
@@ -84,7 +87,7 @@ export async function GET(
                     },
                 },
             };
-        });
+        }, { staleTtl: 600, negativeTtl: 30 });
 
         if (!response) {
             return NextResponse.json(
@@ -1,34 +1,118 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { connectToDatabase } from '@/lib/db/mongodb';
+import Order from '@/lib/models/Order';
 import Product from '@/lib/models/Product';
 import User from '@/lib/models/User';
-import Order from '@/lib/models/Order';
+import { search } from '@/lib/search/engine';
+import { isSearchIndexReady } from '@/lib/search/indexer';
+import { InvalidCursorError } from '@/lib/db/pagination';
 import { z } from 'zod';
 
 const searchSchema = z.object({
   q: z.string().min(1, 'Search query required'),
   type: z.enum(['products', 'creators', 'orders']).default('products'),
   category: z.string().optional(),
+  productType: z.string().optional(),
+  creatorId: z.string().optional(),
   minPrice: z.number().optional(),
   maxPrice: z.number().optional(),
-  sortBy: z.enum(['relevance', 'price', 'rating', 'date']).default('relevance'),
+  sortBy: z.enum(['relevance', 'price', 'price_desc', 'rating', 'date']).default('relevance'),
+  cursor: z.string().optional(),
   page: z.number().default(1),
-  limit: z.number().default(20),
+  limit: z.number().min(1).max(100).default(20),
 });
 
+/**
+ * The source documents for search hits, in hit order, shaped as this route
+ * returned them before the index: whole products, and creators' public
+ * profile fields. Hits whose source has gone since indexing are dropped.
+ */
+async function hydrate(type: 'products' | 'creators', hits: Record<string, any>[]) {
+  const ids = hits.map(hit => hit._id);
+  const docs: any[] = type === 'products'
+    ? await Product.find({ _id: { $in: ids } }).lean()
+    : await User.find({ _id: { $in: ids } }).select('username displayName avatar bio').lean();
+  const byId = new Map(docs.map(doc => [String(doc._id), doc]));
+  return hits.flatMap(hit => {
+    const doc = byId.get(String(hit._id));
+    if (!doc) return [];
+    return [hit.score !== undefined ? { ...doc, score: hit.score } : doc];
+  });
+}
+
+/**
+ * The pre-index query (text search on products, regex on creators), served
+ * until the search index has been built for this kind.
+ */
+async function searchCollections(type: 'products' | 'creators', data: z.infer<typeof searchSchema>) {
+  const { q, category, minPrice, maxPrice, sortBy, page, limit } = data;
+  const skip = (page - 1) * limit;
+
+  if (type === 'products') {
+    const filter: Record<string, any> = { $text: { $search: q } };
+    if (category) filter.category = category;
+    if (minPrice || maxPrice) {
+      filter.price = {};
+      if (minPrice) filter.price.$gte = minPrice;
+      if (maxPrice) filter.price.$lte = maxPrice;
+    }
+    const sortOptions: Record<string, any> = {
+      relevance: { score: { $meta: 'textScore' } },
+      price: { price: 1 },
+      price_desc: { price: -1 },
+      rating: { rating: -1 },
+      date: { createdAt: -1 },
+    };
+    const [results, total] = await Promise.all([
+      Product.find(filter)
+        .select(sortBy === 'relevance' ? { score: { $meta: 'textScore' } } : {})
+        .sort(sortOptions[sortBy])
+        .skip(skip)
+        .limit(limit)
+        .lean(),
+      Product.countDocuments(filter),
+    ]);
+    return { results, total };
+  }
+
+  const filter = {
+    $or: [
+      { username: { $regex: q, $options: 'i' } },
+      { displayName: { $regex: q, $options: 'i' } },
+      { bio: { $regex: q, $options: 'i' } },
+    ],
+  };
+  const [results, total] = await Promise.all([
+    User.find(filter).select('username displayName avatar bio').skip(skip).limit(limit).lean(),
+    User.countDocuments(filter),
+  ]);
+  return { results, total };
+}
+
 /**
  * Advanced search across products, creators, and orders
+ *
+ * Products and creators are matched through the search index (lib/search):
+ * prefix and typo-tolerant matching and category/type/price facets. Pass back
+ * `pagination.nextCursor` as `cursor` for keyset pages; `page` still works
+ * (by skipping) when no cursor is given. `total`, `pages` and the facets count
+ * at most the top 10,000 matches by rank; `totalCapped` says when there were
+ * more. Until the index has been built (`npm run search:build`), the
+ * collections are queried directly, without facets or cursors.
  */
 export async function GET(request: NextRequest) {
   try {
     const searchParams = request.nextUrl.searchParams;
     const validation = searchSchema.safeParse({
       q: searchParams.get('q'),
-      type: searchParams.get('type'),
-      category: searchParams.get('category'),
+      type: searchParams.get('type') || undefined,
+      category: searchParams.get('category') || undefined,
+      productType: searchParams.get('productType') || undefined,
+      creatorId: searchParams.get('creatorId') || undefined,
+      cursor: searchParams.get('cursor') || undefined,
       minPrice: searchParams.get('minPrice') ? parseInt(searchParams.get('minPrice')!) : undefined,
       maxPrice: searchParams.get('maxPrice') ? parseInt(searchParams.get('maxPrice')!) : undefined,
-      sortBy: searchParams.get('sortBy'),
+      sortBy: searchParams.get('sortBy') || undefined,
       page: searchParams.get('page') ? parseInt(searchParams.get('page')!) : 1,
       limit: searchParams.get('limit') ? parseInt(searchParams.get('limit')!) : 20,
     });
@@ -42,79 +126,71 @@ export async function GET(request: NextRequest) {
 
     await connectToDatabase();
 
-    const { q, type, category, minPrice, maxPrice, sortBy, page, limit } = validation.data;
-    const skip = (page - 1) * limit;
-
-    let results: any[] = [];
-    let total = 0;
-
-    if (type === 'products') {
-      // Full-text search on products
-      const filter: Record<string, any> = {
-        $text: { $search: q },
-      };
-
-      if (category) {
-        filter.category = category;
-      }
-
-      if (minPrice || maxPrice) {
-        filter.price = {};
-        if (minPrice) filter.price.$gte = minPrice;
-        if (maxPrice) filter.price.$lte = maxPrice;
-      }
-
-      const sortOptions: Record<string, any> = {
-        relevance: { score: { $meta: 'textScore' } },
-        price: { price: 1 },
-        rating: { rating: -1 },
-        date: { createdAt: -1 },
-      };
-
-      results = await Product.find(filter)
-        .select(sortBy === 'relevance' ? { score: { $meta: 'textScore' } } : {})
-        .sort(sortOptions[sortBy])
-        .skip(skip)
-        .limit(limit)
-        .lean();
-
-      total = await Product.countDocuments(filter);
-    } else if (type === 'creators') {
-      // Search creators
-      const filter = {
-        $or: [
-          { username: { $regex: q, $options: 'i' } },
-          { displayName: { $regex: q, $options: 'i' } },
-          { bio: { $regex: q, $options: 'i' } },
-        ],
-      };
-
-      results = await User.find(filter)
-        .select('username displayName avatar bio')
-        .skip(skip)
-        .limit(limit)
-        .lean();
-
-      total = await User.countDocuments(filter);
-    } else if (type === 'orders') {
-      // Search orders (admin only - would need auth check)
-      const filter = {
-        $or: [
-          { razorpayOrderId: { $regex: q, $options: 'i' } },
-          { customerEmail: { $regex: q, $options: 'i' } },
-        ],
-      };
-
-      results = await Order.find(filter)
-        .populate('productId')
-        .populate('creatorId', 'displayName')
-        .skip(skip)
-        .limit(limit)
-        .lean();
+    const { q, type, category, productType, creatorId, minPrice, maxPrice, sortBy, cursor, page, limit } = validation.data;
+
+    if (type !== 'orders' && !(await isSearchIndexReady(type === 'products' ? 'product' : 'creator'))) {
+      const { results, total } = await searchCollections(type, validation.data);
+      return NextResponse.json({
+        results,
+        pagination: {
+          page,
+          limit,
+          total,
+          pages: Math.ceil(total / limit),
+          hasMore: page * limit < total,
+          nextCursor: null,
+        },
+      });
+    }
 
-      total = await Order.countDocuments(filter);
+    if (type !== 'orders') {
+      const result = await search({
+        kind: type === 'products' ? 'product' : 'creator',
+        q,
+        category,
+        productType,
+        creatorId,
+        minPrice,
+        maxPrice,
+        sortBy,
+        limit,
+        cursor,
+        skip: cursor ? 0 : Math.max(page - 1, 0) * limit,
+      });
+
+      return NextResponse.json({
+        results: await hydrate(type, result.results),
+        facets: result.facets,
+        pagination: {
+          page,
+          limit,
+          total: result.total,
+          pages: Math.ceil(result.total / limit),
+          totalCapped: result.totalCapped,
+          hasMore: result.nextCursor !== null,
+          nextCursor: result.nextCursor,
+        },
+      });
     }
 
+    // Search orders (admin only - would need auth check)
+    const skip = (page - 1) * limit;
+    const filter = {
+      $or: [
+        { razorpayOrderId: { $regex: q, $options: 'i' } },
+        { customerEmail: { $regex: q, $options: 'i' } },
+      ],
+    };
+
+    const results = await Order.find(filter)
+      .populate('productId')
+      .populate('creatorId', 'displayName')
+      .skip(skip)
+      .limit(limit)
+      .lean();
+
+    const total = await Order.countDocuments(filter);
+
     return NextResponse.json({
       results,
       pagination: {
@@ -125,6 +201,9 @@ export async function GET(request: NextRequest) {
       },
     });
   } catch (error) {
+    if (error instanceof InvalidCursorError) {
+      return NextResponse.json({ error: error.message }, { status: 400 });
+    }
     console.error('Search error:', error);
     return NextResponse.json(
       { error: 'Search failed' },
@@ -0,0 +1,144 @@
+import { AnalyticsEvent } from '@/lib/models/AnalyticsEvent';
+import { DailyMetric } from '@/lib/models/DailyMetric';
+import { JobCheckpoint } from '@/lib/models/JobCheckpoint';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const BATCH_SIZE = 1000;
+
+export const DAILY_METRICS_CHECKPOINT = 'daily-metrics';
+
+const startOfUtcDay = (date: Date) => new Date(Math.floor(date.getTime() / DAY_MS) * DAY_MS);
+const isoDay = (date: Date) => date.toISOString().slice(0, 10);
+
+export interface DailyMetricsOptions {
+    /** Backfill [from, to) instead of catching up from the checkpoint to today. */
+    from?: Date;
+    to?: Date;
+    /** Days aggregated per pipeline run (and per checkpoint). */
+    windowDays?: number;
+    /** Stop starting new windows after this long; the next call resumes. */
+    budgetMs?: number;
+}
+
+export interface DailyMetricsWindow {
+    from: string;
+    to: string;
+    groups: number;
+    durationMs: number;
+}
+
+export interface DailyMetricsResult {
+    mode: 'incremental' | 'backfill';
+    from: string;
+    to: string;
+    cursor: string;
+    caughtUp: boolean;
+    windows: DailyMetricsWindow[];
+    groups: number;
+    durationMs: number;
+    groupsPerSecond: number;
+}
+
+/**
+ * Aggregate AnalyticsEvents into DailyMetric rows (one per creator, UTC day
+ * and eventType).
+ *
+ * Without `from`, catches up every complete day since the last run, so a
+ * missed cron run is filled in by the next one. With `from`/`to`, backfills
+ * that range under its own checkpoint: an interrupted backfill resumes where
+ * it stopped, a finished one starts over. Rows are `$set`, never
+ * incremented, so re-running a window is safe.
+ */
+export async function aggregateDailyMetrics(options: DailyMetricsOptions = {}): Promise<DailyMetricsResult> {
+    const started = Date.now();
+    const windowMs = Math.max(1, options.windowDays ?? 1) * DAY_MS;
+    const budgetMs = options.budgetMs ?? 50_000;
+    const today = startOfUtcDay(new Date());
+
+    const mode = options.from ? 'backfill' : 'incremental';
+    let from: Date;
+    let to: Date;
+    let name: string;
+    let cursor: Date;
+    if (options.from) {
+        from = startOfUtcDay(options.from);
+        to = startOfUtcDay(options.to ?? today);
+        name = `${DAILY_METRICS_CHECKPOINT}:${isoDay(from)}:${isoDay(to)}`;
+        const checkpoint = await JobCheckpoint.findOne({ name }).lean();
+        cursor = checkpoint && checkpoint.cursor < to ? checkpoint.cursor : from;
+    } else {
+        name = DAILY_METRICS_CHECKPOINT;
+        to = today;
+        const checkpoint = await JobCheckpoint.findOne({ name }).lean();
+        from = cursor = checkpoint?.cursor ?? new Date(today.getTime() - DAY_MS);
+    }
+
+    const windows: DailyMetricsWindow[] = [];
+    while (cursor < to && Date.now() - started < budgetMs) {
+        const end = new Date(Math.min(cursor.getTime() + windowMs, to.getTime()));
+        const windowStarted = Date.now();
+        const groups = await aggregateWindow(cursor, end);
+        windows.push({ from: isoDay(cursor), to: isoDay(end), groups, durationMs: Date.now() - windowStarted });
+
+        cursor = end;
+        await JobCheckpoint.updateOne(
+            { name },
+            { $set: { cursor, stats: { lastWindow: windows[windows.length - 1] } } },
+            { upsert: true }
+        );
+    }
+
+    const groups = windows.reduce((total, window) => total + window.groups, 0);
+    const durationMs = Date.now() - started;
+    return {
+        mode,
+        from: isoDay(from),
+        to: isoDay(to),
+        cursor: isoDay(cursor),
+        caughtUp: cursor >= to,
+        windows,
+        groups,
+        durationMs,
+        groupsPerSecond: durationMs ? Math.round((groups / durationMs) * 1000) : 0,
+    };
+}
+
+/** Group the events of [start, end) in one pipeline and upsert the rows in bulk; returns the row count. */
+async function aggregateWindow(start: Date, end: Date) {
+    const rows = AnalyticsEvent.aggregate([
+        { $match: { createdAt: { $gte: start, $lt: end }, eventType: { $type: 'string' }, creatorId: { $ne: null } } },
+        {
+            $group: {
+                _id: {
+                    creatorId: '$creatorId',
+                    date: { $dateToString: { format: '%Y-%m-%d', date: '$createdAt', timezone: 'UTC' } },
+                    eventType: '$eventType',
+                },
+                count: { $sum: 1 },
+                revenue: { $sum: { $ifNull: ['$metadata.amount', 0] } },
+            },
+        },
+    ]).allowDiskUse(true).cursor({ batchSize: BATCH_SIZE });
+
+    let groups = 0;
+    let batch: any[] = [];
+    const flush = async () => {
+        if (batch.length === 0) return;
+        await DailyMetric.bulkWrite(batch, { ordered: false });
+        batch = [];
+    };
+
+    for await (const row of rows) {
+        batch.push({
+            updateOne: {
+                filter: { creatorId: row._id.creatorId, date: row._id.date, eventType: row._id.eventType },
+                update: { $set: { count: row.count, revenue: row.revenue } },
+                upsert: true,
+            },
+        });
+        groups++;
+        if (batch.length >= BATCH_SIZE) await flush();
+    }
+    await flush();
+    return groups;
+}
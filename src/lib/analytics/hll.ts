@@ -0,0 +1,65 @@
+import { createHash } from 'crypto';
+
+/**
+ * HyperLogLog unique counting with sparse registers.
+ *
+ * Registers are a plain `{ [index]: rank }` object so they can be stored on
+ * a Mongo document and merged with a per-register max. 2^11 registers give
+ * a standard error of about 2.3%.
+ */
+export const HLL_PRECISION = 11;
+const REGISTERS = 1 << HLL_PRECISION;
+const MAX_RANK = 64 - HLL_PRECISION + 1;
+
+export type HllRegisters = Record<string, number>;
+
+/** Register index and rank (position of the first 1 bit) for `value`. */
+export function hllPosition(value: string): [number, number] {
+    const digest = createHash('sha1').update(value).digest();
+    const high = digest.readUInt32BE(0);
+    const low = digest.readUInt32BE(4);
+
+    const index = high >>> (32 - HLL_PRECISION);
+    // The remaining 64 - p bits, left-aligned.
+    const restHigh = ((high << HLL_PRECISION) | (low >>> (32 - HLL_PRECISION))) >>> 0;
+    const restLow = (low << HLL_PRECISION) >>> 0;
+    const rank = restHigh !== 0
+        ? Math.clz32(restHigh) + 1
+        : restLow !== 0 ? 32 + Math.clz32(restLow) + 1 : MAX_RANK;
+    return [index, Math.min(rank, MAX_RANK)];
+}
+
+export function hllAdd(registers: HllRegisters, value: string) {
+    const [index, rank] = hllPosition(value);
+    if ((registers[index] || 0) < rank) registers[index] = rank;
+    return registers;
+}
+
+/** Merge `source` into `target` (union of the two sets). */
+export function hllMerge(target: HllRegisters, source: HllRegisters | undefined | null) {
+    if (!source) return target;
+    for (const [index, rank] of Object.entries(source)) {
+        if ((target[index] || 0) < rank) target[index] = rank;
+    }
+    return target;
+}
+
+/** Estimated number of distinct values added to `registers`. */
+export function hllEstimate(registers: HllRegisters) {
+    let sum = 0;
+    let zeros = REGISTERS;
+    for (const rank of Object.values(registers)) {
+        if (!rank) continue;
+        sum += Math.pow(2, -rank);
+        zeros--;
+    }
+    sum += zeros; // 2^-0 for every empty register
+
+    const alpha = 0.7213 / (1 + 1.079 / REGISTERS);
+    const estimate = (alpha * REGISTERS * REGISTERS) / sum;
+    // Linear counting is more accurate while many registers are still empty.
+    if (estimate <= 2.5 * REGISTERS && zeros > 0) {
+        return Math.round(REGISTERS * Math.log(REGISTERS / zeros));
+    }
+    return Math.round(estimate);
+}
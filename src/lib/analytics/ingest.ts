@@ -0,0 +1,187 @@
+import { randomUUID } from 'crypto';
+import redis from '@/lib/db/redis';
+import { AnalyticsEvent } from '@/lib/models/AnalyticsEvent';
+
+const QUEUE_KEY = 'analytics:ingest';
+/** Batches taken off the queue but not yet inserted: batch list key -> time taken. */
+const INFLIGHT_KEY = 'analytics:ingest:inflight';
+const BATCH_KEY_PREFIX = 'analytics:ingest:batch:';
+
+/** Events per insertMany. */
+export const FLUSH_BATCH = Number(process.env.ANALYTICS_FLUSH_BATCH || 500);
+/** Flush a partial batch after this long. */
+export const FLUSH_INTERVAL_MS = Number(process.env.ANALYTICS_FLUSH_MS || 1000);
+/** Refuse new events (backpressure) once this many are waiting. */
+export const MAX_BUFFERED = Number(process.env.ANALYTICS_MAX_BUFFERED || 50_000);
+/** Set to `0` to insert synchronously, as before the buffer existed. */
+export const WRITE_BEHIND = process.env.ANALYTICS_WRITE_BEHIND !== '0';
+/** A batch still in flight after this long is put back on the queue. */
+const INFLIGHT_LEASE_MS = 60_000;
+
+// Append only if the queue has room; returns the new length or -1 when full.
+const PUSH_IF_ROOM = `
+if redis.call('LLEN', KEYS[1]) + #ARGV - 1 > tonumber(ARGV[1]) then return -1 end
+return redis.call('RPUSH', KEYS[1], unpack(ARGV, 2))
+`;
+
+// Move up to ARGV[1] events from the queue to a batch list and record it as in flight.
+const TAKE_BATCH = `
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items == 0 then return items end
+redis.call('LTRIM', KEYS[1], #items, -1)
+redis.call('RPUSH', KEYS[3], unpack(items))
+redis.call('ZADD', KEYS[2], ARGV[2], KEYS[3])
+return items
+`;
+
+// Put a batch list's events back at the front of the queue and forget the batch.
+const RETURN_BATCH = `
+local items = redis.call('LRANGE', KEYS[3], 0, -1)
+if #items > 0 then redis.call('LPUSH', KEYS[1], unpack(items)) end
+redis.call('DEL', KEYS[3])
+redis.call('ZREM', KEYS[2], KEYS[3])
+return #items
+`;
+
+export class BufferFullError extends Error {
+    constructor() {
+        super('Analytics ingest buffer is full');
+        this.name = 'BufferFullError';
+    }
+}
+
+/**
+ * Write-behind buffer for AnalyticsEvents.
+ *
+ * Events are queued in a Redis list (shared by every app instance and the
+ * worker) and written with one unordered insertMany per `FLUSH_BATCH`
+ * events or every `FLUSH_INTERVAL_MS`. `enqueue` throws BufferFullError
+ * instead of queueing more than `MAX_BUFFERED` events. Events are never
+ * held in process memory: a serverless instance can freeze or exit before
+ * a timer fires, so while Redis is missing, still connecting (every cold
+ * start) or failing, they are inserted before the request returns.
+ *
+ * A flush moves each batch to its own Redis list before inserting it and
+ * deletes that list only once insertMany has succeeded, so a flush cut off
+ * by a frozen or exiting instance loses nothing: its batch is put back on
+ * the queue after `INFLIGHT_LEASE_MS` (events carry their _id, so a batch
+ * written twice is deduplicated).
+ */
+class AnalyticsIngestBuffer {
+    private timer: NodeJS.Timeout | null = null;
+    private flushing: Promise<number> | null = null;
+
+    readonly stats = { enqueued: 0, inserted: 0, direct: 0, rejected: 0, failedFlushes: 0, reclaimed: 0 };
+
+    async enqueue(events: Record<string, any>[]) {
+        const queued = WRITE_BEHIND ? await this.pushToRedis(events) : null;
+        if (queued === null) {
+            await AnalyticsEvent.insertMany(events, { ordered: false });
+            this.stats.inserted += events.length;
+            this.stats.direct += events.length;
+            return;
+        }
+        if (queued < 0) {
+            this.stats.rejected += events.length;
+            throw new BufferFullError();
+        }
+
+        this.stats.enqueued += events.length;
+        if (queued >= FLUSH_BATCH) {
+            this.flush().catch(() => undefined);
+        } else {
+            this.schedule();
+        }
+    }
+
+    /** Write everything queued so far; resolves to the number of events inserted. */
+    flush(): Promise<number> {
+        if (!this.flushing) {
+            this.flushing = this.drain().finally(() => {
+                this.flushing = null;
+            });
+        }
+        return this.flushing;
+    }
+
+    /** Keep flushing on the interval even when no requests come in (long-running processes). */
+    start() {
+        if (this.timer) clearTimeout(this.timer);
+        this.timer = setInterval(() => this.flush().catch(() => undefined), FLUSH_INTERVAL_MS);
+        this.timer.unref?.();
+    }
+
+    stop() {
+        if (this.timer) clearInterval(this.timer);
+        this.timer = null;
+        return this.flush();
+    }
+
+    private schedule() {
+        if (this.timer) return;
+        this.timer = setTimeout(() => {
+            this.timer = null;
+            this.flush().catch(() => undefined);
+        }, FLUSH_INTERVAL_MS);
+        this.timer.unref?.();
+    }
+
+    private async pushToRedis(events: Record<string, any>[]): Promise<number | null> {
+        if (!redis || redis.status !== 'ready') return null;
+        try {
+            return await redis.eval(PUSH_IF_ROOM, 1, QUEUE_KEY, MAX_BUFFERED, ...events.map(event => JSON.stringify(event)));
+        } catch (error: any) {
+            console.warn('[Analytics] Redis ingest queue unavailable, inserting directly:', error.message);
+            return null;
+        }
+    }
+
+    private async takeBatch(): Promise<{ key: string; events: Record<string, any>[] } | null> {
+        if (!redis || redis.status !== 'ready') return null;
+        const key = `${BATCH_KEY_PREFIX}${randomUUID()}`;
+        const raw: string[] = await redis.eval(TAKE_BATCH, 3, QUEUE_KEY, INFLIGHT_KEY, key, FLUSH_BATCH, Date.now());
+        return raw.length ? { key, events: raw.map(item => JSON.parse(item)) } : null;
+    }
+
+    private returnBatch(key: string): Promise<number> {
+        return redis.eval(RETURN_BATCH, 3, QUEUE_KEY, INFLIGHT_KEY, key);
+    }
+
+    /** Requeue batches whose flush never finished (the instance froze or exited mid-insert). */
+    private async reclaimExpired() {
+        if (!redis || redis.status !== 'ready') return;
+        const expired: string[] = await redis.zrangebyscore(INFLIGHT_KEY, 0, Date.now() - INFLIGHT_LEASE_MS);
+        for (const key of expired) this.stats.reclaimed += await this.returnBatch(key);
+    }
+
+    private async drain() {
+        await this.reclaimExpired();
+        let inserted = 0;
+        while (true) {
+            const batch = await this.takeBatch();
+            if (!batch) return inserted;
+            const { key, events } = batch;
+            try {
+                await AnalyticsEvent.insertMany(events, { ordered: false });
+            } catch (error: any) {
+                // Duplicate _ids mean a retried batch was partly written already.
+                if (error?.code !== 11000 && !error?.writeErrors?.every((e: any) => e.code === 11000)) {
+                    this.stats.failedFlushes++;
+                    console.error('[Analytics] Flush failed, requeueing events:', error.message);
+                    await this.returnBatch(key);
+                    this.schedule();
+                    return inserted;
+                }
+            }
+            await redis.multi().del(key).zrem(INFLIGHT_KEY, key).exec();
+            inserted += events.length;
+            this.stats.inserted += events.length;
+        }
+    }
+}
+
+const globalForIngest = global as unknown as { analyticsIngest?: AnalyticsIngestBuffer };
+
+/** Process-wide buffer (survives Next.js hot reloads in development). */
+export const analyticsIngest = globalForIngest.analyticsIngest ?? new AnalyticsIngestBuffer();
+globalForIngest.analyticsIngest = analyticsIngest;
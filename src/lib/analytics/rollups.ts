@@ -0,0 +1,231 @@
+import mongoose from 'mongoose';
+import { AnalyticsEvent } from '@/lib/models/AnalyticsEvent';
+import { AnalyticsRollup } from '@/lib/models/AnalyticsRollup';
+import { JobCheckpoint } from '@/lib/models/JobCheckpoint';
+import { HllRegisters, hllAdd, hllEstimate, hllMerge } from './hll';
+
+const HOUR_MS = 60 * 60 * 1000;
+const DAY_MS = 24 * HOUR_MS;
+
+export const ROLLUP_CHECKPOINT = 'analytics-rollup';
+
+/** Events whose IPs count as unique visitors ("unique clicks" on the dashboard). */
+export const VISITOR_EVENT_TYPES = ['product_view', 'add_to_cart'];
+
+/** Hours this recent are left to the raw-event tail, so late inserts are not missed. */
+const ROLLUP_LAG_MS = 5 * 60 * 1000;
+
+/** Hourly rollups back the partial days of the `week`/`month` periods. */
+const HOURLY_RETENTION_MS = 35 * DAY_MS;
+
+const floorTo = (date: Date, unit: number) => new Date(Math.floor(date.getTime() / unit) * unit);
+const ceilTo = (date: Date, unit: number) => new Date(Math.ceil(date.getTime() / unit) * unit);
+
+// Start of the UTC hour of `createdAt`; $dateTrunc needs MongoDB 5.0.
+const HOUR_OF_EVENT = { $subtract: ['$createdAt', { $mod: [{ $toLong: '$createdAt' }, HOUR_MS] }] };
+
+export interface RollupRunResult {
+    from: Date | null;
+    cursor: Date | null;
+    caughtUp: boolean;
+    windows: number;
+    buckets: number;
+    durationMs: number;
+}
+
+/**
+ * Roll raw AnalyticsEvents up into hourly and daily AnalyticsRollup documents.
+ *
+ * Works forward from the `analytics-rollup` checkpoint in windows of whole
+ * hours that never cross a UTC day. Every hour in a window is recomputed
+ * from the raw events and `$set`, and the window's day document is rebuilt
+ * from its hours, so replaying a window after a crash is harmless. Stops
+ * after `budgetMs` so a cron invocation stays within its time limit; the
+ * next run resumes from the checkpoint.
+ */
+export async function rollupAnalyticsEvents(options: { until?: Date; budgetMs?: number } = {}): Promise<RollupRunResult> {
+    const started = Date.now();
+    const budgetMs = options.budgetMs ?? 50_000;
+    const until = floorTo(options.until ?? new Date(Date.now() - ROLLUP_LAG_MS), HOUR_MS);
+
+    const checkpoint = await JobCheckpoint.findOne({ name: ROLLUP_CHECKPOINT }).lean();
+    let cursor = checkpoint?.cursor ?? null;
+    if (!cursor) {
+        const first = await AnalyticsEvent.findOne({}, { createdAt: 1 }).sort({ createdAt: 1 }).lean();
+        cursor = first ? floorTo(first.createdAt, HOUR_MS) : until;
+    }
+    const from = cursor;
+
+    let windows = 0;
+    let buckets = 0;
+    while (cursor < until && Date.now() - started < budgetMs) {
+        const end = new Date(Math.min(floorTo(cursor, DAY_MS).getTime() + DAY_MS, until.getTime()));
+        buckets += await rollupWindow(cursor, end);
+        cursor = end;
+        windows++;
+        await JobCheckpoint.updateOne(
+            { name: ROLLUP_CHECKPOINT },
+            { $set: { cursor, stats: { lastWindowAt: new Date(), buckets } } },
+            { upsert: true }
+        );
+    }
+
+    return { from, cursor, caughtUp: cursor >= until, windows, buckets, durationMs: Date.now() - started };
+}
+
+/** Recompute the hourly rollups in [start, end) (within one UTC day) and that day's rollup. */
+async function rollupWindow(start: Date, end: Date) {
+    const hours = new Map<string, { creatorId: mongoose.Types.ObjectId; bucket: Date; counts: Record<string, number>; visitors: HllRegisters }>();
+    const hourFor = (creatorId: mongoose.Types.ObjectId, bucket: Date) => {
+        const key = `${creatorId}:${bucket.getTime()}`;
+        let hour = hours.get(key);
+        if (!hour) {
+            hour = { creatorId, bucket, counts: {}, visitors: {} };
+            hours.set(key, hour);
+        }
+        return hour;
+    };
+
+    const counts = await AnalyticsEvent.aggregate([
+        { $match: { createdAt: { $gte: start, $lt: end }, eventType: { $type: 'string' } } },
+        { $group: { _id: { creatorId: '$creatorId', bucket: HOUR_OF_EVENT, eventType: '$eventType' }, count: { $sum: 1 } } },
+    ]).allowDiskUse(true);
+    for (const row of counts) {
+        if (!row._id.creatorId || row._id.eventType.includes('.') || row._id.eventType.startsWith('$')) continue;
+        hourFor(row._id.creatorId, row._id.bucket).counts[row._id.eventType] = row.count;
+    }
+
+    const visitors = AnalyticsEvent.aggregate([
+        { $match: { createdAt: { $gte: start, $lt: end }, eventType: { $in: VISITOR_EVENT_TYPES }, ip: { $type: 'string' } } },
+        { $group: { _id: { creatorId: '$creatorId', bucket: HOUR_OF_EVENT, ip: '$ip' } } },
+    ]).allowDiskUse(true).cursor({ batchSize: 5000 });
+    for await (const row of visitors) {
+        if (!row._id.creatorId) continue;
+        hllAdd(hourFor(row._id.creatorId, row._id.bucket).visitors, row._id.ip);
+    }
+
+    if (hours.size === 0) return 0;
+
+    const keepUntil = Date.now() + HOUR_MS; // outlive this run even when backfilling old hours
+    const hourly = Array.from(hours.values());
+    for (let i = 0; i < hourly.length; i += 1000) {
+        await AnalyticsRollup.bulkWrite(hourly.slice(i, i + 1000).map(hour => ({
+            updateOne: {
+                filter: { creatorId: hour.creatorId, granularity: 'hour', bucket: hour.bucket },
+                update: {
+                    $set: {
+                        counts: hour.counts,
+                        visitors: hour.visitors,
+                        expiresAt: new Date(Math.max(hour.bucket.getTime() + HOURLY_RETENTION_MS, keepUntil)),
+                    },
+                },
+                upsert: true,
+            },
+        })), { ordered: false });
+    }
+
+    // Rebuild the day from all of its hours rolled up so far.
+    const day = floorTo(start, DAY_MS);
+    const creatorIds = Array.from(new Set(hourly.map(hour => String(hour.creatorId))))
+        .map(id => new mongoose.Types.ObjectId(id));
+    const days = new Map<string, { counts: Record<string, number>; visitors: HllRegisters }>();
+    const dayHours = AnalyticsRollup.find(
+        { creatorId: { $in: creatorIds }, granularity: 'hour', bucket: { $gte: day, $lt: new Date(day.getTime() + DAY_MS) } },
+        { creatorId: 1, counts: 1, visitors: 1 }
+    ).lean().cursor({ batchSize: 1000 });
+    for await (const hour of dayHours) {
+        const key = String(hour.creatorId);
+        const total = days.get(key) ?? { counts: {}, visitors: {} };
+        for (const [eventType, count] of Object.entries(hour.counts || {})) {
+            total.counts[eventType] = (total.counts[eventType] || 0) + count;
+        }
+        hllMerge(total.visitors, hour.visitors);
+        days.set(key, total);
+    }
+
+    const daily = Array.from(days.entries());
+    for (let i = 0; i < daily.length; i += 1000) {
+        await AnalyticsRollup.bulkWrite(daily.slice(i, i + 1000).map(([creatorId, total]) => ({
+            updateOne: {
+                filter: { creatorId: new mongoose.Types.ObjectId(creatorId), granularity: 'day', bucket: day },
+                update: { $set: { counts: total.counts, visitors: total.visitors } },
+                upsert: true,
+            },
+        })), { ordered: false });
+    }
+
+    return hourly.length + daily.length;
+}
+
+export interface EventTotals {
+    counts: Record<string, number>;
+    uniqueVisitors: number;
+}
+
+/**
+ * Event counts and unique visitors for a creator from `from` (or all time)
+ * until now.
+ *
+ * Whole days come from daily rollups, partial days at the edges from
+ * hourly ones; only the part of the first hour before the first rollup and
+ * the events after the checkpoint are read raw.
+ */
+export async function getEventTotals(creatorId: mongoose.Types.ObjectId | string, from: Date | null): Promise<EventTotals> {
+    const creator = new mongoose.Types.ObjectId(String(creatorId));
+    const now = new Date();
+    const counts: Record<string, number> = {};
+    const visitors: HllRegisters = {};
+
+    const checkpoint = await JobCheckpoint.findOne({ name: ROLLUP_CHECKPOINT }, { cursor: 1 }).lean();
+    const rolledUntil = checkpoint?.cursor ?? null;
+    const rolledFrom = from ? ceilTo(from, HOUR_MS) : null;
+
+    const raw: [Date | null, Date][] = [];
+    if (!rolledUntil || (rolledFrom && rolledFrom >= rolledUntil)) {
+        raw.push([from, now]);
+    } else {
+        if (from && rolledFrom && from < rolledFrom) raw.push([from, rolledFrom]);
+        raw.push([rolledUntil, now]);
+
+        const firstDay = rolledFrom ? ceilTo(rolledFrom, DAY_MS) : null;
+        const lastDay = floorTo(rolledUntil, DAY_MS);
+        const ranges: Record<string, any>[] = [];
+        if (!firstDay || firstDay < lastDay) {
+            ranges.push({ granularity: 'day', bucket: { ...(firstDay ? { $gte: firstDay } : {}), $lt: lastDay } });
+            if (rolledFrom && firstDay && rolledFrom < firstDay) {
+                ranges.push({ granularity: 'hour', bucket: { $gte: rolledFrom, $lt: firstDay } });
+            }
+            ranges.push({ granularity: 'hour', bucket: { $gte: lastDay, $lt: rolledUntil } });
+        } else {
+            ranges.push({ granularity: 'hour', bucket: { $gte: rolledFrom, $lt: rolledUntil } });
+        }
+
+        const rollups = await AnalyticsRollup.find({ creatorId: creator, $or: ranges }, { counts: 1, visitors: 1 }).lean();
+        for (const rollup of rollups) {
+            for (const [eventType, count] of Object.entries(rollup.counts || {})) {
+                counts[eventType] = (counts[eventType] || 0) + count;
+            }
+            hllMerge(visitors, rollup.visitors);
+        }
+    }
+
+    await Promise.all(raw.map(async ([start, end]) => {
+        const createdAt = { ...(start ? { $gte: start } : {}), $lt: end };
+        const [byType, ips] = await Promise.all([
+            AnalyticsEvent.aggregate([
+                { $match: { creatorId: creator, createdAt } },
+                { $group: { _id: '$eventType', count: { $sum: 1 } } },
+            ]),
+            AnalyticsEvent.aggregate([
+                { $match: { creatorId: creator, eventType: { $in: VISITOR_EVENT_TYPES }, createdAt, ip: { $type: 'string' } } },
+                { $group: { _id: '$ip' } },
+            ]).allowDiskUse(true),
+        ]);
+        for (const row of byType) {
+            if (row._id) counts[row._id] = (counts[row._id] || 0) + row.count;
+        }
+        for (const row of ips) hllAdd(visitors, row._id);
+    }));
+
+    return { counts, uniqueVisitors: hllEstimate(visitors) };
+}
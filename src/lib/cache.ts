@@ -1,41 +1,276 @@
 import { Redis } from '@upstash/redis';
+import pubsubRedis from '@/lib/db/redis';
+import { LruMap } from '@/lib/cache/memory-cache';
 
 const redis = Redis.fromEnv();
 
+/** Upper bound for caching `null`/`undefined` results unless `negativeTtl` says otherwise. */
+const DEFAULT_NEGATIVE_TTL = 30;
+/** How long one instance may hold the refresh lock of a stale key. */
+const REFRESH_LOCK_SECONDS = 10;
+
+/** L1 (in-process) bounds; entries also never outlive their L2 freshness. */
+const L1_MAX_ENTRIES = Number(process.env.CACHE_L1_MAX_ENTRIES || 1000);
+const L1_MAX_BYTES = Number(process.env.CACHE_L1_MAX_BYTES || 32 * 1024 * 1024);
+/** Default seconds an entry may be served from L1; bounds staleness if an invalidation is missed. */
+const L1_TTL = Number(process.env.CACHE_L1_TTL || 60);
+
+const INVALIDATION_CHANNEL = 'cache:invalidate';
+const INSTANCE_ID = `${process.pid}-${Math.random().toString(36).slice(2, 10)}`;
+
+export interface CacheOptions {
+    /**
+     * Seconds after `ttl` during which the old value is still served while a
+     * single background refresh replaces it. 0 (default) disables it.
+     */
+    staleTtl?: number;
+    /** Seconds to remember a `null`/`undefined` result (default: min(ttl, 30)); 0 disables it. */
+    negativeTtl?: number;
+    /** Max seconds to serve the value from this process's memory (default CACHE_L1_TTL); 0 skips L1. */
+    l1Ttl?: number;
+}
+
+interface Entry<T> {
+    __cached: 1;
+    value: T | null;
+    storedAt: number;
+    ttl: number;
+}
+
+// Hits are counted per tier; negativeHits counts the null results among them.
+const stats = {
+    requests: 0,
+    l1Hits: 0,
+    l2Hits: 0,
+    staleHits: 0,
+    negativeHits: 0,
+    misses: 0,
+    coalesced: 0,
+    loads: 0,
+    loadErrors: 0,
+    refreshes: 0,
+    refreshErrors: 0,
+    redisErrors: 0,
+    invalidationsPublished: 0,
+    invalidationsReceived: 0,
+    totalMs: 0,
+    loadMs: 0,
+    maxLoadMs: 0,
+};
+
+// Loads in progress per key; concurrent misses wait for the same promise.
+const inflight = new Map<string, Promise<any>>();
+// Keys this process is refreshing in the background.
+const refreshing = new Set<string>();
+// L1: fresh entries read from or written to Redis by this process.
+const l1 = new LruMap<Entry<unknown>>(L1_MAX_ENTRIES, L1_MAX_BYTES);
+l1.sweepEvery(60_000);
+let subscribed = false;
+
+const isEntry = (value: any): value is Entry<unknown> =>
+    value !== null && typeof value === 'object' && value.__cached === 1;
+
+/**
+ * Two-tier read-through cache: a size-bounded in-process LRU (L1) in front of
+ * Redis (L2). `invalidateCache` evicts L1 on every instance via Redis pub/sub.
+ *
+ * Concurrent misses for a key in this process share one `fetchFn` call.
+ * Null results are cached for `negativeTtl`, so unknown keys (e.g. missing
+ * usernames) do not reach the database on every request. With `staleTtl`, an
+ * expired value keeps being served while one request per key (across
+ * instances, via a short Redis lock) refreshes it in the background.
+ */
 export async function getCached<T>(
     key: string,
     ttl: number,
-    fetchFn: () => Promise<T>
+    fetchFn: () => Promise<T>,
+    options: CacheOptions = {}
 ): Promise<T> {
+    const started = Date.now();
+    stats.requests++;
+    subscribeToInvalidations();
     try {
-        const cached = await redis.get(key);
-        if (cached) {
-            console.log(`[CACHE HIT] ${key}`);
-            return (typeof cached === 'string' ? JSON.parse(cached) : cached) as T;
-        }
+        return await read(key, ttl, fetchFn, options);
+    } finally {
+        stats.totalMs += Date.now() - started;
+    }
+}
+
+async function read<T>(key: string, ttl: number, fetchFn: () => Promise<T>, options: CacheOptions): Promise<T> {
+    const local = l1.get(key);
+    if (local && (options.l1Ttl ?? L1_TTL) > 0) {
+        stats.l1Hits++;
+        if (local.value === null) stats.negativeHits++;
+        return local.value as T;
+    }
+
+    const pending = inflight.get(key);
+    if (pending) {
+        stats.coalesced++;
+        return pending;
+    }
+
+    let cached: unknown = null;
+    try {
+        cached = await redis.get(key);
     } catch (error) {
+        stats.redisErrors++;
         console.error(`[CACHE ERROR] get: ${key}`, error);
     }
 
-    const data = await fetchFn();
+    if (cached !== null && cached !== undefined) {
+        // Values written before entries were wrapped.
+        if (!isEntry(cached)) {
+            stats.l2Hits++;
+            return (typeof cached === 'string' ? JSON.parse(cached) : cached) as T;
+        }
+        if (Date.now() - cached.storedAt < cached.ttl * 1000) {
+            stats.l2Hits++;
+            if (cached.value === null) stats.negativeHits++;
+            remember(key, cached, options);
+            return cached.value as T;
+        }
+        stats.staleHits++;
+        refreshInBackground(key, ttl, fetchFn, options);
+        return cached.value as T;
+    }
 
+    // Another request may have started loading while we were reading Redis.
+    const racing = inflight.get(key);
+    if (racing) {
+        stats.coalesced++;
+        return racing;
+    }
+
+    stats.misses++;
+    const load = fetchAndStore(key, ttl, fetchFn, options).finally(() => inflight.delete(key));
+    inflight.set(key, load);
+    return load;
+}
+
+async function fetchAndStore<T>(key: string, ttl: number, fetchFn: () => Promise<T>, options: CacheOptions): Promise<T> {
+    const started = Date.now();
+    stats.loads++;
+    let data: T;
     try {
-        await redis.set(key, JSON.stringify(data), { ex: ttl });
-        console.log(`[CACHE MISS] ${key} - stored with TTL ${ttl}s`);
+        data = await fetchFn();
     } catch (error) {
-        console.error(`[CACHE ERROR] set: ${key}`, error);
+        stats.loadErrors++;
+        throw error;
+    } finally {
+        const elapsed = Date.now() - started;
+        stats.loadMs += elapsed;
+        stats.maxLoadMs = Math.max(stats.maxLoadMs, elapsed);
     }
 
+    const negative = data === null || data === undefined;
+    const fresh = negative ? options.negativeTtl ?? Math.min(ttl, DEFAULT_NEGATIVE_TTL) : ttl;
+    if (fresh > 0) {
+        const entry: Entry<T> = { __cached: 1, value: negative ? null : data, storedAt: Date.now(), ttl: fresh };
+        const serialized = JSON.stringify(entry);
+        remember(key, entry, options, serialized.length);
+        try {
+            await redis.set(key, serialized, { ex: fresh + (negative ? 0 : options.staleTtl ?? 0) });
+        } catch (error) {
+            stats.redisErrors++;
+            console.error(`[CACHE ERROR] set: ${key}`, error);
+        }
+    }
     return data;
 }
 
+/** Keep a fresh entry in L1 until it goes stale in L2 or its L1 TTL ends, whichever is first. */
+function remember(key: string, entry: Entry<unknown>, options: CacheOptions, size?: number) {
+    const l1Ttl = options.l1Ttl ?? L1_TTL;
+    if (l1Ttl <= 0) return;
+    const expiresAt = Math.min(entry.storedAt + entry.ttl * 1000, Date.now() + l1Ttl * 1000);
+    l1.set(key, entry, expiresAt, size ?? JSON.stringify(entry).length);
+}
+
+/** Evict L1 entries when another instance invalidates keys (Node runtime with REDIS_URL only). */
+function subscribeToInvalidations() {
+    if (subscribed || !pubsubRedis || typeof pubsubRedis.duplicate !== 'function') return;
+    subscribed = true;
+
+    const subscriber = pubsubRedis.duplicate();
+    subscriber.on('error', (error: any) => console.warn('[CACHE] Invalidation subscriber error:', error.message));
+    subscriber.on('message', (_channel: string, message: string) => {
+        try {
+            const { from, keys } = JSON.parse(message);
+            if (from === INSTANCE_ID) return;
+            stats.invalidationsReceived++;
+            for (const key of keys) l1.delete(key);
+        } catch (error) {
+            console.error('[CACHE ERROR] Bad invalidation message:', message);
+        }
+    });
+    subscriber.connect()
+        .then(() => subscriber.subscribe(INVALIDATION_CHANNEL))
+        .catch((error: any) => console.warn('[CACHE] Invalidation subscribe failed, L1 relies on its TTL:', error.message));
+}
+
+function refreshInBackground<T>(key: string, ttl: number, fetchFn: () => Promise<T>, options: CacheOptions) {
+    if (refreshing.has(key)) return;
+    refreshing.add(key);
+    const lockKey = `${key}:refresh`;
+
+    (async () => {
+        const locked = await redis.set(lockKey, '1', { nx: true, ex: REFRESH_LOCK_SECONDS });
+        if (locked !== 'OK') return; // another instance is refreshing it
+        try {
+            stats.refreshes++;
+            await fetchAndStore(key, ttl, fetchFn, options);
+        } finally {
+            await redis.del(lockKey).catch(() => undefined);
+        }
+    })()
+        .catch(error => {
+            stats.refreshErrors++;
+            console.error(`[CACHE ERROR] refresh: ${key}`, error);
+        })
+        .finally(() => refreshing.delete(key));
+}
+
+const ratio = (part: number, whole: number) => (whole ? Number((part / whole).toFixed(4)) : 0);
+
+/** Counters for this process since it started, with per-tier hit ratios and averages. */
+export function getCacheStats() {
+    const l2Requests = stats.requests - stats.l1Hits - stats.coalesced;
+    const served = stats.l1Hits + stats.l2Hits + stats.staleHits + stats.coalesced;
+    return {
+        ...stats,
+        hitRatio: ratio(served, stats.requests),
+        l1HitRatio: ratio(stats.l1Hits, stats.requests),
+        l2HitRatio: ratio(stats.l2Hits + stats.staleHits, l2Requests),
+        avgMs: stats.requests ? Number((stats.totalMs / stats.requests).toFixed(2)) : 0,
+        avgLoadMs: stats.loads ? Number((stats.loadMs / stats.loads).toFixed(2)) : 0,
+        inflight: inflight.size,
+        l1Entries: l1.size,
+        l1Bytes: l1.byteSize,
+        l1Evictions: l1.evictions,
+        l1Subscribed: subscribed,
+    };
+}
+
+/** Delete keys from Redis and from L1 on this and (via pub/sub) every other instance. */
 export async function invalidateCache(...keys: string[]) {
+    if (keys.length === 0) return;
+    for (const key of keys) l1.delete(key);
     try {
         await redis.del(...keys);
         console.log(`[CACHE INVALIDATE] ${keys.join(', ')}`);
     } catch (error) {
         console.error(`[CACHE ERROR] invalidate: ${keys}`, error);
     }
+
+    const message = JSON.stringify({ from: INSTANCE_ID, keys });
+    try {
+        if (pubsubRedis && pubsubRedis.status === 'ready') await pubsubRedis.publish(INVALIDATION_CHANNEL, message);
+        else await redis.publish(INVALIDATION_CHANNEL, message);
+        stats.invalidationsPublished++;
+    } catch (error) {
+        console.error(`[CACHE ERROR] publish invalidation: ${keys}`, error);
+    }
 }
 
 export default redis;
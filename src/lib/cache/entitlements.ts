@@ -0,0 +1,204 @@
+/**
+ * DM entitlements — what a creator's plan allows and how much of it they
+ * have used this month, resolved without querying Mongo for every queued DM.
+ *
+ * The plan side (creator username, plan and monthly Auto DM limit) goes
+ * through getCached for 5 minutes; subscription writes and changes to a plan's
+ * DM cap invalidate it. Usage is a Redis counter per creator and month: each DM
+ * reserves one unit with INCR before it is sent and gives it back if sending
+ * fails. DMLog stays the record — every RECONCILE_SECONDS one instance
+ * recounts the month's successful DMs and adds what DMLog gained since the
+ * last recount (DMs logged outside the queue). It never resets the counter,
+ * which would erase reservations whose DMLog row is not written yet.
+ */
+import redis, { getCached, invalidateCache } from '@/lib/cache';
+import { connectToDatabase } from '@/lib/db/mongodb';
+import { LruMap } from '@/lib/cache/memory-cache';
+import { PlanTier } from '@/lib/models/plan.types';
+
+const ENTITLEMENT_TTL = 300;
+const SETTINGS_TTL = 30;
+/** How often the usage counter is recounted from DMLog. */
+const RECONCILE_SECONDS = 600;
+/** Usage counters outlive their month by a few days, then expire. */
+const USAGE_TTL_SECONDS = 40 * 24 * 60 * 60;
+const INVALIDATE_BATCH = 500;
+
+// Add the DMLog count's change since the last recount (KEYS[2]) to the usage
+// counter. Without a previous recount the counter is raised to the count.
+const RECONCILE_USAGE = `
+local count = tonumber(ARGV[1])
+local last = redis.call('GET', KEYS[2])
+local used
+if last then
+    used = redis.call('INCRBY', KEYS[1], count - tonumber(last))
+else
+    used = math.max(tonumber(redis.call('GET', KEYS[1]) or '0'), count)
+    redis.call('SET', KEYS[1], used)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('SET', KEYS[2], count, 'EX', ARGV[2])
+return used
+`;
+
+export const AUTOMATION_SETTINGS_KEY = 'platform:automation-enabled';
+
+/** Plan.limits keys a cached DMEntitlement is built from; changing others needs no invalidation. */
+export const DM_ENTITLEMENT_LIMITS: ReadonlySet<string> = new Set(['maxAutoDms']);
+
+export interface DMEntitlement {
+    creatorId: string;
+    username: string;
+    planId: string | null;
+    planTier: string | null;
+    /** Successful Auto DMs allowed per calendar month; -1 = unlimited. */
+    maxAutoDms: number;
+}
+
+export interface DMReservation {
+    /** Usage this month including this DM (null when the plan is unlimited). */
+    used: number | null;
+    /** Give the unit back, e.g. when sending failed. */
+    release: () => Promise<void>;
+}
+
+// Usage keys this process reconciled recently (or saw another instance claim).
+const reconciled = new LruMap<true>(10_000);
+
+export const entitlementKey = (creatorId: string) => `entitlements:dm:${creatorId}`;
+
+function startOfMonth(now = new Date()) {
+    const start = new Date(now);
+    start.setDate(1);
+    start.setHours(0, 0, 0, 0);
+    return start;
+}
+
+export function usageKey(creatorId: string, now = new Date()) {
+    const month = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}`;
+    return `dm-usage:${creatorId}:${month}`;
+}
+
+/**
+ * The plan's monthly Auto DM cap: `limits.maxAutoDms`, which the admin plan
+ * route edits, else the top-level `maxAutoDms` older plan documents were
+ * seeded with. Plans with neither were never capped; keep it that way.
+ */
+function monthlyDMCap(plan: any): number {
+    if (typeof plan.limits?.maxAutoDms === 'number') return plan.limits.maxAutoDms;
+    return typeof plan.maxAutoDms === 'number' ? plan.maxAutoDms : -1;
+}
+
+async function loadDMEntitlement(creatorId: string): Promise<DMEntitlement | null> {
+    await connectToDatabase();
+    const { User } = await import('@/lib/models/User');
+    const { Subscription } = await import('@/lib/models/Subscription');
+    const { Plan } = await import('@/lib/models/Plan');
+
+    const creator = await User.findById(creatorId).select('username').lean() as any;
+    if (!creator) return null;
+
+    const activeSub = await Subscription.findOne({
+        userId: creatorId,
+        status: { $in: ['active', 'trialing'] }
+    }).populate('planId').lean() as any;
+
+    let plan = activeSub?.planId;
+    if (!plan) plan = await Plan.findOne({ tier: PlanTier.FREE }).lean();
+    if (!plan) throw new Error('No plan configuration found.');
+
+    return {
+        creatorId: String(creatorId),
+        username: creator.username || '',
+        planId: plan._id ? String(plan._id) : null,
+        planTier: plan.tier ?? plan.id ?? null,
+        maxAutoDms: monthlyDMCap(plan),
+    };
+}
+
+/** The creator's plan limits and username, or null if the creator does not exist. */
+export function getDMEntitlement(creatorId: string): Promise<DMEntitlement | null> {
+    return getCached(entitlementKey(String(creatorId)), ENTITLEMENT_TTL, () => loadDMEntitlement(String(creatorId)));
+}
+
+/** Forget cached entitlements so the next job re-reads the plan. */
+export async function invalidateEntitlements(...creatorIds: string[]) {
+    const keys = creatorIds.map(id => entitlementKey(String(id)));
+    for (let i = 0; i < keys.length; i += INVALIDATE_BATCH) {
+        await invalidateCache(...keys.slice(i, i + INVALIDATE_BATCH));
+    }
+}
+
+/** The platform-wide automation kill switch, read at most every 30s per instance. */
+export async function isAutomationEnabled(): Promise<boolean> {
+    return getCached(AUTOMATION_SETTINGS_KEY, SETTINGS_TTL, async () => {
+        await connectToDatabase();
+        const { PlatformSettings } = await import('@/lib/models/PlatformSettings');
+        const settings = await PlatformSettings.findOne().select('featureToggles.automationEnabled').lean() as any;
+        return settings?.featureToggles?.automationEnabled !== false;
+    });
+}
+
+async function countMonthlyDMs(creatorId: string) {
+    await connectToDatabase();
+    const { DMLog } = await import('@/lib/models/DMLog');
+    return DMLog.countDocuments({
+        creatorId,
+        createdAt: { $gte: startOfMonth() },
+        status: 'success'
+    });
+}
+
+/**
+ * Recount this month's successful DMs from DMLog and apply the difference
+ * from the last recount to the Redis counter; resolves to the new usage.
+ */
+export async function reconcileDMUsage(creatorId: string) {
+    const count = await countMonthlyDMs(creatorId);
+    const key = usageKey(creatorId);
+    return Number(await redis.eval(RECONCILE_USAGE, [key, `${key}:logged`], [count, USAGE_TTL_SECONDS]));
+}
+
+/**
+ * Reconcile the counter if it is due. A short Redis claim makes one instance
+ * do it per interval; a counter for a new month starts with a recount.
+ */
+async function syncUsage(creatorId: string, key: string) {
+    if (reconciled.get(key)) return;
+    reconciled.set(key, true, Date.now() + RECONCILE_SECONDS * 1000);
+    const claimed = await redis.set(`${key}:reconciled`, '1', { nx: true, ex: RECONCILE_SECONDS });
+    if (claimed === 'OK') await reconcileDMUsage(creatorId);
+}
+
+/**
+ * Reserve one Auto DM against the creator's monthly limit; throws when the
+ * limit is reached. If Redis is unavailable the month is counted from DMLog.
+ */
+export async function reserveDM(entitlement: DMEntitlement): Promise<DMReservation> {
+    const { creatorId, maxAutoDms } = entitlement;
+    const noop = async () => undefined;
+    if (maxAutoDms < 0) return { used: null, release: noop };
+
+    const key = usageKey(creatorId);
+    let used: number;
+    try {
+        await syncUsage(creatorId, key);
+        used = await redis.incr(key);
+    } catch (error) {
+        console.error(`[ENTITLEMENTS] Usage counter unavailable for ${creatorId}, counting DMLog:`, error);
+        const count = await countMonthlyDMs(creatorId);
+        if (count >= maxAutoDms) throw new Error(`Plan limit reached: ${count}/${maxAutoDms} Auto DMs.`);
+        return { used: count + 1, release: noop };
+    }
+
+    if (used > maxAutoDms) {
+        await redis.decr(key).catch(() => undefined);
+        throw new Error(`Plan limit reached: ${used - 1}/${maxAutoDms} Auto DMs.`);
+    }
+    return {
+        used,
+        release: async () => {
+            await redis.decr(key).catch(error => console.error(`[ENTITLEMENTS] Release failed: ${key}`, error));
+        },
+    };
+}
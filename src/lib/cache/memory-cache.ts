@@ -6,14 +6,34 @@
  * across different lambda instances (use Vercel KV / Redis for that), but it
  * eliminates redundant DB hits within a single instance's lifetime.
  *
+ * Each cache is bounded (entry count and approximate bytes, least recently
+ * used evicted first) and swept for expired entries on an interval, so a
+ * warm instance that sees many distinct keys does not grow without limit.
+ *
  * Usage:
  *   const plansCache = createMemoryCache<Plan[]>(5 * 60 * 1000); // 5 min TTL
  *   const data = await plansCache.get('plans', () => Plan.find().lean());
  */
 
-interface CacheEntry<T> {
-    value: T;
-    expiresAt: number;
+export interface MemoryCacheOptions<T> {
+    /** Max entries before the least recently used is evicted (default 5000). */
+    maxEntries?: number;
+    /** Max approximate bytes across entries (default 16 MB). */
+    maxBytes?: number;
+    /** How often expired entries are swept (default: the TTL, at least 1s; 0 disables). */
+    sweepIntervalMs?: number;
+    /** Approximate size of a value in bytes (default: JSON length). */
+    sizeOf?: (value: T) => number;
+}
+
+export interface MemoryCacheStats {
+    size: number;
+    bytes: number;
+    hits: number;
+    misses: number;
+    hitRatio: number;
+    evictions: number;
+    expired: number;
 }
 
 export interface MemoryCache<T> {
@@ -21,29 +41,49 @@ export interface MemoryCache<T> {
     set(key: string, value: T): void;
     invalidate(key: string): void;
     invalidateAll(): void;
+    stats(): MemoryCacheStats;
+    /** Stop the sweep timer and drop every entry. */
+    dispose(): void;
 }
 
-export function createMemoryCache<T>(ttlMs: number): MemoryCache<T> {
-    const store = new Map<string, CacheEntry<T>>();
+/** Approximate in-memory size of a JSON-like value. */
+export function approximateSize(value: unknown): number {
+    try {
+        return JSON.stringify(value)?.length ?? 8;
+    } catch {
+        return 1024;
+    }
+}
+
+export function createMemoryCache<T>(ttlMs: number, options: MemoryCacheOptions<T> = {}): MemoryCache<T> {
+    const store = new LruMap<T>(options.maxEntries ?? 5000, options.maxBytes ?? 16 * 1024 * 1024);
+    const sizeOf = options.sizeOf ?? approximateSize;
     // In-flight deduplication: prevent multiple concurrent fetches for the same key
     const inflight = new Map<string, Promise<T>>();
+    let hits = 0;
+    let misses = 0;
+
+    const sweepIntervalMs = options.sweepIntervalMs ?? Math.max(ttlMs, 1000);
+    let sweeper = sweepIntervalMs > 0 ? store.sweepEvery(sweepIntervalMs) : null;
+
+    const put = (key: string, value: T) => store.set(key, value, Date.now() + ttlMs, sizeOf(value));
 
     return {
         async get(key: string, fetcher: () => Promise<T>): Promise<T> {
-            const now = Date.now();
-            const entry = store.get(key);
-
             // Return cached value if still valid
-            if (entry && entry.expiresAt > now) {
-                return entry.value;
+            const cached = store.get(key);
+            if (cached !== undefined) {
+                hits++;
+                return cached;
             }
+            misses++;
 
             // Dedup concurrent requests for the same key
             const existing = inflight.get(key);
             if (existing) return existing;
 
             const promise = fetcher().then(value => {
-                store.set(key, { value, expiresAt: now + ttlMs });
+                put(key, value);
                 inflight.delete(key);
                 return value;
             }).catch(err => {
@@ -56,7 +96,7 @@ export function createMemoryCache<T>(ttlMs: number): MemoryCache<T> {
         },
 
         set(key: string, value: T): void {
-            store.set(key, { value, expiresAt: Date.now() + ttlMs });
+            put(key, value);
         },
 
         invalidate(key: string): void {
@@ -65,6 +105,111 @@ export function createMemoryCache<T>(ttlMs: number): MemoryCache<T> {
 
         invalidateAll(): void {
             store.clear();
+        },
+
+        stats(): MemoryCacheStats {
+            const lookups = hits + misses;
+            return {
+                size: store.size,
+                bytes: store.byteSize,
+                hits,
+                misses,
+                hitRatio: lookups ? Number((hits / lookups).toFixed(4)) : 0,
+                evictions: store.evictions,
+                expired: store.expired,
+            };
+        },
+
+        dispose(): void {
+            if (sweeper) clearInterval(sweeper);
+            sweeper = null;
+            store.clear();
         }
     };
 }
+
+interface LruEntry<V> {
+    value: V;
+    expiresAt: number;
+    size: number;
+}
+
+/**
+ * Map bounded by entry count and (approximate) bytes that evicts the least
+ * recently used entry first. Map iteration follows insertion order, so
+ * re-inserting an entry on read moves it to the back.
+ */
+export class LruMap<V> {
+    private readonly entries = new Map<string, LruEntry<V>>();
+    private bytes = 0;
+    evictions = 0;
+    expired = 0;
+
+    constructor(readonly maxEntries: number, readonly maxBytes = Infinity) {}
+
+    get(key: string, now = Date.now()): V | undefined {
+        const entry = this.entries.get(key);
+        if (!entry) return undefined;
+        this.entries.delete(key);
+        if (entry.expiresAt <= now) {
+            this.bytes -= entry.size;
+            this.expired++;
+            return undefined;
+        }
+        this.entries.set(key, entry);
+        return entry.value;
+    }
+
+    set(key: string, value: V, expiresAt: number, size = 0): void {
+        this.delete(key);
+        if (size > this.maxBytes) return;
+        this.entries.set(key, { value, expiresAt, size });
+        this.bytes += size;
+        while (this.entries.size > this.maxEntries || this.bytes > this.maxBytes) {
+            this.delete(this.entries.keys().next().value as string);
+            this.evictions++;
+        }
+    }
+
+    delete(key: string): boolean {
+        const entry = this.entries.get(key);
+        if (!entry) return false;
+        this.entries.delete(key);
+        this.bytes -= entry.size;
+        return true;
+    }
+
+    /** Remove every expired entry; returns how many were removed. */
+    prune(now = Date.now()): number {
+        let removed = 0;
+        for (const [key, entry] of this.entries) {
+            if (entry.expiresAt <= now) {
+                this.entries.delete(key);
+                this.bytes -= entry.size;
+                removed++;
+            }
+        }
+        this.expired += removed;
+        return removed;
+    }
+
+    /** Prune on an interval that does not keep the process alive. */
+    sweepEvery(intervalMs: number): NodeJS.Timeout {
+        const timer = setInterval(() => this.prune(), intervalMs);
+        timer.unref?.();
+        return timer;
+    }
+
+    clear(): void {
+        this.entries.clear();
+        this.bytes = 0;
+    }
+
+    get size() {
+        return this.entries.size;
+    }
+
+    get byteSize() {
+        return this.bytes;
+    }
+}
@@ -5,8 +5,9 @@
  * so caching for 5 minutes is safe and eliminates a DB round-trip on every
  * pricing page load and registration form render.
  * 
- * Uses Next.js unstable_cache for persistent cross-request caching on the
- * same server instance, with the memory-cache as a fallback for hot paths.
+ * Goes through getCached, so hot instances answer from their in-process L1
+ * without a Redis round trip, and invalidating `plans:all` clears every
+ * instance.
  */
 import { unstable_cache } from 'next/cache';
 import { connectToDatabase } from '@/lib/db/mongodb';
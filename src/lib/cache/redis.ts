@@ -1,52 +1,13 @@
-import Redis from 'ioredis';
-
-// Check if Redis URL is configured
-const REDIS_URL = process.env.REDIS_URL || process.env.REDIS_HOST;
-
-let redis: Redis | null = null;
-
-// Only initialize Redis if URL is provided
-if (REDIS_URL) {
-  const redisOptions: any = {
-    retryStrategy: (times: number) => {
-      if (times > 3) {
-        console.warn('Redis connection failed after 3 retries, falling back to no-cache mode');
-        return null; // Stop retrying
-      }
-      const delay = Math.min(times * 50, 2000);
-      return delay;
-    },
-    enableReadyCheck: false,
-    enableOfflineQueue: false,
-    lazyConnect: true, // Don't connect immediately
-  };
-
-  // Add TLS config if using rediss:// protocol (Upstash)
-  if (REDIS_URL.startsWith('rediss://')) {
-    redisOptions.tls = {
-      rejectUnauthorized: false, // Required for Upstash
-    };
-  }
-
-  redis = new Redis(REDIS_URL, redisOptions);
-
-  // Handle errors gracefully
-  redis.on('error', (err) => {
-    console.warn('Redis connection error (falling back to no-cache):', err.message);
-  });
-
-  redis.on('connect', () => console.log('✓ Redis connected'));
-  redis.on('disconnect', () => console.log('Redis disconnected'));
-
-  // Try to connect, but don't crash if it fails
-  redis.connect().catch((err) => {
-    console.warn('Failed to connect to Redis, running without cache:', err.message);
-    redis = null;
-  });
-} else {
-  console.warn('⚠ REDIS_URL not set — caching disabled (in-memory fallback)');
-}
+/**
+ * Key/value helpers on top of the shared cache in `@/lib/cache`.
+ *
+ * `getOrSet`/`cachedQuery` go through the tiered `getCached` (in-process LRU
+ * in front of Redis), and deletes go through `invalidateCache`, so every
+ * instance drops its in-process copy too.
+ */
+import redis, { getCached, invalidateCache } from '@/lib/cache';
 
+export { getCacheStats } from '@/lib/cache';
 
 interface CacheOptions {
   ttl?: number; // Time to live in seconds
@@ -57,10 +18,9 @@ interface CacheOptions {
  * Get value from cache
  */
 export async function getCachedValue<T>(key: string): Promise<T | null> {
-  if (!redis) return null;
   try {
-    const value = await redis.get(key);
-    return value ? JSON.parse(value) : null;
+    const value = await redis.get<T | string>(key);
+    return typeof value === 'string' ? JSON.parse(value) : value ?? null;
   } catch (error) {
     console.error(`Error getting cache key ${key}:`, error);
     return null;
@@ -75,24 +35,10 @@ export async function setCachedValue<T>(
   value: T,
   options: CacheOptions = {}
 ): Promise<boolean> {
-  if (!redis) return false;
   try {
-    const serialized = JSON.stringify(value);
     const ttl = options.ttl || 3600; // Default 1 hour
-
-    if (ttl) {
-      await redis.setex(key, ttl, serialized);
-    } else {
-      await redis.set(key, serialized);
-    }
-
-    // Add tags for grouped invalidation
-    if (options.tags && options.tags.length > 0) {
-      for (const tag of options.tags) {
-        await redis.sadd(`tag:${tag}`, key);
-      }
-    }
-
+    await redis.set(key, JSON.stringify(value), { ex: ttl });
+    await tagKey(key, options.tags);
     return true;
   } catch (error) {
     console.error(`Error setting cache key ${key}:`, error);
@@ -104,9 +50,8 @@ export async function setCachedValue<T>(
  * Delete cache key
  */
 export async function deleteCachedValue(key: string): Promise<boolean> {
-  if (!redis) return false;
   try {
-    await redis.del(key);
+    await invalidateCache(key);
     return true;
   } catch (error) {
     console.error(`Error deleting cache key ${key}:`, error);
@@ -118,12 +63,11 @@ export async function deleteCachedValue(key: string): Promise<boolean> {
  * Invalidate all keys with specific tag
  */
 export async function invalidateByTag(tag: string): Promise<number> {
-  if (!redis) return 0;
   try {
     const keys = await redis.smembers(`tag:${tag}`);
     if (keys.length === 0) return 0;
 
-    await redis.del(...keys);
+    await invalidateCache(...keys);
     await redis.del(`tag:${tag}`);
     return keys.length;
   } catch (error) {
@@ -132,6 +76,15 @@ export async function invalidateByTag(tag: string): Promise<number> {
   }
 }
 
+/**
+ * Add a key to its tag sets for grouped invalidation
+ */
+async function tagKey(key: string, tags: string[] = []) {
+  for (const tag of tags) {
+    await redis.sadd(`tag:${tag}`, key);
+  }
+}
+
 /**
  * Get or set pattern - fetch from cache or compute
  */
@@ -140,19 +93,11 @@ export async function getOrSet<T>(
   fetcher: () => Promise<T>,
   options: CacheOptions = {}
 ): Promise<T> {
-  // Try cache first
-  const cached = await getCachedValue<T>(key);
-  if (cached !== null) {
-    return cached;
-  }
-
-  // Compute value
-  const value = await fetcher();
-
-  // Store in cache
-  await setCachedValue(key, value, options);
-
-  return value;
+  return getCached(key, options.ttl || 3600, async () => {
+    const value = await fetcher();
+    await tagKey(key, options.tags).catch((error) => console.error(`Error tagging cache key ${key}:`, error));
+    return value;
+  });
 }
 
 /**
@@ -185,11 +130,10 @@ export async function cachedQuery<T>(
  * Clear entire cache (use with caution)
  */
 export async function clearAllCache(): Promise<number> {
-  if (!redis) return 0;
   try {
     const keys = await redis.keys('*');
     if (keys.length === 0) return 0;
-    await redis.del(...keys);
+    await invalidateCache(...keys);
     return keys.length;
   } catch (error) {
     console.error('Error clearing cache:', error);
@@ -197,24 +141,6 @@ export async function clearAllCache(): Promise<number> {
   }
 }
 
-/**
- * Get cache stats
- */
-export async function getCacheStats() {
-  if (!redis) return null;
-  try {
-    const info = await redis.info('stats');
-    const keys = await redis.dbsize();
-    return {
-      keyCount: keys,
-      info,
-    };
-  } catch (error) {
-    console.error('Error getting cache stats:', error);
-    return null;
-  }
-}
-
 /**
  * Cache decorators for API responses
  */
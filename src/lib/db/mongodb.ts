@@ -1,10 +1,166 @@
 import mongoose from 'mongoose';
 import { mongoSecurityOptions } from '@/lib/security/database-security';
 
+/**
+ * Which kind of process is connecting. Pools are per process, so the right
+ * size depends on how many copies run and how much each does at once:
+ * - api: serverless route instances; many run side by side and share the
+ *   cluster's connection limit, so each keeps a small pool and lets it drain.
+ * - worker: one long-lived process running jobs concurrently (queue
+ *   dispatcher, BullMQ workers); a bigger, warm pool.
+ * - cron: standalone batch scripts running a few long sequential jobs
+ *   (`npm run search:build`). The scheduled /api/cron routes share the app's
+ *   processes and so its `api` pool.
+ */
+export type PoolRole = 'api' | 'worker' | 'cron';
+
+export interface PoolProfile {
+    maxPoolSize: number;
+    minPoolSize: number;
+    maxIdleTimeMS: number;
+    /** How long a query may wait for a free connection before failing. */
+    waitQueueTimeoutMS: number;
+}
+
+export const POOL_PROFILES: Record<PoolRole, PoolProfile> = {
+    api: { maxPoolSize: 10, minPoolSize: 0, maxIdleTimeMS: 60_000, waitQueueTimeoutMS: 10_000 },
+    worker: { maxPoolSize: 40, minPoolSize: 5, maxIdleTimeMS: 300_000, waitQueueTimeoutMS: 30_000 },
+    cron: { maxPoolSize: 5, minPoolSize: 0, maxIdleTimeMS: 30_000, waitQueueTimeoutMS: 60_000 },
+};
+
+/** Recent check-out waits kept for percentiles. */
+const WAIT_SAMPLES = 1024;
+
 let cached = (global as any).mongoose;
 
 if (!cached) {
-    cached = (global as any).mongoose = { conn: null, promise: null };
+    cached = (global as any).mongoose = { conn: null, promise: null, role: null, profile: null, monitor: null };
+}
+
+let role: PoolRole = POOL_PROFILES[process.env.MONGODB_POOL_ROLE as PoolRole]
+    ? (process.env.MONGODB_POOL_ROLE as PoolRole)
+    : 'api';
+
+/**
+ * Set this process's pool role. Call it at startup, before the first
+ * connectToDatabase(); the API routes need not call it (they default to
+ * `api`, or MONGODB_POOL_ROLE).
+ */
+export function setPoolRole(next: PoolRole) {
+    if (cached.promise && next !== cached.role) {
+        console.warn(`[MongoDB] Pool role ${next} requested after connecting as ${cached.role}; ignored`);
+        return;
+    }
+    role = next;
+}
+
+/** The role's profile with MONGODB_MAX_POOL_SIZE / _MIN_POOL_SIZE / _WAIT_QUEUE_TIMEOUT_MS applied. */
+export function resolvePoolProfile(forRole: PoolRole = role): PoolProfile {
+    const profile = { ...POOL_PROFILES[forRole] };
+    const overrides: [keyof PoolProfile, string | undefined][] = [
+        ['maxPoolSize', process.env.MONGODB_MAX_POOL_SIZE],
+        ['minPoolSize', process.env.MONGODB_MIN_POOL_SIZE],
+        ['waitQueueTimeoutMS', process.env.MONGODB_WAIT_QUEUE_TIMEOUT_MS],
+    ];
+    for (const [key, value] of overrides) {
+        const parsed = parseInt(value || '', 10);
+        if (!Number.isNaN(parsed) && parsed >= 0) profile[key] = parsed;
+    }
+    profile.minPoolSize = Math.min(profile.minPoolSize, profile.maxPoolSize);
+    return profile;
+}
+
+// Kept on the global with the connection so dev hot reloads keep counting.
+const monitor = cached.monitor ??= {
+    pool: {
+        checkedOut: 0,
+        waitQueue: 0,
+        maxWaitQueue: 0,
+        checkOuts: 0,
+        checkOutFailures: 0,
+        connectionsCreated: 0,
+        connectionsClosed: 0,
+        cleared: 0,
+        waitMs: 0,
+        maxWaitMs: 0,
+    },
+    /** Start times of pending check-outs, per server (`host:port`). */
+    waitStarts: new Map<string, number[]>(),
+    waitSamples: [] as number[],
+    nextSample: 0,
+};
+const { pool, waitStarts, waitSamples } = monitor;
+
+function pendingWaits() {
+    let waiting = 0;
+    for (const starts of waitStarts.values()) waiting += starts.length;
+    return waiting;
+}
+
+function endWait(address: string, failed: boolean) {
+    const started = waitStarts.get(address)?.shift();
+    pool.waitQueue = pendingWaits();
+    if (started === undefined) return;
+    if (failed) {
+        pool.checkOutFailures++;
+        return;
+    }
+    const elapsed = Date.now() - started;
+    pool.checkOuts++;
+    pool.waitMs += elapsed;
+    pool.maxWaitMs = Math.max(pool.maxWaitMs, elapsed);
+    waitSamples[monitor.nextSample] = elapsed;
+    monitor.nextSample = (monitor.nextSample + 1) % WAIT_SAMPLES;
+}
+
+/**
+ * Count check-outs from the driver's connection pool events. Each server
+ * has its own pool, which serves waiters first come first served, so a
+ * check-out (or failure) ends the oldest pending wait for that server.
+ * Attached before the client connects, so the first check-outs count too.
+ */
+function monitorPool(client: any) {
+    client.on('connectionCheckOutStarted', (event: any) => {
+        const starts = waitStarts.get(event.address) ?? [];
+        starts.push(Date.now());
+        waitStarts.set(event.address, starts);
+        pool.waitQueue = pendingWaits();
+        pool.maxWaitQueue = Math.max(pool.maxWaitQueue, pool.waitQueue);
+    });
+    client.on('connectionCheckedOut', (event: any) => {
+        pool.checkedOut++;
+        endWait(event.address, false);
+    });
+    client.on('connectionCheckOutFailed', (event: any) => endWait(event.address, true));
+    client.on('connectionCheckedIn', () => { pool.checkedOut = Math.max(pool.checkedOut - 1, 0); });
+    client.on('connectionCreated', () => { pool.connectionsCreated++; });
+    client.on('connectionClosed', () => { pool.connectionsClosed++; });
+    client.on('connectionPoolCleared', () => { pool.cleared++; });
+}
+
+function percentile(sorted: number[], pct: number) {
+    if (sorted.length === 0) return 0;
+    return sorted[Math.min(sorted.length - 1, Math.ceil((pct / 100) * sorted.length) - 1)];
+}
+
+/**
+ * Live pool counters for this process: connections in use, queries waiting
+ * for one, and how long check-outs waited (cumulative average and max, plus
+ * percentiles over the last 1024 check-outs).
+ */
+export function getPoolStats() {
+    const recent = waitSamples.slice().sort((a, b) => a - b);
+    return {
+        role: cached.role ?? role,
+        ...(cached.profile ?? resolvePoolProfile()),
+        connected: mongoose.connection.readyState === 1,
+        ...pool,
+        openConnections: pool.connectionsCreated - pool.connectionsClosed,
+        avgWaitMs: pool.checkOuts ? Number((pool.waitMs / pool.checkOuts).toFixed(2)) : 0,
+        p50WaitMs: percentile(recent, 50),
+        p95WaitMs: percentile(recent, 95),
+        p99WaitMs: percentile(recent, 99),
+    };
 }
 
 export async function connectToDatabase() {
@@ -18,29 +174,35 @@ export async function connectToDatabase() {
         return cached.conn;
     }
 
+    // Already connected by someone calling mongoose.connect() directly (scripts).
+    if (!cached.promise && mongoose.connection.readyState === 1) {
+        cached.conn = mongoose;
+        return cached.conn;
+    }
+
     if (!cached.promise) {
+        const profile = resolvePoolProfile();
         const opts = {
             ...mongoSecurityOptions,
-            bufferCommands: false,
-            maxPoolSize: 10,
+            ...profile,
         };
 
-        cached.promise = mongoose.connect(MONGODB_URI!, opts).then((mongoose) => {
-            console.log('✅ MongoDB connected successfully (singleton)');
+        cached.role = role;
+        cached.profile = profile;
+        // Build the driver client here so the pool listeners are attached
+        // before it opens any connection, then hand it to mongoose.
+        const client = new mongoose.mongo.MongoClient(MONGODB_URI!, opts);
+        monitorPool(client);
+        cached.promise = client.connect().then(() => {
+            mongoose.connection.set('bufferCommands', false);
+            mongoose.connection.setClient(client);
+            console.log(`✅ MongoDB connected successfully (singleton, ${role} pool: max ${profile.maxPoolSize}, min ${profile.minPoolSize})`);
             return mongoose;
         });
     }
 
     try {
-        // SCALABILITY: Check active connections before proceeding
-        const connectionCount = mongoose.connection.readyState;
-        if (connectionCount === 1) return cached.conn;
-
         cached.conn = await cached.promise;
-        
-        // Log connection pool info
-        const poolSize = (mongoose.connection as any).client?.topology?.s?.options?.maxPoolSize || 'unknown';
-        console.log(`[MongoDB] Using connection pool (size: ${poolSize})`);
     } catch (e) {
         cached.promise = null;
         throw e;
@@ -0,0 +1,99 @@
+import mongoose from 'mongoose';
+
+/**
+ * Keyset ("cursor") pagination for newest-first lists.
+ *
+ * Rows are ordered by (createdAt, _id) descending and every page returns an
+ * opaque cursor naming its last row. The next page asks for rows before that
+ * one, which an index ending in `createdAt: -1, _id: -1` answers with a seek
+ * rather than by skipping everything in front, so page 5000 costs the same as
+ * page 1. Rows inserted while a client pages through sort ahead of its
+ * cursor, so they never shift later pages or repeat rows.
+ */
+
+export const KEYSET_SORT = { createdAt: -1, _id: -1 } as const;
+const DEFAULT_MAX_LIMIT = 100;
+
+export class InvalidCursorError extends Error {
+    constructor() {
+        super('Invalid cursor');
+        this.name = 'InvalidCursorError';
+    }
+}
+
+/** Opaque cursor for a list of sort-key values ending in an _id. */
+export const encodeCursor = (values: unknown[]) => Buffer.from(JSON.stringify(values)).toString('base64url');
+
+export function decodeCursor(cursor: string): any[] {
+    try {
+        const values = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+        if (Array.isArray(values) && mongoose.isValidObjectId(values[values.length - 1])) return values;
+    } catch {
+        // fall through
+    }
+    throw new InvalidCursorError();
+}
+
+export interface KeysetParams {
+    limit: number;
+    /** Legacy `?page=`; only used (by skipping) when no cursor is given. */
+    page: number;
+    skip: number;
+    cursor: string | null;
+    after: { createdAt: Date; _id: mongoose.Types.ObjectId } | null;
+}
+
+/**
+ * Read `limit`, `cursor` and the legacy `page` from a request's query string.
+ * Throws InvalidCursorError for a cursor this module did not produce.
+ */
+export function parseKeysetParams(
+    searchParams: URLSearchParams,
+    options: { limit?: number; maxLimit?: number } = {}
+): KeysetParams {
+    const requested = parseInt(searchParams.get('limit') || '', 10);
+    const limit = Math.min(
+        Math.max(Number.isNaN(requested) ? options.limit ?? 20 : requested, 1),
+        options.maxLimit ?? DEFAULT_MAX_LIMIT
+    );
+    const cursor = searchParams.get('cursor') || null;
+    const page = Math.max(parseInt(searchParams.get('page') || '1', 10) || 1, 1);
+
+    let after: KeysetParams['after'] = null;
+    if (cursor) {
+        const [createdAt, id] = decodeCursor(cursor);
+        const date = new Date(createdAt);
+        if (typeof createdAt !== 'string' || Number.isNaN(date.getTime())) throw new InvalidCursorError();
+        after = { createdAt: date, _id: new mongoose.Types.ObjectId(id) };
+    }
+    return { limit, page, skip: cursor ? 0 : (page - 1) * limit, cursor, after };
+}
+
+/**
+ * `filter` narrowed to rows after the cursor. The `createdAt` bound lets the
+ * index seek straight to the cursor; the `$or` only settles ties on createdAt.
+ */
+export function keysetFilter(filter: Record<string, any>, after: KeysetParams['after']): Record<string, any> {
+    if (!after) return filter;
+    return {
+        $and: [
+            filter,
+            { createdAt: { $lte: after.createdAt } },
+            { $or: [{ createdAt: { $lt: after.createdAt } }, { _id: { $lt: after._id } }] },
+        ],
+    };
+}
+
+/**
+ * Split rows fetched with `.limit(limit + 1)` into the page and the cursor
+ * for the next one (null on the last page).
+ */
+export function keysetPage<T extends { _id: any; createdAt?: any }>(rows: T[], limit: number) {
+    const items = rows.slice(0, limit);
+    const last = items[items.length - 1];
+    const hasMore = rows.length > limit;
+    const nextCursor = hasMore && last
+        ? encodeCursor([new Date(last.createdAt).toISOString(), String(last._id)])
+        : null;
+    return { items, hasMore, nextCursor };
+}
@@ -1,13 +1,39 @@
 import { connectToDatabase } from './db/mongodb';
 import { User } from './models/User';
 import Product from './models/Product';
+import Plan from './models/Plan';
+import { Subscription } from './models/Subscription';
+import { DM_ENTITLEMENT_LIMITS, invalidateEntitlements } from './cache/entitlements';
 // import { emailQueue } from './queues/email'; // Assume exists or will be added
 
+/**
+ * Drop the cached DM entitlements of the plan's subscribers when a limit the
+ * entitlement is built from changes, so the queue applies it on their next
+ * job instead of after the cache TTL. Other limits leave entitlements alone.
+ *
+ * Subscribers are found the way entitlements resolve plans, through active
+ * subscriptions to the plan document: `User.subscriptionTier` holds a tier
+ * name, not the plan id. Creators without a subscription fall back to the
+ * free plan and pick up its changes when their entry expires.
+ */
+async function refreshEntitlements(planId: string, feature: string) {
+    if (!DM_ENTITLEMENT_LIMITS.has(feature)) return;
+    await connectToDatabase();
+    const plan = await Plan.findOne({ id: planId }).select('_id').lean() as any;
+    if (!plan) return;
+    const userIds = await Subscription.distinct('userId', {
+        planId: plan._id,
+        status: { $in: ['active', 'trialing'] }
+    });
+    await invalidateEntitlements(...userIds.map(String));
+}
+
 export async function enforceDecreasedLimit(
     planId: string,
     feature: string,
     newLimit: number
 ) {
+    await refreshEntitlements(planId, feature);
     if (feature !== 'products') return;
     // Extend for other features as needed
 
@@ -56,6 +82,7 @@ export async function restoreAfterLimitIncrease(
     planId: string,
     feature: string
 ) {
+    await refreshEntitlements(planId, feature);
     if (feature !== 'products') return;
 
     await connectToDatabase();
@@ -0,0 +1,32 @@
+import mongoose, { Schema, Document, Model } from 'mongoose';
+
+/**
+ * Pre-aggregated AnalyticsEvent counts per creator and UTC hour/day.
+ * Written by src/lib/analytics/rollups.ts; read by the dashboard summary.
+ */
+export interface IAnalyticsRollup extends Document {
+    creatorId: mongoose.Types.ObjectId;
+    granularity: 'hour' | 'day';
+    bucket: Date; // UTC start of the hour/day
+    counts: Record<string, number>; // eventType -> events
+    visitors: Record<string, number>; // sparse HyperLogLog registers of visitor IPs
+    expiresAt?: Date; // hourly rollups only
+    updatedAt: Date;
+}
+
+const AnalyticsRollupSchema: Schema = new Schema({
+    creatorId: { type: Schema.Types.ObjectId, ref: 'User', required: true },
+    granularity: { type: String, enum: ['hour', 'day'], required: true },
+    bucket: { type: Date, required: true },
+    counts: { type: Schema.Types.Mixed, default: {} },
+    visitors: { type: Schema.Types.Mixed, default: {} },
+    expiresAt: { type: Date }
+}, { timestamps: true, minimize: false });
+
+AnalyticsRollupSchema.index({ creatorId: 1, granularity: 1, bucket: 1 }, { unique: true });
+// Hourly rollups are only needed for the edges of recent periods; daily ones are kept.
+AnalyticsRollupSchema.index({ expiresAt: 1 }, { expireAfterSeconds: 0 });
+
+const AnalyticsRollup: Model<IAnalyticsRollup> = mongoose.models.AnalyticsRollup || mongoose.model<IAnalyticsRollup>('AnalyticsRollup', AnalyticsRollupSchema);
+export { AnalyticsRollup };
+export default AnalyticsRollup;
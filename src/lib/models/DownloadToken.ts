@@ -4,6 +4,7 @@ export interface IDownloadToken extends Document {
     token: string;
     orderId: mongoose.Types.ObjectId;
     productId: mongoose.Types.ObjectId;
+    fileKey?: string; // copied from the product so redemption needs no product lookup
     userId?: mongoose.Types.ObjectId;
     downloadCount: number; // renamed from usageCount
     maxDownloads: number; // renamed from maxUsage
@@ -32,6 +33,7 @@ const DownloadTokenSchema: Schema = new Schema({
         ref: 'Product',
         required: true
     },
+    fileKey: String,
     userId: {
         type: Schema.Types.ObjectId,
         ref: 'User'
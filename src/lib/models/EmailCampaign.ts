@@ -19,6 +19,24 @@ export interface IEmailCampaign extends Document {
     };
     listId?: mongoose.Types.ObjectId;
     targetAudience?: string;
+    // Fan-out progress, checkpointed per chunk so retries resume mid-list
+    delivery?: {
+        totalRecipients: number;
+        chunkSize: number;
+        chunksTotal: number;
+        chunksCompleted: number;
+        failed: number;
+        startedAt?: Date;
+        chunks: {
+            index: number;
+            start: number;
+            end: number;
+            cursor: number;
+            sent: number;
+            failed: number;
+            status: 'pending' | 'done';
+        }[];
+    };
     createdAt: Date;
     updatedAt: Date;
 }
@@ -44,7 +62,25 @@ const EmailCampaignSchema: Schema = new Schema({
         bounced: { type: Number, default: 0 },
         unsubscribed: { type: Number, default: 0 }
     },
-    listId: { type: Schema.Types.ObjectId, ref: 'EmailList' }
+    listId: { type: Schema.Types.ObjectId, ref: 'EmailList' },
+    delivery: {
+        totalRecipients: { type: Number },
+        chunkSize: { type: Number },
+        chunksTotal: { type: Number },
+        chunksCompleted: { type: Number, default: 0 },
+        failed: { type: Number, default: 0 },
+        startedAt: { type: Date },
+        chunks: [{
+            _id: false,
+            index: { type: Number, required: true },
+            start: { type: Number, required: true },
+            end: { type: Number, required: true },
+            cursor: { type: Number, required: true },
+            sent: { type: Number, default: 0 },
+            failed: { type: Number, default: 0 },
+            status: { type: String, enum: ['pending', 'done'], default: 'pending' }
+        }]
+    }
 }, { timestamps: true });
 
 EmailCampaignSchema.index({ creatorId: 1, status: 1 });
@@ -0,0 +1,22 @@
+import mongoose, { Schema, Document, Model } from 'mongoose';
+
+/**
+ * Resume point for incremental background jobs (analytics rollups, metric
+ * aggregation): everything before `cursor` has been processed.
+ */
+export interface IJobCheckpoint extends Document {
+    name: string;
+    cursor: Date;
+    stats?: Record<string, any>;
+    updatedAt: Date;
+}
+
+const JobCheckpointSchema: Schema = new Schema({
+    name: { type: String, required: true, unique: true },
+    cursor: { type: Date, required: true },
+    stats: { type: Schema.Types.Mixed }
+}, { timestamps: true });
+
+const JobCheckpoint: Model<IJobCheckpoint> = mongoose.models.JobCheckpoint || mongoose.model<IJobCheckpoint>('JobCheckpoint', JobCheckpointSchema);
+export { JobCheckpoint };
+export default JobCheckpoint;
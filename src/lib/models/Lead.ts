@@ -102,7 +102,8 @@ const LeadSchema = new Schema<ILead>({
 
 // Indexes
 LeadSchema.index({ email: 1, createdAt: -1 });
-LeadSchema.index({ creatorId: 1, createdAt: -1 });
+LeadSchema.index({ creatorId: 1, createdAt: -1, _id: -1 }); // keyset pages
+LeadSchema.index({ createdAt: -1, _id: -1 }); // admin list
 LeadSchema.index({ dmStatus: 1 });
 LeadSchema.index({ creatorId: 1, dmStatus: 1 });
 LeadSchema.index({ creatorId: 1, email: 1 });
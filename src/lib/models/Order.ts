@@ -206,9 +206,14 @@ const OrderSchema: Schema = new Schema({
 
 
 // Indexes for performance
-OrderSchema.index({ creatorId: 1, createdAt: -1 });
-OrderSchema.index({ creatorId: 1, status: 1, createdAt: -1 });
+// Keyset pages (src/lib/db/pagination.ts) seek on (createdAt, _id) within each filter
+OrderSchema.index({ creatorId: 1, createdAt: -1, _id: -1 });
+OrderSchema.index({ creatorId: 1, status: 1, createdAt: -1, _id: -1 });
+OrderSchema.index({ createdAt: -1, _id: -1 }); // admin list
 OrderSchema.index({ creatorId: 1, isPublished: 1 }); // Generic
+// Dashboard summary: revenue/sales are summed straight from the index, free orders counted from it
+OrderSchema.index({ creatorId: 1, paymentStatus: 1, createdAt: -1, total: 1 });
+OrderSchema.index({ creatorId: 1, amount: 1, createdAt: -1 });
 OrderSchema.index({ customerEmail: 1, createdAt: -1 });
 OrderSchema.index({ "items.productId": 1 });
 OrderSchema.index({ razorpayOrderId: 1 }, { unique: true, sparse: true });
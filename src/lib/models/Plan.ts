@@ -20,6 +20,7 @@ export interface IPlan extends Document {
         emailSubscribers: number;
         emailCampaigns: number;
         autoDMAutomations: number;
+        maxAutoDms: number;
         scheduledPosts: number;
         aiGenerations: number;
         analyticsRetentionDays: number;
@@ -119,6 +120,7 @@ const PlanSchema = new mongoose.Schema({
         emailSubscribers: { type: Number, default: 100 },
         emailCampaigns: { type: Number, default: 2 },
         autoDMAutomations: { type: Number, default: 0 },
+        maxAutoDms: { type: Number, default: -1 }, // successful Auto DMs per calendar month
         scheduledPosts: { type: Number, default: 5 },
         aiGenerations: { type: Number, default: 10 },
         analyticsRetentionDays: { type: Number, default: 7 },
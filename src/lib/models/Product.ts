@@ -1,4 +1,5 @@
 import mongoose, { Schema, Document, Model } from 'mongoose';
+import { reindexOnDelete, scheduleReindex } from '@/lib/search/indexer';
 
 export interface IProduct extends Document {
     creatorId: mongoose.Types.ObjectId;
@@ -371,6 +372,39 @@ ProductSchema.pre('save', async function () {
     }
 });
 
+// Keep the search index current; the search-index cron picks up bulk updates.
+ProductSchema.post('save', function (doc: any) { scheduleReindex('product', doc._id); });
+ProductSchema.post(['findOneAndUpdate', 'findOneAndDelete'], function (doc: any) { if (doc) scheduleReindex('product', doc._id); });
+ProductSchema.post('updateOne', function (this: any) { scheduleReindex('product', this.getFilter?.()._id); });
+reindexOnDelete(ProductSchema, 'product');
+
+// Download tokens carry the product's file key; a replaced file clears it so
+// the next redemption looks up (and stores) the new one.
+const FILE_FIELDS = ['files', 'digitalFileUrl', 'previewFileKey'];
+const clearTokenFileKeys = (productId: unknown) => {
+    if (!productId) return;
+    import('@/lib/models/DownloadToken')
+        .then(({ DownloadToken }) => DownloadToken.updateMany({ productId, fileKey: { $exists: true } }, { $unset: { fileKey: 1 } }))
+        .catch(error => console.error('[Product] Clearing download token file keys failed:', error.message));
+};
+ProductSchema.pre('save', function () {
+    this.$locals.filesChanged = !this.isNew && FILE_FIELDS.some(field => this.isModified(field));
+});
+ProductSchema.post('save', function (doc: any) { if (doc.$locals?.filesChanged) clearTokenFileKeys(doc._id); });
+const touchesFiles = (update: any = {}) =>
+    Object.keys({ ...update, ...update.$set, ...update.$unset, ...update.$push, ...update.$pull })
+        .some(path => FILE_FIELDS.includes(path.split('.')[0]));
+ProductSchema.post('findOneAndUpdate', function (this: any, doc: any) {
+    if (doc && touchesFiles(this.getUpdate?.())) clearTokenFileKeys(doc._id);
+});
+// updateOne/updateMany only see the filter afterwards, so read the ids first.
+ProductSchema.pre(['updateOne', 'updateMany'], { document: false, query: true }, async function (this: any) {
+    if (touchesFiles(this.getUpdate?.())) this._fileProductIds = await this.model.distinct('_id', this.getFilter());
+});
+ProductSchema.post(['updateOne', 'updateMany'], { document: false, query: true }, function (this: any) {
+    if (this._fileProductIds?.length) clearTokenFileKeys({ $in: this._fileProductIds });
+});
+
 // Backward compatibility virtuals
 ProductSchema.virtual('name').get(function (this: any) { return this.title; }).set(function (this: any, v: string) { this.title = v; });
 ProductSchema.virtual('price').get(function (this: any) { return this.pricing?.basePrice; });
@@ -378,7 +412,8 @@ ProductSchema.virtual('currency').get(function (this: any) { return this.pricing
 
 // Compound indexes for storefront and management
 ProductSchema.index({ creatorId: 1, isActive: 1, sortOrder: 1 });
-ProductSchema.index({ creatorId: 1, createdAt: -1 });
+ProductSchema.index({ creatorId: 1, createdAt: -1, _id: -1 }); // keyset pages
+ProductSchema.index({ createdAt: -1, _id: -1 }); // admin list
 ProductSchema.index({ creatorId: 1, isPublished: 1 });
 
 // Indexes
@@ -392,6 +427,7 @@ ProductSchema.index({ 'sections.lessons.fileKey': 1 }); // Index for lesson file
 ProductSchema.index({ bundledProductIds: 1 });
 ProductSchema.index({ totalSales: -1 });
 ProductSchema.index({ totalRevenue: -1 });
+ProductSchema.index({ updatedAt: 1, _id: 1 }); // search index sync
 
 const Product: Model<IProduct> = mongoose.models.Product || mongoose.model<IProduct>('Product', ProductSchema);
 export { Product };
@@ -1,7 +1,7 @@
 import mongoose, { Schema, Document, Model } from 'mongoose';
 
 export interface IQueueJob extends Document {
-    type: 'dm_delivery' | 'email_sequence_step' | 'email_broadcast' | 'booking_cleanup' | 'one_off_email';
+    type: 'dm_delivery' | 'dm_carousel_step' | 'email_sequence_step' | 'email_broadcast' | 'email_broadcast_chunk' | 'booking_cleanup' | 'one_off_email';
 
     payload: {
         // DM Payload
@@ -16,6 +16,7 @@ export interface IQueueJob extends Document {
         // Email Broadcast Payload (BUG-27)
         campaignId?: string;
         unsubscribeBaseUrl?: string;
+        chunkIndex?: number;
 
         // Email Sequence Payload
         sequenceId?: string;
@@ -30,6 +31,8 @@ export interface IQueueJob extends Document {
         // Automation Delivery Fields
         messageType?: string;
         carouselMessages?: any[];
+        carouselIndex?: number; // dm_carousel_step: next message to send
+        creatorUsername?: string;
         attachmentType?: string;
         attachmentId?: string;
         phoneNumberId?: string;
@@ -45,7 +48,7 @@ export interface IQueueJob extends Document {
 }
 
 const QueueJobSchema: Schema = new Schema({
-    type: { type: String, required: true, enum: ['dm_delivery', 'email_sequence_step', 'email_broadcast', 'booking_cleanup', 'one_off_email'] },
+    type: { type: String, required: true, enum: ['dm_delivery', 'dm_carousel_step', 'email_sequence_step', 'email_broadcast', 'email_broadcast_chunk', 'booking_cleanup', 'one_off_email'] },
 
     payload: { type: Schema.Types.Mixed, required: true },
     status: {
@@ -0,0 +1,56 @@
+import mongoose, { Schema, Document, Model } from 'mongoose';
+
+/**
+ * Denormalized search entry for a product or creator: the inverted-index
+ * terms plus the fields needed to filter, facet, sort and render a hit.
+ * Maintained by src/lib/search/indexer.ts; queried by src/lib/search/engine.ts.
+ */
+export interface ISearchDocument extends Document {
+    kind: 'product' | 'creator';
+    refId: mongoose.Types.ObjectId;
+    creatorId?: mongoose.Types.ObjectId;
+    visible: boolean;
+    terms: string[]; // t:word (title), p:prefix, b:word (body), f:deletion (typo keys)
+    title: string;
+    subtitle?: string;
+    slug?: string;
+    image?: string;
+    category?: string;
+    productType?: string;
+    price?: number; // same unit as Product.pricing.basePrice
+    currency?: string;
+    rating?: number;
+    rank: number; // static popularity; ties are broken by it
+    sourceCreatedAt?: Date;
+    indexedAt: Date;
+}
+
+const SearchDocumentSchema: Schema = new Schema({
+    kind: { type: String, enum: ['product', 'creator'], required: true },
+    refId: { type: Schema.Types.ObjectId, required: true },
+    creatorId: { type: Schema.Types.ObjectId, ref: 'User' },
+    visible: { type: Boolean, default: true },
+    terms: { type: [String], default: [] },
+    title: { type: String, default: '' },
+    subtitle: String,
+    slug: String,
+    image: String,
+    category: String,
+    productType: String,
+    price: Number,
+    currency: String,
+    rating: Number,
+    rank: { type: Number, default: 0 },
+    sourceCreatedAt: Date,
+    indexedAt: { type: Date, required: true }
+}, { versionKey: false });
+
+SearchDocumentSchema.index({ kind: 1, refId: 1 }, { unique: true });
+// Term lookup already in rank order, so the top candidates come straight off the index.
+SearchDocumentSchema.index({ kind: 1, visible: 1, terms: 1, rank: -1, _id: 1 });
+// Full rebuilds remove entries they did not touch.
+SearchDocumentSchema.index({ kind: 1, indexedAt: 1 });
+
+const SearchDocument: Model<ISearchDocument> = mongoose.models.SearchDocument || mongoose.model<ISearchDocument>('SearchDocument', SearchDocumentSchema);
+export { SearchDocument };
+export default SearchDocument;
@@ -35,6 +35,8 @@ const SubscriberSchema: Schema = new Schema({
 
 // Unique subscriber per creator
 SubscriberSchema.index({ email: 1, creatorId: 1 }, { unique: true });
+// Newest-first lists and streaming exports
+SubscriberSchema.index({ creatorId: 1, createdAt: -1, _id: -1 });
 
 const Subscriber: Model<ISubscriber> = mongoose.models.Subscriber || mongoose.model<ISubscriber>('Subscriber', SubscriberSchema);
 
@@ -119,6 +119,17 @@ SubscriptionSchema.pre('validate', function (this: any, next: any) {
     next();
 });
 
+// Plan changes reach the DM queue's cached entitlements right away.
+const refreshEntitlements = (userId: unknown) => {
+    if (!userId) return;
+    import('@/lib/cache/entitlements')
+        .then(({ invalidateEntitlements }) => invalidateEntitlements(String(userId)))
+        .catch(error => console.error('[Subscription] Entitlement invalidation failed:', error.message));
+};
+SubscriptionSchema.post('save', function (doc: any) { refreshEntitlements(doc.userId); });
+SubscriptionSchema.post(['findOneAndUpdate', 'findOneAndDelete'], function (doc: any) { if (doc) refreshEntitlements(doc.userId); });
+SubscriptionSchema.post(['updateOne', 'deleteOne'], function (this: any) { refreshEntitlements(this.getFilter?.().userId); });
+
 // ─── Performance indexes ──────────────────────────────────────────────────────
 // Fast lookup by userId+status for billing dashboard
 SubscriptionSchema.index({ userId: 1, status: 1 });
@@ -1,4 +1,5 @@
 import mongoose, { Schema, Document, Model } from 'mongoose';
+import { reindexOnDelete, scheduleReindex } from '@/lib/search/indexer';
 
 export interface IUser extends Document {
     clerkId?: string; // Clerk User ID
@@ -517,6 +518,21 @@ const UserSchema: Schema = new Schema({
 
 
 
+// Keep creator search entries current when their searchable fields change.
+const SEARCH_FIELDS = ['username', 'displayName', 'bio', 'avatar', 'role', 'status', 'isSuspended'];
+UserSchema.pre('save', function () {
+    this.$locals.searchDirty = this.isNew || SEARCH_FIELDS.some(field => this.isModified(field));
+});
+UserSchema.post('save', function (doc: any) {
+    if (doc.$locals?.searchDirty) scheduleReindex('creator', doc._id);
+});
+const touchesSearchFields = (update: any) =>
+    !update || Object.keys({ ...update, ...update.$set, ...update.$unset }).some(path => SEARCH_FIELDS.includes(path));
+UserSchema.post(['findOneAndUpdate', 'findOneAndDelete'], function (this: any, doc: any) {
+    if (doc && touchesSearchFields(this.getUpdate?.())) scheduleReindex('creator', doc._id);
+});
+reindexOnDelete(UserSchema, 'creator');
+
 // Generic performance indexes
 UserSchema.index({ creatorId: 1, createdAt: -1 });
 UserSchema.index({ creatorId: 1, isPublished: 1 }); // Mapping for potential isPublished usage
@@ -525,6 +541,8 @@ UserSchema.index({ creatorId: 1, isPublished: 1 }); // Mapping for potential isP
 UserSchema.index({ role: 1, isSuspended: 1 });
 UserSchema.index({ adminApprovedAt: 1 });
 UserSchema.index({ lastLogin: -1 });
+UserSchema.index({ createdAt: -1, _id: -1 }); // admin list keyset pages
+UserSchema.index({ updatedAt: 1, _id: 1 }); // search index sync
 
 // ─── Performance indexes ──────────────────────────────────────────────────────
 // Fast Clerk session → MongoDB user lookup (every authenticated API call)
@@ -7,10 +7,20 @@ if (!process.env.RAZORPAY_KEY_ID || !process.env.RAZORPAY_KEY_SECRET) {
     console.warn('Razorpay credentials missing in environment variables');
 }
 
-export const razorpay = new Razorpay({
+// The SDK has no host option; RAZORPAY_API_BASE_URL points it at a local
+// stand-in (testsprite_tests/harness/standin.py) for hermetic perf runs.
+const withApiBaseUrl = (instance: Razorpay): Razorpay => {
+    const baseURL = process.env.RAZORPAY_API_BASE_URL;
+    if (baseURL) {
+        (instance as any).api.rq.defaults.baseURL = baseURL;
+    }
+    return instance;
+};
+
+export const razorpay = withApiBaseUrl(new Razorpay({
     key_id: process.env.RAZORPAY_KEY_ID || 'dummy_key_id_for_build',
     key_secret: process.env.RAZORPAY_KEY_SECRET || 'dummy_secret_for_build',
-});
+}));
 
 /**
  * Returns a Razorpay instance. If credentials are provided, it returns a custom instance (for P2P).
@@ -18,10 +28,10 @@ export const razorpay = new Razorpay({
  */
 export const getRazorpayInstance = (credentials?: { keyId: string; keySecret: string }) => {
     if (credentials?.keyId && credentials?.keySecret) {
-        return new Razorpay({
+        return withApiBaseUrl(new Razorpay({
             key_id: credentials.keyId,
             key_secret: credentials.keySecret,
-        });
+        }));
     }
     return razorpay;
 };
@@ -0,0 +1,196 @@
+import { QueueJob, IQueueJob } from '@/lib/models/QueueJob';
+
+/** Recipients per `email_broadcast_chunk` job. */
+export const BROADCAST_CHUNK_SIZE = Number(process.env.BROADCAST_CHUNK_SIZE || 500);
+
+/** Resend calls in flight per chunk job. */
+export const BROADCAST_SEND_CONCURRENCY = Number(process.env.BROADCAST_SEND_CONCURRENCY || 10);
+
+/** Write the chunk's cursor back to the campaign after this many finished sends. */
+const CHECKPOINT_EVERY = 50;
+
+/**
+ * Fan a broadcast out into `email_broadcast_chunk` jobs.
+ *
+ * The chunk layout is written to `campaign.delivery` once; a retried (or
+ * re-queued) broadcast job only enqueues the chunks that are neither done
+ * nor already queued, so recipients are never split twice.
+ */
+export async function planBroadcast(job: IQueueJob) {
+    const { campaignId, creatorId, unsubscribeBaseUrl } = job.payload;
+    const { default: EmailCampaign } = await import('@/lib/models/EmailCampaign');
+
+    const campaign = await EmailCampaign.findById(campaignId, {
+        status: 1,
+        delivery: 1,
+        recipientCount: { $size: { $ifNull: ['$recipients', []] } },
+    }).lean<any>();
+    if (!campaign) throw new Error('Campaign not found');
+    if (campaign.status === 'sent') return;
+
+    let delivery = campaign.delivery;
+    if (!delivery?.chunksTotal) {
+        const total: number = campaign.recipientCount;
+        const chunks = [];
+        for (let start = 0, index = 0; start < total; start += BROADCAST_CHUNK_SIZE, index++) {
+            const end = Math.min(start + BROADCAST_CHUNK_SIZE, total);
+            chunks.push({ index, start, end, cursor: start, sent: 0, failed: 0, status: 'pending' });
+        }
+        delivery = {
+            totalRecipients: total,
+            chunkSize: BROADCAST_CHUNK_SIZE,
+            chunksTotal: chunks.length,
+            chunksCompleted: 0,
+            failed: 0,
+            startedAt: new Date(),
+            chunks,
+        };
+        // Only the first planner wins; a concurrent one re-reads its layout.
+        const planned = await EmailCampaign.findOneAndUpdate(
+            { _id: campaignId, 'delivery.chunksTotal': { $exists: false } },
+            { $set: { delivery } },
+            { new: true, projection: { delivery: 1 } }
+        ).lean<any>();
+        delivery = planned?.delivery ?? (await EmailCampaign.findById(campaignId, { delivery: 1 }).lean<any>())?.delivery;
+    }
+
+    if (!delivery?.chunksTotal) {
+        await markCampaignSent(campaignId);
+        return;
+    }
+
+    const queued = new Set<number>(await QueueJob.distinct('payload.chunkIndex', {
+        type: 'email_broadcast_chunk',
+        'payload.campaignId': campaignId,
+        status: { $in: ['pending', 'processing'] },
+    }));
+    const now = new Date();
+    const jobs = delivery.chunks
+        .filter((chunk: any) => chunk.status !== 'done' && !queued.has(chunk.index))
+        .map((chunk: any) => ({
+            type: 'email_broadcast_chunk',
+            payload: { campaignId, creatorId, unsubscribeBaseUrl, chunkIndex: chunk.index },
+            status: 'pending',
+            nextRunAt: now,
+        }));
+    if (jobs.length) await QueueJob.insertMany(jobs, { ordered: false });
+}
+
+/**
+ * Send one chunk of a broadcast with bounded parallelism.
+ *
+ * Progress is checkpointed on the campaign: `cursor` only moves past
+ * recipients whose send has finished (contiguously), together with the
+ * matching `stats.sent` / `delivery.failed` increments, so a retried chunk
+ * resumes at the cursor and re-sends at most the sends that were in
+ * flight when the worker died.
+ */
+export async function sendBroadcastChunk(job: IQueueJob) {
+    const { campaignId, chunkIndex } = job.payload;
+    const { sendMarketingEmail } = await import('@/lib/services/email');
+    const { default: EmailCampaign } = await import('@/lib/models/EmailCampaign');
+    const { default: User } = await import('@/lib/models/User');
+
+    const state = await EmailCampaign.findById(campaignId, {
+        creatorId: 1,
+        'delivery.chunks': { $elemMatch: { index: chunkIndex } },
+    }).lean<any>();
+    if (!state) throw new Error('Campaign not found');
+
+    const chunk = state.delivery?.chunks?.[0];
+    if (!chunk) throw new Error(`Campaign ${campaignId} has no chunk ${chunkIndex}`);
+    if (chunk.status === 'done') return;
+
+    // Load only the part of the recipient list this chunk still has to send.
+    const campaign = await EmailCampaign.findById(campaignId, {
+        subject: 1,
+        content: 1,
+        recipients: { $slice: [chunk.cursor, Math.max(chunk.end - chunk.cursor, 1)] },
+    }).lean<any>();
+    if (!campaign) throw new Error('Campaign not found');
+    const recipients: string[] = chunk.cursor < chunk.end ? campaign.recipients : [];
+
+    const creator = await User.findById(state.creatorId, { displayName: 1, username: 1 }).lean<any>();
+    const creatorName = creator?.displayName || creator?.username || 'Creator';
+    const appUrl = process.env.NEXT_PUBLIC_APP_URL || 'https://creatorly.in';
+    const content = campaign.content.replace(/{{name}}/g, 'there');
+    const hasUnsubscribeLink = content.includes('{{unsubscribe}}') || content.includes('/unsubscribe');
+
+    const renderFor = (email: string) => {
+        const unsubscribeUrl = `${appUrl}/api/marketing/unsubscribe?email=${encodeURIComponent(email)}&cid=${state.creatorId.toString()}`;
+        return hasUnsubscribeLink
+            ? content.replace(/{{unsubscribe}}/g, unsubscribeUrl)
+            : content + `<br/><br/><hr/><small style="color: #666;">Sent by ${creatorName} via Creatorly. <a href="${unsubscribeUrl}">Unsubscribe</a></small>`;
+    };
+
+    const outcome: (boolean | undefined)[] = new Array(recipients.length);
+    let checkpointed = 0; // offset into `recipients` already written back
+    let finishedSinceCheckpoint = 0;
+    let writing: Promise<void> = Promise.resolve();
+
+    const checkpoint = () => {
+        let offset = checkpointed;
+        while (offset < recipients.length && outcome[offset] !== undefined) offset++;
+        if (offset === checkpointed) return writing;
+
+        const sent = outcome.slice(checkpointed, offset).filter(Boolean).length;
+        const failed = offset - checkpointed - sent;
+        const cursor = chunk.cursor + offset;
+        checkpointed = offset;
+        writing = writing.then(async () => {
+            await EmailCampaign.updateOne(
+                { _id: campaignId, 'delivery.chunks.index': chunkIndex },
+                {
+                    $set: { 'delivery.chunks.$.cursor': cursor },
+                    $inc: {
+                        'delivery.chunks.$.sent': sent,
+                        'delivery.chunks.$.failed': failed,
+                        'stats.sent': sent,
+                        'delivery.failed': failed,
+                    },
+                }
+            );
+        });
+        return writing;
+    };
+
+    let next = 0;
+    const sendNext = async () => {
+        while (next < recipients.length) {
+            const offset = next++;
+            const email = recipients[offset];
+            const result = await sendMarketingEmail(email, { subject: campaign.subject, html: renderFor(email) });
+            if (!result.success) {
+                console.error(`[Broadcast] Failed to send campaign ${campaignId} to ${email}:`, result.error);
+            }
+            outcome[offset] = result.success;
+            if (++finishedSinceCheckpoint >= CHECKPOINT_EVERY) {
+                finishedSinceCheckpoint = 0;
+                await checkpoint();
+            }
+        }
+    };
+
+    await Promise.all(
+        Array.from({ length: Math.min(BROADCAST_SEND_CONCURRENCY, recipients.length) }, sendNext)
+    );
+    await checkpoint();
+
+    const finished = await EmailCampaign.findOneAndUpdate(
+        { _id: campaignId, 'delivery.chunks': { $elemMatch: { index: chunkIndex, status: 'pending' } } },
+        { $set: { 'delivery.chunks.$.status': 'done' }, $inc: { 'delivery.chunksCompleted': 1 } },
+        { new: true, projection: { 'delivery.chunksCompleted': 1, 'delivery.chunksTotal': 1 } }
+    ).lean<any>();
+
+    if (finished && finished.delivery.chunksCompleted >= finished.delivery.chunksTotal) {
+        await markCampaignSent(campaignId);
+    }
+}
+
+async function markCampaignSent(campaignId: string) {
+    const { default: EmailCampaign } = await import('@/lib/models/EmailCampaign');
+    await EmailCampaign.updateOne(
+        { _id: campaignId, status: { $ne: 'sent' } },
+        { $set: { status: 'sent', sentAt: new Date() } }
+    );
+}
@@ -0,0 +1,131 @@
+import { IQueueJob } from '@/lib/models/QueueJob';
+import { connectToDatabase } from '@/lib/db/mongodb';
+import { claimNextQueueJob, holdQueueJobLease, runClaimedJob, JOB_LEASE_MS } from './processor';
+
+type JobType = IQueueJob['type'];
+
+export interface DispatcherOptions {
+    /** Jobs in flight across all types. */
+    concurrency?: number;
+    /** Per-type caps, e.g. to stay inside Meta/WhatsApp rate limits. */
+    typeConcurrency?: Partial<Record<JobType, number>>;
+    /** How long to wait before polling again when the queue is empty. */
+    idleMs?: number;
+    leaseMs?: number;
+    onJobDone?: (job: IQueueJob, result: unknown, durationMs: number) => void;
+}
+
+const JOB_TYPES: JobType[] = [
+    'dm_delivery', 'dm_carousel_step', 'email_sequence_step', 'email_broadcast', 'email_broadcast_chunk', 'booking_cleanup', 'one_off_email',
+];
+
+export const DEFAULT_TYPE_CONCURRENCY: Record<JobType, number> = {
+    dm_delivery: 8,
+    dm_carousel_step: 8,
+    email_sequence_step: 8,
+    one_off_email: 8,
+    email_broadcast: 2,
+    email_broadcast_chunk: 4,
+    booking_cleanup: 1,
+};
+
+/**
+ * Claims due QueueJobs and runs them with bounded concurrency.
+ *
+ * Slots are refilled as soon as a job finishes, so one slow Meta/WhatsApp
+ * call only holds its own slot. Each claim goes through the atomic
+ * findOneAndUpdate lease in processor.ts, so several dispatchers (or the
+ * process-queue cron) can drain the same collection safely. The lease is
+ * renewed while a job runs, so only a dead dispatcher's jobs are taken over.
+ */
+export class QueueDispatcher {
+    private readonly concurrency: number;
+    private readonly typeConcurrency: Record<JobType, number>;
+    private readonly idleMs: number;
+    private readonly leaseMs: number;
+    private readonly onJobDone?: DispatcherOptions['onJobDone'];
+
+    private running = false;
+    private inFlight = 0;
+    private readonly perType = new Map<JobType, number>();
+    private readonly active = new Set<Promise<void>>();
+    private wake: (() => void) | null = null;
+
+    constructor(options: DispatcherOptions = {}) {
+        this.concurrency = options.concurrency ?? Number(process.env.QUEUE_CONCURRENCY || 16);
+        this.typeConcurrency = { ...DEFAULT_TYPE_CONCURRENCY, ...options.typeConcurrency } as Record<JobType, number>;
+        this.idleMs = options.idleMs ?? 1000;
+        this.leaseMs = options.leaseMs ?? JOB_LEASE_MS;
+        this.onJobDone = options.onJobDone;
+    }
+
+    get stats() {
+        return { inFlight: this.inFlight, perType: Object.fromEntries(this.perType) };
+    }
+
+    /** Run until stop() is called. */
+    async start() {
+        await connectToDatabase();
+        this.running = true;
+        while (this.running) {
+            const claimed = await this.fill();
+            if (claimed === 0) await this.sleep(this.idleMs);
+        }
+        await Promise.allSettled(this.active);
+    }
+
+    /** Stop claiming new jobs; resolves once in-flight jobs have finished. */
+    async stop() {
+        this.running = false;
+        this.wake?.();
+        await Promise.allSettled(this.active);
+    }
+
+    /** Claim jobs until every slot is busy or nothing is due; returns how many were claimed. */
+    async fill() {
+        let claimed = 0;
+        while (this.running && this.inFlight < this.concurrency) {
+            const types = JOB_TYPES.filter(type => (this.perType.get(type) || 0) < this.typeConcurrency[type]);
+            if (types.length === 0) break;
+
+            const job = await claimNextQueueJob(types.length === JOB_TYPES.length ? undefined : types, this.leaseMs);
+            if (!job) break;
+
+            this.dispatch(job);
+            claimed++;
+        }
+        return claimed;
+    }
+
+    private dispatch(job: IQueueJob) {
+        const started = Date.now();
+        this.inFlight++;
+        this.perType.set(job.type, (this.perType.get(job.type) || 0) + 1);
+        const releaseLease = holdQueueJobLease(job, this.leaseMs);
+
+        const task = runClaimedJob(job)
+            .then(result => this.onJobDone?.(job, result, Date.now() - started))
+            .catch(error => console.error(`[Dispatcher] Job ${job._id} crashed:`, error))
+            .finally(() => {
+                releaseLease();
+                this.inFlight--;
+                this.perType.set(job.type, (this.perType.get(job.type) || 1) - 1);
+                this.active.delete(task);
+                this.wake?.();
+            });
+        this.active.add(task);
+    }
+
+    /** Wait for `ms`, or less if a slot frees up or stop() is called. */
+    private sleep(ms: number) {
+        return new Promise<void>(resolve => {
+            const done = () => {
+                clearTimeout(timer);
+                if (this.wake === done) this.wake = null;
+                resolve();
+            };
+            const timer = setTimeout(done, ms);
+            this.wake = done;
+        });
+    }
+}
@@ -2,10 +2,14 @@ import { QueueJob, IQueueJob } from '@/lib/models/QueueJob';
 import { MetaGraphService } from '@/lib/services/meta';
 import { DMLog } from '@/lib/models/DMLog';
 import { connectToDatabase } from '@/lib/db/mongodb';
-import { PlatformSettings } from '@/lib/models/PlatformSettings';
-import { Subscription } from '@/lib/models/Subscription';
-import { Plan } from '@/lib/models/Plan';
-import { PlanTier } from '@/lib/models/plan.types';
+import { getDMEntitlement, isAutomationEnabled, reserveDM } from '@/lib/cache/entitlements';
+import { planBroadcast, sendBroadcastChunk } from './broadcast';
+
+/**
+ * How long a claimed job may go without a lease renewal before another
+ * worker may take it over (the claiming worker is assumed to have died).
+ */
+export const JOB_LEASE_MS = 15 * 60 * 1000;
 
 /**
  * Process a single job with robust error handling and state management.
@@ -21,11 +25,90 @@ export async function processQueueJob(jobId: string) {
 
     if (!job) return { status: 'skipped' };
 
+    return runClaimedJob(job);
+}
+
+/**
+ * Atomically claim the next due job, restricted to `types` when given.
+ * Uses the same findOneAndUpdate lease as processQueueJob, so concurrent
+ * workers never receive the same job. A job whose lease expired is
+ * claimable again while it has attempts left; the run that lost it (a
+ * worker killed mid-job) counts as an attempt, so a job that keeps killing
+ * its worker ends up `failed` instead of being reclaimed forever.
+ */
+export async function claimNextQueueJob(types?: IQueueJob['type'][], leaseMs = JOB_LEASE_MS) {
+    const now = new Date();
+    const typeFilter = types ? { type: { $in: types } } : {};
+    const leaseExpired = { status: 'processing', updatedAt: { $lte: new Date(now.getTime() - leaseMs) } };
+    const job = await QueueJob.findOneAndUpdate(
+        {
+            ...typeFilter,
+            $or: [
+                { status: { $in: ['pending', 'failed'] }, nextRunAt: { $lte: now } },
+                leaseExpired,
+            ],
+            $expr: { $lt: ['$attempt', '$maxAttempts'] },
+        },
+        [{
+            $set: {
+                attempt: { $cond: [{ $eq: ['$status', 'processing'] }, { $add: ['$attempt', 1] }, '$attempt'] },
+                status: 'processing',
+                updatedAt: now,
+            },
+        }],
+        { new: true, sort: { nextRunAt: 1 } }
+    );
+    if (!job) await failExhaustedLeases(typeFilter, leaseExpired);
+    return job;
+}
+
+/** Mark jobs whose lease expired on their last attempt as failed (checked when the queue is idle). */
+async function failExhaustedLeases(typeFilter: Record<string, any>, leaseExpired: Record<string, any>) {
+    const result = await QueueJob.updateMany(
+        { ...typeFilter, ...leaseExpired, $expr: { $gte: ['$attempt', '$maxAttempts'] } },
+        { $set: { status: 'failed', error: 'Lease expired on the last attempt (worker stopped mid-job)' } }
+    );
+    if (result.modifiedCount) console.warn(`[Queue] Failed ${result.modifiedCount} job(s) that lost their lease on the last attempt`);
+}
+
+/**
+ * Keep a claimed job's lease fresh while its handler runs, so a job that
+ * outlives `leaseMs` (a large broadcast chunk, a slow provider) is not
+ * claimed and run a second time. Returns a function that stops renewing.
+ */
+export function holdQueueJobLease(job: IQueueJob, leaseMs = JOB_LEASE_MS) {
+    const renew = async () => {
+        try {
+            const result = await QueueJob.updateOne(
+                { _id: job._id, status: 'processing' },
+                { $set: { updatedAt: new Date() } }
+            );
+            if (result.matchedCount === 0) {
+                console.warn(`[Queue] Job ${job._id} is no longer processing; lease not renewed`);
+            }
+        } catch (error: any) {
+            console.error(`[Queue] Lease renewal failed for job ${job._id}:`, error.message);
+        }
+    };
+    // Renew well inside the lease so one failed write does not let it lapse.
+    const timer = setInterval(renew, Math.max(1000, Math.floor(leaseMs / 3)));
+    timer.unref?.();
+    return () => clearInterval(timer);
+}
+
+/**
+ * Run a job that has already been claimed (status `processing`).
+ */
+export async function runClaimedJob(job: IQueueJob) {
+    const jobId = String(job._id);
+
     // 1. Global Kill-switch Check
-    const settings = await PlatformSettings.findOne();
-    if (settings?.featureToggles?.automationEnabled === false && job.type === 'dm_delivery') {
+    const isDM = job.type === 'dm_delivery' || job.type === 'dm_carousel_step';
+    if (isDM && !(await isAutomationEnabled())) {
         job.status = 'failed';
         job.error = 'Automations are globally disabled by platform administrator.';
+        // Look again later rather than re-claiming it in a tight loop.
+        job.nextRunAt = new Date(Date.now() + 5 * 60 * 1000);
         await job.save();
         return { status: 'globally_disabled', jobId };
     }
@@ -33,10 +116,14 @@ export async function processQueueJob(jobId: string) {
     try {
         if (job.type === 'dm_delivery') {
             await handleDMDelivery(job);
+        } else if (job.type === 'dm_carousel_step') {
+            await handleCarouselStep(job);
         } else if (job.type === 'email_sequence_step') {
             await handleEmailSequenceStep(job);
         } else if (job.type === 'email_broadcast') {
-            await handleEmailBroadcast(job);
+            await planBroadcast(job);
+        } else if (job.type === 'email_broadcast_chunk') {
+            await sendBroadcastChunk(job);
         } else if (job.type === 'booking_cleanup') {
             await handleBookingCleanup(job);
         } else if (job.type === 'one_off_email') {
@@ -68,70 +155,53 @@ export async function processQueueJob(jobId: string) {
 }
 
 async function handleDMDelivery(job: IQueueJob) {
+    const { recipientId, creatorId } = job.payload;
+
+    if (!recipientId) throw new Error('Invalid DM recipient');
+
+    await connectToDatabase();
+
+    // 1. Subscription & Plan Limit Check (cached plan, Redis usage counter)
+    const entitlement = await getDMEntitlement(creatorId);
+    if (!entitlement) throw new Error('Creator not found');
+    const reservation = await reserveDM(entitlement);
+    try {
+        await sendDM(job, entitlement.username);
+    } catch (error) {
+        await reservation.release();
+        throw error;
+    }
+}
+
+/** Send the job's DM on its platform, then log it and update the rule's stats. */
+async function sendDM(job: IQueueJob, creatorUsername: string) {
     const {
         recipientId, text, accessToken, creatorId, ruleId,
         source, platform, messageType, carouselMessages,
         attachmentType, attachmentId, phoneNumberId,
         variables = {}
     } = job.payload;
-
-    if (!recipientId) throw new Error('Invalid DM recipient');
-
-    await connectToDatabase();
-    const { User } = await import('@/lib/models/User');
     const { AutoReplyRule } = await import('@/lib/models/AutoReplyRule');
     const { Product } = await import('@/lib/models/Product');
 
-    const creator = await User.findById(creatorId).lean();
-    if (!creator) throw new Error('Creator not found');
-
-    // 1. Subscription & Plan Limit Check
-    const activeSub = await Subscription.findOne({
-        userId: creatorId,
-        status: { $in: ['active', 'trialing'] }
-    }).populate('planId');
-
-    let plan = activeSub?.planId as any;
-    if (!plan) plan = await Plan.findOne({ tier: PlanTier.FREE });
-    if (!plan) throw new Error('No plan configuration found.');
-
-    const startOfMonth = new Date();
-    startOfMonth.setDate(1);
-    startOfMonth.setHours(0, 0, 0, 0);
-
-    const usageCount = await DMLog.countDocuments({
-        creatorId,
-        createdAt: { $gte: startOfMonth },
-        status: 'success'
-    });
-
-    if (usageCount >= plan.maxAutoDms) {
-        throw new Error(`Plan limit reached: ${usageCount}/${plan.maxAutoDms} Auto DMs.`);
-    }
-
     // 2. Variable Injection
-    const injectVariables = (str: string | undefined) => {
-        if (!str) return '';
-        return str
-            .replace(/{{first_name}}/g, variables.firstName || 'there')
-            .replace(/{{creator_username}}/g, creator.username || '')
-            .replace(/{{content_description}}/g, variables.contentDescription || '')
-            .replace(/{{product_name}}/g, variables.productName || '')
-            .replace(/{{custom_link}}/g, variables.customLink || '')
-            .replace(/{{name}}/g, variables.firstName || 'there');
-    };
+    const injectVariables = (str: string | undefined) => injectDMVariables(str, variables, creatorUsername);
 
     const finalMessage = injectVariables(text);
 
     // 3. Platform Specific Logic
     if (platform === 'whatsapp') {
         const { WhatsAppService } = await import('@/lib/services/whatsapp');
+        const { User } = await import('@/lib/models/User');
         const { decryptTokenGCM } = await import('@/lib/security/encryption');
 
-        const waConfig = creator.whatsappConfig;
         let waToken = accessToken;
         let waPhoneId = phoneNumberId;
 
+        // Stored credentials are only read when the job did not carry them.
+        const waConfig = (!waToken || !waPhoneId)
+            ? ((await User.findById(creatorId).select('whatsappConfig').lean()) as any)?.whatsappConfig
+            : undefined;
         if (!waToken && waConfig?.accessToken) {
             waToken = decryptTokenGCM(waConfig.accessToken, waConfig.accessTokenIV!, waConfig.accessTokenTag!);
         }
@@ -174,21 +244,11 @@ async function handleDMDelivery(job: IQueueJob) {
         if (!accessToken) throw new Error('Missing Instagram Access Token');
 
         if (messageType === 'carousel' && carouselMessages && carouselMessages.length > 0) {
-            for (const msg of carouselMessages) {
-                // Handle delay
-                if (msg.delaySeconds > 0) {
-                    await new Promise(r => setTimeout(r, msg.delaySeconds * 1000));
-                }
-                await MetaGraphService.sendDirectMessage({
-                    recipientId,
-                    message: injectVariables(msg.text),
-                    accessToken
-                });
-            }
+            await sendCarousel(job.payload, 0, creatorUsername, false);
         } else if (messageType === 'product' && attachmentId) {
             const product = await Product.findById(attachmentId).lean();
             if (product) {
-                const productMsg = `${finalMessage}\n\nCheck out ${product.name}: ${process.env.NEXT_PUBLIC_APP_URL}/u/${creator.username}/p/${product.slug}`;
+                const productMsg = `${finalMessage}\n\nCheck out ${product.name}: ${process.env.NEXT_PUBLIC_APP_URL}/u/${creatorUsername}/p/${product.slug}`;
                 await MetaGraphService.sendDirectMessage({
                     recipientId,
                     message: productMsg,
@@ -225,6 +285,52 @@ async function handleDMDelivery(job: IQueueJob) {
     }
 }
 
+function injectDMVariables(str: string | undefined, variables: any, creatorUsername: string) {
+    if (!str) return '';
+    return str
+        .replace(/{{first_name}}/g, variables.firstName || 'there')
+        .replace(/{{creator_username}}/g, creatorUsername)
+        .replace(/{{content_description}}/g, variables.contentDescription || '')
+        .replace(/{{product_name}}/g, variables.productName || '')
+        .replace(/{{custom_link}}/g, variables.customLink || '')
+        .replace(/{{name}}/g, variables.firstName || 'there');
+}
+
+/**
+ * Send carousel messages from `from` on. The next message with a delay is
+ * not slept on: it becomes a dm_carousel_step job due after the delay, so
+ * the worker slot is free in between. `delayDone` is set when that job runs.
+ */
+async function sendCarousel(payload: IQueueJob['payload'], from: number, creatorUsername: string, delayDone: boolean) {
+    const { recipientId, accessToken, carouselMessages = [], variables = {} } = payload;
+    for (let i = from; i < carouselMessages.length; i++) {
+        const msg = carouselMessages[i];
+        if (msg.delaySeconds > 0 && !(delayDone && i === from)) {
+            await QueueJob.create({
+                type: 'dm_carousel_step',
+                payload: { ...payload, creatorUsername, carouselIndex: i },
+                nextRunAt: new Date(Date.now() + msg.delaySeconds * 1000),
+                status: 'pending'
+            });
+            return;
+        }
+        await MetaGraphService.sendDirectMessage({
+            recipientId: recipientId!,
+            message: injectDMVariables(msg.text, variables, creatorUsername),
+            accessToken: accessToken!
+        });
+    }
+}
+
+/**
+ * A delayed carousel message. The DM was already counted and logged by the
+ * dm_delivery job that started the carousel.
+ */
+async function handleCarouselStep(job: IQueueJob) {
+    const { carouselIndex = 0, creatorUsername = '' } = job.payload;
+    await sendCarousel(job.payload, carouselIndex, creatorUsername, true);
+}
+
 async function handleEmailSequenceStep(job: IQueueJob) {
     const { sequenceId, enrollmentId, email, subject, content, stepIndex } = (job as any).payload;
     const { sendEmail } = await import('@/lib/services/email');
@@ -322,51 +428,6 @@ async function handleBookingCleanup(job: IQueueJob) {
     });
 }
 
-async function handleEmailBroadcast(job: IQueueJob) {
-    const { campaignId } = (job as any).payload;
-    const { sendMarketingEmail } = await import('@/lib/services/email');
-    const { default: EmailCampaign } = await import('@/lib/models/EmailCampaign');
-    const { default: User } = await import('@/lib/models/User');
-
-    const campaign = await EmailCampaign.findById(campaignId);
-    if (!campaign) throw new Error('Campaign not found');
-
-    const creator = await User.findById(campaign.creatorId);
-    const creatorName = creator?.displayName || creator?.username || 'Creator';
-
-    const appUrl = process.env.NEXT_PUBLIC_APP_URL || 'https://creatorly.in';
-
-    let successCount = 0;
-    let failCount = 0;
-
-    // Process recipients
-    for (const recipientEmail of campaign.recipients) {
-        try {
-            const unsubscribeUrl = `${appUrl}/api/marketing/unsubscribe?email=${encodeURIComponent(recipientEmail)}&cid=${campaign.creatorId.toString()}`;
-
-            // Basic interpolation for broadcast too
-            const content = campaign.content.replace(/{{name}}/g, 'there');
-
-            await sendMarketingEmail(
-                recipientEmail,
-                {
-                    subject: campaign.subject,
-                    html: content,
-                }
-            );
-            successCount++;
-        } catch (err) {
-            console.error(`Failed to send broadcast to ${recipientEmail}:`, err);
-            failCount++;
-        }
-    }
-
-    campaign.status = 'sent';
-    campaign.sentAt = new Date();
-    campaign.stats.sent = successCount;
-    await campaign.save();
-}
-
 async function handleOneOffEmail(job: IQueueJob) {
     const { email, subject, content, creatorId } = job.payload;
     const { sendEmail } = await import('@/lib/services/email');
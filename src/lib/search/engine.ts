@@ -0,0 +1,187 @@
+import mongoose from 'mongoose';
+import { SearchDocument } from '@/lib/models/SearchDocument';
+import { queryKeys, tokenize, TERM_WEIGHTS } from '@/lib/search/terms';
+import type { SearchKind } from '@/lib/search/indexer';
+import { decodeCursor, encodeCursor } from '@/lib/db/pagination';
+
+/** Matches (in rank order) that totals and facet counts are computed over. */
+export const MATCH_LIMIT = 10_000;
+const MAX_QUERY_WORDS = 6;
+/** Price facet buckets, in Product.pricing units (paise). */
+const PRICE_BOUNDARIES = [0, 1, 50_000, 100_000, 250_000, 500_000];
+
+export type SearchSort = 'relevance' | 'price' | 'price_desc' | 'rating' | 'date';
+
+const SORT_FIELDS: Record<Exclude<SearchSort, 'relevance'>, [string, 1 | -1]> = {
+    price: ['price', 1],
+    price_desc: ['price', -1],
+    rating: ['rating', -1],
+    date: ['sourceCreatedAt', -1],
+};
+
+export interface SearchOptions {
+    kind: SearchKind;
+    q: string;
+    category?: string;
+    productType?: string;
+    creatorId?: string;
+    minPrice?: number;
+    maxPrice?: number;
+    sortBy?: SearchSort;
+    limit?: number;
+    cursor?: string | null;
+    /** Rows to skip for legacy `?page=` requests; ignored with a cursor. */
+    skip?: number;
+}
+
+export interface SearchFacets {
+    categories: { value: string; count: number }[];
+    productTypes: { value: string; count: number }[];
+    prices: { min: number; max: number | null; count: number }[];
+}
+
+export interface SearchResult {
+    results: Record<string, any>[];
+    total: number;
+    totalCapped: boolean;
+    facets?: SearchFacets;
+    nextCursor: string | null;
+}
+
+/** Best tier a query word matched in: whole title word > prefix > body word > typo. */
+const wordScore = (word: string) => ({
+    $switch: {
+        branches: [
+            { case: { $in: [`t:${word}`, '$terms'] }, then: TERM_WEIGHTS.t },
+            { case: { $in: [`p:${word}`, '$terms'] }, then: TERM_WEIGHTS.p },
+            { case: { $in: [`b:${word}`, '$terms'] }, then: TERM_WEIGHTS.b },
+        ],
+        default: TERM_WEIGHTS.f,
+    },
+});
+
+/**
+ * Query the search index: every query word must match a title word, a prefix
+ * of one, a body word, or a title word one typo away.
+ *
+ * Hits are ordered over every match, so "cheapest first" is the cheapest
+ * overall: the page is a top-k sort on the requested key after the cursor
+ * bound. Counting is what stays bounded: the total and facet counts come
+ * from a second aggregation, run alongside, over the top `MATCH_LIMIT`
+ * matches by rank (`totalCapped` says when there were more). Pages are
+ * keyset cursors over the sort key and _id.
+ */
+export async function search(options: SearchOptions): Promise<SearchResult> {
+    const { kind } = options;
+    const sortBy = options.sortBy ?? 'relevance';
+    const limit = Math.min(Math.max(options.limit ?? 20, 1), 100);
+    const words = tokenize(options.q).slice(0, MAX_QUERY_WORDS);
+
+    const match: Record<string, any> = { kind, visible: true };
+    if (words.length) match.$and = words.map(word => ({ terms: { $in: queryKeys(word) } }));
+    if (options.category) match.category = options.category;
+    if (options.productType) match.productType = options.productType;
+    if (options.creatorId && mongoose.isValidObjectId(options.creatorId)) {
+        match.creatorId = new mongoose.Types.ObjectId(options.creatorId);
+    }
+    if (options.minPrice !== undefined || options.maxPrice !== undefined) {
+        match.price = {};
+        if (options.minPrice !== undefined) match.price.$gte = options.minPrice;
+        if (options.maxPrice !== undefined) match.price.$lte = options.maxPrice;
+    }
+
+    const after = options.cursor ? decodeCursor(options.cursor) : null;
+    // Cursor bounds go before each $sort so it stays a top-k sort of `limit + 1`.
+    const hits: any[] = [{ $match: match }];
+    if (sortBy === 'relevance' && words.length) {
+        hits.push({ $addFields: { score: { $add: words.map(wordScore) } } });
+        if (after) {
+            const [score, rank, id] = after;
+            const _id = new mongoose.Types.ObjectId(id);
+            hits.push({
+                $match: {
+                    $or: [
+                        { score: { $lt: score } },
+                        { score, rank: { $lt: rank } },
+                        { score, rank, _id: { $gt: _id } },
+                    ],
+                },
+            });
+        }
+        hits.push({ $sort: { score: -1, rank: -1, _id: 1 } });
+    } else if (sortBy === 'relevance') {
+        // No words: browse in rank order.
+        if (after) {
+            const [rank, id] = after;
+            const _id = new mongoose.Types.ObjectId(id);
+            hits.push({ $match: { $or: [{ rank: { $lt: rank } }, { rank, _id: { $gt: _id } }] } });
+        }
+        hits.push({ $sort: { rank: -1, _id: 1 } });
+    } else {
+        const [field, direction] = SORT_FIELDS[sortBy];
+        if (after) {
+            const value = field === 'sourceCreatedAt' ? new Date(after[0]) : after[0];
+            const _id = new mongoose.Types.ObjectId(after[1]);
+            hits.push({
+                $match: { $or: [{ [field]: { [direction === 1 ? '$gt' : '$lt']: value } }, { [field]: value, _id: { $gt: _id } }] },
+            });
+        }
+        hits.push({ $sort: { [field]: direction, _id: 1 } });
+    }
+    if (!after && options.skip) hits.push({ $skip: options.skip });
+    hits.push({ $limit: limit + 1 }, { $project: { terms: 0, visible: 0, indexedAt: 0 } });
+
+    const facet: Record<string, any[]> = { total: [{ $count: 'count' }] };
+    if (kind === 'product') {
+        facet.categories = [{ $match: { category: { $nin: [null, ''] } } }, { $sortByCount: '$category' }, { $limit: 20 }];
+        facet.productTypes = [{ $match: { productType: { $ne: null } } }, { $sortByCount: '$productType' }];
+        facet.prices = [{
+            $bucket: { groupBy: '$price', boundaries: PRICE_BOUNDARIES, default: 'more', output: { count: { $sum: 1 } } },
+        }];
+    }
+
+    const [rows, [result]] = await Promise.all([
+        SearchDocument.aggregate(hits),
+        SearchDocument.aggregate([
+            { $match: match },
+            { $sort: { rank: -1, _id: 1 } },
+            { $limit: MATCH_LIMIT },
+            { $facet: facet },
+        ]),
+    ]);
+
+    const page: any[] = rows.slice(0, limit);
+    const last = page[page.length - 1];
+    let nextCursor: string | null = null;
+    if (rows.length > limit && last) {
+        if (sortBy === 'relevance' && words.length) nextCursor = encodeCursor([last.score, last.rank, String(last._id)]);
+        else if (sortBy === 'relevance') nextCursor = encodeCursor([last.rank, String(last._id)]);
+        else {
+            const value = last[SORT_FIELDS[sortBy][0]];
+            nextCursor = encodeCursor([value instanceof Date ? value.toISOString() : value, String(last._id)]);
+        }
+    }
+
+    const total = result.total[0]?.count ?? 0;
+    const output: SearchResult = {
+        results: page.map(({ _id, refId, rank, ...hit }) => ({ _id: refId, ...hit, ...(kind === 'product' ? { name: hit.title } : {}) })),
+        total,
+        totalCapped: total >= MATCH_LIMIT,
+        nextCursor,
+    };
+    if (kind === 'product') {
+        output.facets = {
+            categories: result.categories.map((row: any) => ({ value: row._id, count: row.count })),
+            productTypes: result.productTypes.map((row: any) => ({ value: row._id, count: row.count })),
+            prices: result.prices.map((row: any) => {
+                const index = PRICE_BOUNDARIES.indexOf(row._id);
+                return {
+                    min: row._id === 'more' ? PRICE_BOUNDARIES[PRICE_BOUNDARIES.length - 1] : row._id,
+                    max: row._id === 'more' ? null : PRICE_BOUNDARIES[index + 1],
+                    count: row.count,
+                };
+            }),
+        };
+    }
+    return output;
+}
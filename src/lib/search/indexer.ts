@@ -0,0 +1,251 @@
+import mongoose, { Schema } from 'mongoose';
+import { SearchDocument } from '@/lib/models/SearchDocument';
+import { JobCheckpoint } from '@/lib/models/JobCheckpoint';
+import { documentTerms } from '@/lib/search/terms';
+
+export type SearchKind = 'product' | 'creator';
+
+export const SEARCH_CHECKPOINT = 'search-index';
+
+const BATCH_SIZE = 1000;
+/** Writes that land within this window of "now" are left to the next sync (and to the hooks). */
+const SYNC_LAG_MS = 5000;
+/** Hook-triggered reindexing is batched for this long. */
+const DEBOUNCE_MS = 250;
+/** How often a process re-reads the checkpoint while the index is still being built. */
+const READY_RECHECK_MS = 30_000;
+
+const PRODUCT_FIELDS = {
+    creatorId: 1, title: 1, slug: 1, description: 1, shortDescription: 1, tagline: 1, tags: 1, category: 1,
+    productType: 1, pricing: 1, status: 1, isDeleted: 1, isArchived: 1, hiddenByPlanLimit: 1, isFeatured: 1,
+    totalSales: 1, avgRating: 1, reviewCount: 1, coverImageUrl: 1, image: 1, thumbnail: 1, 'seo.keywords': 1,
+    createdAt: 1, updatedAt: 1,
+};
+const CREATOR_FIELDS = {
+    username: 1, displayName: 1, bio: 1, avatar: 1, role: 1, status: 1, isSuspended: 1, createdAt: 1, updatedAt: 1,
+};
+
+const SOURCES: Record<SearchKind, { collection: string; fields: Record<string, 1> }> = {
+    product: { collection: 'products', fields: PRODUCT_FIELDS },
+    creator: { collection: 'users', fields: CREATOR_FIELDS },
+};
+
+/** The SearchDocument for a raw product, or null if it should not be in the index. */
+function productEntry(product: any) {
+    return {
+        kind: 'product',
+        refId: product._id,
+        creatorId: product.creatorId,
+        visible: ['published', 'active'].includes(product.status)
+            && !product.isDeleted && !product.isArchived && !product.hiddenByPlanLimit,
+        terms: documentTerms(
+            [product.title, product.category, ...(product.tags || []), ...(product.seo?.keywords || [])],
+            [product.tagline, product.shortDescription, product.description?.replace(/<[^>]*>/g, ' ')]
+        ),
+        title: product.title || '',
+        subtitle: product.tagline || product.shortDescription || '',
+        slug: product.slug,
+        image: product.coverImageUrl || product.image || product.thumbnail || '',
+        category: product.category || null,
+        productType: product.productType || null,
+        price: product.pricing?.salePrice ?? product.pricing?.basePrice ?? 0,
+        currency: product.pricing?.currency || 'INR',
+        rating: product.avgRating || 0,
+        rank: (product.totalSales || 0) + (product.reviewCount || 0) + (product.isFeatured ? 1000 : 0),
+        sourceCreatedAt: product.createdAt,
+    };
+}
+
+function creatorEntry(user: any) {
+    if (user.role !== 'creator') return null;
+    return {
+        kind: 'creator',
+        refId: user._id,
+        creatorId: user._id,
+        visible: !user.isSuspended && user.status !== 'suspended',
+        terms: documentTerms([user.username, user.displayName], [user.bio]),
+        title: user.displayName || user.username,
+        subtitle: user.bio ? String(user.bio).slice(0, 160) : '',
+        slug: user.username,
+        image: user.avatar || '',
+        rank: 0,
+        sourceCreatedAt: user.createdAt,
+    };
+}
+
+const ENTRY_BUILDERS: Record<SearchKind, (source: any) => Record<string, any> | null> = {
+    product: productEntry,
+    creator: creatorEntry,
+};
+
+/** Upsert (or remove) the entries for these raw source documents in one bulkWrite. */
+async function writeEntries(kind: SearchKind, sources: any[], indexedAt = new Date()) {
+    if (sources.length === 0) return 0;
+    const operations = sources.map(source => {
+        const entry = ENTRY_BUILDERS[kind](source);
+        if (!entry) return { deleteOne: { filter: { kind, refId: source._id } } };
+        return { replaceOne: { filter: { kind, refId: source._id }, replacement: { ...entry, indexedAt }, upsert: true } };
+    });
+    await SearchDocument.bulkWrite(operations as any[], { ordered: false });
+    return operations.length;
+}
+
+/**
+ * Re-index specific documents now. Reads the collections directly, so
+ * soft-deleted products (hidden by Product's find hooks) are re-indexed as
+ * invisible instead of being skipped.
+ */
+export async function reindexDocuments(kind: SearchKind, ids: (string | mongoose.Types.ObjectId)[]) {
+    const objectIds = ids.filter(id => mongoose.isValidObjectId(id)).map(id => new mongoose.Types.ObjectId(String(id)));
+    if (objectIds.length === 0) return 0;
+    const { collection, fields } = SOURCES[kind];
+    const sources = await mongoose.connection.collection(collection)
+        .find({ _id: { $in: objectIds } }, { projection: fields })
+        .toArray();
+    const found = new Set(sources.map(source => String(source._id)));
+    const missing = objectIds.filter(id => !found.has(String(id)));
+    if (missing.length) await SearchDocument.deleteMany({ kind, refId: { $in: missing } });
+    return (await writeEntries(kind, sources)) + missing.length;
+}
+
+const pending: Record<SearchKind, Set<string>> = { product: new Set(), creator: new Set() };
+let timer: NodeJS.Timeout | null = null;
+
+/**
+ * Queue documents for re-indexing after a write (called from the Product and
+ * User model hooks). Batched briefly; `syncSearchIndex` picks up anything a
+ * hook missed (bulk updates, writes from other processes).
+ */
+export function scheduleReindex(kind: SearchKind, ...ids: unknown[]) {
+    for (const id of ids) if (id) pending[kind].add(String(id));
+    if (timer) return;
+    timer = setTimeout(() => {
+        timer = null;
+        for (const current of Object.keys(pending) as SearchKind[]) {
+            const batch = Array.from(pending[current]);
+            pending[current].clear();
+            reindexDocuments(current, batch).catch(error =>
+                console.error(`[Search] Reindexing ${batch.length} ${current}(s) failed:`, error.message));
+        }
+    }, DEBOUNCE_MS);
+    timer.unref?.();
+}
+
+/**
+ * Remove index entries for documents deleted with deleteOne/deleteMany. The
+ * matching ids are read before the delete, since the post hooks only see the
+ * filter, and re-indexed (so dropped) after it.
+ */
+export function reindexOnDelete(schema: Schema, kind: SearchKind) {
+    schema.pre(['deleteOne', 'deleteMany'], { document: false, query: true }, async function (this: any) {
+        this._searchRefIds = await this.model.distinct('_id', this.getFilter());
+    });
+    schema.post(['deleteOne', 'deleteMany'], { document: false, query: true }, function (this: any) {
+        if (this._searchRefIds?.length) scheduleReindex(kind, ...this._searchRefIds);
+    });
+    schema.post('deleteOne', { document: true, query: false }, function (this: any) {
+        scheduleReindex(kind, this._id);
+    });
+}
+
+const readiness: Record<SearchKind, { ready: boolean; checkedAt: number }> = {
+    product: { ready: false, checkedAt: 0 },
+    creator: { ready: false, checkedAt: 0 },
+};
+
+/**
+ * Whether the index has been built for `kind`: a sync has caught up with the
+ * source collection at least once (`npm run search:build` before cut-over,
+ * or the reindex cron). Until then /api/search queries the collections.
+ */
+export async function isSearchIndexReady(kind: SearchKind) {
+    const state = readiness[kind];
+    if (state.ready || Date.now() - state.checkedAt < READY_RECHECK_MS) return state.ready;
+    const checkpoint = await JobCheckpoint.findOne({ name: `${SEARCH_CHECKPOINT}:${kind}` }).select('stats.builtAt').lean();
+    readiness[kind] = { ready: Boolean(checkpoint?.stats?.builtAt), checkedAt: Date.now() };
+    return readiness[kind].ready;
+}
+
+export interface SearchSyncResult {
+    kind: SearchKind;
+    mode: 'incremental' | 'full';
+    indexed: number;
+    removed: number;
+    caughtUp: boolean;
+    cursor: string;
+    durationMs: number;
+    docsPerSecond: number;
+}
+
+/**
+ * Bring the index up to date with every product/creator changed since the
+ * last run, in (updatedAt, _id) order under a JobCheckpoint. `full` re-indexes
+ * everything and, once it has caught up, removes entries it did not touch
+ * (hard-deleted sources). Stops after `budgetMs`; call again while
+ * `caughtUp` is false. The first catch-up marks the index as built
+ * (`isSearchIndexReady`).
+ */
+export async function syncSearchIndex(kind: SearchKind, options: { full?: boolean; budgetMs?: number } = {}): Promise<SearchSyncResult> {
+    const started = Date.now();
+    const budgetMs = options.budgetMs ?? 50_000;
+    const name = `${SEARCH_CHECKPOINT}:${kind}`;
+    const { collection, fields } = SOURCES[kind];
+    const until = new Date(started - SYNC_LAG_MS);
+
+    const previous = await JobCheckpoint.findOne({ name }).lean();
+    // A full rebuild starts over, but the existing entries keep serving meanwhile.
+    const checkpoint = options.full && !previous?.stats?.fullRunStartedAt ? null : previous;
+    const stats: Record<string, any> = { ...(checkpoint?.stats || {}) };
+    if (previous?.stats?.builtAt) stats.builtAt = previous.stats.builtAt;
+    if (options.full && !stats.fullRunStartedAt) stats.fullRunStartedAt = new Date(started);
+
+    let cursor: Date = checkpoint?.cursor ?? new Date(0);
+    let lastId = stats.lastId ? new mongoose.Types.ObjectId(stats.lastId) : null;
+    let indexed = 0;
+    let caughtUp = false;
+
+    while (Date.now() - started < budgetMs) {
+        const after = lastId
+            ? { $or: [{ updatedAt: { $gt: cursor } }, { updatedAt: cursor, _id: { $gt: lastId } }] }
+            : { updatedAt: { $gte: cursor } };
+        const batch = await mongoose.connection.collection(collection)
+            .find({ $and: [after, { updatedAt: { $lte: until } }] }, { projection: fields })
+            .sort({ updatedAt: 1, _id: 1 })
+            .limit(BATCH_SIZE)
+            .toArray();
+
+        indexed += await writeEntries(kind, batch);
+        if (batch.length) {
+            const last = batch[batch.length - 1];
+            cursor = last.updatedAt;
+            lastId = last._id;
+        }
+        caughtUp = batch.length < BATCH_SIZE;
+        if (caughtUp && !stats.builtAt) stats.builtAt = new Date();
+        await JobCheckpoint.updateOne(
+            { name },
+            { $set: { cursor, stats: { ...stats, lastId: lastId ? String(lastId) : null } } },
+            { upsert: true }
+        );
+        if (caughtUp) break;
+    }
+
+    let removed = 0;
+    if (caughtUp && stats.fullRunStartedAt) {
+        const result = await SearchDocument.deleteMany({ kind, indexedAt: { $lt: new Date(stats.fullRunStartedAt) } });
+        removed = result.deletedCount || 0;
+        await JobCheckpoint.updateOne({ name }, { $unset: { 'stats.fullRunStartedAt': '' } });
+    }
+
+    const durationMs = Date.now() - started;
+    return {
+        kind,
+        mode: stats.fullRunStartedAt ? 'full' : 'incremental',
+        indexed,
+        removed,
+        caughtUp,
+        cursor: cursor.toISOString(),
+        durationMs,
+        docsPerSecond: durationMs ? Math.round((indexed / durationMs) * 1000) : 0,
+    };
+}
@@ -0,0 +1,73 @@
+/**
+ * Tokenizing for the search index.
+ *
+ * A document stores tiered terms: `t:` whole words of its title-like fields,
+ * `p:` their prefixes (search-as-you-type), `b:` whole words of body text,
+ * and `f:` one-character deletions of title words (typo tolerance). Two words
+ * within one edit of each other share a deletion, so a query word matches a
+ * typo'd title word if `queryKeys` and the stored `f:`/`t:` terms intersect.
+ */
+
+const MIN_PREFIX = 2;
+const MAX_PREFIX = 12;
+/** Shorter words are too ambiguous to match with a typo. */
+const FUZZY_MIN_LENGTH = 4;
+const MAX_WORD_LENGTH = 40;
+
+const STOP_WORDS = new Set([
+    'a', 'an', 'and', 'are', 'as', 'at', 'by', 'for', 'from', 'in', 'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with',
+]);
+
+/** Term weights used to score a query word against a document (best tier wins). */
+export const TERM_WEIGHTS = { t: 8, p: 4, b: 2, f: 1 } as const;
+
+export function normalize(text: string): string {
+    return text
+        .normalize('NFKD')
+        .replace(/[\u0300-\u036f]/g, '')
+        .toLowerCase()
+        .replace(/[^a-z0-9]+/g, ' ')
+        .trim();
+}
+
+/** Distinct words of `text`, without stop words. */
+export function tokenize(text: string): string[] {
+    const words = normalize(text).split(' ').filter(word => word && word.length <= MAX_WORD_LENGTH && !STOP_WORDS.has(word));
+    return Array.from(new Set(words));
+}
+
+function deletions(word: string): string[] {
+    const result: string[] = [];
+    for (let i = 0; i < word.length; i++) result.push(word.slice(0, i) + word.slice(i + 1));
+    return result;
+}
+
+/** Index terms for a document's title-like (`primary`) and body (`secondary`) text. */
+export function documentTerms(primary: (string | undefined | null)[], secondary: (string | undefined | null)[] = []): string[] {
+    const terms = new Set<string>();
+    for (const word of tokenize(primary.filter(Boolean).join(' '))) {
+        terms.add(`t:${word}`);
+        for (let length = MIN_PREFIX; length < Math.min(word.length, MAX_PREFIX + 1); length++) {
+            terms.add(`p:${word.slice(0, length)}`);
+        }
+        if (word.length >= FUZZY_MIN_LENGTH) {
+            for (const deletion of deletions(word)) terms.add(`f:${deletion}`);
+        }
+    }
+    for (const word of tokenize(secondary.filter(Boolean).join(' '))) {
+        if (!terms.has(`t:${word}`)) terms.add(`b:${word}`);
+    }
+    return Array.from(terms);
+}
+
+/** Terms any of which lets a document match the query word `word`. */
+export function queryKeys(word: string): string[] {
+    const keys = [`t:${word}`, `b:${word}`];
+    if (word.length <= MAX_PREFIX) keys.push(`p:${word}`);
+    if (word.length >= FUZZY_MIN_LENGTH) {
+        // word has an extra letter (t:), is missing one (f:word), or has one wrong (f:).
+        keys.push(`f:${word}`);
+        for (const deletion of deletions(word)) keys.push(`t:${deletion}`, `f:${deletion}`);
+    }
+    return Array.from(new Set(keys));
+}
@@ -2,6 +2,7 @@ import { Order } from '@/lib/models/Order';
 import Product from '@/lib/models/Product';
 import User from '@/lib/models/User';
 import { DownloadToken } from '@/lib/models/DownloadToken';
+import { productFileKey } from './downloadToken';
 import { LicenseKey } from '@/lib/models/LicenseKey';
 import { connectToDatabase } from '@/lib/db/mongodb';
 import { sendDownloadInstructionsEmail, sendPaymentConfirmationEmail } from './email';
@@ -173,6 +174,7 @@ export class DigitalDeliveryService {
             token: require('crypto').randomUUID(),
             orderId: order._id,
             productId: product._id,
+            fileKey: productFileKey(product),
             userId: order.userId,
             downloadCount: 0,
             maxDownloads: product.downloadLimit || 3,
@@ -10,7 +10,8 @@ export async function generateDownloadToken(
     orderId: string,
     productId: string,
     maxDownloads: number = 3,
-    expiryDays: number = 30
+    expiryDays: number = 30,
+    fileKey?: string
 ): Promise<IDownloadToken> {
     const token = crypto.randomBytes(32).toString('hex');
     const expiresAt = new Date();
@@ -20,6 +21,7 @@ export async function generateDownloadToken(
         token,
         orderId,
         productId,
+        fileKey,
         maxDownloads,
         downloadCount: 0,
         expiresAt,
@@ -27,6 +29,50 @@ export async function generateDownloadToken(
     });
 }
 
+/**
+ * The storage key a download token serves for a product: the main file,
+ * else the first file, else the legacy single-file fields.
+ */
+export function productFileKey(product: {
+    files?: Array<{ key?: string; isMain?: boolean }>;
+    digitalFileUrl?: string;
+    previewFileKey?: string;
+}): string | undefined {
+    if (product.files && product.files.length > 0) {
+        return product.files.find(f => f.isMain)?.key || product.files[0].key;
+    }
+    return product.digitalFileUrl || product.previewFileKey;
+}
+
+/**
+ * Redeem one download in a single round trip: the filter checks the token is
+ * active, unexpired and under its limit; the pipeline update increments the
+ * count, records the download and deactivates the token on its last use.
+ * Concurrent requests can never push downloadCount past maxDownloads.
+ * Returns null when the token cannot be redeemed.
+ */
+export async function redeemDownloadToken(tokenString: string, ip: string) {
+    return DownloadToken.findOneAndUpdate(
+        {
+            token: tokenString,
+            isActive: true,
+            expiresAt: { $gt: new Date() },
+            $expr: { $lt: ['$downloadCount', '$maxDownloads'] }
+        },
+        [
+            {
+                $set: {
+                    downloadCount: { $add: ['$downloadCount', 1] },
+                    lastDownloadedAt: '$$NOW',
+                    lastUsedIp: { $literal: ip }
+                }
+            },
+            { $set: { isActive: { $lt: ['$downloadCount', '$maxDownloads'] } } }
+        ],
+        { new: true, projection: { productId: 1, fileKey: 1, downloadCount: 1, maxDownloads: 1 } }
+    ).lean();
+}
+
 /**
  * Validate download token and check limits
  * Returns null if invalid/expired, otherwise returns token document
@@ -1,6 +1,7 @@
 import axios from 'axios';
 
-const GRAPH_BASE_URL = 'https://graph.facebook.com';
+// META_GRAPH_BASE_URL points at a local stand-in (testsprite_tests/harness/standin.py) for perf runs.
+const GRAPH_BASE_URL = process.env.META_GRAPH_BASE_URL || 'https://graph.facebook.com';
 const VERSION = process.env.META_GRAPH_VERSION || 'v19.0';
 
 interface MetaMessageResponse {
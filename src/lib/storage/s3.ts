@@ -2,6 +2,7 @@ import { S3Client } from '@aws-sdk/client-s3';
 import { getSignedUrl } from '@aws-sdk/s3-request-presigner';
 import { getSignedUrl as getCloudFrontSignedUrl } from '@aws-sdk/cloudfront-signer';
 import { createPresignedPost } from '@aws-sdk/s3-presigned-post';
+import { createMemoryCache } from '@/lib/cache/memory-cache';
 
 export const s3Client = new S3Client({
     region: process.env.AWS_REGION || 'ap-south-1',
@@ -51,6 +52,20 @@ export async function getDownloadUrl(key: string, expiresIn = 3 * 24 * 3600) {
     return await getSignedUrl(s3Client, command, { expiresIn });
 }
 
+/** Lifetime of the download links handed out by /api/download/[token]. */
+const DOWNLOAD_LINK_SECONDS = 900;
+// Each link is reused for 5 minutes, so it stays valid for at least 10 more.
+const downloadLinks = createMemoryCache<string>(5 * 60 * 1000, { maxEntries: 10_000 });
+
+/**
+ * A 15-minute signed download URL for `key`, shared by everyone downloading
+ * the same file within 5 minutes, so a launch burst signs each file once.
+ * The download token still decides who is given the URL.
+ */
+export function getCachedDownloadUrl(key: string): Promise<string> {
+    return downloadLinks.get(key, () => getDownloadUrl(key, DOWNLOAD_LINK_SECONDS));
+}
+
 export function getPublicUrl(key: string): string {
     if (process.env.CLOUDFRONT_DOMAIN) {
         return `https://${process.env.CLOUDFRONT_DOMAIN}/${key}`;
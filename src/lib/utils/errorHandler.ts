@@ -71,6 +71,13 @@ export function withErrorHandler<T = any>(
                 }, { status: 400 });
             }
 
+            if (error.name === 'InvalidCursorError') {
+                return NextResponse.json<APIResponse>({
+                    success: false,
+                    error: { code: 'INVALID_CURSOR', message: error.message }
+                }, { status: 400 });
+            }
+
             if (error.name === 'UnauthorizedError' || error.code === 'UNAUTHORIZED') {
                 log.warn('API Unauthorized access attempt', { message: error.message });
                 return NextResponse.json<APIResponse>({
@@ -1,5 +1,7 @@
 /**
- * Simple CSV Generator for Order Exports
+ * Simple CSV Generator for small, already-loaded tables. Full order, lead and
+ * subscriber exports are streamed by the server (see export-stream.ts); use
+ * downloadExport for those.
  */
 export function generateCSV(data: any[], columns: { header: string; key: string }[]): string {
     const headerRow = columns.map(col => `"${col.header}"`).join(',');
@@ -27,3 +29,18 @@ export function downloadCSV(csvContent: string, fileName: string) {
         document.body.removeChild(link);
     }
 }
+
+/**
+ * Download a server-side streaming export (e.g. `/api/creator/orders/export`)
+ * by pointing a link at it, so the browser writes the response straight to
+ * disk instead of holding it in memory as a Blob.
+ */
+export function downloadExport(url: string) {
+    const link = document.createElement('a');
+    link.setAttribute('href', url);
+    link.setAttribute('download', '');
+    link.style.visibility = 'hidden';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
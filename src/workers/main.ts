@@ -1,5 +1,5 @@
 import 'dotenv/config';
-import { connectToDatabase } from '@/lib/db/mongodb';
+import { connectToDatabase, setPoolRole } from '@/lib/db/mongodb';
 import { mailQueue, whatsappQueue, instagramQueue } from '@/lib/queue';
 import { Worker, Job } from 'bullmq';
 import IORedis from 'ioredis';
@@ -11,6 +11,7 @@ const connection = new IORedis(process.env.REDIS_URL || 'redis://localhost:6379'
 });
 
 async function startWorker() {
+    setPoolRole('worker');
     await connectToDatabase();
     console.log('[Worker] MongoDB connected');
 
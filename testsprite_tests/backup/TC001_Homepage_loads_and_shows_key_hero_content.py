@@ -1,37 +1,19 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+from harness.browser_pool import browser_context
+from harness.steps import Steps
 
+async def run_test():
+    # Get a fresh, isolated context from the shared warm browser pool
+    async with browser_context() as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await steps.goto("/")
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -39,15 +21,6 @@ async def run_test():
         await expect(frame.locator('text=Get Started').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Sign In').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Terms').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
 
 asyncio.run(run_test())
     
\ No newline at end of file
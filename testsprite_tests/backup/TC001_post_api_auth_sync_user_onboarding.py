@@ -1,13 +1,8 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-HEADERS = {
-    "X-Test-Secret": "v3ry-s3cr3t-t3st-v4lu3",
-    "Content-Type": "application/json"
-}
+from harness.client import api_session
 
 def test_post_api_auth_sync_user_onboarding():
-    url = f"{BASE_URL}/api/auth/sync"
     payload = {
         # Sample user onboarding sync payload with realistic fields
         "username": "testuser123",
@@ -20,7 +15,7 @@ def test_post_api_auth_sync_user_onboarding():
     }
 
     try:
-        response = requests.post(url, json=payload, headers=HEADERS, timeout=30)
+        response = api_session().post("/api/auth/sync", json=payload)
         response.raise_for_status()
     except requests.RequestException as e:
         assert False, f"Request failed: {e}"
@@ -1,32 +1,23 @@
 import requests
 import time
 
-BASE_URL = "http://localhost:3000"
+from harness.client import api_session
+
 VERIFY_PHONE_ENDPOINT = "/api/auth/verify-phone"
-TIMEOUT = 30
 
 def test_post_api_auth_verify_phone_otp_validation():
-    session = requests.Session()
+    session = api_session(authenticated=False)
     phone_number = "+919876543210"
     correct_otp = "123456"
     incorrect_otps = ["000000", "111111", "222222"]
 
-    headers = {
-        "Content-Type": "application/json"
-    }
-
     # 1. Test correct OTP acceptance
     payload_correct = {
         "phone": phone_number,
         "otp": correct_otp
     }
     try:
-        response = session.post(
-            BASE_URL + VERIFY_PHONE_ENDPOINT,
-            json=payload_correct,
-            headers=headers,
-            timeout=TIMEOUT
-        )
+        response = session.post(VERIFY_PHONE_ENDPOINT, json=payload_correct)
         assert response.status_code == 200, f"Expected 200 OK for correct OTP, got {response.status_code}"
         json_resp = response.json()
         assert "success" in json_resp and isinstance(json_resp["success"], bool), "Missing or invalid 'success' in response"
@@ -41,12 +32,7 @@ def test_post_api_auth_verify_phone_otp_validation():
             "otp": wrong_otp
         }
         try:
-            response = session.post(
-                BASE_URL + VERIFY_PHONE_ENDPOINT,
-                json=payload_wrong,
-                headers=headers,
-                timeout=TIMEOUT
-            )
+            response = session.post(VERIFY_PHONE_ENDPOINT, json=payload_wrong)
             # Expected: 400 or 401 or 422 for invalid OTP depending on implementation
             assert response.status_code in (400, 401, 422), f"Expected error status for wrong OTP, got {response.status_code}"
             json_resp = response.json()
@@ -67,12 +53,7 @@ def test_post_api_auth_verify_phone_otp_validation():
             "otp": lockout_trigger_otp
         }
         try:
-            response = session.post(
-                BASE_URL + VERIFY_PHONE_ENDPOINT,
-                json=payload_lockout,
-                headers=headers,
-                timeout=TIMEOUT
-            )
+            response = session.post(VERIFY_PHONE_ENDPOINT, json=payload_lockout)
             if attempt < 3:
                 # Expect normal error response
                 assert response.status_code in (400, 401, 422), f"Expected error for failed OTP attempt {attempt+1}, got {response.status_code}"
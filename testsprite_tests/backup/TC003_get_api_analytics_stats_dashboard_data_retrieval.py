@@ -1,15 +1,10 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-HEADERS = {
-    "X-Test-Secret": "v3ry-s3cr3t-t3st-v4lu3"
-}
-TIMEOUT = 30
+from harness.client import api_session
 
 def test_get_api_analytics_stats_dashboard_data_retrieval():
-    url = f"{BASE_URL}/api/creator/analytics/summary"
     try:
-        response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
+        response = api_session().get("/api/creator/analytics/summary")
         response.raise_for_status()
     except requests.RequestException as e:
         assert False, f"Request failed: {e}"
@@ -1,21 +1,14 @@
 import requests
 
+from harness.client import api_session
+
 def test_get_api_products_storefront_product_listing():
-    base_url = "http://localhost:3000"
     endpoint = "/api/products"
-    headers = {
-        "X-Test-Secret": "v3ry-s3cr3t-t3st-v4lu3"
-    }
     params = {
         "creatorId": "65db8d9f1234567890abcdef"
     }
     try:
-        response = requests.get(
-            url=f"{base_url}{endpoint}",
-            headers=headers,
-            params=params,
-            timeout=30
-        )
+        response = api_session().get(endpoint, params=params)
         response.raise_for_status()
     except requests.RequestException as e:
         assert False, f"Request to {endpoint} failed: {e}"
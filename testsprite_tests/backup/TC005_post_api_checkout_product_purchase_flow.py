@@ -1,18 +1,11 @@
-import requests
-
-BASE_URL = "http://localhost:3000"
-HEADERS = {
-    "X-Test-Secret": "v3ry-s3cr3t-t3st-v4lu3",
-    "Content-Type": "application/json"
-}
-TIMEOUT = 30
+from harness.client import api_session
 
 
 def test_post_api_checkout_product_purchase_flow():
     # Step 1: Get the list of products
-    products_url = f"{BASE_URL}/api/products"
+    client = api_session()
     try:
-        products_response = requests.get(products_url, headers=HEADERS, timeout=TIMEOUT)
+        products_response = client.get("/api/products")
         assert products_response.status_code == 200, f"Expected 200 OK, got {products_response.status_code}"
         products = products_response.json()
         assert isinstance(products, list) and len(products) > 0, "Product list is empty or not a list"
@@ -32,11 +25,9 @@ def test_post_api_checkout_product_purchase_flow():
         "amount": 100  # Assuming amount in smallest currency unit (e.g. paise)
     }
 
-    create_order_url = f"{BASE_URL}/api/checkout"
-
     try:
         # Step 2: POST to create order/checkout
-        order_response = requests.post(create_order_url, json=payload, headers=HEADERS, timeout=TIMEOUT)
+        order_response = client.post("/api/checkout", json=payload)
         assert order_response.status_code == 200, f"Expected 200 OK, got {order_response.status_code}"
         order_json = order_response.json()
         assert order_json.get("success") is True, "Order response success flag is not True"
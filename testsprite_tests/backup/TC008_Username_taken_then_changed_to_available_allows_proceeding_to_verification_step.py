@@ -1,110 +1,83 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+from harness.browser_pool import browser_context
+from harness.steps import Steps
 
+async def run_test():
+    # Get a fresh, isolated context from the shared warm browser pool
+    async with browser_context() as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await steps.goto("/")
         
         # -> Navigate to /signup (http://localhost:3000/signup) as the explicit step requires.
-        await page.goto("http://localhost:3000/signup", wait_until="commit", timeout=10000)
+        await steps.goto("/signup")
         
         # -> Type 'creatorly' into the username field to trigger the real-time availability check.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('creatorly')
+        await steps.fill(elem, 'creatorly')
         
         # -> Trigger username availability validation by blurring the username field (click full name input), wait briefly, and then search the page again for the text 'Username taken'.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # -> Type 'e2ecreatorlyuser02' into the username field and trigger validation to check for an 'Available' indicator
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('e2ecreatorlyuser02')
+        await steps.fill(elem, 'e2ecreatorlyuser02')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # -> Dismiss cookie banner, fill Full Name, Phone, Email, Password, click 'Create your account', then verify the page shows 'Verification code'.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/div[2]/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Creator')
+        await steps.fill(elem, 'Test Creator')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('9999999999')
+        await steps.fill(elem, '9999999999')
         
         # -> Fill the Email and Password fields, click 'Create your account', then verify that the text 'Verification code' appears on the resulting page.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('e2e_user02@example.com')
+        await steps.fill(elem, 'e2e_user02@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassword123!')
+        await steps.fill(elem, 'ValidPassword123!')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Username taken').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Available').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Verification code').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
 
 asyncio.run(run_test())
     
\ No newline at end of file
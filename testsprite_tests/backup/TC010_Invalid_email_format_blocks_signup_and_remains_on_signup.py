@@ -1,110 +1,83 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+from harness.browser_pool import browser_context
+from harness.steps import Steps
 
+async def run_test():
+    # Get a fresh, isolated context from the shared warm browser pool
+    async with browser_context() as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await steps.goto("/")
         
         # -> Click the 'Get Started' link (index 111) to navigate to the signup page.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/header/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # -> Click the 'Start Free for 14 Days' link (index 146) to navigate to the signup page (prefer clicking an on-page link over direct navigation).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[3]/section[1]/div[3]/div/div[1]/div[2]/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # -> Dismiss the cookie banner, enter the username 'e2ecreatorlyuser04', wait for validation, and check whether the text 'Available' appears on the page.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/div/div/button[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/main/div/form/div[1]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('e2ecreatorlyuser04')
+        await steps.fill(elem, 'e2ecreatorlyuser04')
         
         # -> Navigate to /signup (http://localhost:3000/signup) as the next immediate action.
-        await page.goto("http://localhost:3000/signup", wait_until="commit", timeout=10000)
+        await steps.goto("/signup")
         
         # -> Type the test values into the signup form fields (username, full name, phone, email (invalid), password), submit the form (press Enter) and check for the validation message 'Enter a valid email'.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('e2ecreatorlyuser04')
+        await steps.fill(elem, 'e2ecreatorlyuser04')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Creator')
+        await steps.fill(elem, 'Test Creator')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('9999999999')
+        await steps.fill(elem, '9999999999')
         
         # -> Type 'not-an-email' into the email field, type 'ValidPassword123!' into the password field, click 'Create your account', then check for the validation message 'Enter a valid email' and ensure the URL still contains '/signup'.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('not-an-email')
+        await steps.fill(elem, 'not-an-email')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassword123!')
+        await steps.fill(elem, 'ValidPassword123!')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Available').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Enter a valid email').first).to_be_visible(timeout=3000)
         assert '/signup' in frame.url
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
 
 asyncio.run(run_test())
     
\ No newline at end of file
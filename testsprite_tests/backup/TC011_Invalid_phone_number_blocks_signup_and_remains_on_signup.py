@@ -1,99 +1,72 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+from harness.browser_pool import browser_context
+from harness.steps import Steps
 
+async def run_test():
+    # Get a fresh, isolated context from the shared warm browser pool
+    async with browser_context() as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await steps.goto("/")
         
         # -> Click the 'Get Started' link/button (interactive element index 111) to reach the signup page.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/header/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # -> Navigate to /signup using the explicit navigate action (http://localhost:3000/signup). ASSERTION: The next action will navigate to /signup as required by the test step.
-        await page.goto("http://localhost:3000/signup", wait_until="commit", timeout=10000)
+        await steps.goto("/signup")
         
         # -> Click the cookie banner 'Accept' button to remove overlay, then fill the signup form fields in this order: username, full name, phone (invalid value '123'), email, password. After filling, scroll down to reveal the 'Create your account' button so it can be clicked in the next step. ASSERTION: After filling the username, verify the UI shows the availability status ('Available').
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/div[2]/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('e2ecreatorlyuser05')
+        await steps.fill(elem, 'e2ecreatorlyuser05')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[3]/div[1]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Creator')
+        await steps.fill(elem, 'Test Creator')
         
         # -> Type '123' into the phone field (index 1655) as the immediate next action to trigger phone validation.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[3]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123')
+        await steps.fill(elem, '123')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('e2e_user05@example.com')
+        await steps.fill(elem, 'e2e_user05@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassword123!')
+        await steps.fill(elem, 'ValidPassword123!')
         
         # -> Click the 'Create your account' button (index 1663) to trigger validation and check for the phone number error message.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[2]/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Available').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Enter a valid phone').first).to_be_visible(timeout=3000)
         assert '/signup' in frame.url
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
 
 asyncio.run(run_test())
     
\ No newline at end of file
@@ -1,81 +1,63 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+from harness.browser_pool import browser_context
+from harness.steps import Steps
 
+async def run_test():
+    # Get a fresh, isolated context from the shared warm browser pool
+    async with browser_context() as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await steps.goto("/")
         
         # -> Click the 'Get Started' link to open the signup page (use element index 111).
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/header/div/div[2]/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # -> Click the page element that should open the signup flow (Click 'Start Free for 14 Days' at index 146) to navigate to the signup page.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/div[3]/section[1]/div[3]/div/div[1]/div[2]/a[1]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # -> Dismiss the cookie banner, fill the available signup fields (username, full name, email), then submit 'Create Account' to reach the verification screen. After the page updates, verify the verification UI and continue with entering an invalid code.
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/main/div/form/div[1]/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('e2ecreatorlyuser07')
+        await steps.fill(elem, 'e2ecreatorlyuser07')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/main/div/form/div[1]/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Creator')
+        await steps.fill(elem, 'Test Creator')
         
         # -> Fill the Email and Password fields then submit the Create Account form to reach the verification screen (inputs: index 1241 email, index 1252 password, click index 1276 Create Account).
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/main/div/form/div[1]/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('e2e_user07@example.com')
+        await steps.fill(elem, 'e2e_user07@example.com')
         
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/main/div/form/div[1]/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassword123!')
+        await steps.fill(elem, 'ValidPassword123!')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/main/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -83,15 +65,6 @@ async def run_test():
         await expect(frame.locator('text=Verification code').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Invalid code').first).to_be_visible(timeout=3000)
         await expect(frame.locator('text=Verification code').first).to_be_visible(timeout=3000)
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
 
 asyncio.run(run_test())
     
\ No newline at end of file
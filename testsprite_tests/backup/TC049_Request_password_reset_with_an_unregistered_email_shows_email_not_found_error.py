@@ -1,51 +1,33 @@
 import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
+from harness.browser_pool import browser_context
+from harness.steps import Steps
 
+async def run_test():
+    # Get a fresh, isolated context from the shared warm browser pool
+    async with browser_context() as context:
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page)
 
         # Interact with the page elements to simulate user flow
         # -> Navigate to http://localhost:3000
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await steps.goto("/")
         
         # -> Navigate to /auth/forgot-password (http://localhost:3000/auth/forgot-password) to begin the forgot-password test.
-        await page.goto("http://localhost:3000/auth/forgot-password", wait_until="commit", timeout=10000)
+        await steps.goto("/auth/forgot-password")
         
         # -> Type the unregistered email into the email field, submit the form, then check for the 'email not found' message and verify the URL still contains '/auth/forgot-password'.
         frame = context.pages[-1]
         # Input text
         elem = frame.locator('xpath=/html/body/div[2]/main/div/main/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('not-a-user-999999@example.com')
+        await steps.fill(elem, 'not-a-user-999999@example.com')
         
         frame = context.pages[-1]
         # Click element
         elem = frame.locator('xpath=/html/body/div[2]/main/div/main/div/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem)
         
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -53,15 +35,6 @@ async def run_test():
         assert await frame.locator('xpath=/html/body/div[2]/main/div/main/div/div/form/div/input').is_visible()
         assert "/auth/forgot-password" in frame.url
         raise AssertionError("Expected error text 'email not found' not found on the page. Available elements do not include an element containing that text.")
-        await asyncio.sleep(5)
-
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
 
 asyncio.run(run_test())
     
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""Execution harness for the generated TestSprite TCxxx scripts.
+
+Run the whole suite from the ``testsprite_tests`` directory with::
+
+    python -m harness --workers 8
+"""
@@ -0,0 +1,180 @@
+"""Throughput benchmark for chunked email broadcasts (``email_broadcast``).
+
+Creates an EmailCampaign with synthetic recipients in the stand-in MongoDB,
+queues its ``email_broadcast`` job and runs ``worker.ts`` against the fake
+Resend API until the campaign is ``sent``::
+
+    python -m harness.broadcast_bench --recipients 20000 --chunk-size 500 --send-concurrency 10
+
+The broadcast job fans out into ``email_broadcast_chunk`` jobs; progress is
+read from the campaign's ``delivery`` checkpoints. ``--kill-after 5`` kills
+the worker mid-send, expires its job leases and starts it again, to check
+that the retry resumes from the checkpoints: ``duplicates`` in the report is
+how many emails the fake Resend received beyond one per recipient.
+
+The report - emails/s, failures, duplicates and a per-second progress
+timeline - goes to ``tmp/broadcast_bench.json``.
+"""
+import argparse
+import json
+import signal
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness.config import TMP_DIR
+from harness.queue_bench import WORKER_COMMAND, worker
+from harness.standin import CREATOR_ID, StandIn
+
+REPORT_PATH = TMP_DIR / "broadcast_bench.json"
+WORKER_LOG = TMP_DIR / "broadcast_bench.worker.log"
+
+
+def create_campaign(db, recipients):
+    """Insert a queued campaign plus its ``email_broadcast`` job; return the campaign id."""
+    from bson import ObjectId
+
+    now = datetime.now(timezone.utc)
+    campaign_id = ObjectId()
+    db["emailcampaigns"].insert_one({
+        "_id": campaign_id,
+        "creatorId": ObjectId(CREATOR_ID),
+        "name": "Broadcast benchmark",
+        "subject": "Broadcast benchmark",
+        "content": "<p>Hi {{name}}, this is a broadcast benchmark.</p>",
+        "status": "queued",
+        "recipients": [f"broadcast-bench-{i}@example.test" for i in range(recipients)],
+        "stats": {"sent": 0, "delivered": 0, "opened": 0, "clicked": 0, "bounced": 0, "unsubscribed": 0},
+        "createdAt": now,
+        "updatedAt": now,
+    })
+    db["queuejobs"].insert_one({
+        "type": "email_broadcast",
+        "payload": {"campaignId": str(campaign_id), "creatorId": CREATOR_ID},
+        "status": "pending",
+        "attempt": 0,
+        "maxAttempts": 5,
+        "nextRunAt": now,
+        "createdAt": now,
+        "updatedAt": now,
+    })
+    return campaign_id
+
+
+def progress(db, campaign_id):
+    campaign = db["emailcampaigns"].find_one(
+        {"_id": campaign_id}, {"status": 1, "stats.sent": 1, "delivery.failed": 1, "delivery.chunksCompleted": 1,
+                               "delivery.chunksTotal": 1},
+    )
+    delivery = campaign.get("delivery") or {}
+    return {
+        "status": campaign["status"],
+        "sent": campaign.get("stats", {}).get("sent", 0),
+        "failed": delivery.get("failed", 0),
+        "chunks": f"{delivery.get('chunksCompleted', 0)}/{delivery.get('chunksTotal', '?')}",
+    }
+
+
+def wait_for(db, campaign_id, until, timeout, started, timeline, on_tick=None):
+    """Poll the campaign until ``until(state)``; append to ``timeline``."""
+    while True:
+        elapsed = time.monotonic() - started
+        state = progress(db, campaign_id)
+        timeline.append({"t": round(elapsed, 1), **state})
+        if on_tick:
+            on_tick(elapsed, state)
+        if until(state, elapsed):
+            return elapsed, state
+        if elapsed > timeout:
+            raise TimeoutError(f"campaign still {state['status']} after {timeout:.0f}s ({state})")
+        time.sleep(0.5)
+
+
+def expire_leases(db, campaign_id):
+    """Make the killed worker's chunk jobs claimable now instead of after the lease."""
+    db["queuejobs"].update_many(
+        {"payload.campaignId": str(campaign_id), "status": "processing"},
+        {"$set": {"status": "pending", "nextRunAt": datetime.now(timezone.utc)}},
+    )
+
+
+def run_once(db, api, env, recipients, command=WORKER_COMMAND, kill_after=None, timeout=3600, on_tick=None):
+    campaign_id = create_campaign(db, recipients)
+    emails_before = api.stats().get("resend.emails", 0)
+    timeline, restarts = [], 0
+    started = time.monotonic()
+
+    if kill_after:
+        with worker(env, command, WORKER_LOG) as process:
+            wait_for(db, campaign_id, lambda state, elapsed: state["status"] == "sent" or elapsed >= kill_after,
+                     timeout, started, timeline, on_tick)
+            process.send_signal(signal.SIGKILL)
+        expire_leases(db, campaign_id)
+        restarts = 1
+
+    with worker(env, command, WORKER_LOG if not kill_after else WORKER_LOG.with_suffix(".restart.log")):
+        seconds, state = wait_for(db, campaign_id, lambda state, elapsed: state["status"] == "sent",
+                                  timeout, started, timeline, on_tick)
+
+    emails = api.stats().get("resend.emails", 0) - emails_before
+    db["queuejobs"].delete_many({"payload.campaignId": str(campaign_id)})
+    db["emailcampaigns"].delete_one({"_id": campaign_id})
+    return {
+        "recipients": recipients,
+        "restarts": restarts,
+        # Includes worker startup, as a deploy would.
+        "seconds": round(seconds, 2),
+        "emails_per_second": round(recipients / seconds, 1) if seconds else None,
+        "sent": state["sent"],
+        "failed": state["failed"],
+        "resend_requests": emails,
+        "duplicates": max(emails - recipients, 0),
+        "timeline": timeline,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.broadcast_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--recipients", type=int, default=20_000)
+    parser.add_argument("--chunk-size", type=int, default=500, help="BROADCAST_CHUNK_SIZE")
+    parser.add_argument("--send-concurrency", type=int, default=10, help="BROADCAST_SEND_CONCURRENCY per chunk")
+    parser.add_argument("--concurrency", type=int, default=16, help="QUEUE_CONCURRENCY")
+    parser.add_argument("--latency-ms", type=float, default=50, help="fake Resend latency per email")
+    parser.add_argument("--kill-after", type=float, help="kill and restart the worker after this many seconds")
+    parser.add_argument("--worker", default=WORKER_COMMAND, help="command that starts the worker")
+    parser.add_argument("--timeout", type=float, default=3600, help="give up after this many seconds")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    from pymongo import MongoClient
+
+    with StandIn(latency_ms=args.latency_ms) as standin, MongoClient(standin.mongo.uri) as client:
+        env = {
+            **standin.env,
+            "QUEUE_CONCURRENCY": str(args.concurrency),
+            "BROADCAST_CHUNK_SIZE": str(args.chunk_size),
+            "BROADCAST_SEND_CONCURRENCY": str(args.send_concurrency),
+        }
+
+        def on_tick(elapsed, state):
+            print(f"\r  {elapsed:7.1f}s  {state}", end="", flush=True)
+
+        result = run_once(client.get_default_database(), standin.api, env, args.recipients, args.worker,
+                          args.kill_after, args.timeout, on_tick)
+
+    print(f"\n{args.recipients} recipients sent in {result['seconds']}s ({result['emails_per_second']} emails/s, "
+          f"{result['failed']} failed, {result['duplicates']} duplicates)", flush=True)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "latency_ms": args.latency_ms,
+        "chunk_size": args.chunk_size,
+        "send_concurrency": args.send_concurrency,
+        "queue_concurrency": args.concurrency,
+        **result,
+    }, indent=2) + "\n", encoding="utf-8")
+    return 0 if result["failed"] == 0 and result["sent"] == args.recipients else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
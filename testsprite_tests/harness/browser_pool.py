@@ -0,0 +1,170 @@
+"""Warm Chromium pool shared by the Playwright UI cases.
+
+Launching Chromium dominates the runtime of the short UI cases, so a worker
+keeps ``size`` browsers running and hands every case a fresh, isolated
+``BrowserContext`` on one of them. Cases that need a signed-in creator ask
+for ``authenticated=True`` and start from a saved Clerk storage state, so
+the login form is filled once per worker rather than once per case.
+
+Generated scripts only use :func:`browser_context`::
+
+    async with browser_context(authenticated=True) as context:
+        page = await context.new_page()
+
+When the runner has installed a pool (see :func:`install`) the context comes
+from it; when a script is run on its own a single throwaway browser is used.
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+from harness.config import BASE_URL, TMP_DIR
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+DEFAULT_TIMEOUT_MS = 5000
+STORAGE_STATE_PATH = TMP_DIR / "auth" / "storage_state.json"
+# Clerk sessions outlive this comfortably; re-login after an hour anyway so a
+# stale file from yesterday's run is never reused.
+STORAGE_STATE_MAX_AGE = float(os.environ.get("TESTSPRITE_AUTH_MAX_AGE", 3600))
+
+EMAIL_SELECTORS = [
+    'input[type="email"]',
+    'input[name="identifier"]',
+    'input[name="emailAddress"]',
+    ".cl-formFieldInput__identifier",
+]
+PASSWORD_SELECTORS = [
+    'input[type="password"]',
+    'input[name="password"]',
+    ".cl-formFieldInput__password",
+]
+
+_active_pool = None
+
+
+class BrowserPool:
+    """A fixed set of warm browsers handing out fresh contexts."""
+
+    def __init__(self, size=1, headless=True):
+        self.size = size
+        self.headless = headless
+        self._playwright = None
+        self._browsers = []
+        self._idle = None
+        self._login_lock = asyncio.Lock()
+
+    async def start(self):
+        self._playwright = await async_playwright().start()
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            browser = await self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+            self._browsers.append(browser)
+            self._idle.put_nowait(browser)
+        return self
+
+    async def close(self):
+        for browser in self._browsers:
+            await browser.close()
+        self._browsers = []
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @asynccontextmanager
+    async def context(self, authenticated=False):
+        """Yield a new isolated context, signed in if ``authenticated``."""
+        storage_state = str(await self.storage_state()) if authenticated else None
+        browser = await self._idle.get()
+        context = None
+        try:
+            context = await browser.new_context(storage_state=storage_state)
+            context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+            yield context
+        finally:
+            if context:
+                await context.close()
+            self._idle.put_nowait(browser)
+
+    async def storage_state(self):
+        """Return the path of a fresh signed-in storage state, logging in if needed."""
+        async with self._login_lock:
+            if _is_fresh(STORAGE_STATE_PATH):
+                return STORAGE_STATE_PATH
+            browser = await self._idle.get()
+            try:
+                await _login(browser, STORAGE_STATE_PATH)
+            finally:
+                self._idle.put_nowait(browser)
+            return STORAGE_STATE_PATH
+
+
+def _is_fresh(path):
+    try:
+        return time.time() - path.stat().st_mtime < STORAGE_STATE_MAX_AGE
+    except OSError:
+        return False
+
+
+async def _fill_first_visible(page, selectors, value):
+    for selector in selectors:
+        field = page.locator(selector).first
+        if await field.is_visible():
+            await field.fill(value)
+            return
+    raise RuntimeError(f"No visible login field matched {selectors}")
+
+
+async def _login(browser, path):
+    email = os.environ.get("TEST_USER_EMAIL")
+    password = os.environ.get("TEST_USER_PASSWORD")
+    if not email or not password:
+        raise RuntimeError("TEST_USER_EMAIL and TEST_USER_PASSWORD must be set for authenticated UI cases")
+
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        await page.goto(f"{BASE_URL}/auth/login", wait_until="domcontentloaded", timeout=30000)
+        await page.locator(",".join(EMAIL_SELECTORS)).first.wait_for(state="visible", timeout=15000)
+        await _fill_first_visible(page, EMAIL_SELECTORS, email)
+        await _fill_first_visible(page, PASSWORD_SELECTORS, password)
+        await page.locator('button[type="submit"]').first.click()
+        await page.wait_for_url("**/dashboard**", timeout=30000)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so parallel workers never read a half-written file.
+        partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        await context.storage_state(path=str(partial))
+        os.replace(partial, path)
+    finally:
+        await context.close()
+
+
+def install(pool):
+    """Make ``pool`` the one :func:`browser_context` draws from."""
+    global _active_pool
+    _active_pool = pool
+
+
+@asynccontextmanager
+async def browser_context(authenticated=False):
+    """Yield a fresh context from the installed pool, or from a throwaway browser."""
+    if _active_pool is not None:
+        async with _active_pool.context(authenticated=authenticated) as context:
+            yield context
+        return
+
+    async with BrowserPool(size=1) as pool:
+        async with pool.context(authenticated=authenticated) as context:
+            yield context
@@ -0,0 +1,221 @@
+"""Enforce the latency budgets written in ``performance_specs.yaml``.
+
+Each spec whose steps name a route and a ``< N ms``/``under N s`` limit
+becomes a :class:`Budget`. The engine warms the route up, takes ``N``
+measured samples, and fails when any enforced percentile is over budget::
+
+    python -m harness.budgets --iterations 50 --percentile p95 --percentile p99
+
+API budgets are measured over the keep-alive :func:`harness.client.api_session`
+so they reflect server time rather than TCP setup; page budgets (e.g. the
+dashboard) are measured as navigation-to-``load`` in a pooled browser.
+Specs that are not latency limits (Lighthouse score, concurrency) are
+reported as skipped.
+"""
+import argparse
+import asyncio
+import json
+import math
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import yaml
+
+from harness.config import BASE_URL, SUITE_DIR, TMP_DIR
+
+SPECS_PATH = SUITE_DIR / "performance_specs.yaml"
+REPORT_PATH = TMP_DIR / "perf_budgets.json"
+PERCENTILES = ("p50", "p95", "p99")
+
+_ROUTE = re.compile(r"\b(GET|POST|PUT|PATCH|DELETE)\s+(/\S*)")
+_PAGE = re.compile(r"\s(/[\w/-]*)\s+navigation")
+_LIMIT = re.compile(r"(?:<|under)\s*([\d,.]+)\s*(ms|s)\b", re.IGNORECASE)
+
+# Request bodies for routes that need one, and how to undo what they created.
+REQUEST_BODIES = {
+    ("POST", "/api/products"): lambda i: {
+        "name": f"Perf Budget Product {i}",
+        "description": "Created by the performance budget check",
+        "price": 9999,
+        "productType": "digital",
+        "isPublished": False,
+    },
+}
+CLEANUP = {
+    ("POST", "/api/products"): lambda body: (
+        f"/api/products/{body['data']['productId']}" if body.get("data", {}).get("productId") else None
+    ),
+}
+
+
+@dataclass
+class Budget:
+    spec_id: str
+    description: str
+    kind: str  # "api" or "page"
+    method: str
+    path: str
+    limit_ms: float
+
+
+@dataclass
+class BudgetResult:
+    budget: Budget
+    samples: int
+    errors: int
+    stats: dict
+    violations: list = field(default_factory=list)
+
+    @property
+    def passed(self):
+        return not self.violations and not self.errors
+
+
+def load_budgets(path=SPECS_PATH):
+    """Return ``(budgets, skipped_spec_ids)`` parsed from a specs file."""
+    budgets, skipped = [], []
+    for spec in yaml.safe_load(path.read_text(encoding="utf-8")) or []:
+        text = f"{spec.get('Description', '')} {spec.get('Steps', '')}"
+        limit = _LIMIT.search(text)
+        route = _ROUTE.search(text)
+        page = _PAGE.search(text)
+        if not limit or not (route or page):
+            skipped.append(spec["ID"])
+            continue
+        value = float(limit.group(1).replace(",", ""))
+        limit_ms = value * 1000 if limit.group(2).lower() == "s" else value
+        if route:
+            budgets.append(Budget(spec["ID"], spec["Description"], "api", route.group(1), route.group(2), limit_ms))
+        else:
+            budgets.append(Budget(spec["ID"], spec["Description"], "page", "GET", page.group(1), limit_ms))
+    return budgets, skipped
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    if not samples:
+        return {}
+    stats = {name: round(percentile(samples, float(name[1:])), 1) for name in PERCENTILES}
+    stats.update(
+        mean=round(sum(samples) / len(samples), 1),
+        min=round(min(samples), 1),
+        max=round(max(samples), 1),
+    )
+    return stats
+
+
+def measure_api(budget, iterations, warmup):
+    """Time ``iterations`` calls to an API route; return ``(samples_ms, errors)``."""
+    from harness.client import api_session
+
+    session = api_session()
+    key = (budget.method, budget.path)
+    make_body = REQUEST_BODIES.get(key)
+    cleanup = CLEANUP.get(key)
+
+    samples, errors = [], 0
+    for i in range(warmup + iterations):
+        kwargs = {"json": make_body(i)} if make_body else {}
+        started = time.perf_counter()
+        response = session.request(budget.method, budget.path, **kwargs)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if cleanup and response.ok:
+            target = cleanup(response.json())
+            if target:
+                session.delete(target)
+        if i < warmup:
+            continue
+        if response.ok:
+            samples.append(elapsed)
+        else:
+            errors += 1
+    return samples, errors
+
+
+async def _measure_page(budget, iterations, warmup):
+    from harness.browser_pool import BrowserPool
+
+    samples, errors = [], 0
+    async with BrowserPool(size=1) as pool:
+        for i in range(warmup + iterations):
+            async with pool.context(authenticated=True) as context:
+                page = await context.new_page()
+                started = time.perf_counter()
+                response = await page.goto(f"{BASE_URL}{budget.path}", wait_until="load")
+                elapsed = (time.perf_counter() - started) * 1000
+            if i < warmup:
+                continue
+            if response is not None and response.ok and budget.path in page.url:
+                samples.append(elapsed)
+            else:
+                errors += 1
+    return samples, errors
+
+
+def measure_page(budget, iterations, warmup):
+    """Time ``iterations`` signed-in navigations to a page."""
+    return asyncio.run(_measure_page(budget, iterations, warmup))
+
+
+def check(budget, iterations=50, warmup=5, enforce=("p95",)):
+    measure = measure_page if budget.kind == "page" else measure_api
+    samples, errors = measure(budget, iterations, warmup)
+    stats = summarize(samples)
+    violations = [name for name in enforce if name in stats and stats[name] > budget.limit_ms]
+    return BudgetResult(budget, len(samples), errors, stats, violations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.budgets", description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50, help="measured samples per budget")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured calls before sampling")
+    parser.add_argument("--percentile", dest="percentiles", action="append", choices=PERCENTILES,
+                        help="percentile(s) that must stay within budget (default: p95)")
+    parser.add_argument("--only", action="append", help="only check these spec IDs")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH, help="JSON report to write")
+    args = parser.parse_args(argv)
+    enforce = tuple(args.percentiles or ("p95",))
+
+    budgets, skipped = load_budgets()
+    if args.only:
+        budgets = [budget for budget in budgets if budget.spec_id in args.only]
+
+    results = []
+    for budget in budgets:
+        result = check(budget, args.iterations, args.warmup, enforce)
+        results.append(result)
+        stats = "  ".join(f"{name}={result.stats.get(name, '-')}" for name in PERCENTILES)
+        print(
+            f"{'PASS' if result.passed else 'FAIL'}  {budget.spec_id:<13} {budget.method:<6} {budget.path:<16} "
+            f"budget={budget.limit_ms:.0f}ms  {stats}  errors={result.errors}",
+            flush=True,
+        )
+    for spec_id in skipped:
+        print(f"SKIP  {spec_id:<13} not a latency budget")
+
+    report = [
+        {**asdict(result.budget), "samples": result.samples, "errors": result.errors,
+         "stats": result.stats, "violations": result.violations, "passed": result.passed}
+        for result in results
+    ]
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps({"enforced": enforce, "results": report, "skipped": skipped}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+    return 0 if all(result.passed for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
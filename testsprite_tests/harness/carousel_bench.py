@@ -0,0 +1,146 @@
+"""Concurrent carousel DMs: delayed messages must not hold worker slots.
+
+Enqueues ``--flows`` carousel ``dm_delivery`` jobs, each a few messages with
+``delaySeconds`` between them. Then it starts the worker (``worker.ts``) on the
+stand-in with a small ``QUEUE_CONCURRENCY``, and reads back what the fake
+Graph API received::
+
+    python -m harness.carousel_bench --flows 50 --concurrency 4 --delay 2
+
+If workers slept through the delays, the flows would go through about
+``concurrency`` at a time and the run would take roughly
+``flows / concurrency * total delay``. With the delays scheduled as
+``dm_carousel_step`` jobs, every flow runs side by side. The run fails if:
+- any recipient misses a message or gets them out of order
+- two messages arrive closer together than their delay
+- the time from the first to the last message overall exceeds one flow's
+  total delay by more than ``--slack`` seconds
+
+The report goes to ``tmp/carousel_bench.json``.
+"""
+import argparse
+import json
+import math
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness.config import TMP_DIR
+from harness.queue_bench import drain, worker
+from harness.standin import CREATOR_ID, StandIn
+
+REPORT_PATH = TMP_DIR / "carousel_bench.json"
+WORKER_LOG = TMP_DIR / "carousel_bench.worker.log"
+# Scheduling jitter allowed below a message's delay (the dispatcher polls once a second when idle).
+EARLY_TOLERANCE_S = 0.05
+
+
+def carousel(messages, delay):
+    return [{"text": f"Part {i + 1}", "delaySeconds": 0 if i == 0 else delay} for i in range(messages)]
+
+
+def enqueue(db, flows, messages, delay, run_id):
+    from bson import ObjectId
+
+    # Entitlements fall back to the free plan; the stand-in seeds none.
+    db["plans"].update_one({"tier": "free"}, {"$setOnInsert": {"id": "free", "name": "Free", "isActive": True}},
+                           upsert=True)
+    now = datetime.now(timezone.utc)
+    db["queuejobs"].insert_many([
+        {
+            "type": "dm_delivery",
+            "payload": {
+                "creatorId": ObjectId(CREATOR_ID),
+                "recipientId": f"carousel-{run_id}-{i}",
+                "accessToken": "standin",
+                "platform": "instagram",
+                "messageType": "carousel",
+                "carouselMessages": carousel(messages, delay),
+                "text": "Carousel",
+                "benchmarkRun": run_id,
+            },
+            "status": "pending",
+            "attempt": 0,
+            "maxAttempts": 5,
+            "nextRunAt": now,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        for i in range(flows)
+    ])
+
+
+def check_flows(received, run_id, flows, messages, delay):
+    """Per-flow ordering and spacing problems, plus the first/last arrival times."""
+    problems, first, last = [], math.inf, 0
+    expected = [message["text"] for message in carousel(messages, delay)]
+    for i in range(flows):
+        sent = received.get(f"carousel-{run_id}-{i}", [])
+        texts = [text for _, text in sent]
+        if texts != expected:
+            problems.append(f"flow {i}: got {texts}")
+            continue
+        for (previous, _), (current, _) in zip(sent, sent[1:]):
+            if current - previous < delay - EARLY_TOLERANCE_S:
+                problems.append(f"flow {i}: messages {current - previous:.2f}s apart, delay is {delay}s")
+        first, last = min(first, sent[0][0]), max(last, sent[-1][0])
+    return problems, first, last
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.carousel_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--flows", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=3, help="messages per carousel")
+    parser.add_argument("--delay", type=float, default=2, help="delaySeconds before each message after the first")
+    parser.add_argument("--concurrency", type=int, default=4, help="QUEUE_CONCURRENCY for the worker")
+    parser.add_argument("--slack", type=float, default=5, help="allowed seconds over one flow's total delay")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    from pymongo import MongoClient
+
+    run_id = uuid.uuid4().hex[:12]
+    total_delay = args.delay * (args.messages - 1)
+    # One dm_delivery job per flow plus one dm_carousel_step per delayed message.
+    jobs = args.flows * args.messages if args.delay > 0 else args.flows
+    with StandIn() as standin, MongoClient(standin.mongo.uri) as client:
+        db = client.get_default_database()
+        enqueue(db, args.flows, args.messages, args.delay, run_id)
+        with worker({**standin.env, "QUEUE_CONCURRENCY": str(args.concurrency)}, log_path=WORKER_LOG):
+            seconds, timeline, counts = drain(db["queuejobs"], run_id, jobs, args.timeout)
+        received = standin.api.messages()
+        db["queuejobs"].delete_many({"payload.benchmarkRun": run_id})
+
+    problems, first, last = check_flows(received, run_id, args.flows, args.messages, args.delay)
+    span = last - first if last else None
+    serialized = math.ceil(args.flows / args.concurrency) * total_delay
+    passed = not problems and counts.get("failed", 0) == 0 and span is not None and span <= total_delay + args.slack
+    report = {
+        "flows": args.flows,
+        "messages": args.messages,
+        "delay_s": args.delay,
+        "concurrency": args.concurrency,
+        "drain_seconds": round(seconds, 2),
+        "send_span_seconds": round(span, 2) if span is not None else None,
+        "one_flow_delay_seconds": total_delay,
+        "serialized_estimate_seconds": serialized,
+        "jobs": counts,
+        "problems": problems[:50],
+        "passed": passed,
+        "timeline": timeline,
+    }
+    print(f"{args.flows} carousels x {args.messages} messages at concurrency {args.concurrency}: all sent within "
+          f"{report['send_span_seconds']}s (one flow's delays: {total_delay}s, serialized: ~{serialized}s), "
+          f"{counts.get('failed', 0)} failed jobs, {len(problems)} ordering/spacing problems", flush=True)
+    for problem in problems[:10]:
+        print(f"  {problem}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Shared HTTP clients for the backend API cases.
+
+Bare ``requests.get``/``requests.post`` open a new TCP connection per call.
+:func:`api_session` returns a per-thread keep-alive session that already
+knows ``BASE_URL``, the test-bypass headers and the default timeout, so a
+case only names the route::
+
+    response = api_session().get("/api/products")
+
+:func:`async_client` is the asyncio counterpart (an ``httpx.AsyncClient``)
+for cases that fan out requests concurrently::
+
+    async with async_client() as client:
+        products, orders = await asyncio.gather(
+            client.get("/api/products"), client.get("/api/orders"),
+        )
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from harness.config import BASE_URL, CRON_SECRET, TEST_EMAIL, TEST_SECRET
+
+DEFAULT_TIMEOUT = 30
+POOL_SIZE = int(os.environ.get("TESTSPRITE_HTTP_POOL_SIZE", 32))
+
+
+def auth_headers():
+    """Headers that let the API cases through the app's test bypass."""
+    headers = {
+        "x-test-secret": TEST_SECRET,
+        "Authorization": f"Bearer {TEST_SECRET}",
+    }
+    if TEST_EMAIL:
+        headers["x-test-email"] = TEST_EMAIL
+    return headers
+
+
+class ApiSession(requests.Session):
+    """``requests.Session`` rooted at ``base_url`` with a pooled adapter."""
+
+    def __init__(self, base_url=BASE_URL, authenticated=True, timeout=DEFAULT_TIMEOUT, pool_size=POOL_SIZE):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        if authenticated:
+            self.headers.update(auth_headers())
+
+    def request(self, method, url, **kwargs):
+        if url.startswith("/"):
+            url = self.base_url + url
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+_local = threading.local()
+
+
+def api_session(authenticated=True):
+    """Return this thread's shared keep-alive session."""
+    attr = "authenticated" if authenticated else "anonymous"
+    session = getattr(_local, attr, None)
+    if session is None:
+        session = ApiSession(authenticated=authenticated)
+        setattr(_local, attr, session)
+    return session
+
+
+def async_client(authenticated=True, timeout=DEFAULT_TIMEOUT, max_connections=POOL_SIZE):
+    """Return an ``httpx.AsyncClient`` with keep-alive connection limits."""
+    import httpx
+
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        headers=auth_headers() if authenticated else None,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+def _health_stats(name, session=None):
+    """One section of ``/api/platform/health``'s process stats, which need ``CRON_SECRET``."""
+    session = session or api_session(authenticated=False)
+    try:
+        response = session.get("/api/platform/health", headers={"Authorization": f"Bearer {CRON_SECRET}"})
+        return response.json().get(name)
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def cache_stats(session=None):
+    """The app's ``getCached`` counters (per-tier hits, loads, ...) from ``/api/platform/health``.
+
+    Counters are per app process; returns ``None`` if the app doesn't report them.
+    """
+    return _health_stats("cache", session)
+
+
+def pool_stats(session=None):
+    """The app's Mongo connection pool counters (in use, waiting, wait times) from ``/api/platform/health``.
+
+    Counters are per app process; returns ``None`` if the app doesn't report them.
+    """
+    return _health_stats("pool", session)
+
+
+def app_memory(session=None):
+    """The app process's ``{"rssMb", "heapUsedMb"}`` from ``/api/platform/health`` (``None`` if unreported)."""
+    return _health_stats("memory", session)
@@ -0,0 +1,40 @@
+"""Shared paths and settings for the harness.
+
+Everything can be overridden from the environment so the same scripts work
+locally and on CI without editing the generated TCxxx files.
+"""
+import json
+import os
+from pathlib import Path
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+BACKUP_DIR = SUITE_DIR / "backup"
+# Seed-dependent perf cases for the stand-in; only run with ``--perf``.
+PERF_DIR = SUITE_DIR / "perf"
+TMP_DIR = SUITE_DIR / "tmp"
+RESULTS_PATH = TMP_DIR / "test_results.json"
+
+
+def _recorded_config():
+    try:
+        return json.loads((TMP_DIR / "config.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+BASE_URL = (
+    os.environ.get("TESTSPRITE_BASE_URL")
+    or _recorded_config().get("localEndpoint")
+    or "http://localhost:3000"
+).rstrip("/")
+
+# Shared secret accepted by the app's test bypass (middleware and getMongoUser).
+TEST_SECRET = (
+    os.environ.get("TEST_SECRET")
+    or _recorded_config().get("backendCredential")
+    or "v3ry-s3cr3t-t3st-v4lu3"
+)
+# Unlocks process stats in /api/platform/health (the stand-in sets the same default).
+CRON_SECRET = os.environ.get("CRON_SECRET", "standin-cron-secret")
+# Optional: which seeded user the bypass should act as.
+TEST_EMAIL = os.environ.get("TEST_USER_EMAIL")
@@ -0,0 +1,71 @@
+"""DM queue entitlement checks: Mongo round trips per dm_delivery job, before and after caching.
+
+Starts the stand-in and runs ``scripts/bench-dm-entitlements.ts`` twice
+against it: ``legacy`` replays the per-job lookups handleDMDelivery used to
+make, and ``cached`` runs the entitlement cache the queue uses now::
+
+    python -m harness.entitlement_bench --jobs 1000
+
+For each mode it reports:
+- Mongo commands per job, for the check alone and including the DMLog write
+- Upstash commands per job (from the stand-in's counters)
+- p50/p95 time for the check
+
+The run fails if the cached check averages more than
+``--max-round-trips`` Mongo commands per job. The report goes to
+``tmp/entitlement_bench.json``.
+"""
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+from harness.config import SUITE_DIR, TMP_DIR
+from harness.standin import StandIn
+
+REPO_DIR = SUITE_DIR.parent
+REPORT_PATH = TMP_DIR / "entitlement_bench.json"
+BENCH_COMMAND = "npx tsx scripts/bench-dm-entitlements.ts"
+MODES = ("legacy", "cached")
+
+
+def run_mode(standin, mode, jobs):
+    upstash_before = standin.api.stats().get("upstash.commands", 0)
+    command = shlex.split(BENCH_COMMAND) + ["--mode", mode, "--jobs", str(jobs)]
+    output = subprocess.run(command, cwd=REPO_DIR, env={**os.environ, **standin.env},
+                            capture_output=True, text=True, check=True).stdout
+    result = next(json.loads(line) for line in output.splitlines() if line.startswith("{"))
+    upstash = standin.api.stats().get("upstash.commands", 0) - upstash_before
+    result["upstashCommands"] = upstash
+    result["upstashCommandsPerJob"] = round(upstash / jobs, 3)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.entitlement_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--max-round-trips", type=float, default=0.05,
+                        help="allowed Mongo commands per job for the cached check")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    with StandIn() as standin:
+        runs = [run_mode(standin, mode, args.jobs) for mode in MODES]
+    for run in runs:
+        print(f"{run['mode']:<7} {run['jobs']} jobs: check {run['gateRoundTripsPerJob']} Mongo/job "
+              f"({run['roundTripsPerJob']} with the DMLog write), {run['upstashCommandsPerJob']} Upstash/job, "
+              f"p50={run['gateP50Ms']}ms p95={run['gateP95Ms']}ms  {run['byCommand']}", flush=True)
+
+    cached = runs[-1]
+    passed = cached["gateRoundTripsPerJob"] <= args.max_round_trips
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({"max_round_trips": args.max_round_trips, "passed": passed, "runs": runs},
+                                      indent=2) + "\n", encoding="utf-8")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""HDR-style latency histogram.
+
+Values are kept to ``significant_figures`` decimal digits of precision (3 by
+default, i.e. within 0.1%), so memory stays bounded no matter how many
+samples a load run records, and percentiles are exact to that precision.
+:meth:`LatencyHistogram.write_hgrm` emits the HdrHistogram percentile
+distribution format understood by the HdrHistogram plotter.
+"""
+import math
+
+
+class LatencyHistogram:
+    """Record latencies in milliseconds with bounded relative error."""
+
+    def __init__(self, significant_figures=3):
+        self.significant_figures = significant_figures
+        self._counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, value_us):
+        digits = len(str(value_us))
+        if digits <= self.significant_figures:
+            return value_us
+        quantum = 10 ** (digits - self.significant_figures)
+        # Round up so a bucket reports the highest value it can contain.
+        return -(-value_us // quantum) * quantum
+
+    def record(self, value_ms):
+        value_us = max(0, int(round(value_ms * 1000)))
+        bucket = self._bucket(value_us)
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        self.total_squares += value_ms * value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def merge(self, other):
+        for bucket, count in other._counts.items():
+            self._counts[bucket] = self._counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def stddev(self):
+        if not self.count:
+            return 0.0
+        return math.sqrt(max(0.0, self.total_squares / self.count - self.mean ** 2))
+
+    def percentile(self, pct):
+        """Smallest recorded bucket (ms) at or above ``pct`` percent of samples."""
+        if not self.count:
+            return 0.0
+        threshold = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= threshold:
+                return bucket / 1000
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "min": round(self.min or 0.0, 3),
+            "mean": round(self.mean, 3),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": round(self.max or 0.0, 3),
+        }
+
+    def write_hgrm(self, path):
+        """Write the percentile distribution in HdrHistogram ``.hgrm`` format."""
+        lines = [f"{'Value':>12} {'Percentile':>14} {'TotalCount':>10} {'1/(1-Percentile)':>14}", ""]
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            fraction = seen / self.count
+            inverse = "inf" if fraction >= 1 else f"{1 / (1 - fraction):.2f}"
+            lines.append(f"{bucket / 1000:12.3f} {fraction:14.12f} {seen:10d} {inverse:>14}")
+        lines += [
+            f"#[Mean    = {self.mean:12.3f}, StdDeviation   = {self.stddev:12.3f}]",
+            f"#[Max     = {self.max or 0.0:12.3f}, Total count    = {self.count:12d}]",
+            f"#[Buckets = {len(self._counts):12d}, SubBuckets     = {10 ** self.significant_figures:12d}]",
+        ]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
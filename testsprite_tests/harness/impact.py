@@ -0,0 +1,304 @@
+"""Select the cases a change can affect, and reuse results for the rest.
+
+Each case depends on the source behind the routes it touches:
+
+* every ``/api/...`` path or page path in its source (``"/api/products"``,
+  ``"http://localhost:3000/pricing"``, ``'/dashboard' in frame.url``) is
+  matched against ``src/app`` to find the ``route.ts``/``page.tsx`` (and,
+  for pages, their layouts)
+* ``tmp/code_summary.yaml`` adds the files it lists for matching endpoints
+* the ``@/`` and relative imports of those files are followed transitively
+
+A case is *affected* when ``git diff`` against a ref touches one of its
+files, the case itself, the harness, or a project-wide file such as
+``package.json`` or ``src/middleware.ts``. Every case also gets a
+fingerprint: a hash of the contents of all of its files. A passing result
+is stored under that fingerprint in ``tmp/impact_cache.json`` and reused
+while the fingerprint is unchanged, so a typical PR re-runs a handful of
+cases::
+
+    python -m harness --changed-since origin/main
+"""
+import ast
+import hashlib
+import json
+import re
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlparse
+
+import yaml
+
+from harness.config import BASE_URL, SUITE_DIR, TMP_DIR
+
+REPO_DIR = SUITE_DIR.parent
+APP_DIR = REPO_DIR / "src" / "app"
+SUMMARY_PATH = TMP_DIR / "code_summary.yaml"
+CACHE_PATH = TMP_DIR / "impact_cache.json"
+HARNESS_DIR = SUITE_DIR / "harness"
+
+# A change to any of these can affect every case.
+GLOBAL_FILES = (
+    "package.json", "package-lock.json", "tsconfig.json", "next.config.js", "next.config.mjs",
+    "next.config.ts", "src/middleware.ts",
+)
+
+_PATH_LITERAL = re.compile(r"(?<!\w)/[\w\-./]*")
+_IMPORT = re.compile(r"""(?:\bfrom\s+|\bimport\s*\(?\s*|\brequire\(\s*)["']((?:@/|\.{1,2}/)[^"']+)["']""")
+_EXTENSIONS = ("", ".ts", ".tsx", ".js", ".jsx", "/index.ts", "/index.tsx", "/index.js")
+
+
+def _relative(path):
+    return Path(path).resolve().relative_to(REPO_DIR).as_posix()
+
+
+@dataclass(frozen=True)
+class Route:
+    pattern: re.Pattern
+    file: str  # repo-relative route.ts / page.tsx
+    dynamic: int  # dynamic segments; static matches win
+
+
+def _segment_pattern(segment):
+    if segment.startswith("[[..."):
+        return r"(?:/.*)?"
+    if segment.startswith("[..."):
+        return r"/.+"
+    if segment.startswith("["):
+        return r"/[^/]+"
+    return "/" + re.escape(segment)
+
+
+@lru_cache(maxsize=None)
+def route_index():
+    """``(api_routes, page_routes)`` found under ``src/app``."""
+    api, pages = [], []
+    for path in sorted(APP_DIR.rglob("*")):
+        if path.stem not in ("route", "page") or path.suffix not in (".ts", ".tsx", ".js", ".jsx"):
+            continue
+        # Route groups "(dashboard)" and private folders don't appear in the URL.
+        segments = [
+            part for part in path.parent.relative_to(APP_DIR).parts
+            if not (part.startswith("(") and part.endswith(")"))
+        ]
+        if any(part.startswith("_") for part in segments):
+            continue
+        regex = "".join(_segment_pattern(part) for part in segments)
+        dynamic = sum(part.startswith("[") for part in segments)
+        route = Route(re.compile(f"^{regex}/?$"), _relative(path), dynamic)
+        (api if path.stem == "route" else pages).append(route)
+    return api, pages
+
+
+def match_routes(url_path, routes):
+    """Files for the most specific routes matching ``url_path``."""
+    url_path = url_path.split("?", 1)[0].rstrip("/") or "/"
+    matches = [route for route in routes if route.pattern.match(url_path)]
+    if not matches:
+        return []
+    fewest = min(route.dynamic for route in matches)
+    return [route.file for route in matches if route.dynamic == fewest]
+
+
+def _layouts(page_file):
+    """``layout.*`` files from the page's directory up to ``src/app``."""
+    directory = (REPO_DIR / page_file).parent
+    layouts = []
+    while True:
+        layouts += [_relative(path) for path in directory.glob("layout.*")]
+        if directory == APP_DIR or APP_DIR not in directory.parents:
+            return layouts
+        directory = directory.parent
+
+
+def _resolve_import(source_file, specifier):
+    if specifier.startswith("@/"):
+        base = REPO_DIR / "src" / specifier[2:]
+    else:
+        base = (REPO_DIR / source_file).parent / specifier
+    for extension in _EXTENSIONS:
+        candidate = Path(f"{base}{extension}")
+        if candidate.is_file():
+            return _relative(candidate)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _imports(file):
+    try:
+        source = (REPO_DIR / file).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return ()
+    resolved = (_resolve_import(file, specifier) for specifier in _IMPORT.findall(source))
+    return tuple(sorted({path for path in resolved if path}))
+
+
+def import_closure(files):
+    """``files`` plus everything they import, transitively."""
+    seen, pending = set(), list(files)
+    while pending:
+        file = pending.pop()
+        if file in seen:
+            continue
+        seen.add(file)
+        pending.extend(_imports(file))
+    return seen
+
+
+@lru_cache(maxsize=None)
+def summary_features(path=SUMMARY_PATH):
+    """``[(endpoint_paths, files)]`` from ``code_summary.yaml``."""
+    try:
+        summary = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    except OSError:
+        return ()
+    return tuple(
+        (
+            tuple(endpoint["path"] for endpoint in feature.get("endpoints", [])),
+            tuple(feature.get("files", [])),
+        )
+        for feature in summary.get("features", [])
+    )
+
+
+def _string_literals(source):
+    """String constants in ``source``; f-string placeholders become ``x``."""
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield node.value
+        elif isinstance(node, ast.JoinedStr):
+            yield "".join(
+                part.value if isinstance(part, ast.Constant) else "x" for part in node.values
+            )
+
+
+def referenced_paths(source):
+    """App URL paths mentioned in a case's source."""
+    app_hosts = {urlparse(BASE_URL).netloc, "localhost:3000"}
+    paths = set()
+    for literal in _string_literals(source):
+        if literal.startswith(("xpath=", "//")):
+            continue
+        if "://" in literal:
+            url = urlparse(literal.strip())
+            if url.netloc in app_hosts:
+                paths.add(url.path or "/")
+            continue
+        paths.update(_PATH_LITERAL.findall(literal))
+    return paths
+
+
+def case_files(case):
+    """Repo-relative source files ``case`` depends on (excluding the harness)."""
+    source = case.path.read_text(encoding="utf-8")
+    api_routes, page_routes = route_index()
+    roots = set()
+    for url_path in referenced_paths(source):
+        if url_path.startswith("/api/"):
+            roots.update(match_routes(url_path, api_routes))
+            for endpoints, files in summary_features():
+                if any(url_path == endpoint or url_path.startswith(endpoint + "/") for endpoint in endpoints):
+                    roots.update(file for file in files if (REPO_DIR / file).is_file())
+        else:
+            for page in match_routes(url_path, page_routes):
+                roots.add(page)
+                roots.update(_layouts(page))
+    return import_closure(roots)
+
+
+@lru_cache(maxsize=None)
+def _file_hash(path):
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def _harness_files():
+    return sorted(_relative(path) for path in HARNESS_DIR.glob("*.py"))
+
+
+def fingerprint(case, files=None):
+    """Hash of the case, the harness, project-wide files and ``case_files``."""
+    files = case_files(case) if files is None else files
+    digest = hashlib.sha256()
+    for file in sorted({*files, *GLOBAL_FILES, *_harness_files(), _relative(case.path)}):
+        digest.update(f"{file}:{_file_hash(REPO_DIR / file)}\n".encode())
+    return digest.hexdigest()
+
+
+def changed_files(ref="HEAD"):
+    """Files changed since this branch left ``ref``, plus untracked files.
+
+    The diff starts at the merge base of ``ref`` and HEAD (``ref...HEAD`` plus
+    the working tree), so commits that landed on ``ref`` after the branch
+    point do not count.
+    """
+    def git(*args):
+        return subprocess.run(
+            ["git", *args], cwd=REPO_DIR, capture_output=True, text=True, check=True,
+        ).stdout.splitlines()
+
+    base = git("merge-base", ref, "HEAD")[0]
+    return set(git("diff", "--name-only", base)) | set(git("ls-files", "--others", "--exclude-standard"))
+
+
+def affected(case, files, changed):
+    """Why ``case`` is affected by ``changed`` files, or ``None``."""
+    harness = _relative(HARNESS_DIR) + "/"
+    for file in sorted(changed):
+        if file == _relative(case.path):
+            return "case changed"
+        if file in GLOBAL_FILES:
+            return f"{file} changed"
+        if file.startswith(harness) and file.endswith(".py"):
+            return f"{file} changed"
+        if file in files:
+            return f"{file} changed"
+    return None
+
+
+def load_cache(path=CACHE_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, results, fingerprints, path=CACHE_PATH):
+    """Record passing ``results`` under their fingerprints; forget failing ones."""
+    for result in results:
+        title = result.case.title
+        if result.status == "PASSED" and title in fingerprints:
+            cache[title] = {"fingerprint": fingerprints[title], "duration": result.duration}
+        else:
+            cache.pop(title, None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def plan(cases, ref="HEAD", cache=None):
+    """Split ``cases`` into ``(to_run, reused, fingerprints, reasons)``.
+
+    ``to_run`` are cases affected by the diff against ``ref`` or without a
+    passing result for their current fingerprint; ``reused`` maps the rest
+    to their cached entry.
+    """
+    cache = load_cache() if cache is None else cache
+    changed = changed_files(ref)
+    to_run, reused, fingerprints, reasons = [], {}, {}, {}
+    for case in cases:
+        files = case_files(case)
+        fingerprints[case.title] = fingerprint(case, files)
+        cached = cache.get(case.title)
+        reason = affected(case, files, changed)
+        if reason is None and (not cached or cached["fingerprint"] != fingerprints[case.title]):
+            reason = "no cached result" if not cached else "dependencies changed"
+        if reason is None:
+            reused[case.title] = cached
+        else:
+            to_run.append(case)
+            reasons[case.title] = reason
+    return to_run, reused, fingerprints, reasons
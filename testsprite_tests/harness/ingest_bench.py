@@ -0,0 +1,165 @@
+"""Before/after load test for analytics ingestion (``POST /api/analytics/track``).
+
+Starts the app on the stand-in backend once per mode and hammers the track
+endpoint with concurrent beacons::
+
+    python -m harness.ingest_bench --app "npm run start" --concurrency 200 --duration 30
+
+``sync`` runs with ``ANALYTICS_WRITE_BEHIND=0`` (one insert per request, the
+old path), ``buffered`` with the write-behind buffer; ``--batch 20`` sends
+batched beacons of 20 events. Every run reports accepted events/s, latency
+percentiles, 503 backpressure responses, and how long the buffer took to
+persist everything after the load stopped. The report goes to
+``tmp/ingest_bench.json``.
+
+Without ``--app`` the running app is measured as-is (one run labelled
+``--label``).
+"""
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from harness.client import async_client
+from harness.config import TMP_DIR
+from harness.histogram import LatencyHistogram
+from harness.standin import CREATOR_ID, StandIn, wait_for_app
+
+REPORT_PATH = TMP_DIR / "ingest_bench.json"
+APP_LOG = TMP_DIR / "ingest_bench.app.log"
+MODES = {"sync": {"ANALYTICS_WRITE_BEHIND": "0"}, "buffered": {"ANALYTICS_WRITE_BEHIND": "1"}}
+
+
+async def hammer(run_id, concurrency, duration, batch):
+    """POST beacons from ``concurrency`` loops for ``duration`` seconds."""
+    histogram = LatencyHistogram()
+    statuses = {}
+    accepted = 0
+    sent = 0
+    path = f"/ingest-bench/{run_id}"
+    stop_at = time.monotonic() + duration
+
+    async def loop(client):
+        nonlocal accepted, sent
+        while time.monotonic() < stop_at:
+            sent += 1
+            # A fresh client IP per request keeps the per-IP rate limit out of the measurement.
+            ip = f"10.{sent >> 16 & 255}.{sent >> 8 & 255}.{sent & 255}"
+            event = {"eventType": "page_view", "creatorId": CREATOR_ID, "path": path}
+            body = {"events": [event] * batch} if batch > 1 else event
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/analytics/track", json=body, headers={"x-forwarded-for": ip})
+                status = response.status_code
+            except Exception as exc:
+                status = type(exc).__name__
+            histogram.record((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 201:
+                accepted += batch
+            elif status == 503:
+                await asyncio.sleep(0.1)
+
+    async with async_client(authenticated=False, max_connections=concurrency) as client:
+        await asyncio.gather(*(loop(client) for _ in range(concurrency)))
+    return histogram, statuses, accepted
+
+
+def wait_persisted(db, run_id, expected, timeout):
+    """Seconds until ``expected`` events of ``run_id`` are in Mongo (``None`` on timeout)."""
+    from bson import ObjectId
+
+    query = {"creatorId": ObjectId(CREATOR_ID), "path": f"/ingest-bench/{run_id}"}
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if db["analyticsevents"].count_documents(query) >= expected:
+            return time.monotonic() - started
+        time.sleep(0.25)
+    return None
+
+
+def run_once(db, label, concurrency, duration, batch, drain_timeout=60):
+    run_id = uuid.uuid4().hex[:12]
+    histogram, statuses, accepted = asyncio.run(hammer(run_id, concurrency, duration, batch))
+    lag = wait_persisted(db, run_id, accepted, drain_timeout)
+    summary = histogram.summary()
+    return {
+        "mode": label,
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "batch": batch,
+        "requests": histogram.count,
+        "events_accepted": accepted,
+        "events_per_second": round(accepted / duration, 1),
+        "rejected_503": statuses.get(503, 0),
+        "errors": sum(count for status, count in statuses.items() if status not in (201, 503)),
+        "latency_ms": summary,
+        "persist_lag_s": None if lag is None else round(lag, 2),
+        "statuses": {str(status): count for status, count in statuses.items()},
+    }
+
+
+def print_run(result):
+    latency = result["latency_ms"]
+    lag = "timeout" if result["persist_lag_s"] is None else f"{result['persist_lag_s']}s"
+    print(f"{result['mode']:<10} {result['events_per_second']:>10,.1f} events/s  p50={latency['p50']}ms "
+          f"p99={latency['p99']}ms  503s={result['rejected_503']}  errors={result['errors']}  persisted after {lag}",
+          flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.ingest_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--app", help='command that starts the app, e.g. "npm run start"')
+    parser.add_argument("--mode", action="append", choices=sorted(MODES), help="modes to run with --app (default: both)")
+    parser.add_argument("--label", default="current", help="name of the run without --app")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load per run")
+    parser.add_argument("--batch", type=int, default=1, help="events per beacon")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    from pymongo import MongoClient
+
+    from harness.load import raise_fd_limit
+
+    raise_fd_limit()
+    runs = []
+    if not args.app:
+        with MongoClient(os.environ["MONGODB_URI"]) as client:
+            runs.append(run_once(client.get_default_database(), args.label, args.concurrency, args.duration, args.batch))
+            print_run(runs[-1])
+    else:
+        with StandIn() as standin, MongoClient(standin.mongo.uri) as client:
+            db = client.get_default_database()
+            for mode in args.mode or ["sync", "buffered"]:
+                APP_LOG.parent.mkdir(parents=True, exist_ok=True)
+                with APP_LOG.open("a", encoding="utf-8") as log:
+                    app = subprocess.Popen(
+                        shlex.split(args.app), cwd=TMP_DIR.parent.parent,
+                        env={**os.environ, **standin.env, **MODES[mode]}, stdout=log, stderr=subprocess.STDOUT,
+                    )
+                    try:
+                        wait_for_app()
+                        runs.append(run_once(db, mode, args.concurrency, args.duration, args.batch))
+                        print_run(runs[-1])
+                    finally:
+                        app.terminate()
+                        app.wait(timeout=30)
+
+    if len(runs) == 2:
+        before, after = runs
+        print(f"buffered vs sync: {after['events_per_second'] / max(before['events_per_second'], 0.1):.1f}x events/s, "
+              f"p99 {before['latency_ms']['p99']}ms -> {after['latency_ms']['p99']}ms")
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({"runs": runs}, indent=2) + "\n", encoding="utf-8")
+    return 0 if all(run["errors"] == 0 and run["persist_lag_s"] is not None for run in runs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""asyncio load generator for the PERF-SCA-001 scenario and friends.
+
+Mirrors the k6 scenarios in ``tests/load/creatorly-load-test.js`` - constant,
+ramping and spike stages of virtual users (VUs) - but runs inside the Python
+harness so results can be asserted on. Each VU loops over a weighted mix of
+requests with a short think time; latencies go into HDR-style histograms::
+
+    python -m harness.load --scenario sca-001 --username demo --creator-id 65db8d9f1234567890abcdef
+
+writes ``tmp/load/<scenario>.json`` (per-endpoint percentiles, status
+codes, error rate, per-second timeline) and ``tmp/load/<scenario>.hgrm``,
+and exits non-zero when the error rate reaches ``--max-error-rate``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from harness.client import async_client, cache_stats
+from harness.config import TMP_DIR
+from harness.histogram import LatencyHistogram
+
+REPORT_DIR = TMP_DIR / "load"
+
+
+@dataclass
+class Stage:
+    duration: float  # seconds
+    target: int  # VUs at the end of the stage
+
+
+def constant(vus, duration):
+    return [Stage(0, vus), Stage(duration, vus)]
+
+
+SCENARIOS = {
+    "smoke": constant(2, 30),
+    "average": [Stage(60, 50), Stage(180, 50), Stage(60, 0)],
+    "spike": [Stage(10, 200), Stage(30, 200), Stage(10, 0)],
+    # PERF-SCA-001: handle 1,000 concurrent users with < 1% errors.
+    "sca-001": [Stage(60, 1000), Stage(180, 1000), Stage(30, 0)],
+}
+
+
+def target_at(stages, elapsed):
+    """VU target ``elapsed`` seconds in, interpolating linearly within a stage."""
+    previous = 0
+    for stage in stages:
+        if elapsed < stage.duration:
+            return round(previous + (stage.target - previous) * elapsed / stage.duration)
+        elapsed -= stage.duration
+        previous = stage.target
+    return None  # past the last stage
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    weight: float
+    body: object = None  # callable(vu_id) -> JSON body
+    authenticated: bool = False
+
+
+def default_mix(username, creator_id=None):
+    """Storefront-heavy traffic, roughly what a creator launch looks like."""
+    mix = [
+        Endpoint("public_storefront", "GET", f"/api/public/{username}", 0.6),
+        Endpoint("products", "GET", "/api/products", 0.2, authenticated=True),
+    ]
+    if creator_id:
+        mix.append(Endpoint(
+            "analytics_track", "POST", "/api/analytics/track", 0.2,
+            body=lambda vu: {"eventType": "page_view", "creatorId": creator_id, "path": f"/u/{username}"},
+        ))
+    return mix
+
+
+class LoadStats:
+    def __init__(self):
+        self.overall = LatencyHistogram()
+        self.endpoints = {}
+        self.statuses = {}
+        self.errors = 0
+        self.timeline = []
+        self._second = {"requests": 0, "errors": 0}
+
+    def record(self, endpoint, latency_ms, status, ok):
+        self.overall.record(latency_ms)
+        self.endpoints.setdefault(endpoint, LatencyHistogram()).record(latency_ms)
+        key = f"{endpoint}:{status}"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        self._second["requests"] += 1
+        if not ok:
+            self.errors += 1
+            self._second["errors"] += 1
+
+    def tick(self, elapsed, vus):
+        self.timeline.append({"t": round(elapsed), "vus": vus, **self._second})
+        self._second = {"requests": 0, "errors": 0}
+
+    @property
+    def error_rate(self):
+        return self.errors / self.overall.count if self.overall.count else 0.0
+
+
+async def _virtual_user(vu_id, clients, mix, stats, stop, think):
+    weights = [endpoint.weight for endpoint in mix]
+    # Distinct client IPs, so per-IP rate limits see many users rather than one.
+    headers = {"x-forwarded-for": f"10.{vu_id >> 16 & 255}.{vu_id >> 8 & 255}.{vu_id & 255}"}
+    while not stop.is_set():
+        endpoint = random.choices(mix, weights)[0]
+        client = clients[endpoint.authenticated]
+        kwargs = {"headers": headers}
+        if endpoint.body:
+            kwargs["json"] = endpoint.body(vu_id)
+        started = time.perf_counter()
+        try:
+            response = await client.request(endpoint.method, endpoint.path, **kwargs)
+            status, ok = response.status_code, response.status_code < 400
+        except Exception as exc:  # timeouts, resets: count them, keep the VU alive
+            status, ok = type(exc).__name__, False
+        stats.record(endpoint.name, (time.perf_counter() - started) * 1000, status, ok)
+        try:
+            # Think time, cut short when the VU is stopped.
+            await asyncio.wait_for(stop.wait(), random.uniform(*think))
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(stages, mix, think=(0.5, 1.5), on_tick=None):
+    """Drive VUs through ``stages`` and return the collected :class:`LoadStats`."""
+    stats = LoadStats()
+    peak = max(stage.target for stage in stages)
+    anonymous = async_client(authenticated=False, max_connections=peak)
+    authenticated = async_client(authenticated=True, max_connections=peak)
+    clients = {False: anonymous, True: authenticated}
+    vus = []  # (task, stop_event)
+
+    started = time.monotonic()
+    try:
+        while True:
+            elapsed = time.monotonic() - started
+            target = target_at(stages, elapsed)
+            if target is None:
+                break
+            while len(vus) < target:
+                stop = asyncio.Event()
+                task = asyncio.create_task(_virtual_user(len(vus), clients, mix, stats, stop, think))
+                vus.append((task, stop))
+            stopping = []
+            while len(vus) > target:
+                # Ramp down gracefully: the VU finishes its in-flight request.
+                task, stop = vus.pop()
+                stop.set()
+                stopping.append(task)
+            # Wait for them, so their requests do not land in the next stage.
+            await asyncio.gather(*stopping, return_exceptions=True)
+            await asyncio.sleep(1)
+            stats.tick(elapsed, len(vus))
+            if on_tick:
+                on_tick(stats, elapsed, len(vus))
+    finally:
+        for task, stop in vus:
+            stop.set()
+        await asyncio.gather(*(task for task, _ in vus), return_exceptions=True)
+        await anonymous.aclose()
+        await authenticated.aclose()
+    return stats
+
+
+def raise_fd_limit():
+    """Lift the soft open-files limit so 1,000 VUs fit on one Linux box."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+CACHE_COUNTERS = ("requests", "l1Hits", "l2Hits", "staleHits", "negativeHits", "misses", "coalesced", "loads",
+                  "invalidationsReceived")
+
+
+def cache_delta(before, after):
+    """Per-tier counters and hit ratios of the app's cache over the run (``None`` if not reported)."""
+    if not before or not after:
+        return None
+    delta = {name: after.get(name, 0) - before.get(name, 0) for name in CACHE_COUNTERS}
+    l2_requests = delta["requests"] - delta["l1Hits"] - delta["coalesced"]
+    delta["l1HitRatio"] = round(delta["l1Hits"] / delta["requests"], 4) if delta["requests"] else 0
+    delta["l2HitRatio"] = round((delta["l2Hits"] + delta["staleHits"]) / l2_requests, 4) if l2_requests > 0 else 0
+    delta["l1Entries"] = after.get("l1Entries")
+    return delta
+
+
+def write_report(stats, name, stages, directory=REPORT_DIR, cache=None):
+    directory.mkdir(parents=True, exist_ok=True)
+    report = {
+        "scenario": name,
+        "stages": [vars(stage) for stage in stages],
+        "requests": stats.overall.count,
+        "errors": stats.errors,
+        "error_rate": round(stats.error_rate, 5),
+        "latency_ms": stats.overall.summary(),
+        "endpoints": {endpoint: hist.summary() for endpoint, hist in stats.endpoints.items()},
+        "statuses": stats.statuses,
+        "timeline": stats.timeline,
+        "cache": cache,
+    }
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    stats.overall.write_hgrm(directory / f"{name}.hgrm")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.load", description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="smoke")
+    parser.add_argument("--vus", type=int, help="run a constant-VU scenario instead")
+    parser.add_argument("--duration", type=float, default=60, help="seconds, with --vus")
+    parser.add_argument("--username", default=os.environ.get("TEST_USERNAME", "demo"))
+    parser.add_argument("--creator-id", default=os.environ.get("TEST_CREATOR_ID"),
+                        help="creator _id for analytics beacons (omit to skip /api/analytics/track)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--output-dir", type=Path, default=REPORT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.vus:
+        name, stages = f"constant-{args.vus}", constant(args.vus, args.duration)
+    else:
+        name, stages = args.scenario, SCENARIOS[args.scenario]
+    mix = default_mix(args.username, args.creator_id)
+
+    def progress(stats, elapsed, vus):
+        second = stats.timeline[-1]
+        print(f"{elapsed:6.0f}s  vus={vus:<5} rps={second['requests']:<6} errors={second['errors']}", flush=True)
+
+    raise_fd_limit()
+    cache_before = cache_stats()
+    stats = asyncio.run(run_load(stages, mix, on_tick=progress))
+    cache = cache_delta(cache_before, cache_stats())
+    path = write_report(stats, name, stages, args.output_dir, cache)
+
+    summary = stats.overall.summary()
+    print(
+        f"\n{stats.overall.count} requests, error rate {stats.error_rate:.2%}, "
+        f"p50={summary['p50']}ms p99={summary['p99']}ms max={summary['max']}ms -> {path}"
+    )
+    if cache:
+        print(f"cache: L1 hit ratio {cache['l1HitRatio']:.1%}, L2 hit ratio {cache['l2HitRatio']:.1%}, {cache['loads']} loads")
+    return 0 if stats.error_rate < args.max_error_rate else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
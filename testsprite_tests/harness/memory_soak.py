@@ -0,0 +1,91 @@
+"""Memory soak for ``createMemoryCache`` (``scripts/bench-memory-cache.ts``).
+
+Pushes a million distinct keys through a bounded cache and checks that RSS
+levels off once the cache is full::
+
+    python -m harness.memory_soak --keys 1000000 --compare
+
+The first 20% of keys are warm-up. After that, RSS may grow by at most
+``--max-growth-mb``. ``--compare`` also runs the unbounded configuration (no
+size limits, no sweep) for contrast; that run is reported but not checked.
+Samples and verdicts go to ``tmp/memory_soak.json``.
+"""
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+from harness.config import SUITE_DIR, TMP_DIR
+
+REPO_DIR = SUITE_DIR.parent
+REPORT_PATH = TMP_DIR / "memory_soak.json"
+BENCH_COMMAND = "npx tsx scripts/bench-memory-cache.ts"
+WARMUP_FRACTION = 0.2
+
+
+def run_once(keys, unbounded=False, extra=()):
+    command = shlex.split(BENCH_COMMAND) + ["--keys", str(keys), *extra]
+    if unbounded:
+        command.append("--unbounded")
+    env = {**os.environ, "NODE_OPTIONS": f"{os.environ.get('NODE_OPTIONS', '')} --expose-gc".strip()}
+    output = subprocess.run(command, cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True).stdout
+    lines = [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+    samples = [line for line in lines if "rssMb" in line]
+    done = next((line for line in lines if line.get("done")), {})
+
+    warm = [sample for sample in samples if sample["keys"] >= keys * WARMUP_FRACTION]
+    baseline = warm[0]["rssMb"] if warm else samples[-1]["rssMb"]
+    window = warm or samples
+    peak = max(sample["rssMb"] for sample in window)
+    heap_growth = max(sample["heapUsedMb"] for sample in window) - window[0]["heapUsedMb"]
+    return {
+        "unbounded": unbounded,
+        "keys": keys,
+        "duration_ms": done.get("durationMs"),
+        "rss_after_warmup_mb": baseline,
+        "rss_peak_mb": peak,
+        "rss_growth_mb": round(peak - baseline, 1),
+        "heap_growth_mb": round(heap_growth, 1),
+        "final": samples[-1],
+        "samples": samples,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.memory_soak", description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--max-entries", type=int, help="cache entry bound (script default 5000)")
+    parser.add_argument("--max-bytes", type=int, help="cache byte bound (script default 16 MB)")
+    parser.add_argument("--max-growth-mb", type=float, default=20, help="allowed RSS growth after warm-up")
+    parser.add_argument("--compare", action="store_true", help="also run without bounds or sweeping")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    extra = []
+    if args.max_entries:
+        extra += ["--max-entries", str(args.max_entries)]
+    if args.max_bytes:
+        extra += ["--max-bytes", str(args.max_bytes)]
+
+    runs = [run_once(args.keys, extra=extra)]
+    if args.compare:
+        runs.append(run_once(args.keys, unbounded=True))
+    for run in runs:
+        final = run["final"]
+        print(f"{'unbounded' if run['unbounded'] else 'bounded':<10} rss {run['rss_after_warmup_mb']}MB -> "
+              f"peak {run['rss_peak_mb']}MB (+{run['rss_growth_mb']}MB, heap +{run['heap_growth_mb']}MB)  "
+              f"entries={final['size']} evictions={final['evictions']} hit ratio={final['hitRatio']}", flush=True)
+
+    bounded = runs[0]
+    bounded["passed"] = bounded["rss_growth_mb"] <= args.max_growth_mb
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({"max_growth_mb": args.max_growth_mb, "runs": runs}, indent=2) + "\n",
+                           encoding="utf-8")
+    return 0 if bounded["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Per-page latency of keyset vs ``?page=`` pagination on creator lists.
+
+Walks the top seeded creator's orders and leads from page 1 to page 5000
+along ``pagination.nextCursor``, then samples the old ``?page=N`` (skip)
+path at a few depths for contrast::
+
+    python -m harness.pagination_bench --profile large --pages 5000
+
+Per-page latency is reported in ten buckets (pages 1-500, 501-1000, ...);
+the run fails if the median of the last bucket is more than ``--max-ratio``
+times the first. While the orders walk runs, a thread inserts new orders for
+the same creator. Afterwards the walked ids must equal the first rows of a
+direct ``(createdAt, _id)`` query: no duplicates, no gaps, none of the
+inserted rows. The report goes to ``tmp/pagination_bench.json``.
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness.client import api_session
+from harness.config import TMP_DIR
+from harness.histogram import LatencyHistogram
+from harness.seed import _database, ensure_seeded
+from harness.standin import CREATOR_ID
+
+REPORT_PATH = TMP_DIR / "pagination_bench.json"
+BUCKETS = 10
+SKIP_DEPTHS = (1, 10, 100, 1000, 5000)
+
+# path -> (collection, where the rows and pagination sit in the response)
+ENDPOINTS = {
+    "/api/orders": ("orders", lambda body: body["data"]["orders"], lambda body: body["data"]["pagination"]),
+    "/api/creator/leads": ("leads", lambda body: body["leads"], lambda body: body["pagination"]),
+}
+
+
+def fetch(session, path, params):
+    started = time.perf_counter()
+    response = session.get(path, params=params)
+    elapsed = (time.perf_counter() - started) * 1000
+    assert response.ok, f"{path} {params}: {response.status_code} {response.text[:200]}"
+    return elapsed, response.json()
+
+
+def walk(session, path, pages, limit):
+    """Follow ``nextCursor`` for ``pages`` pages; returns (per-page ms, row ids)."""
+    _, rows_of, pagination_of = ENDPOINTS[path]
+    latencies, ids, cursor = [], [], None
+    for _ in range(pages):
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        elapsed, body = fetch(session, path, params)
+        latencies.append(elapsed)
+        ids.extend(str(row["_id"]) for row in rows_of(body))
+        cursor = pagination_of(body).get("nextCursor")
+        if not cursor:
+            break
+    return latencies, ids
+
+
+def bucket_summary(latencies):
+    size = max(1, -(-len(latencies) // BUCKETS))
+    buckets = []
+    for start in range(0, len(latencies), size):
+        histogram = LatencyHistogram()
+        chunk = latencies[start:start + size]
+        for value in chunk:
+            histogram.record(value)
+        buckets.append({"pages": f"{start + 1}-{start + len(chunk)}", "median_ms": round(statistics.median(chunk), 2),
+                        **histogram.summary()})
+    return buckets
+
+
+def sample_skip(session, path, depths, limit, repeat=5):
+    """Median latency of the legacy ``?page=N`` path at each depth."""
+    return {depth: round(statistics.median(fetch(session, path, {"page": depth, "limit": limit})[0]
+                                           for _ in range(repeat)), 2) for depth in depths}
+
+
+class Inserter(threading.Thread):
+    """Insert new orders for the creator every ``interval`` seconds until stopped."""
+
+    def __init__(self, db, run_id, interval=0.01):
+        super().__init__(daemon=True)
+        self.db, self.run_id, self.interval = db, run_id, interval
+        self.stopped = threading.Event()
+        self.inserted = 0
+
+    def run(self):
+        from bson import ObjectId
+
+        while not self.stopped.wait(self.interval):
+            now = datetime.now(timezone.utc)
+            self.db["orders"].insert_one({
+                "_id": ObjectId(), "creatorId": ObjectId(CREATOR_ID), "orderNumber": f"KS-{self.run_id}-{self.inserted}",
+                "status": "completed", "paymentStatus": "paid", "total": 0, "amount": 0, "items": [],
+                "paginationBench": self.run_id, "createdAt": now, "updatedAt": now,
+            })
+            self.inserted += 1
+
+
+def expected_ids(db, collection, count, run_id):
+    from bson import ObjectId
+
+    rows = db[collection].find({"creatorId": ObjectId(CREATOR_ID), "paginationBench": {"$ne": run_id}}, {"_id": 1}) \
+        .sort([("createdAt", -1), ("_id", -1)]).limit(count)
+    return [str(row["_id"]) for row in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.pagination_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", default="large")
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--max-ratio", type=float, default=1.5, help="allowed last/first bucket median ratio")
+    parser.add_argument("--no-inserts", action="store_true", help="walk the orders without concurrent inserts")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    dataset = ensure_seeded(args.profile)
+    db = _database(None)
+    session = api_session()
+    run_id = uuid.uuid4().hex[:8]
+    report = {"profile": args.profile, "limit": args.limit, "max_ratio": args.max_ratio, "endpoints": {}}
+    failed = False
+
+    for path, (collection, _, _) in ENDPOINTS.items():
+        rows = dataset.creators.get(collection, [0])[0]
+        pages = min(args.pages, rows // args.limit)
+        inserter = None
+        if collection == "orders" and not args.no_inserts:
+            inserter = Inserter(db, run_id)
+            inserter.start()
+        try:
+            latencies, ids = walk(session, path, pages, args.limit)
+        finally:
+            if inserter:
+                inserter.stopped.set()
+                inserter.join()
+
+        buckets = bucket_summary(latencies)
+        ratio = buckets[-1]["median_ms"] / buckets[0]["median_ms"] if buckets[0]["median_ms"] else 0
+        stable = ids == expected_ids(db, collection, len(ids), run_id)
+        result = {
+            "rows": rows,
+            "pages": len(latencies),
+            "buckets": buckets,
+            "last_first_ratio": round(ratio, 2),
+            "flat": ratio <= args.max_ratio,
+            "stable": stable,
+            "duplicates": len(ids) - len(set(ids)),
+            "concurrent_inserts": inserter.inserted if inserter else 0,
+            "skip_median_ms": sample_skip(session, path, [d for d in SKIP_DEPTHS if d <= pages], args.limit),
+        }
+        report["endpoints"][path] = result
+        failed |= not (result["flat"] and stable)
+
+        print(f"{path}: {result['pages']} pages of {args.limit}, last/first median {result['last_first_ratio']}x "
+              f"({'flat' if result['flat'] else 'NOT FLAT'}), {'stable' if stable else 'UNSTABLE'} under "
+              f"{result['concurrent_inserts']} inserts", flush=True)
+        for bucket in buckets:
+            print(f"  pages {bucket['pages']:<11} p50={bucket['p50']:>7}ms p95={bucket['p95']:>7}ms", flush=True)
+        print("  ?page= skip: " + ", ".join(f"page {depth} {ms}ms" for depth, ms in result["skip_median_ms"].items()))
+
+    db["orders"].delete_many({"paginationBench": run_id})
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
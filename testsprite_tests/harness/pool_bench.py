@@ -0,0 +1,147 @@
+"""Mongo connection pool saturation: queueing latency as concurrency outgrows the pool.
+
+Drives an increasing number of virtual users, with no think time, at a
+database-bound route. At each level it reads the app's pool counters from
+``/api/platform/health``::
+
+    python -m harness.pool_bench --app "npm run start" --pool-sizes 5,10,25 --levels 5,10,25,50,100
+
+With ``--app`` the app is started on the stand-in once per pool size
+(``MONGODB_MAX_POOL_SIZE``). Without it, the running app is measured as-is.
+Each level reports request throughput and latency, and for the pool:
+- connections in use
+- peak wait queue
+- average and p95 check-out wait
+- check-out failures (``waitQueueTimeoutMS`` hit)
+
+The report goes to ``tmp/pool_bench.json``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from harness.client import api_session, pool_stats
+from harness.config import TMP_DIR
+from harness.load import Endpoint, constant, raise_fd_limit, run_load
+from harness.seed import ensure_seeded
+from harness.standin import StandIn, wait_for_app
+
+REPORT_PATH = TMP_DIR / "pool_bench.json"
+APP_LOG = TMP_DIR / "pool_bench.app.log"
+SAMPLE_INTERVAL_S = 0.25
+
+
+class PoolSampler(threading.Thread):
+    """Poll pool stats during a level and keep the peaks."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.peak_checked_out = 0
+        self.peak_wait_queue = 0
+
+    def run(self):
+        session = api_session(authenticated=False)
+        while not self.stopped.wait(SAMPLE_INTERVAL_S):
+            stats = pool_stats(session)
+            if stats:
+                self.peak_checked_out = max(self.peak_checked_out, stats["checkedOut"])
+                self.peak_wait_queue = max(self.peak_wait_queue, stats["waitQueue"])
+
+
+def run_level(path, vus, duration):
+    before = pool_stats()
+    sampler = PoolSampler()
+    sampler.start()
+    try:
+        stats = asyncio.run(run_load(constant(vus, duration), [Endpoint("db", "GET", path, 1, authenticated=True)],
+                                     think=(0, 0)))
+    finally:
+        sampler.stopped.set()
+        sampler.join()
+    after = pool_stats()
+    if not before or not after:
+        raise SystemExit("The app does not report pool stats in /api/platform/health (does CRON_SECRET match?)")
+
+    check_outs = after["checkOuts"] - before["checkOuts"]
+    latency = stats.overall.summary()
+    return {
+        "vus": vus,
+        "requests_per_second": round(stats.overall.count / duration, 1),
+        "error_rate": round(stats.error_rate, 4),
+        "latency_ms": latency,
+        "pool": {
+            "max_pool_size": after["maxPoolSize"],
+            "peak_checked_out": sampler.peak_checked_out,
+            "peak_wait_queue": sampler.peak_wait_queue,
+            "check_outs": check_outs,
+            "check_out_failures": after["checkOutFailures"] - before["checkOutFailures"],
+            "avg_wait_ms": round((after["waitMs"] - before["waitMs"]) / check_outs, 2) if check_outs else 0,
+            "p95_wait_ms": after["p95WaitMs"],
+            "p99_wait_ms": after["p99WaitMs"],
+        },
+    }
+
+
+def run_levels(label, path, levels, duration):
+    results = []
+    for vus in levels:
+        result = run_level(path, vus, duration)
+        results.append(result)
+        pool = result["pool"]
+        print(f"{label:<10} {vus:>4} VUs {result['requests_per_second']:>8} req/s  p95={result['latency_ms']['p95']}ms  "
+              f"in use {pool['peak_checked_out']}/{pool['max_pool_size']}  queue {pool['peak_wait_queue']}  "
+              f"wait avg {pool['avg_wait_ms']}ms p95 {pool['p95_wait_ms']}ms  failures {pool['check_out_failures']}",
+              flush=True)
+    return {"label": label, "levels": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.pool_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--app", help='command that starts the app, e.g. "npm run start"')
+    parser.add_argument("--pool-sizes", default="5,10,25", help="MONGODB_MAX_POOL_SIZE per run with --app")
+    parser.add_argument("--levels", default="5,10,25,50,100", help="concurrent VUs per level")
+    parser.add_argument("--duration", type=float, default=15, help="seconds per level")
+    parser.add_argument("--path", default="/api/orders?limit=50", help="database-bound route to hit")
+    parser.add_argument("--profile", default="medium", help="seed profile")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.levels.split(",")]
+    raise_fd_limit()
+    runs = []
+    if not args.app:
+        ensure_seeded(args.profile)
+        runs.append(run_levels("current", args.path, levels, args.duration))
+    else:
+        with StandIn() as standin:
+            ensure_seeded(args.profile, uri=standin.mongo.uri)
+            for size in args.pool_sizes.split(","):
+                APP_LOG.parent.mkdir(parents=True, exist_ok=True)
+                with APP_LOG.open("a", encoding="utf-8") as log:
+                    app = subprocess.Popen(
+                        shlex.split(args.app), cwd=TMP_DIR.parent.parent,
+                        env={**os.environ, **standin.env, "MONGODB_MAX_POOL_SIZE": size},
+                        stdout=log, stderr=subprocess.STDOUT,
+                    )
+                    try:
+                        wait_for_app()
+                        runs.append(run_levels(f"pool={size}", args.path, levels, args.duration))
+                    finally:
+                        app.terminate()
+                        app.wait(timeout=30)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({"path": args.path, "duration_s": args.duration, "runs": runs}, indent=2) + "\n",
+                           encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
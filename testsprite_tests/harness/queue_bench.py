@@ -0,0 +1,160 @@
+"""Drain-time benchmark for the QueueJob dispatcher (``worker.ts``).
+
+Enqueues synthetic ``one_off_email`` jobs straight into MongoDB, starts the
+worker against the stand-in backend (local Mongo, fake Resend with
+injected latency), and times how long the queue takes to drain::
+
+    python -m harness.queue_bench --jobs 10000 --concurrency 1 --concurrency 16
+
+Each ``--concurrency`` value is a separate run (``QUEUE_CONCURRENCY`` for
+the worker). The report - drain time, jobs/s, failures and a per-second
+completion timeline - goes to ``tmp/queue_bench.json``; the worker's output
+to ``tmp/queue_bench.worker.log``.
+"""
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness.config import SUITE_DIR, TMP_DIR
+from harness.standin import CREATOR_ID, StandIn
+
+REPO_DIR = SUITE_DIR.parent
+REPORT_PATH = TMP_DIR / "queue_bench.json"
+WORKER_LOG = TMP_DIR / "queue_bench.worker.log"
+WORKER_COMMAND = "npx tsx worker.ts"
+INSERT_BATCH = 5000
+
+
+def enqueue(collection, jobs, run_id):
+    """Insert ``jobs`` due-now one-off email jobs tagged with ``run_id``."""
+    from bson import ObjectId
+
+    now = datetime.now(timezone.utc)
+    creator = ObjectId(CREATOR_ID)
+    for start in range(0, jobs, INSERT_BATCH):
+        collection.insert_many([
+            {
+                "type": "one_off_email",
+                "payload": {
+                    "creatorId": creator,
+                    "email": f"queue-bench-{i}@example.test",
+                    "subject": f"Benchmark {i}",
+                    "content": "<p>Queue drain benchmark</p>",
+                    "benchmarkRun": run_id,
+                },
+                "status": "pending",
+                "attempt": 0,
+                "maxAttempts": 5,
+                "nextRunAt": now,
+                "createdAt": now,
+                "updatedAt": now,
+            }
+            for i in range(start, min(start + INSERT_BATCH, jobs))
+        ], ordered=False)
+
+
+def drain(collection, run_id, jobs, timeout, on_tick=None):
+    """Poll until every job of ``run_id`` is terminal; return ``(seconds, timeline, counts)``."""
+    query = {"payload.benchmarkRun": run_id}
+    started = time.monotonic()
+    timeline = []
+    while True:
+        elapsed = time.monotonic() - started
+        counts = {
+            row["_id"]: row["count"]
+            for row in collection.aggregate([{"$match": query}, {"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+        }
+        done = counts.get("completed", 0) + counts.get("failed", 0)
+        timeline.append({"t": round(elapsed, 1), **counts})
+        if on_tick:
+            on_tick(elapsed, counts)
+        if done >= jobs:
+            return elapsed, timeline, counts
+        if elapsed > timeout:
+            raise TimeoutError(f"{jobs - done} of {jobs} jobs still queued after {timeout:.0f}s")
+        time.sleep(0.5)
+
+
+@contextmanager
+def worker(env, command=WORKER_COMMAND, log_path=WORKER_LOG):
+    """Run the worker with ``env`` (on top of ``os.environ``) for the duration of the block."""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("w", encoding="utf-8") as log:
+        process = subprocess.Popen(
+            shlex.split(command), cwd=REPO_DIR, env={**os.environ, **env},
+            stdout=log, stderr=subprocess.STDOUT,
+        )
+        try:
+            yield process
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def run_once(db, env, jobs, concurrency, command=WORKER_COMMAND, timeout=3600, on_tick=None):
+    collection = db["queuejobs"]
+    run_id = uuid.uuid4().hex
+    enqueue(collection, jobs, run_id)
+
+    with worker({**env, "QUEUE_CONCURRENCY": str(concurrency)}, command):
+        seconds, timeline, counts = drain(collection, run_id, jobs, timeout, on_tick)
+    collection.delete_many({"payload.benchmarkRun": run_id})
+    return {
+        "concurrency": concurrency,
+        "jobs": jobs,
+        # Includes worker startup, as a deploy would.
+        "drain_seconds": round(seconds, 2),
+        "jobs_per_second": round(jobs / seconds, 1) if seconds else None,
+        "completed": counts.get("completed", 0),
+        "failed": counts.get("failed", 0),
+        "timeline": timeline,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.queue_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, action="append", help="QUEUE_CONCURRENCY to test (repeatable)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="fake Resend latency per email")
+    parser.add_argument("--worker", default=WORKER_COMMAND, help="command that starts the worker")
+    parser.add_argument("--timeout", type=float, default=3600, help="give up on a run after this many seconds")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    from pymongo import MongoClient
+
+    runs = []
+    with StandIn(latency_ms=args.latency_ms) as standin, MongoClient(standin.mongo.uri) as client:
+        db = client.get_default_database()
+        for concurrency in args.concurrency or [16]:
+            def progress(elapsed, counts):
+                print(f"\r  concurrency={concurrency:<4} {elapsed:7.1f}s  {counts}", end="", flush=True)
+
+            result = run_once(db, standin.env, args.jobs, concurrency, args.worker, args.timeout, progress)
+            runs.append(result)
+            print(f"\nconcurrency={concurrency}: {args.jobs} jobs drained in {result['drain_seconds']}s "
+                  f"({result['jobs_per_second']} jobs/s, {result['failed']} failed)", flush=True)
+        resend = standin.api.stats().get("resend.emails", 0)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "latency_ms": args.latency_ms,
+        "emails_sent": resend,
+        "runs": runs,
+    }, indent=2) + "\n", encoding="utf-8")
+    return 0 if all(run["failed"] == 0 for run in runs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""Discover the TCxxx scripts and run them in a bounded worker pool.
+
+Every case runs in its own ``python -m harness.worker`` process, so a hung
+browser or a leaked event loop can only take down that case, and the
+per-case timeout is enforced by killing the process. UI cases are instead
+sharded across worker processes that each keep a warm browser pool, so
+Chromium starts once per worker. Results are written back in the same shape
+as ``tmp/test_results.json``. With ``--changed-since`` only the cases a
+change can affect are run (see :mod:`harness.impact`).
+
+The perf cases under ``perf/`` seed millions of rows and measure the app on
+the stand-in backend, so default discovery skips them. ``--perf`` runs them
+one at a time with the stand-in's environment and a long timeout.
+"""
+import argparse
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness import impact
+from harness.config import BACKUP_DIR, PERF_DIR, RESULTS_PATH, SUITE_DIR, TMP_DIR
+from harness.standin import ENV_PATH, read_env
+from harness.trace import TRACE_DIR, api_calls
+from harness.worker import RESULT_PREFIX
+
+CASE_PATTERN = re.compile(r"^(TC\d{3})_(.+)\.py$")
+DEFAULT_TIMEOUT = 180
+# Perf cases may seed a profile before measuring.
+PERF_TIMEOUT = 3 * 60 * 60
+DEFAULT_BROWSERS = 2
+# Headroom for a shard's interpreter, Playwright and browser startup.
+SHARD_STARTUP_SECONDS = 60
+STEP_TIMINGS_PATH = TMP_DIR / "step_timings.json"
+
+
+@dataclass(frozen=True)
+class TestCase:
+    case_id: str
+    name: str
+    path: Path
+    test_type: str  # "BACKEND" or "FRONTEND"
+
+    @property
+    def title(self):
+        return f"{self.case_id}-{self.name}"
+
+
+@dataclass
+class TestResult:
+    case: TestCase
+    status: str  # "PASSED" or "FAILED"
+    error: str
+    duration: float
+    steps: list = field(default_factory=list)
+
+
+def discover(directory=BACKUP_DIR, test_type=None, keyword=None):
+    """Return the TCxxx cases under ``directory`` sorted by id and name."""
+    cases = []
+    for path in sorted(Path(directory).glob("TC*.py")):
+        match = CASE_PATTERN.match(path.name)
+        if not match:
+            continue
+        source = path.read_text(encoding="utf-8")
+        kind = "FRONTEND" if "playwright" in source else "BACKEND"
+        if test_type and kind != test_type.upper():
+            continue
+        if keyword and keyword.lower() not in path.stem.lower():
+            continue
+        cases.append(TestCase(match.group(1), match.group(2), path, kind))
+    return cases
+
+
+def _worker_env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SUITE_DIR), env.get("PYTHONPATH")])
+    )
+    env.setdefault("PYTHONUNBUFFERED", "1")
+    return env
+
+
+def run_case(case, timeout=DEFAULT_TIMEOUT):
+    """Run one case in an isolated interpreter."""
+    started = time.monotonic()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "harness.worker", str(case.path)],
+            cwd=SUITE_DIR,
+            env=_worker_env(),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return TestResult(
+            case, "FAILED", f"Test execution timed out after {timeout} seconds",
+            time.monotonic() - started,
+        )
+
+    duration = time.monotonic() - started
+    if proc.returncode == 0:
+        return TestResult(case, "PASSED", "", duration)
+    return TestResult(case, "FAILED", proc.stderr.strip() or proc.stdout.strip(), duration)
+
+
+def _decode(output):
+    if isinstance(output, bytes):
+        return output.decode("utf-8", "replace")
+    return output or ""
+
+
+def run_shard(cases, browsers=DEFAULT_BROWSERS, timeout=DEFAULT_TIMEOUT, traced=False):
+    """Run UI ``cases`` in one worker process sharing ``browsers`` pooled browsers."""
+    started = time.monotonic()
+    budget = timeout * math.ceil(len(cases) / browsers) + SHARD_STARTUP_SECONDS
+    command = [
+        sys.executable, "-m", "harness.worker",
+        "--browsers", str(browsers), "--timeout", str(timeout),
+        *(["--trace"] if traced else []),
+        *(str(case.path) for case in cases),
+    ]
+    try:
+        proc = subprocess.run(
+            command, cwd=SUITE_DIR, env=_worker_env(),
+            capture_output=True, text=True, timeout=budget,
+        )
+        stdout, stderr = proc.stdout, proc.stderr
+        missing_error = stderr.strip() or "Worker exited without reporting a result"
+    except subprocess.TimeoutExpired as exc:
+        stdout, stderr = _decode(exc.stdout), _decode(exc.stderr)
+        missing_error = f"Test execution timed out after {budget:.0f} seconds (worker shard)"
+
+    reported = {}
+    for line in stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            record = json.loads(line[len(RESULT_PREFIX):])
+            reported[record["path"]] = record
+
+    results = []
+    for case in cases:
+        record = reported.get(str(case.path))
+        if record:
+            results.append(TestResult(
+                case, record["status"], record["error"], record["duration"], record.get("steps", []),
+            ))
+        else:
+            results.append(TestResult(case, "FAILED", missing_error, time.monotonic() - started))
+    return results
+
+
+def run_suite(cases, workers=None, timeout=DEFAULT_TIMEOUT, browsers=DEFAULT_BROWSERS, on_result=None,
+              traced=False):
+    """Run ``cases`` concurrently and return results in discovery order.
+
+    Backend cases get a process each. UI cases are split into at most
+    ``workers`` shards with ``browsers`` warm browsers per shard; pass
+    ``browsers=0`` to run UI cases one process each as well. ``traced``
+    writes a per-step trace and waterfall for each UI case (see
+    :mod:`harness.trace`).
+    """
+    workers = workers or os.cpu_count() or 1
+    ui_cases = [case for case in cases if case.test_type == "FRONTEND"] if browsers else []
+    single_cases = [case for case in cases if case not in ui_cases]
+    shards = [ui_cases[i::workers] for i in range(min(workers, len(ui_cases)))]
+
+    def _single(case):
+        return [run_case(case, timeout)]
+
+    def _shard(shard):
+        return run_shard(shard, browsers, timeout, traced)
+
+    by_title = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_shard, shard) for shard in shards]
+        futures += [pool.submit(_single, case) for case in single_cases]
+        for future in as_completed(futures):
+            for result in future.result():
+                by_title[result.case.title] = result
+                if on_result:
+                    on_result(result)
+    return [by_title[case.title] for case in cases]
+
+
+def _plan_descriptions():
+    descriptions = {}
+    for plan in ("testsprite_backend_test_plan.json", "testsprite_frontend_test_plan.json"):
+        try:
+            entries = json.loads((SUITE_DIR / plan).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        for entry in entries:
+            descriptions[f"{entry['id']}-{entry['title']}"] = entry.get("description", "")
+    return descriptions
+
+
+def write_results(results, path=RESULTS_PATH):
+    """Merge ``results`` into ``path``, keeping ids of previously recorded cases."""
+    path = Path(path)
+    try:
+        existing = {entry["title"]: entry for entry in json.loads(path.read_text(encoding="utf-8"))}
+    except (OSError, ValueError):
+        existing = {}
+
+    descriptions = _plan_descriptions()
+    now = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+    entries = []
+    for result in results:
+        case = result.case
+        entry = dict(existing.pop(case.title, None) or {"testId": str(uuid.uuid4()), "created": now})
+        entry.update({
+            "title": case.title,
+            "description": entry.get("description") or descriptions.get(case.title, ""),
+            "code": case.path.read_text(encoding="utf-8"),
+            "testStatus": result.status,
+            "testError": result.error,
+            "testType": case.test_type,
+            "modified": now,
+        })
+        entries.append(entry)
+    # Keep cases that were not part of this run.
+    entries.extend(existing.values())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entries, indent=2) + "\n", encoding="utf-8")
+
+
+def write_step_timings(results, path=STEP_TIMINGS_PATH):
+    """Write the per-step waits of every UI case that recorded any."""
+    timings = {result.case.title: result.steps for result in results if result.steps}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(timings, indent=2) + "\n", encoding="utf-8")
+    return timings
+
+
+def slowest_steps(results, limit=5):
+    """Return ``(title, step)`` pairs with the longest waits across ``results``."""
+    steps = [(result.case.title, step) for result in results for step in result.steps]
+    return sorted(steps, key=lambda item: item[1].get("wait_ms", 0), reverse=True)[:limit]
+
+
+def slowest_api_calls(results, limit=5):
+    """Return ``(title, request)`` pairs for the traced ``/api`` calls with the slowest TTFB."""
+    calls = [(result.case.title, call) for result in results for call in api_calls(result.steps)]
+    return sorted(calls, key=lambda item: item[1].get("ttfb_ms") or 0, reverse=True)[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness", description=__doc__.splitlines()[0])
+    parser.add_argument("--type", choices=("backend", "frontend"), help="only run one kind of case")
+    parser.add_argument("-k", dest="keyword", help="only run cases whose file name contains this")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parallel worker processes")
+    parser.add_argument("--timeout", type=float, help=f"per-case timeout in seconds (default {DEFAULT_TIMEOUT}, "
+                                                      f"{PERF_TIMEOUT} with --perf)")
+    parser.add_argument("--browsers", type=int, default=DEFAULT_BROWSERS,
+                        help="warm browsers per UI worker (0 runs every UI case in its own process)")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="results file to write")
+    parser.add_argument("--trace", action="store_true",
+                        help="record network, navigation timing and Web Vitals per UI step into tmp/traces")
+    parser.add_argument("--changed-since", metavar="REF", nargs="?", const="HEAD",
+                        help="only run cases affected by changes since REF (default HEAD); "
+                             "reuse cached passes for the rest")
+    parser.add_argument("--list", action="store_true", help="list matching cases and exit")
+    parser.add_argument("--perf", action="store_true",
+                        help="run the perf cases in perf/ instead, one at a time, against a running "
+                             'stand-in with the app (python -m harness.standin --app "npm run start")')
+    args = parser.parse_args(argv)
+
+    if args.perf:
+        standin_env = read_env()
+        if not standin_env and not args.list:
+            print(f"No stand-in environment at {ENV_PATH}; start one first: "
+                  f'python -m harness.standin --app "npm run start"', file=sys.stderr)
+            return 2
+        # The stand-in's MONGODB_URI etc. win over a loaded app .env.
+        os.environ.update(standin_env)
+        args.workers = 1
+    if args.timeout is None:
+        args.timeout = PERF_TIMEOUT if args.perf else DEFAULT_TIMEOUT
+
+    cases = discover(PERF_DIR if args.perf else BACKUP_DIR, test_type=args.type, keyword=args.keyword)
+    cache = impact.load_cache()
+    if args.changed_since:
+        selected, reused, fingerprints, reasons = impact.plan(cases, args.changed_since, cache)
+        print(f"Selected {len(selected)} of {len(cases)} cases affected since {args.changed_since}; "
+              f"reusing {len(reused)} cached passes", flush=True)
+    else:
+        selected, reused, reasons = cases, {}, {}
+        fingerprints = {case.title: impact.fingerprint(case) for case in cases}
+    if args.list:
+        for case in selected:
+            reason = f"  ({reasons[case.title]})" if case.title in reasons else ""
+            print(f"{case.test_type:<8} {case.path.name}{reason}")
+        return 0
+
+    def report(result):
+        print(f"{result.status:<6} {result.duration:6.1f}s  {result.case.path.name}", flush=True)
+
+    started = time.monotonic()
+    results = run_suite(selected, workers=args.workers, timeout=args.timeout,
+                        browsers=args.browsers, on_result=report, traced=args.trace)
+    write_results(results, args.output)
+    impact.save_cache(cache, results, fingerprints)
+    if write_step_timings(results):
+        print("\nSlowest waits:")
+        for title, step in slowest_steps(results):
+            print(f"  {step.get('wait_ms', 0):8.0f}ms  {step['action']:<12} {step['route']:<24} {title}")
+    if args.trace:
+        print(f"\nTraces and waterfalls: {TRACE_DIR}")
+        for title, call in slowest_api_calls(results):
+            print(f"  {call.get('ttfb_ms') or 0:8.0f}ms  TTFB {call['method']:<6} {call['path']:<30} {title}")
+
+    failed = sum(result.status == "FAILED" for result in results)
+    cached = f", {len(reused)} cached" if reused else ""
+    print(f"\n{len(results) - failed} passed, {failed} failed{cached} in {time.monotonic() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Latency benchmark for ``GET /api/search`` over a million-product catalogue.
+
+Seeds the ``catalog`` profile (1M products), builds the search index through
+``/api/cron/search/reindex?full=1`` if it is missing, then times a fixed set
+of queries: exact words, prefixes, typos, multi-word, filtered, price-sorted,
+and 20 pages deep along ``nextCursor``::
+
+    python -m harness.search_bench --iterations 30
+
+Run it against the app started on the stand-in
+(``python -m harness.standin --app "npm run start"``). Each case reports
+latency percentiles, ``total`` and whether facets came back. The run fails if
+a case's p95 is over ``--budget-ms`` (default: the PERF-API-001 GET budget).
+The report goes to ``tmp/search_bench.json``.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from harness.budgets import load_budgets
+from harness.client import api_session
+from harness.config import TMP_DIR
+from harness.histogram import LatencyHistogram
+from harness.seed import _database, ensure_seeded
+
+REPORT_PATH = TMP_DIR / "search_bench.json"
+DEEP_PAGES = 20
+
+CASES = {
+    "word": {"q": "photography"},
+    "prefix": {"q": "phot"},
+    "typo": {"q": "photgraphy"},
+    "multi_word": {"q": "advanced python course"},
+    "category_filter": {"q": "guide", "category": "fitness"},
+    "price_range": {"q": "template", "minPrice": 50000, "maxPrice": 250000},
+    "sort_price": {"q": "masterclass", "sortBy": "price"},
+    "creators": {"q": "perf creator", "type": "creators"},
+}
+
+
+def build_index(session, timeout=3600):
+    """Run the reindex cron until it has caught up; returns (seconds, documents indexed)."""
+    headers = {"Authorization": f"Bearer {os.environ.get('CRON_SECRET', 'standin-cron-secret')}"}
+    started = time.monotonic()
+    indexed = 0
+    params = {"full": "1"}
+    while time.monotonic() - started < timeout:
+        response = session.get("/api/cron/search/reindex", params=params, headers=headers, timeout=120)
+        response.raise_for_status()
+        body = response.json()
+        indexed += sum(result["indexed"] for result in body["results"])
+        print(f"  indexed {indexed:,} in {time.monotonic() - started:.0f}s", flush=True)
+        if body["caughtUp"]:
+            return time.monotonic() - started, indexed
+    raise TimeoutError(f"Search index not built after {timeout}s")
+
+
+def timed(session, params):
+    started = time.perf_counter()
+    response = session.get("/api/search", params=params)
+    elapsed = (time.perf_counter() - started) * 1000
+    assert response.ok, f"{params}: {response.status_code} {response.text[:200]}"
+    return elapsed, response.json()
+
+
+def run_case(session, params, iterations, warmup=2):
+    histogram = LatencyHistogram()
+    body = None
+    for i in range(warmup + iterations):
+        elapsed, body = timed(session, params)
+        if i >= warmup:
+            histogram.record(elapsed)
+    return {
+        "params": params,
+        "latency_ms": histogram.summary(),
+        "total": body["pagination"]["total"],
+        "total_capped": body["pagination"].get("totalCapped"),
+        "facets": bool(body.get("facets")),
+        "top": [hit.get("title") for hit in body["results"][:3]],
+    }
+
+
+def run_deep_pagination(session, params, pages=DEEP_PAGES):
+    """Follow ``nextCursor`` and time every page."""
+    latencies = []
+    cursor = None
+    for _ in range(pages):
+        elapsed, body = timed(session, {**params, **({"cursor": cursor} if cursor else {})})
+        latencies.append(round(elapsed, 1))
+        cursor = body["pagination"]["nextCursor"]
+        if not cursor:
+            break
+    return {"params": params, "pages": len(latencies), "page_ms": latencies,
+            "first_page_ms": latencies[0], "last_page_ms": latencies[-1]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.search_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", default="catalog", help="seed profile (default: catalog, 1M products)")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--reindex", action="store_true", help="rebuild the index even if it looks complete")
+    parser.add_argument("--budget-ms", type=float, help="p95 limit per case (default: PERF-API-001)")
+    parser.add_argument("--output", type=Path, default=REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.budget_ms is None:
+        budgets, _ = load_budgets()
+        args.budget_ms = next(budget.limit_ms for budget in budgets if budget.spec_id == "PERF-API-001")
+
+    dataset = ensure_seeded(args.profile)
+    session = api_session()
+    db = _database(None)
+    indexed = db["searchdocuments"].count_documents({"kind": "product"})
+    # Other seeded profiles share the collection; index whatever is there.
+    products = db["products"].estimated_document_count()
+    index_build = None
+    if args.reindex or indexed < products:
+        print(f"Building the search index ({indexed:,} of {products:,} products indexed)...")
+        seconds, documents = build_index(session)
+        index_build = {"seconds": round(seconds, 1), "documents": documents,
+                       "docs_per_second": round(documents / seconds) if seconds else None}
+
+    cases = {}
+    for name, params in CASES.items():
+        cases[name] = run_case(session, params, args.iterations)
+        latency = cases[name]["latency_ms"]
+        print(f"{name:<16} p50={latency['p50']:>7}ms p95={latency['p95']:>7}ms p99={latency['p99']:>7}ms "
+              f"total={cases[name]['total']:,}{'+' if cases[name]['total_capped'] else ''}", flush=True)
+    deep = run_deep_pagination(session, {"q": "guide", "limit": 20})
+    print(f"deep pages: page 1 {deep['first_page_ms']}ms, page {deep['pages']} {deep['last_page_ms']}ms")
+
+    over = {name: case["latency_ms"]["p95"] for name, case in cases.items() if case["latency_ms"]["p95"] > args.budget_ms}
+    report = {"profile": args.profile, "products": dataset.counts.get("products"), "budget_ms": args.budget_ms,
+              "index_build": index_build, "cases": cases, "deep_pagination": deep, "over_budget": over}
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if over:
+        print(f"Over the {args.budget_ms:.0f}ms p95 budget: {over}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,581 @@
+"""Bulk synthetic data for realistic-scale benchmarks.
+
+The seeded test accounts are far too small to show how ``Order.aggregate``,
+``AnalyticsEvent.distinct('ip')`` or the product search index scale.
+This seeder bulk-inserts millions of products, orders, leads and analytics
+events spread over many creators with a Zipf skew: a few huge creators and
+a long tail. Documents are generated lazily and streamed in unordered
+``insert_many`` batches over a small thread pool::
+
+    python -m harness.seed --profile large --uri mongodb://127.0.0.1:27017/creatorly_perf
+
+Every document id is derived from ``(profile, creator, n)`` and every random
+choice from a seeded RNG, so two runs on the same day produce the same data
+(timestamps end at the seeding day's UTC midnight so events stay inside the
+TTL). Creator 0 is the stand-in creator (:data:`harness.standin.CREATOR_ID`)
+and the biggest one.
+
+Profiles live side by side: each seeded document carries the profile name in
+``perfSeed``, and a reseed deletes only that profile's documents. Creators
+are shared and only ever added. Seeding refuses to write to anything but a
+loopback MongoDB (the stand-in's) unless ``--allow-remote`` or
+``PERF_SEED_ALLOW_REMOTE=1`` is given.
+
+Perf cases use :func:`ensure_seeded` as a fixture: it loads a profile only
+if the database does not already hold it (seeded within the last
+``PERF_SEED_MAX_AGE_DAYS`` days) and returns a :class:`Dataset` describing
+what is there (creator ids, per-collection counts).
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from harness.standin import CREATOR_EMAIL, CREATOR_ID, CREATOR_USERNAME, DATABASE
+
+MANIFEST_COLLECTION = "perfseed"
+# Marks every seeded product, order, lead and event with its profile name.
+SEED_FIELD = "perfSeed"
+PROFILE_COLLECTIONS = ("products", "orders", "leads", "analyticsevents")
+BATCH_SIZE = 5000
+WORKERS = 4
+# AnalyticsEvent has a 90-day TTL index; keep seeded events inside it.
+MAX_DAYS = 89
+# A seeded window ending this many days ago is still reused, so a profile
+# is not reloaded every day; TC054's "week" period still finds events.
+MAX_AGE_DAYS = int(os.environ.get("PERF_SEED_MAX_AGE_DAYS", "3"))
+ALLOW_REMOTE_ENV = "PERF_SEED_ALLOW_REMOTE"
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+@dataclass(frozen=True)
+class Profile:
+    creators: int
+    products: int
+    orders: int
+    leads: int
+    events: int
+    days: int = 30
+    skew: float = 1.1  # Zipf exponent: creator i gets weight 1 / (i + 1) ** skew
+    seed: int = 1
+
+
+PROFILES = {
+    "small": Profile(creators=50, products=2_000, orders=20_000, leads=10_000, events=200_000),
+    "medium": Profile(creators=500, products=20_000, orders=200_000, leads=100_000, events=2_000_000),
+    "large": Profile(creators=2_000, products=100_000, orders=1_000_000, leads=500_000, events=10_000_000),
+    # Search benchmarks: a million-product catalogue and little else.
+    "catalog": Profile(creators=5_000, products=1_000_000, orders=10_000, leads=10_000, events=10_000),
+    # Streaming exports: one creator with a million orders and a million leads.
+    "export": Profile(creators=1, products=1_000, orders=1_000_000, leads=1_000_000, events=10_000),
+}
+
+EVENT_TYPES = {
+    "page_view": 55, "store_view": 15, "product_view": 18, "add_to_cart": 3, "checkout_start": 4, "purchase": 2,
+    "download": 2, "error": 1,
+}
+PRODUCT_TYPES = ("digital_download", "course", "ebook", "template", "preset", "membership", "service")
+UTM_SOURCES = (None, None, None, "instagram", "youtube", "twitter", "newsletter", "google")
+REFERRERS = (None, "https://instagram.com/", "https://www.youtube.com/", "https://t.co/", "https://www.google.com/")
+USER_AGENTS = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148",
+    "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 Chrome/124.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 Version/17.4 Safari/605.1.15",
+)
+# Small vocabulary so search queries hit realistic numbers of documents.
+TOPICS = (
+    "fitness", "yoga", "photography", "lightroom", "notion", "productivity", "finance", "investing",
+    "cooking", "baking", "guitar", "piano", "design", "figma", "marketing", "instagram", "youtube",
+    "coding", "python", "javascript", "writing", "journaling", "travel", "skincare", "meditation",
+)
+FORMATS = ("guide", "course", "template", "preset pack", "ebook", "workbook", "masterclass", "toolkit", "checklist")
+LEVELS = ("beginner", "complete", "advanced", "ultimate", "quick-start", "pro")
+
+# Hot-path indexes from the Mongoose models, built after the load (much
+# faster than maintaining them per insert). Search entries are not seeded:
+# the app's /api/cron/search/reindex builds them from the products.
+INDEXES = {
+    "analyticsevents": [
+        ({"createdAt": 1}, {"expireAfterSeconds": 60 * 60 * 24 * 90}),
+        ({"creatorId": 1, "eventType": 1, "createdAt": -1}, {}),
+        ({"creatorId": 1, "utm_source": 1, "createdAt": -1}, {}),
+        ({"creatorId": 1}, {}),
+        ({"sessionId": 1}, {}),
+    ],
+    "orders": [
+        ({"orderNumber": 1}, {"unique": True}),
+        ({"razorpayOrderId": 1}, {"unique": True, "sparse": True}),
+        ({"creatorId": 1, "createdAt": -1, "_id": -1}, {}),
+        ({"creatorId": 1, "status": 1, "createdAt": -1, "_id": -1}, {}),
+        ({"createdAt": -1, "_id": -1}, {}),
+        ({"creatorId": 1, "paymentStatus": 1, "createdAt": -1, "total": 1}, {}),
+        ({"creatorId": 1, "amount": 1, "createdAt": -1}, {}),
+        ({"customerEmail": 1, "createdAt": -1}, {}),
+        ({"userId": 1}, {}),
+        ({"items.productId": 1}, {}),
+    ],
+    "leads": [
+        ({"email": 1, "createdAt": -1}, {}),
+        ({"creatorId": 1, "createdAt": -1, "_id": -1}, {}),
+        ({"createdAt": -1, "_id": -1}, {}),
+        ({"creatorId": 1, "email": 1}, {}),
+        ({"creatorId": 1, "dmStatus": 1}, {}),
+    ],
+    "products": [
+        ({"slug": 1}, {"unique": True}),
+        ({"creatorId": 1, "slug": 1}, {"unique": True}),
+        ({"creatorId": 1, "createdAt": -1, "_id": -1}, {}),
+        ({"createdAt": -1, "_id": -1}, {}),
+        ({"creatorId": 1, "status": 1, "sortOrder": 1}, {}),
+        ({"creatorId": 1, "isActive": 1, "sortOrder": 1}, {}),
+        ({"updatedAt": 1, "_id": 1}, {}),
+    ],
+    "searchdocuments": [
+        ({"kind": 1, "refId": 1}, {"unique": True}),
+        ({"kind": 1, "visible": 1, "terms": 1, "rank": -1, "_id": 1}, {}),
+        ({"kind": 1, "indexedAt": 1}, {}),
+    ],
+}
+
+
+def _object_id(kind, *parts):
+    """Deterministic 12-byte ObjectId for ``kind`` and ``parts``."""
+    from bson import ObjectId
+
+    digest = hashlib.blake2b(repr((kind, *parts)).encode(), digest_size=12).digest()
+    return ObjectId(digest)
+
+
+def creator_id(profile, index):
+    if index == 0:
+        from bson import ObjectId
+
+        return ObjectId(CREATOR_ID)
+    return _object_id("creator", profile.seed, index)
+
+
+def creator_username(index):
+    return CREATOR_USERNAME if index == 0 else f"{CREATOR_USERNAME}-{index}"
+
+
+def creator_email(index):
+    if index == 0:
+        return os.environ.get("TEST_USER_EMAIL", CREATOR_EMAIL).lower()
+    return f"{creator_username(index)}@creatorly.test"
+
+
+def product_id(name, profile, creator, n):
+    return _object_id("product", name, profile.seed, creator, n)
+
+
+def allocate(total, creators, skew):
+    """Split ``total`` over ``creators`` by Zipf weight; every creator gets at least one."""
+    if total < creators:
+        return [1 if i < total else 0 for i in range(creators)]
+    weights = [1 / (i + 1) ** skew for i in range(creators)]
+    scale = (total - creators) / sum(weights)
+    counts = [1 + int(weight * scale) for weight in weights]
+    counts[0] += total - sum(counts)  # rounding remainder to the largest creator
+    return counts
+
+
+def today():
+    """UTC midnight: the end of the seeded window, so data stays inside the TTL."""
+    return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class Dataset:
+    """What a seeded database holds; returned by :func:`seed` and :func:`ensure_seeded`."""
+
+    profile: str
+    settings: dict
+    anchor: str = ""  # ISO date the seeded window ends on
+    counts: dict = field(default_factory=dict)
+    creators: dict = field(default_factory=dict)  # collection -> per-creator counts
+    seconds: float = 0.0
+
+    @property
+    def top_creator_id(self):
+        return CREATOR_ID
+
+    def creator_ids(self, limit=None):
+        profile = Profile(**self.settings)
+        return [str(creator_id(profile, i)) for i in range(min(limit or profile.creators, profile.creators))]
+
+
+class Generator:
+    """Lazy document streams for one profile."""
+
+    def __init__(self, name, profile, end=None):
+        self.name = name
+        self.profile = profile
+        self.end = end or today()
+        self.start = self.end - timedelta(days=min(profile.days, MAX_DAYS))
+        self.window = (self.end - self.start).total_seconds()
+        self.products_per_creator = allocate(profile.products, profile.creators, profile.skew)
+
+    def at(self, rng):
+        # Skewed towards recent days, like real growth.
+        return self.start + timedelta(seconds=self.window * rng.random() ** 0.7)
+
+    def rng(self, collection, creator):
+        return random.Random(f"{self.profile.seed}:{collection}:{creator}")
+
+    def users(self):
+        for i in range(self.profile.creators):
+            yield {
+                "_id": creator_id(self.profile, i),
+                "username": creator_username(i),
+                "email": creator_email(i),
+                "displayName": f"Perf Creator {i}",
+                "role": "creator",
+                "plan": "pro" if i < self.profile.creators // 10 + 1 else "free",
+                "status": "active",
+                "isSuspended": False,
+                "emailVerified": True,
+                "createdAt": self.start,
+                "updatedAt": self.start,
+            }
+
+    def creator_profiles(self):
+        for i in range(self.profile.creators):
+            yield {
+                "_id": _object_id("profile", self.profile.seed, i),
+                "creatorId": creator_id(self.profile, i),
+                "storeName": f"Perf Creator {i} Store",
+                "createdAt": self.start,
+                "updatedAt": self.start,
+            }
+
+    def products(self):
+        for creator, count in enumerate(self.products_per_creator):
+            rng = self.rng("products", creator)
+            owner = creator_id(self.profile, creator)
+            for n in range(count):
+                topic, fmt, level = rng.choice(TOPICS), rng.choice(FORMATS), rng.choice(LEVELS)
+                created = self.at(rng)
+                price = rng.choice((0, 99, 199, 299, 499, 999, 1499, 2999, 4999)) * 100
+                yield {
+                    "_id": product_id(self.name, self.profile, creator, n),
+                    SEED_FIELD: self.name,
+                    "creatorId": owner,
+                    "productType": rng.choice(PRODUCT_TYPES),
+                    "title": f"The {level} {topic} {fmt}",
+                    "slug": f"{creator_username(creator)}-{self.name}-{topic}-{n}",
+                    "description": f"A {level} {fmt} on {topic} and {rng.choice(TOPICS)} for creators.",
+                    "tags": [topic, fmt.split()[0]],
+                    "category": topic,
+                    "pricing": {"basePrice": price, "currency": "INR", "taxInclusive": False},
+                    "status": "published" if rng.random() < 0.85 else "draft",
+                    "isActive": True,
+                    "isPublished": True,
+                    "isDeleted": False,
+                    "isArchived": False,
+                    "sortOrder": n,
+                    "totalSales": 0,
+                    "createdAt": created,
+                    "updatedAt": created,
+                }
+
+    def orders(self):
+        seq = 0
+        for creator, count in enumerate(allocate(self.profile.orders, self.profile.creators, self.profile.skew)):
+            rng = self.rng("orders", creator)
+            owner = creator_id(self.profile, creator)
+            catalogue = self.products_per_creator[creator]
+            buyers = max(1, count // 3)  # repeat customers
+            for _ in range(count):
+                seq += 1
+                buyer = rng.randrange(buyers)
+                n = rng.randrange(catalogue) if catalogue else 0
+                price = rng.choice((99, 199, 299, 499, 999, 1499)) * 100
+                created = self.at(rng)
+                status = rng.choices(("completed", "pending", "failed", "refunded"), (90, 5, 4, 1))[0]
+                yield {
+                    "_id": _object_id("order", self.name, self.profile.seed, seq),
+                    SEED_FIELD: self.name,
+                    "orderNumber": f"PERF-{self.name.upper()}-{self.profile.seed}-{seq:09d}",
+                    "items": [{"productId": product_id(self.name, self.profile, creator, n), "name": f"Product {n}",
+                               "price": price, "quantity": 1, "type": "digital"}],
+                    "creatorId": owner,
+                    "userId": _object_id("buyer", self.profile.seed, creator, buyer),
+                    "customerEmail": f"buyer{buyer}.c{creator}@example.test",
+                    "amount": price,
+                    "total": price,
+                    "currency": "INR",
+                    "paymentGateway": "razorpay",
+                    "razorpayOrderId": f"order_{self.name}{self.profile.seed}x{seq:010d}",
+                    "status": status,
+                    "paymentStatus": {"completed": "paid", "refunded": "refunded"}.get(status, status),
+                    "createdAt": created,
+                    "updatedAt": created,
+                }
+
+    def leads(self):
+        for creator, count in enumerate(allocate(self.profile.leads, self.profile.creators, self.profile.skew)):
+            rng = self.rng("leads", creator)
+            owner = creator_id(self.profile, creator)
+            for n in range(count):
+                created = self.at(rng)
+                yield {
+                    "_id": _object_id("lead", self.name, self.profile.seed, creator, n),
+                    SEED_FIELD: self.name,
+                    "email": f"lead{n}.c{creator}@example.test",
+                    "name": f"Lead {n}",
+                    "creatorId": owner,
+                    "source": rng.choice(("storefront", "instagram", "lead_magnet", "whatsapp")),
+                    "downloadSent": rng.random() < 0.6,
+                    "dmStatus": rng.choices(("none", "sent", "pending", "failed"), (50, 40, 5, 5))[0],
+                    "dmAttempts": 0,
+                    "createdAt": created,
+                    "updatedAt": created,
+                }
+
+    def events(self):
+        types, weights = list(EVENT_TYPES), list(EVENT_TYPES.values())
+        for creator, count in enumerate(allocate(self.profile.events, self.profile.creators, self.profile.skew)):
+            rng = self.rng("events", creator)
+            owner = creator_id(self.profile, creator)
+            catalogue = self.products_per_creator[creator]
+            visitors = max(1, count // 8)  # ~8 events per unique visitor
+            username = creator_username(creator)
+            for n in range(count):
+                visitor = rng.randrange(visitors)
+                event_type = rng.choices(types, weights)[0]
+                doc = {
+                    "_id": _object_id("event", self.name, self.profile.seed, creator, n),
+                    SEED_FIELD: self.name,
+                    "eventType": event_type,
+                    "creatorId": owner,
+                    "path": f"/u/{username}",
+                    "ip": f"10.{visitor >> 16 & 255}.{visitor >> 8 & 255}.{visitor & 255}",
+                    "userAgent": USER_AGENTS[visitor % len(USER_AGENTS)],
+                    "sessionId": f"s{creator}-{visitor}-{n // 20}",
+                    "createdAt": self.at(rng),
+                }
+                if event_type != "page_view" and catalogue:
+                    doc["productId"] = product_id(self.name, self.profile, creator, rng.randrange(catalogue))
+                referrer = rng.choice(REFERRERS)
+                if referrer:
+                    doc["referrer"] = referrer
+                source = rng.choice(UTM_SOURCES)
+                if source:
+                    doc["utm_source"] = source
+                    doc["utm_medium"] = "social" if source in ("instagram", "youtube", "twitter") else "email"
+                yield doc
+
+    def streams(self):
+        """``(collection, documents, count)`` in dependency order."""
+        profile = self.profile
+        return [
+            ("users", self.users(), profile.creators),
+            ("creatorprofiles", self.creator_profiles(), profile.creators),
+            ("products", self.products(), profile.products),
+            ("orders", self.orders(), profile.orders),
+            ("leads", self.leads(), profile.leads),
+            ("analyticsevents", self.events(), profile.events),
+        ]
+
+
+def _batches(documents, size):
+    while True:
+        batch = list(islice(documents, size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_stream(collection, documents, batch_size=BATCH_SIZE, workers=WORKERS, on_batch=None):
+    """Insert ``documents`` in unordered batches, at most ``workers`` in flight."""
+    from pymongo.errors import BulkWriteError
+
+    def insert(batch):
+        try:
+            return len(collection.insert_many(batch, ordered=False).inserted_ids)
+        except BulkWriteError as exc:
+            # Re-running over partly seeded data: duplicates are fine, anything else is not.
+            errors = exc.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in errors):
+                raise
+            return exc.details.get("nInserted", 0)
+
+    inserted = 0
+    pending = set()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(documents, batch_size):
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    inserted += future.result()
+                    if on_batch:
+                        on_batch(inserted)
+            pending.add(pool.submit(insert, batch))
+        for future in pending:
+            inserted += future.result()
+    if on_batch:
+        on_batch(inserted)
+    return inserted
+
+
+def build_indexes(db):
+    for name, specs in INDEXES.items():
+        for keys, options in specs:
+            db[name].create_index(list(keys.items()), **options)
+
+
+def check_target(db, allow_remote=False):
+    """Refuse to seed a database that is not on a loopback MongoDB.
+
+    A shell with the app's ``.env`` loaded points ``MONGODB_URI`` at real
+    data; the stand-in always listens on 127.0.0.1.
+    """
+    if allow_remote or os.environ.get(ALLOW_REMOTE_ENV) == "1":
+        return
+    hosts = [host for host, _ in db.client.topology_description.server_descriptions()]
+    if hosts and all(host in LOOPBACK_HOSTS or host.startswith("127.") for host in hosts):
+        return
+    raise RuntimeError(
+        f"Refusing to seed {db.name} on {', '.join(hosts) or 'an unknown host'}: not a loopback MongoDB. "
+        f"Use the stand-in, or pass --allow-remote / set {ALLOW_REMOTE_ENV}=1 if this database is disposable."
+    )
+
+
+def clear_profile(db, name):
+    """Delete the documents seeded for ``name``; other profiles and creators stay."""
+    products = db["products"].find({SEED_FIELD: name}, {"_id": 1}).batch_size(BATCH_SIZE)
+    for batch in _batches((product["_id"] for product in products), BATCH_SIZE):
+        db["searchdocuments"].delete_many({"kind": "product", "refId": {"$in": batch}})
+    for collection in PROFILE_COLLECTIONS:
+        db[collection].delete_many({SEED_FIELD: name})
+    db[MANIFEST_COLLECTION].delete_one({"_id": name})
+    # Seeded products bypass the model hooks; the next reindex must see all of them.
+    db["jobcheckpoints"].delete_many({"name": {"$regex": "^search-index:"}})
+
+
+def reset(db):
+    """Drop every seeded collection, including data from older seeder versions."""
+    for collection in (*PROFILE_COLLECTIONS, "searchdocuments", MANIFEST_COLLECTION):
+        db[collection].drop()
+    db["jobcheckpoints"].delete_many({"name": {"$regex": "^search-index:"}})
+
+
+def seed(db, name="small", profile=None, drop=True, indexes=True, batch_size=BATCH_SIZE, workers=WORKERS,
+         progress=None, allow_remote=False):
+    """Load ``profile`` into ``db`` and record a manifest; return the :class:`Dataset`."""
+    check_target(db, allow_remote)
+    profile = profile or PROFILES[name]
+    generator = Generator(name, profile)
+    started = time.monotonic()
+    if drop:
+        # Creators are only added: the stand-in's own creator 0 (and any
+        # signed-in test account) survives a reseed.
+        clear_profile(db, name)
+
+    dataset = Dataset(name, asdict(profile), generator.end.date().isoformat())
+    for collection, documents, expected in generator.streams():
+        collection_started = time.monotonic()
+
+        def report(done, collection=collection, expected=expected, collection_started=collection_started):
+            if progress:
+                progress(collection, done, expected, time.monotonic() - collection_started)
+
+        dataset.counts[collection] = insert_stream(db[collection], documents, batch_size, workers, report)
+
+    per_creator = {
+        "products": generator.products_per_creator,
+        "orders": allocate(profile.orders, profile.creators, profile.skew),
+        "leads": allocate(profile.leads, profile.creators, profile.skew),
+        "analyticsevents": allocate(profile.events, profile.creators, profile.skew),
+    }
+    dataset.creators = {collection: counts[:10] for collection, counts in per_creator.items()}
+    if indexes:
+        build_indexes(db)
+    dataset.seconds = round(time.monotonic() - started, 1)
+    db[MANIFEST_COLLECTION].replace_one({"_id": name}, {"_id": name, **asdict(dataset)}, upsert=True)
+    return dataset
+
+
+def _database(uri):
+    from pymongo import MongoClient
+
+    client = MongoClient(uri or os.environ.get("MONGODB_URI", f"mongodb://127.0.0.1:27017/{DATABASE}"))
+    return client.get_default_database(DATABASE)
+
+
+def _fresh(manifest, profile):
+    """Whether a manifest's window is recent enough to reuse for ``profile``."""
+    try:
+        age = (today().date() - datetime.fromisoformat(manifest["anchor"]).date()).days
+    except (KeyError, ValueError):
+        return False
+    return 0 <= age <= min(MAX_AGE_DAYS, MAX_DAYS - profile.days)
+
+
+def ensure_seeded(name="small", uri=None, **overrides):
+    """Fixture: seed ``name`` unless the database already holds exactly that data."""
+    profile = replace(PROFILES[name], **overrides)
+    db = _database(uri)
+    manifest = db[MANIFEST_COLLECTION].find_one({"_id": name})
+    if manifest and manifest.get("settings") == asdict(profile) and _fresh(manifest, profile):
+        manifest.pop("_id")
+        return Dataset(**manifest)
+    return seed(db, name, profile)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.seed", description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--uri", help="MongoDB URI (default: $MONGODB_URI)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every document count")
+    parser.add_argument("--skew", type=float, help="Zipf exponent for the per-creator split")
+    parser.add_argument("--seed", type=int, help="RNG seed (changes every id)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS, help="insert batches in flight")
+    parser.add_argument("--keep", action="store_true", help="don't delete the profile's earlier data first")
+    parser.add_argument("--reset", action="store_true",
+                        help="drop every seeded collection first (all profiles, and data from older seeders)")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help=f"seed a non-loopback MongoDB (or set {ALLOW_REMOTE_ENV}=1)")
+    parser.add_argument("--no-indexes", action="store_true", help="skip building the hot-path indexes")
+    args = parser.parse_args(argv)
+
+    base = PROFILES[args.profile]
+    profile = replace(
+        base,
+        products=int(base.products * args.scale),
+        orders=int(base.orders * args.scale),
+        leads=int(base.leads * args.scale),
+        events=int(base.events * args.scale),
+        skew=args.skew if args.skew is not None else base.skew,
+        seed=args.seed if args.seed is not None else base.seed,
+    )
+
+    def progress(collection, done, expected, elapsed):
+        rate = done / elapsed if elapsed else 0
+        print(f"\r{collection:<16} {done:>11,}/{expected:,}  {rate:>9,.0f} docs/s", end="", flush=True)
+        if done >= expected:
+            print()
+
+    db = _database(args.uri)
+    if args.reset:
+        check_target(db, args.allow_remote)
+        reset(db)
+    dataset = seed(
+        db, args.profile, profile, drop=not args.keep, indexes=not args.no_indexes,
+        batch_size=args.batch_size, workers=args.workers, progress=progress, allow_remote=args.allow_remote,
+    )
+    print(json.dumps(asdict(dataset), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,551 @@
+"""Local stand-in backend for hermetic performance runs.
+
+Starts everything the app talks to on loopback, so checkout and storefront
+latency can be measured with no network:
+
+* MongoDB (``mongod`` on PATH, else the ``mongo:6.0`` image CI uses)
+* Redis (``redis-server`` on PATH, else ``redis:7``) for ioredis/BullMQ
+* one fake HTTP server for the SaaS APIs:
+    - ``/upstash``  - Upstash REST protocol, proxied to the local Redis
+      (``src/lib/cache.ts`` uses ``Redis.fromEnv()``)
+    - ``/razorpay`` - deterministic order and payment objects
+    - ``/resend``   - accepts emails and counts them
+    - ``/meta``     - Graph API ``me/messages``; accepts DMs and records when
+      each recipient got which text (``/__messages``)
+    - ``/__stats``  - request counters, for throughput assertions
+
+and seeds a deterministic creator with a storefront and products::
+
+    python -m harness.standin --app "npm run start"
+
+prints the environment the app needs (also written to ``tmp/standin.env``),
+optionally launches the app with it, and runs until interrupted.
+"""
+import abc
+import argparse
+import base64
+import json
+import os
+import shlex
+import shutil
+import signal
+import socket
+import subprocess
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from harness.config import BASE_URL, TEST_SECRET, TMP_DIR
+
+STANDIN_DIR = TMP_DIR / "standin"
+ENV_PATH = TMP_DIR / "standin.env"
+DATABASE = "creatorly_perf"
+
+# Fixed ids so perf cases can address the seeded creator directly.
+CREATOR_ID = "650000000000000000000001"
+CREATOR_USERNAME = "perf-creator"
+CREATOR_EMAIL = "perf-creator@creatorly.test"
+PRODUCT_COUNT = 20
+SEED_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Nothing listening on 127.0.0.1:{port} after {timeout}s")
+
+
+class LocalService(abc.ABC):
+    """A loopback server started from a local binary or, failing that, Docker."""
+
+    binary = None
+    image = None
+    container_port = None
+
+    def __init__(self):
+        self.port = _free_port()
+        self._process = None
+        self._container = None
+
+    @abc.abstractmethod
+    def command(self):
+        """The argv that runs ``binary`` on ``self.port``."""
+
+    def start(self):
+        if shutil.which(self.binary):
+            self._process = subprocess.Popen(
+                self.command(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+        elif shutil.which("docker"):
+            self._container = f"creatorly-perf-{self.binary}-{self.port}"
+            subprocess.run(
+                ["docker", "run", "-d", "--rm", "--name", self._container,
+                 "-p", f"127.0.0.1:{self.port}:{self.container_port}", self.image],
+                check=True, stdout=subprocess.DEVNULL,
+            )
+        else:
+            raise RuntimeError(f"Neither {self.binary} nor docker is available")
+        _wait_for_port(self.port)
+        return self
+
+    def stop(self):
+        if self._process:
+            self._process.terminate()
+            self._process.wait(timeout=30)
+        if self._container:
+            subprocess.run(["docker", "stop", self._container], stdout=subprocess.DEVNULL)
+
+
+class LocalMongo(LocalService):
+    binary = "mongod"
+    image = "mongo:6.0"
+    container_port = 27017
+
+    def command(self):
+        dbpath = STANDIN_DIR / f"mongo-{self.port}"
+        dbpath.mkdir(parents=True, exist_ok=True)
+        return [self.binary, "--dbpath", str(dbpath), "--port", str(self.port), "--bind_ip", "127.0.0.1", "--quiet"]
+
+    @property
+    def uri(self):
+        return f"mongodb://127.0.0.1:{self.port}/{DATABASE}"
+
+
+class LocalRedis(LocalService):
+    binary = "redis-server"
+    image = "redis:7"
+    container_port = 6379
+
+    def command(self):
+        return [self.binary, "--port", str(self.port), "--bind", "127.0.0.1", "--save", "", "--appendonly", "no"]
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.port}"
+
+
+class RedisError(Exception):
+    pass
+
+
+class RespConnection:
+    """Just enough RESP2 to proxy Upstash REST commands to a real Redis."""
+
+    def __init__(self, port):
+        self._sock = socket.create_connection(("127.0.0.1", port))
+        self._file = self._sock.makefile("rb")
+
+    def execute(self, *args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read()
+
+    def _read(self):
+        line = self._file.readline().rstrip(b"\r\n")
+        kind, rest = line[:1], line[1:]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)[:-2]
+            return data
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise RedisError(f"Unexpected RESP reply: {line!r}")
+
+
+def _upstash_value(value, encode):
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode() if encode else value.decode("utf-8", "replace")
+    if isinstance(value, list):
+        return [_upstash_value(item, encode) for item in value]
+    return value
+
+
+class FakeState:
+    """Counters and deterministic ids shared by the fake API handlers."""
+
+    def __init__(self, redis_port, latency_ms=0):
+        self.redis_port = redis_port
+        self.latency_ms = latency_ms
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.sequences = {}
+        self.orders = {}
+        self.messages = {}
+        self._local = threading.local()
+
+    def redis(self):
+        connection = getattr(self._local, "redis", None)
+        if connection is None:
+            connection = self._local.redis = RespConnection(self.redis_port)
+        return connection
+
+    def next_id(self, prefix):
+        with self.lock:
+            self.sequences[prefix] = self.sequences.get(prefix, 0) + 1
+            return f"{prefix}_perf{self.sequences[prefix]:010d}"
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    server_version = "CreatorlyStandIn/1.0"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        body = self._body() if method == "POST" else None
+        if self.state.latency_ms and not path.startswith("/__"):
+            time.sleep(self.state.latency_ms / 1000)
+
+        if path == "/__stats":
+            with self.state.lock:
+                return self._send(200, dict(self.state.counters))
+        if path == "/__messages":
+            with self.state.lock:
+                return self._send(200, {recipient: list(sent) for recipient, sent in self.state.messages.items()})
+        if path.startswith("/upstash"):
+            return self._upstash(path[len("/upstash"):], body)
+        if path.startswith("/razorpay"):
+            return self._razorpay(method, path[len("/razorpay"):], body)
+        if path.startswith("/resend"):
+            return self._resend(path[len("/resend"):], body)
+        if path.startswith("/meta"):
+            return self._meta(path[len("/meta"):], body)
+        self._send(404, {"error": f"No fake for {method} {path}"})
+
+    # -- Upstash REST ------------------------------------------------------
+
+    def _upstash(self, path, body):
+        encode = self.headers.get("Upstash-Encoding", "").lower() == "base64"
+        redis = self.state.redis()
+        self.state.count("upstash.commands", len(body) if path else 1)
+        if path in ("/pipeline", "/multi-exec"):
+            results = []
+            for command in body:
+                try:
+                    results.append({"result": _upstash_value(redis.execute(*command), encode)})
+                except RedisError as exc:
+                    results.append({"error": str(exc)})
+            return self._send(200, results)
+        try:
+            return self._send(200, {"result": _upstash_value(redis.execute(*body), encode)})
+        except RedisError as exc:
+            return self._send(400, {"error": str(exc)})
+
+    # -- Razorpay ----------------------------------------------------------
+
+    def _razorpay(self, method, path, body):
+        parts = path.strip("/").split("/")  # ["v1", "orders", ...]
+        resource = parts[1] if len(parts) > 1 else ""
+        created_at = int(time.time())
+
+        if resource == "orders" and method == "POST" and len(parts) == 2:
+            order = {
+                "id": self.state.next_id("order"),
+                "entity": "order",
+                "amount": body.get("amount"),
+                "amount_paid": 0,
+                "amount_due": body.get("amount"),
+                "currency": body.get("currency", "INR"),
+                "receipt": body.get("receipt"),
+                "status": "created",
+                "attempts": 0,
+                "notes": body.get("notes") or {},
+                "created_at": created_at,
+            }
+            with self.state.lock:
+                self.state.orders[order["id"]] = order
+            self.state.count("razorpay.orders")
+            return self._send(200, order)
+        if resource == "orders" and method == "GET" and len(parts) == 3:
+            order = self.state.orders.get(parts[2])
+            if order:
+                return self._send(200, order)
+        if resource == "payments" and len(parts) >= 3:
+            self.state.count("razorpay.payments")
+            return self._send(200, {
+                "id": parts[2],
+                "entity": "payment",
+                "amount": (body or {}).get("amount", 0),
+                "currency": "INR",
+                "status": "captured",
+                "method": "upi",
+                "captured": True,
+                "created_at": created_at,
+            })
+        return self._send(400, {"error": {
+            "code": "BAD_REQUEST_ERROR",
+            "description": f"The stand-in does not implement {method} {path}",
+        }})
+
+    # -- Resend ------------------------------------------------------------
+
+    def _resend(self, path, body):
+        if path == "/emails":
+            self.state.count("resend.emails")
+            return self._send(200, {"id": self.state.next_id("email")})
+        if path == "/emails/batch":
+            self.state.count("resend.emails", len(body))
+            return self._send(200, {"data": [{"id": self.state.next_id("email")} for _ in body]})
+        return self._send(404, {"name": "not_found", "message": f"No fake for {path}"})
+
+    # -- Meta Graph API ----------------------------------------------------
+
+    def _meta(self, path, body):
+        if path.endswith("/me/messages") and body:
+            recipient = body.get("recipient", {}).get("id")
+            text = body.get("message", {}).get("text")
+            with self.state.lock:
+                self.state.messages.setdefault(recipient, []).append([time.time(), text])
+            self.state.count("meta.messages")
+            return self._send(200, {"message_id": self.state.next_id("mid"), "recipient_id": recipient})
+        return self._send(400, {"error": {"message": f"The stand-in does not implement {path}", "code": 100}})
+
+
+class FakeApiServer:
+    def __init__(self, redis_port, latency_ms=0):
+        self.port = _free_port()
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), FakeApiHandler)
+        self._server.daemon_threads = True
+        self._server.state = FakeState(redis_port, latency_ms)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self):
+        with urllib.request.urlopen(f"{self.url}/__stats") as response:
+            return json.loads(response.read())
+
+    def messages(self):
+        """DMs received per recipient, as ``[unix time, text]`` in arrival order."""
+        with urllib.request.urlopen(f"{self.url}/__messages") as response:
+            return json.loads(response.read())
+
+
+def seed_baseline(mongo_uri):
+    """Replace the perf database with one creator, a storefront and products."""
+    from bson import ObjectId
+    from pymongo import MongoClient
+
+    creator_id = ObjectId(CREATOR_ID)
+    with MongoClient(mongo_uri) as client:
+        db = client.get_default_database()
+        for name in ("users", "creatorprofiles", "products"):
+            db[name].delete_many({})
+
+        db.users.insert_one({
+            "_id": creator_id,
+            "username": CREATOR_USERNAME,
+            "email": os.environ.get("TEST_USER_EMAIL", CREATOR_EMAIL).lower(),
+            "displayName": "Perf Creator",
+            "bio": "Seeded by the TestSprite stand-in backend.",
+            "role": "creator",
+            "plan": "pro",
+            "status": "active",
+            "isSuspended": False,
+            "emailVerified": True,
+            "createdAt": SEED_EPOCH,
+            "updatedAt": SEED_EPOCH,
+        })
+        db.creatorprofiles.insert_one({
+            "creatorId": creator_id,
+            "storeName": "Perf Creator Store",
+            "description": "Deterministic storefront for benchmarks.",
+            "createdAt": SEED_EPOCH,
+            "updatedAt": SEED_EPOCH,
+        })
+        db.products.insert_many([
+            {
+                "_id": ObjectId(f"6500000000000000001{i + 1:05x}"),
+                "creatorId": creator_id,
+                "productType": "digital_download",
+                "title": f"Perf Product {i + 1}",
+                "slug": f"perf-product-{i + 1}",
+                "description": "Deterministic product for benchmarks.",
+                "pricing": {"basePrice": 9900 + 100 * i, "currency": "INR", "taxInclusive": False},
+                "status": "published",
+                "isActive": True,
+                "isPublished": True,
+                "isDeleted": False,
+                "isArchived": False,
+                "sortOrder": i,
+                "createdAt": SEED_EPOCH + timedelta(minutes=i),
+                "updatedAt": SEED_EPOCH + timedelta(minutes=i),
+            }
+            for i in range(PRODUCT_COUNT)
+        ])
+
+
+class StandIn:
+    """Start Mongo, Redis and the fake APIs; expose the env the app needs."""
+
+    def __init__(self, seed=True, latency_ms=0):
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.mongo = LocalMongo()
+        self.redis = LocalRedis()
+        self.api = None
+        self.env = {}
+
+    def start(self):
+        self.mongo.start()
+        self.redis.start()
+        self.api = FakeApiServer(self.redis.port, self.latency_ms).start()
+        if self.seed:
+            seed_baseline(self.mongo.uri)
+        self.env = {
+            "MONGODB_URI": self.mongo.uri,
+            "REDIS_URL": self.redis.url,
+            "UPSTASH_REDIS_REST_URL": f"{self.api.url}/upstash",
+            "UPSTASH_REDIS_REST_TOKEN": "standin",
+            "RAZORPAY_API_BASE_URL": f"{self.api.url}/razorpay",
+            "RAZORPAY_KEY_ID": "rzp_test_standin",
+            "RAZORPAY_KEY_SECRET": "standin_secret",
+            "RESEND_BASE_URL": f"{self.api.url}/resend",
+            "RESEND_API_KEY": "re_standin",
+            "META_GRAPH_BASE_URL": f"{self.api.url}/meta",
+            # Download links are signed locally; nothing is fetched from S3.
+            "AWS_ACCESS_KEY_ID": "standin",
+            "AWS_SECRET_ACCESS_KEY": "standin",
+            "AWS_S3_BUCKET": "creatorly-standin",
+            "TEST_SECRET": TEST_SECRET,
+            "TEST_USER_EMAIL": os.environ.get("TEST_USER_EMAIL", CREATOR_EMAIL),
+            "TEST_USERNAME": CREATOR_USERNAME,
+            "TEST_CREATOR_ID": CREATOR_ID,
+            "CRON_SECRET": os.environ.get("CRON_SECRET", "standin-cron-secret"),
+        }
+        return self
+
+    def stop(self):
+        if self.api:
+            self.api.stop()
+        self.redis.stop()
+        self.mongo.stop()
+
+    def __enter__(self):
+        try:
+            return self.start()
+        except BaseException:
+            self.stop()
+            raise
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def read_env(path=ENV_PATH):
+    """The environment a running stand-in wrote, or ``{}`` if none is running."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+    return dict(line.partition("=")[::2] for line in lines if "=" in line)
+
+
+def wait_for_app(url=BASE_URL, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/api/health", timeout=5):
+                return
+        except OSError:
+            time.sleep(1)
+    raise TimeoutError(f"App at {url} did not become healthy within {timeout}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.standin", description=__doc__.splitlines()[0])
+    parser.add_argument("--app", help='command that starts the app, e.g. "npm run start"')
+    parser.add_argument("--latency-ms", type=float, default=0, help="artificial latency for the fake APIs")
+    parser.add_argument("--no-seed", action="store_true", help="leave the database empty")
+    args = parser.parse_args(argv)
+
+    with StandIn(seed=not args.no_seed, latency_ms=args.latency_ms) as standin:
+        ENV_PATH.parent.mkdir(parents=True, exist_ok=True)
+        ENV_PATH.write_text("".join(f"{key}={value}\n" for key, value in standin.env.items()), encoding="utf-8")
+        for key, value in standin.env.items():
+            print(f"{key}={value}")
+        print(f"\n# written to {ENV_PATH}", flush=True)
+
+        app = None
+        if args.app:
+            app = subprocess.Popen(shlex.split(args.app), cwd=TMP_DIR.parent.parent, env={**os.environ, **standin.env})
+            wait_for_app()
+            print(f"App is up at {BASE_URL}", flush=True)
+        try:
+            signal.sigwait({signal.SIGINT, signal.SIGTERM})
+        finally:
+            if app:
+                app.terminate()
+                app.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Condition-driven step execution for the Playwright UI cases.
+
+The generated scripts used to sleep a fixed 3s before every click and fill.
+:class:`Steps` waits for the thing the step actually needs instead - the
+element becoming actionable, the network going idle, or the URL matching a
+predicate - and records how long each wait took::
+
+    steps = Steps(page)
+    await steps.goto("/login")
+    await steps.click(frame.locator("text=Sign in"))
+    await steps.wait_for_url("**/dashboard**")
+
+Paths passed to :meth:`Steps.goto` are resolved against ``BASE_URL``, the
+same way ``api_session()`` resolves API paths.
+
+Timeouts adapt per route: once a page has been seen, the next wait on it is
+allowed a multiple of its recent wait time, within fixed bounds, so a slow
+page does not flake and a fast page fails fast. Navigations are keyed on the
+route being loaded; every other step on the route the page is on.
+"""
+import time
+from contextvars import ContextVar
+from urllib.parse import urlparse
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from harness import trace
+from harness.config import BASE_URL
+
+# Set by the worker around each case so concurrent cases keep separate records.
+_collector = ContextVar("harness_steps_collector", default=None)
+
+
+def collect(records):
+    """Append every step recorded in the current context to ``records``."""
+    return _collector.set(records)
+
+
+def stop_collecting(token):
+    _collector.reset(token)
+
+
+class AdaptiveTimeout:
+    """Per-route timeout following an exponential moving average of waits."""
+
+    def __init__(self, initial=5000, floor=2000, ceiling=30000, factor=4.0, alpha=0.3):
+        self.initial = initial
+        self.floor = floor
+        self.ceiling = ceiling
+        self.factor = factor
+        self.alpha = alpha
+        self._average = {}
+
+    def for_route(self, route):
+        average = self._average.get(route)
+        if average is None:
+            return self.initial
+        return min(self.ceiling, max(self.floor, self.factor * average))
+
+    def observe(self, route, waited_ms):
+        average = self._average.get(route)
+        self._average[route] = waited_ms if average is None else (
+            self.alpha * waited_ms + (1 - self.alpha) * average
+        )
+
+
+# Shared by every case in a worker so later cases benefit from earlier ones.
+default_timeouts = AdaptiveTimeout()
+
+
+def _route(url):
+    return urlparse(url).path or "/"
+
+
+def app_url(url):
+    """``url`` unchanged if absolute, otherwise resolved against ``BASE_URL``."""
+    if "://" in url:
+        return url
+    return f"{BASE_URL}/{url.lstrip('/')}" if url.strip("/") else BASE_URL
+
+
+class Steps:
+    """Run page interactions behind explicit waits and time each one."""
+
+    def __init__(self, page, timeouts=None):
+        self.page = page
+        self.timeouts = timeouts or default_timeouts
+        self.records = []
+        self.tracer = trace.PageTracer(page) if trace.enabled() else None
+        self._tracer_installed = False
+
+    async def _timed(self, action, target, page, wait, act=None, optional=False, route=None):
+        route = route or _route(page.url)
+        timeout = self.timeouts.for_route(route)
+        record = {
+            "step": len(self.records) + 1,
+            "action": action,
+            "target": target,
+            "route": route,
+            "timeout_ms": round(timeout),
+        }
+        self.records.append(record)
+        collector = _collector.get()
+        if collector is not None:
+            collector.append(record)
+
+        if self.tracer:
+            if not self._tracer_installed:
+                await self.tracer.install()
+                self._tracer_installed = True
+            self.tracer.begin(record)
+        try:
+            return await self._run(record, route, timeout, wait, act, optional)
+        finally:
+            if self.tracer:
+                await self.tracer.end(record)
+
+    async def _run(self, record, route, timeout, wait, act, optional):
+        started = time.perf_counter()
+        try:
+            await wait(timeout)
+        except PlaywrightTimeoutError:
+            record["wait_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            record["timed_out"] = True
+            if optional:
+                return record
+            raise
+        record["wait_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.timeouts.observe(route, record["wait_ms"])
+
+        if act is not None:
+            started = time.perf_counter()
+            await act(timeout)
+            record["action_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return record
+
+    async def goto(self, url, wait_until="commit"):
+        """Navigate and record how long the navigation took to reach ``wait_until``.
+
+        ``url`` may be a path on the app; the timeout is the target route's.
+        """
+        url = app_url(url)
+
+        async def navigate(timeout):
+            await self.page.goto(url, wait_until=wait_until, timeout=max(timeout, 10000))
+        return await self._timed("goto", url, self.page, navigate, route=_route(url))
+
+    async def click(self, locator):
+        """Click once the element is visible; Playwright checks the rest of actionability."""
+        return await self._timed(
+            "click", str(locator), locator.page,
+            lambda timeout: locator.wait_for(state="visible", timeout=timeout),
+            lambda timeout: locator.click(timeout=timeout),
+        )
+
+    async def fill(self, locator, value):
+        """Fill once the element is visible and editable."""
+        return await self._timed(
+            "fill", str(locator), locator.page,
+            lambda timeout: locator.wait_for(state="visible", timeout=timeout),
+            lambda timeout: locator.fill(value, timeout=timeout),
+        )
+
+    async def wait_for_url(self, url):
+        """Wait until the page URL matches a glob, regex or predicate."""
+        return await self._timed(
+            "wait_for_url", str(url), self.page,
+            lambda timeout: self.page.wait_for_url(url, wait_until="commit", timeout=timeout),
+        )
+
+    async def wait_for_network_idle(self):
+        """Wait until the page has had no network traffic for 500ms.
+
+        Pages with polling or analytics beacons may never go idle, so running
+        out of time here is recorded but not raised.
+        """
+        return await self._timed(
+            "network_idle", None, self.page,
+            lambda timeout: self.page.wait_for_load_state("networkidle", timeout=timeout),
+            optional=True,
+        )
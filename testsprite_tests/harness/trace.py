@@ -0,0 +1,252 @@
+"""Per-step performance traces for the Playwright UI cases.
+
+With tracing on (``python -m harness --trace``), every :class:`harness.steps.Steps`
+record is enriched with what the page did during that step:
+
+* ``network`` - each request started in the step, with its timing phases
+  (``ttfb_ms`` is request start to first response byte), status and size
+* ``navigation`` - the document's Navigation Timing (TTFB, DOMContentLoaded,
+  load, transfer size)
+* ``vitals`` - LCP, CLS and INP observed in the page so far
+
+:func:`write_trace` saves a case's steps as ``tmp/traces/<case>.json`` plus
+``<case>.html``, a waterfall of steps and requests, so a slow dashboard step
+points at the ``/api`` call that held it up.
+"""
+import html
+import json
+import time
+from contextvars import ContextVar
+from urllib.parse import urlparse
+
+from harness.config import TMP_DIR
+
+TRACE_DIR = TMP_DIR / "traces"
+
+_enabled = ContextVar("harness_trace_enabled", default=False)
+
+# Web Vitals via PerformanceObserver. CLS is the plain sum of shifts without
+# recent input and INP the slowest interaction; close enough for the few
+# interactions a test case makes.
+VITALS_SCRIPT = """
+(() => {
+  const vitals = { lcp: null, cls: 0, inp: null };
+  window.__harnessVitals = vitals;
+  const observe = (type, onEntry, options = {}) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(onEntry))
+        .observe({ type, buffered: true, ...options });
+    } catch (e) { /* entry type not supported */ }
+  };
+  observe('largest-contentful-paint', (entry) => { vitals.lcp = entry.startTime; });
+  observe('layout-shift', (entry) => { if (!entry.hadRecentInput) vitals.cls += entry.value; });
+  observe('event', (entry) => {
+    if (entry.interactionId && (vitals.inp === null || entry.duration > vitals.inp)) vitals.inp = entry.duration;
+  }, { durationThreshold: 16 });
+})();
+"""
+
+SNAPSHOT_SCRIPT = """
+() => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  return {
+    vitals: { ...(window.__harnessVitals || {}) },
+    navigation: nav ? {
+      url: nav.name,
+      ttfb_ms: nav.responseStart,
+      dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+      load_ms: nav.loadEventEnd,
+      transfer_size: nav.transferSize,
+    } : null,
+  };
+}
+"""
+
+
+def enable():
+    """Trace every :class:`~harness.steps.Steps` created in the current context."""
+    return _enabled.set(True)
+
+
+def disable(token):
+    _enabled.reset(token)
+
+
+def enabled():
+    return _enabled.get()
+
+
+def _ms(value):
+    return round(value, 1) if value is not None and value >= 0 else None
+
+
+class PageTracer:
+    """Attribute a page's network requests and vitals to the running step."""
+
+    def __init__(self, page):
+        self.page = page
+        self.current = None
+        self._started = {}  # request -> step record
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_failed)
+
+    async def install(self):
+        await self.page.add_init_script(VITALS_SCRIPT)
+
+    def begin(self, record):
+        record["started_at"] = round(time.time() * 1000, 1)
+        record["network"] = []
+        self.current = record
+
+    async def end(self, record):
+        record["ended_at"] = round(time.time() * 1000, 1)
+        # Requests from here on belong to no step until the next one begins.
+        if self.current is record:
+            self.current = None
+        try:
+            record.update(await self.page.evaluate(SNAPSHOT_SCRIPT))
+        except Exception:
+            # Mid-navigation or closed page: keep the network data we have.
+            pass
+
+    def _on_request(self, request):
+        if self.current is not None:
+            self._started[request] = self.current
+
+    def _entry(self, request):
+        record = self._started.pop(request, None)
+        if record is None:
+            return None, None
+        url = urlparse(request.url)
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "path": url.path,
+            "type": request.resource_type,
+            "api": url.path.startswith("/api/"),
+        }
+        record["network"].append(entry)
+        return record, entry
+
+    async def _on_finished(self, request):
+        record, entry = self._entry(request)
+        if entry is None:
+            return
+        timing = request.timing
+        entry.update(
+            started_at=round(timing["startTime"], 1),
+            queued_ms=_ms(timing["requestStart"]),
+            ttfb_ms=_ms(timing["responseStart"]),
+            duration_ms=_ms(timing["responseEnd"]),
+        )
+        try:
+            response = await request.response()
+            sizes = await request.sizes()
+        except Exception:
+            return
+        entry["status"] = response.status if response else None
+        entry["size"] = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+
+    def _on_failed(self, request):
+        _, entry = self._entry(request)
+        if entry is not None:
+            entry.update(started_at=round(request.timing["startTime"], 1), failure=request.failure)
+
+
+def api_calls(steps):
+    """Every ``/api`` request across ``steps``, slowest first-byte first."""
+    calls = [
+        {"step": step["step"], **entry}
+        for step in steps for entry in step.get("network", []) if entry["api"]
+    ]
+    return sorted(calls, key=lambda call: call.get("ttfb_ms") or 0, reverse=True)
+
+
+def write_trace(name, steps, directory=TRACE_DIR):
+    """Write ``<name>.json`` and the ``<name>.html`` waterfall; return the JSON path."""
+    directory.mkdir(parents=True, exist_ok=True)
+    trace = {"case": name, "steps": steps, "api": api_calls(steps)}
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(trace, indent=2) + "\n", encoding="utf-8")
+    (directory / f"{name}.html").write_text(render_waterfall(name, steps), encoding="utf-8")
+    return path
+
+
+_STYLE = """
+body { font: 13px system-ui, sans-serif; margin: 24px; color: #222; }
+table { border-collapse: collapse; width: 100%; }
+td { padding: 2px 6px; white-space: nowrap; border-bottom: 1px solid #eee; }
+td.label { max-width: 480px; overflow: hidden; text-overflow: ellipsis; }
+tr.step td { background: #f4f4f8; font-weight: 600; }
+.track { position: relative; height: 14px; width: 100%; min-width: 400px; }
+.bar { position: absolute; top: 2px; height: 10px; }
+.step-bar { background: #8884d8; } .wait { background: #c9c9c9; }
+.ttfb { background: #4caf50; } .download { background: #2196f3; } .failed { background: #e53935; }
+.vitals { color: #666; font-weight: normal; }
+"""
+
+
+def render_waterfall(name, steps):
+    """Render ``steps`` as a self-contained HTML waterfall."""
+    starts = [step["started_at"] for step in steps if "started_at" in step]
+    ends = [step.get("ended_at", step["started_at"]) for step in steps if "started_at" in step]
+    for step in steps:
+        for entry in step.get("network", []):
+            if "started_at" in entry:
+                ends.append(entry["started_at"] + (entry.get("duration_ms") or 0))
+    if not starts:
+        return f"<!doctype html><title>{html.escape(name)}</title><p>No traced steps.</p>\n"
+    origin, span = min(starts), max(max(ends) - min(starts), 1)
+
+    def bar(css, start, length, title):
+        left = (start - origin) / span * 100
+        width = max(length / span * 100, 0.15)
+        return f'<div class="bar {css}" style="left:{left:.2f}%;width:{width:.2f}%" title="{html.escape(title)}"></div>'
+
+    rows = []
+    for step in steps:
+        if "started_at" not in step:
+            continue
+        duration = step.get("ended_at", step["started_at"]) - step["started_at"]
+        vitals = step.get("vitals") or {}
+        vitals_text = "  ".join(
+            f"{key.upper()} {value:.3f}" if key == "cls" else f"{key.upper()} {value:.0f} ms"
+            for key, value in vitals.items() if value is not None
+        )
+        label = f"{step['step']}. {step['action']} {step.get('target') or ''}"
+        rows.append(
+            f'<tr class="step"><td class="label" title="{html.escape(label)}">{html.escape(label)}'
+            f' <span class="vitals">{html.escape(vitals_text)}</span></td><td>{duration:.0f} ms</td><td></td>'
+            f'<td><div class="track">{bar("step-bar", step["started_at"], duration, label)}</div></td></tr>'
+        )
+        for entry in sorted(step.get("network", []), key=lambda entry: entry.get("started_at", 0)):
+            if "started_at" not in entry:
+                continue
+            start = entry["started_at"]
+            queued = entry.get("queued_ms") or 0
+            ttfb = entry.get("ttfb_ms") or queued
+            total = entry.get("duration_ms") or ttfb
+            if entry.get("failure"):
+                bars = bar("failed", start, max(total, 1), entry["failure"])
+            else:
+                bars = (
+                    bar("wait", start, queued, f"queued/connect {queued:.0f} ms")
+                    + bar("ttfb", start + queued, ttfb - queued, f"waiting {ttfb - queued:.0f} ms")
+                    + bar("download", start + ttfb, total - ttfb, f"download {total - ttfb:.0f} ms")
+                )
+            size = entry.get("size")
+            rows.append(
+                f'<tr><td class="label" title="{html.escape(entry["url"])}">'
+                f'{"<b>" if entry["api"] else ""}{html.escape(entry["method"])} {html.escape(entry["path"])}'
+                f'{"</b>" if entry["api"] else ""}</td>'
+                f'<td>{total:.0f} ms (TTFB {ttfb:.0f})</td>'
+                f'<td>{entry.get("status", "")} {"" if size is None else f"{size / 1024:.1f} KB"}</td>'
+                f'<td><div class="track">{bars}</div></td></tr>'
+            )
+
+    return (
+        f"<!doctype html>\n<meta charset=\"utf-8\">\n<title>{html.escape(name)}</title>\n"
+        f"<style>{_STYLE}</style>\n<h1>{html.escape(name)}</h1>\n"
+        f"<table>\n{chr(10).join(rows)}\n</table>\n"
+    )
@@ -0,0 +1,154 @@
+"""Load and execute a single generated TCxxx script.
+
+The generated scripts invoke their test at import time (``test_x()`` or
+``asyncio.run(run_test())``). The worker strips those module-level calls,
+executes the rest of the module, and calls the entrypoint itself so the
+runner controls when and where a case actually runs.
+
+UI cases can also be run as a batch that shares one warm browser pool (see
+:mod:`harness.browser_pool`); each case then reports a ``##harness-result``
+JSON line on stdout.
+
+Usage::
+
+    python -m harness.worker backup/TC003_get_products_list_with_valid_authentication.py
+    python -m harness.worker --browsers 2 --timeout 120 backup/TC018_*.py backup/TC019_*.py
+    python -m harness.worker --browsers 1 --trace backup/TC018_*.py
+"""
+import argparse
+import ast
+import asyncio
+import json
+import sys
+import time
+import traceback
+import types
+from pathlib import Path
+
+RESULT_PREFIX = "##harness-result "
+
+
+def _entrypoint_name(call):
+    """Return the function name invoked by a module-level call, if any."""
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    # asyncio.run(run_test())
+    if (
+        isinstance(call.func, ast.Attribute)
+        and call.func.attr == "run"
+        and call.args
+        and isinstance(call.args[0], ast.Call)
+    ):
+        return _entrypoint_name(call.args[0])
+    return None
+
+
+def load_entrypoint(path):
+    """Import ``path`` without side effects and return its test callable."""
+    path = Path(path)
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+
+    body = []
+    entrypoint = None
+    for node in tree.body:
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            entrypoint = _entrypoint_name(node.value) or entrypoint
+            continue
+        body.append(node)
+    tree.body = body
+
+    module = types.ModuleType(path.stem)
+    module.__file__ = str(path)
+    exec(compile(tree, str(path), "exec"), module.__dict__)
+
+    if entrypoint is None:
+        candidates = [
+            name for name, value in vars(module).items()
+            if callable(value) and (name == "run_test" or name.startswith("test_"))
+        ]
+        if len(candidates) != 1:
+            raise LookupError(f"Could not find a test entrypoint in {path.name}")
+        entrypoint = candidates[0]
+
+    return getattr(module, entrypoint)
+
+
+def run(path):
+    """Run the case at ``path``; raises on failure."""
+    result = load_entrypoint(path)()
+    if asyncio.iscoroutine(result):
+        asyncio.run(result)
+
+
+async def _run_pooled(path, timeout, slots, traced=False):
+    from harness import trace
+    from harness.steps import collect, stop_collecting
+
+    async with slots:
+        steps = []
+        token = collect(steps)
+        trace_token = trace.enable() if traced else None
+        started = time.monotonic()
+        try:
+            result = load_entrypoint(path)()
+            if asyncio.iscoroutine(result):
+                await asyncio.wait_for(result, timeout)
+        except asyncio.TimeoutError:
+            status, error = "FAILED", f"Test execution timed out after {timeout} seconds"
+        except Exception:
+            status, error = "FAILED", traceback.format_exc().strip()
+        else:
+            status, error = "PASSED", ""
+        finally:
+            stop_collecting(token)
+            if trace_token:
+                trace.disable(trace_token)
+        if traced and steps:
+            trace.write_trace(Path(path).stem, steps)
+        record = {
+            "path": str(path),
+            "status": status,
+            "error": error,
+            "duration": time.monotonic() - started,
+            "steps": steps,
+        }
+        print(RESULT_PREFIX + json.dumps(record), flush=True)
+
+
+async def run_batch(paths, browsers, timeout, traced=False):
+    """Run UI ``paths`` against a shared pool of ``browsers`` warm browsers."""
+    from harness.browser_pool import BrowserPool, install
+
+    slots = asyncio.Semaphore(browsers)
+    async with BrowserPool(size=browsers) as pool:
+        install(pool)
+        try:
+            await asyncio.gather(*(_run_pooled(path, timeout, slots, traced) for path in paths))
+        finally:
+            install(None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m harness.worker")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--browsers", type=int, help="run the paths as a batch on this many pooled browsers")
+    parser.add_argument("--timeout", type=float, default=180, help="per-case timeout in batch mode")
+    parser.add_argument("--trace", action="store_true", help="write per-step traces to tmp/traces in batch mode")
+    args = parser.parse_args(argv)
+
+    if args.browsers:
+        asyncio.run(run_batch(args.paths, args.browsers, args.timeout, args.trace))
+        return 0
+
+    if len(args.paths) != 1:
+        parser.error("pass exactly one script, or use --browsers to run a batch")
+    try:
+        run(args.paths[0])
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""PERF-API-001: the dashboard summary stays within budget at 10M analytics events.
+
+The first run seeds the ``large`` profile, which takes a while; later runs
+reuse it.
+"""
+import os
+import time
+
+from harness.budgets import load_budgets, summarize
+from harness.client import api_session
+from harness.seed import ensure_seeded
+
+PERIODS = ("all", "today", "week", "month")
+ITERATIONS = 30
+WARMUP = 3
+
+
+def budget_ms():
+    budgets, _ = load_budgets()
+    return next(budget.limit_ms for budget in budgets if budget.spec_id == "PERF-API-001")
+
+
+def catch_up_rollups(session, max_calls=200):
+    """Run the rollup cron until it has processed every seeded event."""
+    headers = {"Authorization": f"Bearer {os.environ.get('CRON_SECRET', 'standin-cron-secret')}"}
+    for _ in range(max_calls):
+        response = session.get("/api/cron/analytics/rollup", headers=headers, timeout=120)
+        assert response.ok, f"Rollup cron failed: {response.status_code} {response.text[:200]}"
+        if response.json().get("caughtUp"):
+            return
+    assert False, f"Rollups not caught up after {max_calls} cron runs"
+
+
+def test_get_creator_analytics_summary_within_budget_at_10M_events():
+    dataset = ensure_seeded("large")
+    assert dataset.counts.get("analyticsevents", 0) >= 10_000_000, f"Seeded only {dataset.counts}"
+
+    session = api_session()
+    catch_up_rollups(session)
+    limit = budget_ms()
+
+    for period in PERIODS:
+        samples = []
+        for i in range(WARMUP + ITERATIONS):
+            started = time.perf_counter()
+            response = session.get("/api/creator/analytics/summary", params={"period": period})
+            elapsed = (time.perf_counter() - started) * 1000
+            assert response.ok, f"period={period}: {response.status_code} {response.text[:200]}"
+            if i >= WARMUP:
+                samples.append(elapsed)
+
+        data = response.json()["data"]
+        assert data["storeViews"] > 0 or period == "today", f"period={period}: no store views in {data}"
+        stats = summarize(samples)
+        assert stats["p95"] <= limit, f"period={period}: p95 {stats['p95']}ms over {limit:.0f}ms budget ({stats})"
+
+
+test_get_creator_analytics_summary_within_budget_at_10M_events()
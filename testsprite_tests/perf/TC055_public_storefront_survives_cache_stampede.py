@@ -0,0 +1,100 @@
+"""A burst on an expired storefront key reaches MongoDB once (PERF-SCA-001).
+
+The test rewrites the ``storefront:<username>`` cache entry through the
+stand-in's Upstash REST endpoint (missing, then expired), publishes an
+invalidation so the app drops its in-process copy, fires concurrent requests
+at ``/api/public/<username>``, and reads the app's cache counters from
+``/api/platform/health`` (sending ``CRON_SECRET``, which unlocks them).
+Requests served stale must stay within the PERF-API-001 GET budget.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+
+import requests
+
+from harness.budgets import load_budgets, summarize
+from harness.client import async_client, cache_stats
+from harness.standin import CREATOR_USERNAME, ENV_PATH, read_env
+
+BURST = 200
+
+
+def standin_env(name):
+    # The stand-in's own settings first: a loaded app .env points at real Upstash.
+    value = read_env().get(name) or os.environ.get(name)
+    if not value:
+        raise KeyError(f"{name} is not set and there is no stand-in environment at {ENV_PATH}; "
+                       f'start python -m harness.standin --app "npm run start" first')
+    return value
+
+
+def upstash(*command):
+    response = requests.post(
+        standin_env("UPSTASH_REDIS_REST_URL"),
+        json=list(command),
+        headers={"Authorization": f"Bearer {standin_env('UPSTASH_REDIS_REST_TOKEN')}"},
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.json()["result"]
+
+
+def evict_l1(key):
+    upstash("PUBLISH", "cache:invalidate", json.dumps({"from": "tc055", "keys": [key]}))
+
+
+async def burst(username, count=BURST):
+    async def one(client):
+        started = time.perf_counter()
+        response = await client.get(f"/api/public/{username}")
+        return response.status_code, (time.perf_counter() - started) * 1000
+
+    async with async_client(authenticated=False, max_connections=count) as client:
+        return await asyncio.gather(*(one(client) for _ in range(count)))
+
+
+def loads_during(username, expected_status):
+    before = cache_stats()
+    results = asyncio.run(burst(username))
+    after = cache_stats()
+    statuses = {status for status, _ in results}
+    assert statuses == {expected_status}, f"{username}: statuses {statuses}"
+    return after["loads"] - before["loads"], [ms for _, ms in results]
+
+
+def test_public_storefront_survives_cache_stampede():
+    key = f"storefront:{CREATOR_USERNAME}"
+
+    # Cold key: concurrent misses share one load.
+    upstash("DEL", key)
+    evict_l1(key)
+    loads, _ = loads_during(CREATOR_USERNAME, 200)
+    assert loads <= 1, f"Cold burst of {BURST} ran {loads} storefront loads"
+
+    # Expired key: the stale profile is served while one refresh runs.
+    entry = json.loads(upstash("GET", key))
+    entry["storedAt"] -= (entry["ttl"] + 1) * 1000
+    upstash("SET", key, json.dumps(entry), "EX", 600)
+    evict_l1(key)
+    loads, latencies = loads_during(CREATOR_USERNAME, 200)
+    budgets, _ = load_budgets()
+    limit = next(budget.limit_ms for budget in budgets if budget.spec_id == "PERF-API-001")
+    stats = summarize(latencies)
+    assert stats["p95"] <= limit, f"Stale burst p95 {stats['p95']}ms over {limit:.0f}ms budget ({stats})"
+    assert loads <= 1, f"Stale burst of {BURST} ran {loads} storefront loads"
+    time.sleep(1)
+    refreshed = json.loads(upstash("GET", key))
+    assert refreshed["storedAt"] > entry["storedAt"], "Stale entry was not refreshed in the background"
+
+    # Unknown username: one load, then served from the negative cache.
+    missing = f"no-such-creator-{uuid.uuid4().hex[:8]}"
+    loads, _ = loads_during(missing, 404)
+    assert loads <= 1, f"Unknown-username burst ran {loads} loads"
+    loads, _ = loads_during(missing, 404)
+    assert loads == 0, f"Negative cache miss: repeat burst ran {loads} loads"
+
+
+test_public_storefront_survives_cache_stampede()
@@ -0,0 +1,95 @@
+"""PERF-SCA-002: a million-row export streams without growing the server's memory.
+
+The first run seeds the ``export`` profile (one creator with 1M orders and
+1M leads).
+
+The orders are exported as plain CSV and the leads as gzipped JSONL. The
+body is read in chunks and only counted, never held. Meanwhile the app's
+RSS is polled from ``/api/platform/health`` (with ``CRON_SECRET``, which
+unlocks the process stats); its peak may not exceed the
+pre-export baseline by more than ``MAX_RSS_GROWTH_MB``.
+"""
+import threading
+import time
+import zlib
+
+from harness.client import api_session, app_memory
+from harness.seed import _database, ensure_seeded
+from harness.standin import CREATOR_ID
+
+MAX_RSS_GROWTH_MB = 128
+SAMPLE_INTERVAL_S = 0.5
+
+EXPORTS = (
+    ("/api/creator/orders/export", {"format": "csv"}, "orders"),
+    ("/api/creator/leads/export", {"format": "jsonl", "gzip": "1"}, "leads"),
+)
+
+
+class RssSampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.samples = []
+
+    def run(self):
+        session = api_session(authenticated=False)
+        while not self.stopped.wait(SAMPLE_INTERVAL_S):
+            memory = app_memory(session)
+            if memory:
+                self.samples.append(memory["rssMb"])
+
+
+def stream_lines(session, path, params):
+    """Count the lines of a (possibly gzipped) export without keeping the body."""
+    gzipped = params.get("gzip") == "1"
+    inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+    lines = 0
+    with session.get(path, params=params, stream=True, timeout=600) as response:
+        assert response.ok, f"{path}: {response.status_code} {response.text[:200]}"
+        expected_type = "application/gzip" if gzipped else "text/csv"
+        assert response.headers["Content-Type"].startswith(expected_type), response.headers["Content-Type"]
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            lines += (inflate.decompress(chunk) if inflate else chunk).count(b"\n")
+    if inflate:
+        lines += inflate.flush().count(b"\n")
+    return lines
+
+
+def test_streaming_export_keeps_server_rss_flat():
+    from bson import ObjectId
+
+    dataset = ensure_seeded("export")
+    db = _database(None)
+    session = api_session()
+
+    for path, params, collection in EXPORTS:
+        seeded = dataset.creators[collection][0]
+        assert seeded >= 1_000_000, f"Seeded only {seeded} {collection}"
+        # Other seeded profiles share the creator; the export covers all of its rows.
+        expected = db[collection].count_documents({"creatorId": ObjectId(CREATOR_ID)})
+
+        baseline = app_memory()
+        assert baseline, "App does not report memory in /api/platform/health (does CRON_SECRET match the app's?)"
+        sampler = RssSampler()
+        sampler.start()
+        started = time.monotonic()
+        try:
+            lines = stream_lines(session, path, params)
+        finally:
+            sampler.stopped.set()
+            sampler.join()
+        seconds = time.monotonic() - started
+
+        header = 1 if params["format"] == "csv" else 0
+        assert lines == expected + header, f"{path}: {lines} lines for {expected} {collection}"
+        peak = max(sampler.samples, default=baseline["rssMb"])
+        growth = peak - baseline["rssMb"]
+        print(f"{path} {params}: {expected:,} rows in {seconds:.1f}s ({expected / seconds:,.0f}/s), "
+              f"RSS {baseline['rssMb']}MB -> peak {peak}MB")
+        assert growth <= MAX_RSS_GROWTH_MB, (
+            f"{path}: RSS grew {growth}MB (from {baseline['rssMb']}MB to {peak}MB), limit {MAX_RSS_GROWTH_MB}MB"
+        )
+
+
+test_streaming_export_keeps_server_rss_flat()
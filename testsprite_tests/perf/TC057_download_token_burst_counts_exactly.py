@@ -0,0 +1,112 @@
+"""Download link bursts redeem exactly ``maxDownloads`` (PERF-SCA-003, E2E-EDG-003 at launch scale).
+
+Tokens for a seeded product are written straight to ``downloadtokens`` with
+a ``fileKey``.
+
+Two bursts hit ``/api/download/<token>`` without following redirects:
+- one shared link: ``SHARED_BURST`` requests at a token allowing
+  ``SHARED_MAX`` downloads
+- a launch: ``LAUNCH_BUYERS`` buyers, each with a one-download token,
+  each requested twice at once
+
+Every allowed download must redirect and every other request must get 403.
+Afterwards each token's ``downloadCount`` must equal its limit, and the
+token must be inactive. The launch's redirects must reuse one signed URL,
+and their p95 must stay within the PERF-API-001 GET budget.
+"""
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from harness.budgets import load_budgets, summarize
+from harness.client import async_client
+from harness.seed import _database
+from harness.standin import ENV_PATH, read_env
+
+SHARED_BURST = 200
+SHARED_MAX = 3
+LAUNCH_BUYERS = 1000
+FILE_KEY = "products/perf-creator/launch.pdf"
+PRODUCT_ID = "650000000000000000100001"
+
+
+def standin_env(name):
+    # The stand-in's own settings first: a loaded app .env points at real data.
+    value = read_env().get(name) or os.environ.get(name)
+    if not value:
+        raise KeyError(f"{name} is not set and there is no stand-in environment at {ENV_PATH}; "
+                       f'start python -m harness.standin --app "npm run start" first')
+    return value
+
+
+def insert_tokens(db, run_id, count, max_downloads):
+    from bson import ObjectId
+
+    now = datetime.now(timezone.utc)
+    tokens = [f"tc057-{run_id}-{i}" for i in range(count)]
+    db["downloadtokens"].insert_many([
+        {
+            "token": token, "orderId": ObjectId(), "productId": ObjectId(PRODUCT_ID), "fileKey": FILE_KEY,
+            "downloadCount": 0, "maxDownloads": max_downloads, "isActive": True,
+            "expiresAt": now + timedelta(hours=1), "createdAt": now, "updatedAt": now,
+        }
+        for token in tokens
+    ])
+    return tokens
+
+
+async def burst(paths):
+    async def one(client, path):
+        started = time.perf_counter()
+        response = await client.get(path)
+        return path, response.status_code, response.headers.get("location"), (time.perf_counter() - started) * 1000
+
+    async with async_client(authenticated=False, max_connections=min(len(paths), 500)) as client:
+        return await asyncio.gather(*(one(client, path) for path in paths))
+
+
+def check_counts(db, tokens, expected):
+    rows = {row["token"]: row for row in db["downloadtokens"].find({"token": {"$in": tokens}})}
+    wrong = [(token, rows[token]["downloadCount"]) for token in tokens if rows[token]["downloadCount"] != expected]
+    assert not wrong, f"{len(wrong)} tokens with downloadCount != {expected}, e.g. {wrong[:5]}"
+    active = [token for token in tokens if rows[token]["isActive"]]
+    assert not active, f"{len(active)} used-up tokens still active, e.g. {active[:5]}"
+
+
+def test_download_token_burst_counts_exactly():
+    db = _database(standin_env("MONGODB_URI"))
+    run_id = uuid.uuid4().hex[:8]
+    try:
+        # One link shared far beyond its limit.
+        [shared] = insert_tokens(db, f"{run_id}-shared", 1, SHARED_MAX)
+        results = asyncio.run(burst([f"/api/download/{shared}"] * SHARED_BURST))
+        statuses = [status for _, status, _, _ in results]
+        redirected = sum(1 for status in statuses if 300 <= status < 400)
+        assert redirected == SHARED_MAX, f"{redirected} of {SHARED_BURST} requests redirected, limit {SHARED_MAX}"
+        assert statuses.count(403) == SHARED_BURST - SHARED_MAX, f"Unexpected statuses: {set(statuses)}"
+        check_counts(db, [shared], SHARED_MAX)
+
+        # A launch: every buyer clicks twice at once.
+        tokens = insert_tokens(db, f"{run_id}-launch", LAUNCH_BUYERS, 1)
+        results = asyncio.run(burst([f"/api/download/{token}" for token in tokens for _ in range(2)]))
+        redirects = [(path, location, ms) for path, status, location, ms in results if 300 <= status < 400]
+        denied = [status for _, status, _, _ in results if status == 403]
+        assert len(redirects) == LAUNCH_BUYERS, f"{len(redirects)} redirects for {LAUNCH_BUYERS} one-use tokens"
+        assert len({path for path, _, _ in redirects}) == LAUNCH_BUYERS, "A token was redeemed twice"
+        assert len(denied) == LAUNCH_BUYERS, f"{len(denied)} requests denied, expected {LAUNCH_BUYERS}"
+        check_counts(db, tokens, 1)
+
+        locations = {location for _, location, _ in redirects}
+        assert len(locations) == 1, f"{len(locations)} distinct signed URLs for one file; expected a cached one"
+        budgets, _ = load_budgets()
+        limit = next(budget.limit_ms for budget in budgets if budget.spec_id == "PERF-API-001")
+        stats = summarize([ms for _, _, ms in redirects])
+        print(f"Launch burst: {LAUNCH_BUYERS} downloads redeemed once each, redirect latency {stats}")
+        assert stats["p95"] <= limit, f"Redirect p95 {stats['p95']}ms over {limit:.0f}ms budget ({stats})"
+    finally:
+        db["downloadtokens"].delete_many({"token": {"$regex": f"^tc057-{run_id}-"}})
+
+
+test_download_token_burst_counts_exactly()
@@ -1,26 +1,31 @@
 // worker.ts
 import 'dotenv/config';
-import { processQueueJob } from './src/lib/queue/processor';
-import { QueueJob } from './src/lib/models/QueueJob';
-import { connectToDatabase } from './src/lib/db/mongodb';
+import { QueueDispatcher } from './src/lib/queue/dispatcher';
+import { analyticsIngest } from './src/lib/analytics/ingest';
+import { setPoolRole } from './src/lib/db/mongodb';
 
 async function startWorker() {
-    await connectToDatabase();
-    console.log('Worker started. Polling for jobs...');
+    setPoolRole('worker');
+    const dispatcher = new QueueDispatcher({
+        onJobDone: (job, result: any, durationMs) => {
+            console.log(`Processed job ${job._id} (${job.type}) -> ${result?.status} in ${durationMs}ms`);
+        },
+    });
 
-    setInterval(async () => {
-        const now = new Date();
-        const pendingJobs = await QueueJob.find({
-            status: { $in: ['pending', 'failed'] },
-            nextRunAt: { $lte: now },
-            attempt: { $lt: 5 } // Max attempts from processor or here
-        }).limit(10);
+    const shutdown = async () => {
+        console.log('Worker stopping; waiting for in-flight jobs...');
+        await dispatcher.stop();
+        await analyticsIngest.stop();
+        process.exit(0);
+    };
+    process.on('SIGINT', shutdown);
+    process.on('SIGTERM', shutdown);
 
-        for (const job of pendingJobs) {
-            console.log(`Processing job ${job._id} (${job.type})`);
-            await processQueueJob(job._id.toString());
-        }
-    }, 10000); // Check every 10 seconds
+    // Drain analytics events buffered by the app even when no requests arrive.
+    analyticsIngest.start();
+
+    console.log('Worker started. Dispatching jobs...');
+    await dispatcher.start();
 }
 
 startWorker().catch(err => {